@@ -1,6 +1,8 @@
 """
 Solar Benefit Calculator - Streamlit Web Application
 """
+import os
+
 import streamlit as st
 import pandas as pd
 from utils.calculations import SolarCalculator
@@ -58,6 +60,14 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
+@st.cache_resource
+def get_calculator():
+    """Share one calculator (and its analysis cache) across reruns"""
+    calculator = SolarCalculator()
+    if os.getenv('ANSWER_TABLE_FILE'):
+        calculator.load_answer_table(os.getenv('ANSWER_TABLE_FILE'))
+    return calculator
+
 def main():
     # Header with clean design
     st.markdown('''
@@ -71,7 +81,7 @@ def main():
     ''', unsafe_allow_html=True)
 
     # Initialize calculator and OCR processor
-    calculator = SolarCalculator()
+    calculator = get_calculator()
     ocr_processor = BillOCRProcessor()
 
     # Sidebar for inputs
@@ -195,7 +205,7 @@ def main():
 
         # Perform calculations
         with st.spinner("Calculating solar benefits..."):
-            analysis = calculator.get_comprehensive_analysis(
+            analysis = calculator.get_cached_analysis(
                 monthly_bill=monthly_bill,
                 tariff_rate=tariff_rate,
                 investment_model=investment_model
@@ -351,12 +361,12 @@ def show_sample_benefits():
     </div>
     ''', unsafe_allow_html=True)
 
-    calculator = SolarCalculator()
+    calculator = get_calculator()
     sample_bills = [5000, 25000, 100000, 500000, 1000000]
     sample_data = []
 
     for bill in sample_bills:
-        analysis = calculator.get_comprehensive_analysis(
+        analysis = calculator.get_cached_analysis(
             monthly_bill=bill,
             tariff_rate=8.0,
             investment_model="CAPEX"
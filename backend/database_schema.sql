@@ -37,6 +37,9 @@ CREATE TABLE solar_calculations (
     payback_period DECIMAL(5,2),
     co2_saved_annual DECIMAL(8,2),
     co2_saved_lifetime DECIMAL(10,2),
+    generation_by_year REAL[],
+    savings_by_year REAL[],
+    co2_saved_by_year REAL[],
     equivalent_trees DECIMAL(8,0),
     
     -- System Specifications
@@ -100,6 +103,35 @@ INSERT INTO consumer_categories (category_code, category_name, voltage_level, co
 ('HT-6', 'Public Lighting', 'HT', 'Commercial', 7.00, 9.00, 'Public infrastructure lighting'),
 ('HT-7', 'Mixed Load', 'HT', 'Commercial', 7.50, 10.50, 'Mixed commercial and residential complexes');
 
+-- Table for tiered installed cost per kW (state/installer rows override the defaults)
+CREATE TABLE cost_per_kw_tiers (
+    id UUID DEFAULT gen_random_uuid() PRIMARY KEY,
+    consumer_type TEXT NOT NULL,
+    state TEXT,
+    installer TEXT,
+    tier_order INTEGER NOT NULL,
+    max_kw DECIMAL(10,2), -- NULL for the open-ended top tier
+    max_inclusive BOOLEAN DEFAULT FALSE,
+    price_per_kw DECIMAL(10,2) NOT NULL,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
+-- Insert default cost tiers
+INSERT INTO cost_per_kw_tiers (consumer_type, state, installer, tier_order, max_kw, max_inclusive, price_per_kw) VALUES
+('Residential', NULL, NULL, 1, 5, FALSE, 80000),
+('Residential', NULL, NULL, 2, 10, TRUE, 78000),
+('Residential', NULL, NULL, 3, NULL, FALSE, 76000),
+('Commercial', NULL, NULL, 1, 50, FALSE, 75000),
+('Commercial', NULL, NULL, 2, 100, TRUE, 72000),
+('Commercial', NULL, NULL, 3, NULL, FALSE, 70000),
+('Industrial', NULL, NULL, 1, 100, FALSE, 70000),
+('Industrial', NULL, NULL, 2, 500, TRUE, 68000),
+('Industrial', NULL, NULL, 3, NULL, FALSE, 65000),
+-- '*' prices consumer types without their own rows
+('*', NULL, NULL, 1, 100, FALSE, 80000),
+('*', NULL, NULL, 2, 500, TRUE, 78000),
+('*', NULL, NULL, 3, NULL, FALSE, 76000);
+
 -- Insert sample location data (major Indian cities)
 INSERT INTO location_solar_data (city, state, latitude, longitude, ghi_annual, dni_annual, avg_irradiance, default_tariff) VALUES
 ('Mumbai', 'Maharashtra', 19.0760, 72.8777, 1825, 1650, 5.0, 7.2),
@@ -129,14 +161,17 @@ CREATE INDEX idx_solar_calculations_created_at ON solar_calculations(created_at)
 CREATE INDEX idx_solar_calculations_location ON solar_calculations(location_city, location_state);
 CREATE INDEX idx_location_solar_data_city_state ON location_solar_data(city, state);
 CREATE INDEX idx_consumer_categories_type ON consumer_categories(consumer_type, voltage_level);
+CREATE INDEX idx_cost_per_kw_tiers_lookup ON cost_per_kw_tiers(consumer_type, state, installer);
 
 -- Enable Row Level Security (RLS)
 ALTER TABLE solar_calculations ENABLE ROW LEVEL SECURITY;
 ALTER TABLE location_solar_data ENABLE ROW LEVEL SECURITY;
 ALTER TABLE consumer_categories ENABLE ROW LEVEL SECURITY;
+ALTER TABLE cost_per_kw_tiers ENABLE ROW LEVEL SECURITY;
 
 -- Create policies for public access (since this is a calculator app)
 CREATE POLICY "Allow public read access" ON location_solar_data FOR SELECT USING (true);
 CREATE POLICY "Allow public read access" ON consumer_categories FOR SELECT USING (true);
+CREATE POLICY "Allow public read access" ON cost_per_kw_tiers FOR SELECT USING (true);
 CREATE POLICY "Allow public insert" ON solar_calculations FOR INSERT WITH CHECK (true);
 CREATE POLICY "Allow public read own calculations" ON solar_calculations FOR SELECT USING (true);
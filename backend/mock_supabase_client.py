@@ -7,7 +7,7 @@ import os
 import uuid
 import json
 from datetime import datetime
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 
 class MockSupabaseClient:
     """Mock Supabase client that simulates database operations"""
@@ -29,14 +29,15 @@ class MockSupabaseClient:
         print("💡 To use real Supabase, update .env with your credentials")
     
     def save_calculation(self, form_data: Dict[str, Any], solar_data: Dict[str, Any], 
-                        results: Dict[str, Any]) -> str:
+                        results: Dict[str, Any], lifetime: Optional[Dict[str, List[float]]] = None) -> str:
         """
         Mock save calculation data
         
         Args:
             form_data: Form input data
             solar_data: Solar irradiance and location data
-            results: Calculation results
+            results: Calculation results (dict or AnalysisResult)
+            lifetime: Optional per-year arrays (utils.lifetime.lifetime_columns)
             
         Returns:
             str: Calculation ID
@@ -89,6 +90,10 @@ class MockSupabaseClient:
                 'estimated_area_required': float(calculations.get('area_required', 0)),
             }
             
+            # Per-year generation, savings and CO2 arrays
+            if lifetime:
+                mock_record.update(lifetime)
+
             # Store in mock database
             self.mock_data['calculations'][calculation_id] = mock_record
             
@@ -146,6 +151,26 @@ class MockSupabaseClient:
             print(f"❌ Mock: Error retrieving recent calculations: {str(e)}")
             return []
     
+    def get_price_book_records(self) -> list:
+        """
+        Mock get tiered cost-per-kW rows
+
+        Returns:
+            List of price book rows (the mock has none, so the calculator
+            keeps its built-in prices)
+        """
+        return list(self.mock_data.get('price_book', []))
+    
+    def get_consumer_categories(self) -> list:
+        """
+        Mock get consumer categories
+
+        Returns:
+            List of consumer_categories rows (the mock has none, so the
+            calculator keeps the built-in categories)
+        """
+        return list(self.mock_data.get('consumer_categories', []))
+    
     def save_location_data(self, city: str, state: str, solar_data: Dict[str, Any]) -> bool:
         """
         Mock save location data
@@ -13,11 +13,14 @@ from datetime import datetime
 import tempfile
 from typing import Dict, Any
 
+from utils.recommendations import RecommendationEngine
+
 class ReportGenerator:
     def __init__(self):
         """Initialize report generator"""
         self.styles = getSampleStyleSheet()
         self._setup_custom_styles()
+        self.recommendation_engine = RecommendationEngine(audience=None)
     
     def _setup_custom_styles(self):
         """Setup custom styles for the report"""
@@ -96,6 +99,9 @@ class ReportGenerator:
         
         # Environmental Impact
         story.extend(self._build_environmental_impact(calculation_data))
+
+        # Year-by-year Performance
+        story.extend(self._build_lifetime_profile(calculation_data))
         
         # Recommendations
         story.extend(self._build_recommendations(calculation_data))
@@ -264,30 +270,55 @@ class ReportGenerator:
         
         return story
     
+    def _build_lifetime_profile(self, data: Dict[str, Any]) -> list:
+        """Build year-by-year generation, savings and CO2 section (skipped for older records)"""
+        story = []
+        if not data.get('generation_by_year'):
+            return story
+
+        story.append(Paragraph("Year-by-Year Performance", self.section_style))
+
+        profile_data = [['Year', 'Generation', 'Savings', 'CO₂ Reduction']]
+        for year, (generation, savings, co2) in enumerate(zip(data['generation_by_year'],
+                                                              data['savings_by_year'],
+                                                              data['co2_saved_by_year']), start=1):
+            profile_data.append([str(year), f"{generation:,.0f} kWh", f"₹{savings:,.0f}", f"{co2:.2f} tons"])
+        profile_data.append(['Total', f"{sum(data['generation_by_year']):,.0f} kWh",
+                             f"₹{sum(data['savings_by_year']):,.0f}",
+                             f"{sum(data['co2_saved_by_year']):.1f} tons"])
+
+        profile_table = Table(profile_data, colWidths=[0.8*inch, 1.6*inch, 1.6*inch, 1.4*inch], repeatRows=1)
+        profile_table.setStyle(TableStyle([
+            ('ALIGN', (0, 0), (-1, -1), 'RIGHT'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTNAME', (0, -1), (-1, -1), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, -1), 9),
+            ('GRID', (0, 0), (-1, -1), 1, colors.lightgrey),
+            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#e8f5e8')),
+            ('PADDING', (0, 0), (-1, -1), 4),
+        ]))
+
+        story.append(profile_table)
+        story.append(Spacer(1, 20))
+
+        return story
+
     def _build_recommendations(self, data: Dict[str, Any]) -> list:
         """Build recommendations section"""
         story = []
         
         story.append(Paragraph("Recommendations", self.section_style))
         
-        # Add some standard recommendations based on the data
-        recommendations = []
-        
-        if data['investment_model'] == 'CAPEX' and data['payback_period'] <= 6:
-            recommendations.append("✓ Excellent investment opportunity with quick payback period")
-        
-        if data['plant_capacity'] > 10:
-            recommendations.append("✓ Consider phased installation to spread investment")
-        
-        if data['consumer_type'] == 'Commercial':
-            recommendations.append("✓ Explore accelerated depreciation benefits for commercial installations")
-        
-        recommendations.extend([
-            "✓ Ensure regular cleaning and maintenance for optimal performance",
-            "✓ Consider battery storage for backup power during outages",
-            "✓ Monitor system performance through mobile app or web portal",
-            "✓ Review electricity bill patterns after installation"
-        ])
+        # Same rules as the calculator, plus the report-only general advice
+        recommendations = [
+            f"✓ {item['message']}" for item in self.recommendation_engine.evaluate(
+                plant_capacity=data['plant_capacity'],
+                investment=data.get('investment_amount', 0),
+                payback_period=data.get('payback_period', 0),
+                consumer_type=data['consumer_type'],
+                investment_model=data['investment_model']
+            )
+        ]
         
         for rec in recommendations:
             story.append(Paragraph(rec, self.normal_style))
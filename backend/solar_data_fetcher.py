@@ -6,7 +6,9 @@ import requests
 import os
 from typing import Dict, Any, Optional
 import json
-from utils.location_data import get_location_info
+from utils.location_data import CITY_COORDINATES, get_hourly_weather, get_location_info, set_hourly_weather
+from utils.orientation import OrientationOptimizer
+from utils.temperature import hourly_weather
 
 class SolarDataFetcher:
     def __init__(self):
@@ -37,6 +39,11 @@ class SolarDataFetcher:
             "Patna": {"lat": 25.5941, "lon": 85.1376},
             "Vadodara": {"lat": 22.3072, "lon": 73.1812}
         }
+        for city, coords in CITY_COORDINATES.items():
+            self.city_coordinates.setdefault(city, coords)
+
+        # Optimal tilt/azimuth per city, cached in the location store
+        self.orientation_optimizer = OrientationOptimizer()
     
     def get_enhanced_solar_data(self, city: str, fallback_data: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -138,6 +145,25 @@ class SolarDataFetcher:
         
         # Add seasonal variation estimates
         enhanced_data['seasonal_variation'] = self._get_seasonal_variation(city)
+
+        # Add weather impact factors (used by the hourly generation engine)
+        enhanced_data['weather_factors'] = self.get_weather_impact_factors(city)
+
+        # Hourly temperatures stay in the location store; the engine looks them up by city
+        weather = self.get_hourly_weather(city)
+        enhanced_data.update({
+            'city': city,
+            'mean_ambient_temperature': round(float(weather['temperature'].mean()), 1)
+        })
+
+        # Add the optimal module orientation (used by the hourly generation engine)
+        orientation = self.orientation_optimizer.optimize_city(city)
+        if orientation:
+            enhanced_data.update({
+                'optimal_tilt': orientation['tilt'],
+                'optimal_azimuth': orientation['azimuth'],
+                'orientation_gain': orientation['gain']
+            })
         
         return enhanced_data
     
@@ -229,6 +255,25 @@ class SolarDataFetcher:
             'post_monsoon': round(base_irradiance * 1.0, 2)  # Oct-Nov
         }
     
+    def get_hourly_weather(self, city: str) -> Dict[str, Any]:
+        """
+        Get hourly ambient temperature and wind speed for a city
+
+        Synthesized from the city's climate zone the first time and cached
+        in the location store next to its irradiance data.
+
+        Args:
+            city: City name
+
+        Returns:
+            Dict with 'temperature' (°C) and 'wind_speed' (m/s) arrays
+        """
+        weather = get_hourly_weather(city)
+        if weather is None:
+            weather = hourly_weather(self._get_climate_zone(city))
+            set_hourly_weather(city, weather)
+        return weather
+
     def get_weather_impact_factors(self, city: str) -> Dict[str, float]:
         """
         Get weather impact factors for solar generation
@@ -7,7 +7,7 @@ from supabase import create_client, Client
 from datetime import datetime
 import uuid
 import json
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 
 class SupabaseClient:
     def __init__(self):
@@ -24,14 +24,15 @@ class SupabaseClient:
         self.supabase: Client = create_client(self.url, self.key)
 
     def save_calculation(self, form_data: Dict[str, Any], solar_data: Dict[str, Any],
-                        results: Dict[str, Any]) -> str:
+                        results: Dict[str, Any], lifetime: Optional[Dict[str, List[float]]] = None) -> str:
         """
         Save calculation data to Supabase
 
         Args:
             form_data: Form input data
             solar_data: Solar irradiance and location data
-            results: Calculation results
+            results: Calculation results (dict or AnalysisResult)
+            lifetime: Optional per-year arrays (utils.lifetime.lifetime_columns)
 
         Returns:
             str: Calculation ID
@@ -90,6 +91,10 @@ class SupabaseClient:
                 'user_agent': ''  # Can be populated from request
             }
 
+            # Per-year generation, savings and CO2 arrays
+            if lifetime:
+                db_data.update(lifetime)
+
             # Insert into database
             result = self.supabase.table('solar_calculations').insert(db_data).execute()
 
@@ -142,6 +147,36 @@ class SupabaseClient:
             print(f"Error retrieving recent calculations: {str(e)}")
             return []
 
+    def get_price_book_records(self) -> list:
+        """
+        Get tiered cost-per-kW rows for the price book
+
+        Returns:
+            List of cost_per_kw_tiers rows
+        """
+        try:
+            result = self.supabase.table('cost_per_kw_tiers').select('*').order('tier_order').execute()
+            return result.data or []
+
+        except Exception as e:
+            print(f"Error retrieving price book: {str(e)}")
+            return []
+
+    def get_consumer_categories(self) -> list:
+        """
+        Get consumer categories with their tariff ranges for the billing engine
+
+        Returns:
+            List of consumer_categories rows
+        """
+        try:
+            result = self.supabase.table('consumer_categories').select('*').execute()
+            return result.data or []
+
+        except Exception as e:
+            print(f"Error retrieving consumer categories: {str(e)}")
+            return []
+
     def save_location_data(self, city: str, state: str, solar_data: Dict[str, Any]) -> bool:
         """
         Save or update location solar data
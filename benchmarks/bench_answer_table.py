@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Benchmark: per-request latency of get_cached_analysis with and without the
+precomputed answer table, against the uncached exact computation
+
+The three are called in turn for every request so machine noise affects
+them alike. Bills are unique, so the LRU cache alone misses every time and
+shows what get_cached_analysis costs without a table.
+
+Usage: python benchmarks/bench_answer_table.py [requests]   (default 20,000)
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.calculations import SolarCalculator
+from utils.location_data import LOCATION_DATA
+
+
+def latencies(functions, requests):
+    """Per-request µs for each function, calls interleaved so machine noise hits all of them alike"""
+    timings = np.empty((len(functions), len(requests)))
+    for i, request in enumerate(requests):
+        for j, function in enumerate(functions):
+            start = time.perf_counter()
+            function(*request)
+            timings[j, i] = time.perf_counter() - start
+    return timings * 1e6
+
+
+def report(label, timings):
+    p50, p90, p99 = np.percentile(timings, [50, 90, 99])
+    print(f"{label:<26}{p50:>9.1f}{p90:>9.1f}{p99:>9.1f}{timings.max():>10.1f}")
+
+
+def main(count=20000):
+    rng = np.random.default_rng(0)
+    cities = list(LOCATION_DATA.values())
+    requests = []
+    for _ in range(count):
+        city = cities[rng.integers(len(cities))]
+        requests.append((
+            float(np.round(rng.uniform(500, 200000), 2)), city['tariff'],
+            str(rng.choice(['CAPEX', 'OPEX'])), city['irradiance'],
+            str(rng.choice(['Residential', 'Commercial', 'Industrial']))
+        ))
+
+    exact = SolarCalculator()
+    cached = SolarCalculator()
+    tabled = SolarCalculator()
+    start = time.perf_counter()
+    table = tabled.load_answer_table()
+    build_seconds = time.perf_counter() - start
+
+    # Warm up interpreter caches; the LRU cache only helps on repeats
+    for calculator in (exact, cached, tabled):
+        calculator.get_comprehensive_analysis(*requests[0])
+
+    print(f"{count:,} requests over {len(LOCATION_DATA)} cities, unique bills")
+    print(f"Answer table: {table.stats()['size_mb']} MB, built in {build_seconds:.2f}s")
+    print(f"{'Latency (µs)':<26}{'p50':>9}{'p90':>9}{'p99':>9}{'max':>10}")
+    print("-" * 63)
+    timings = latencies((exact.get_comprehensive_analysis, cached.get_cached_analysis, tabled.get_cached_analysis),
+                        requests)
+    for label, row in zip(("Exact compute", "LRU cache", "Answer table + cache"), timings):
+        report(label, row)
+    print(f"Table stats: {table.stats()}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20000)
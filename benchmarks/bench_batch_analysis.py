@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+Benchmark: scalar get_comprehensive_analysis loop vs vectorized get_batch_analysis
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.calculations import SolarCalculator
+
+
+def main(rows=100000, scalar_rows=10000):
+    calculator = SolarCalculator()
+    rng = np.random.default_rng(0)
+
+    bills = rng.uniform(1000, 2500000, rows)
+    tariffs = rng.uniform(3.0, 10.0, rows)
+    irradiance = rng.uniform(3.8, 6.2, rows)
+    types = rng.choice(['Residential', 'Commercial', 'Industrial'], rows)
+    models = rng.choice(['CAPEX', 'OPEX'], rows)
+
+    start = time.perf_counter()
+    for i in range(scalar_rows):
+        calculator.get_comprehensive_analysis(
+            float(bills[i]), float(tariffs[i]), str(models[i]), float(irradiance[i]), str(types[i])
+        )
+    scalar_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    calculator.get_batch_analysis(bills, tariffs, models, irradiance, types)
+    batch_seconds = time.perf_counter() - start
+
+    scalar_rate = scalar_rows / scalar_seconds
+    batch_rate = rows / batch_seconds
+    print(f"Scalar loop : {scalar_rate:>14,.0f} rows/s ({scalar_rows:,} rows in {scalar_seconds:.3f}s)")
+    print(f"Batch       : {batch_rate:>14,.0f} rows/s ({rows:,} rows in {batch_seconds:.3f}s)")
+    print(f"Speed-up    : {batch_rate / scalar_rate:>14,.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Benchmark: cheapest module/inverter selection on a large catalog against
+string-sizing every pair
+
+Usage: python benchmarks/bench_equipment.py [skus]   (default 2000 modules and 2000 inverters)
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.equipment import EquipmentCatalog
+
+
+def random_catalog(count, seed=0):
+    rng = np.random.default_rng(seed)
+    power = rng.uniform(300, 600, count)
+    modules = [{'name': f'Module {i}', 'power_w': power[i], 'voc': power[i] / 10 + 10,
+                'vmp': power[i] / 12 + 8, 'isc': rng.uniform(9, 15), 'voltage_temp_coefficient': -0.0028,
+                'price': power[i] * rng.uniform(24, 32)} for i in range(count)]
+    ratings = rng.choice([1, 2, 3, 5, 8, 10, 15, 20, 30, 50, 60, 100], count)
+    inverters = [{'name': f'Inverter {i}', 'ac_kw': ratings[i],
+                  'max_dc_voltage': 600 if ratings[i] <= 5 else 1100,
+                  'mppt_min_voltage': 90 if ratings[i] <= 5 else 200,
+                  'mppt_max_voltage': 550 if ratings[i] <= 5 else 1000,
+                  'max_input_current': rng.uniform(12, 32), 'mppt_count': max(1, int(ratings[i]) // 10),
+                  'price': ratings[i] * rng.uniform(5000, 12000) + 10000} for i in range(count)]
+    return EquipmentCatalog(modules, inverters)
+
+
+def exhaustive(catalog, capacity, chunk=65536):
+    """String-size every valid pair (the search select() avoids)"""
+    module_count = np.ceil(capacity * 1000 / catalog.modules['power_w'])
+    inverter_count = np.maximum(np.ceil(capacity / (catalog.inverters['ac_kw'] * catalog.dc_ac_ratio[1])), 1)
+    usable = np.flatnonzero(capacity / (inverter_count * catalog.inverters['ac_kw']) >= catalog.dc_ac_ratio[0])
+    pairs = np.arange(len(catalog.module_names) * len(usable))
+    best = None
+    for start in range(0, len(pairs), chunk):
+        block = pairs[start:start + chunk]
+        candidate = catalog._best_pair(block // len(usable), usable[block % len(usable)],
+                                       module_count, inverter_count)
+        if candidate is not None and (best is None or candidate[0] < best[0]):
+            best = candidate
+    return best
+
+
+def main(count=2000):
+    catalog = random_catalog(count)
+    capacities = [3.0, 10.0, 47.0, 100.0, 500.0]
+    print(f"{count} modules x {count} inverters")
+    for capacity in capacities:
+        start = time.perf_counter()
+        for _ in range(20):
+            design = catalog.select(capacity)
+        selected = (time.perf_counter() - start) / 20
+
+        start = time.perf_counter()
+        reference = exhaustive(catalog, capacity)
+        brute = time.perf_counter() - start
+        assert round(reference[0]) == design['equipment_cost']
+        print(f"{capacity:6.0f} kW: select {selected * 1000:6.2f} ms, every pair {brute * 1000:8.1f} ms "
+              f"-> {design['module_count']} x {design['module']}, "
+              f"{design['inverter_count']} x {design['inverter']}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Benchmark: memory of cached analysis results as nested dicts vs
+AnalysisResult objects vs one RESULT_DTYPE structured array
+
+Usage: python benchmarks/bench_result_memory.py [count]   (default 1,000,000)
+"""
+
+import os
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.analysis_result import AnalysisResult, batch_to_array
+from utils.calculations import SolarCalculator
+
+
+def measure(label, build, count):
+    tracemalloc.start()
+    start = time.perf_counter()
+    data = build()
+    elapsed = time.perf_counter() - start
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<22}{current / 1e6:>10,.1f} MB {current / count:>8,.0f} B/result {elapsed:>8.2f}s")
+    return data
+
+
+def main(count=1000000):
+    calculator = SolarCalculator()
+    rng = np.random.default_rng(0)
+    bills = np.round(rng.uniform(1000, 2500000, count), 2)
+    tariffs = np.round(rng.uniform(3.0, 10.0, count), 2)
+    irradiance = np.round(rng.uniform(3.8, 6.2, count), 1)
+    types = rng.choice(['Residential', 'Commercial', 'Industrial'], count)
+    models = rng.choice(['CAPEX', 'OPEX'], count)
+    columns = calculator.get_batch_analysis(bills, tariffs, models, irradiance, types)
+
+    # Rows as Python values, the way the scalar path produces them
+    rows = [{name: values[i].item() for name, values in columns.items()} for i in range(count)]
+    inputs = [(bills[i].item(), tariffs[i].item(), str(models[i]), str(types[i]), irradiance[i].item())
+              for i in range(count)]
+    recommendations = calculator._generate_recommendations(3.0, 0, 4.0, 'Commercial', 'CAPEX')
+
+    print(f"{count:,} cached results")
+    print("-" * 60)
+
+    measure("Nested dicts", lambda: [{
+        "input_data": {"monthly_bill": bill, "tariff_rate": tariff, "investment_model": model,
+                       "consumer_type": ctype, "solar_irradiance": irr},
+        "calculations": dict(row),
+        "recommendations": [dict(item) for item in recommendations]
+    } for row, (bill, tariff, model, ctype, irr) in zip(rows, inputs)], count)
+
+    measure("AnalysisResult", lambda: [
+        AnalysisResult(recommendations=recommendations, monthly_bill=bill, tariff_rate=tariff,
+                       investment_model=model, consumer_type=ctype, solar_irradiance=irr, **row)
+        for row, (bill, tariff, model, ctype, irr) in zip(rows, inputs)
+    ], count)
+
+    measure("Structured array", lambda: batch_to_array(columns, bills, tariffs, models, types, irradiance), count)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000000)
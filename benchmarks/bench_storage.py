@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Benchmark: storage-sizing curve (every battery size dispatched in one pass)
+against simulating each size separately
+
+Usage: python benchmarks/bench_storage.py [sizes]   (default 50)
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.calculations import SolarCalculator
+
+
+def main(count=50):
+    calculator = SolarCalculator()
+    generation = calculator.calculate_hourly_generation(5.0, 19.08, 72.88, 5.2)
+    hour = np.arange(8760) % 24
+    load = 1 + 0.8 * np.exp(-((hour - 20) / 2.0) ** 2)
+    load *= 700 * 12 / load.sum()
+    sizes = np.linspace(0, 50, count)
+
+    start = time.perf_counter()
+    curve = calculator.get_storage_sizing(generation, 700, 7.5, 'HT-1', sizes=sizes,
+                                          load_profile=load, arbitrage=True)
+    batched = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for size in sizes[:5]:
+        calculator.get_storage_sizing(generation, 700, 7.5, 'HT-1', sizes=[size],
+                                      load_profile=load, arbitrage=True)
+    separate = (time.perf_counter() - start) / 5 * count
+
+    best = int(np.argmax(curve['annual_savings'] - curve['battery_cost'] / calculator.SYSTEM_LIFETIME))
+    print(f"{count} battery sizes x 8760 hours")
+    print(f"Batched sweep:     {batched * 1000:8.1f} ms")
+    print(f"One size at a time: {separate * 1000:7.1f} ms (extrapolated)")
+    print(f"Best size {sizes[best]:.1f} kWh: saves ₹{curve['annual_savings'][best]:,.0f}/yr, "
+          f"payback {curve['payback_period'][best]:.1f} yrs")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 50)
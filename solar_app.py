@@ -3,6 +3,7 @@ Solar Plant Financial Calculator - Flask Web Application
 Comprehensive form-based solar calculator with backend storage
 """
 
+import math
 import os
 from flask import Flask, render_template, request, jsonify, redirect, url_for, flash, send_file
 from flask_cors import CORS
@@ -18,9 +19,12 @@ import uuid
 load_dotenv()
 
 # Import our existing utilities
+from utils.billing import TariffBook
 from utils.calculations import SolarCalculator
-from utils.location_data import get_cities, get_location_info
+from utils.lifetime import lifetime_columns
+from utils.location_data import get_cities, get_location_info, get_location_info_at
 from utils.ocr_processor import BillOCRProcessor
+from utils.spatial_index import get_location_index
 
 # Import backend modules
 from backend.solar_data_fetcher import SolarDataFetcher
@@ -58,6 +62,42 @@ except Exception as e:
 solar_data_fetcher = SolarDataFetcher()
 report_generator = ReportGenerator()
 
+# Cost-per-kW price book: JSON file (hot reloaded) or the cost_per_kw_tiers table
+PRICE_BOOK_FILE = os.getenv('PRICE_BOOK_FILE')
+try:
+    if PRICE_BOOK_FILE:
+        calculator.load_price_book(path=PRICE_BOOK_FILE)
+    elif SUPABASE_AVAILABLE and supabase_client.get_price_book_records():
+        calculator.load_price_book(fetch_records=supabase_client.get_price_book_records)
+except Exception as e:
+    print(f"⚠️  Price book not loaded, using built-in prices: {e}")
+
+# Slab/time-of-use schedules from the consumer_categories table
+if SUPABASE_AVAILABLE:
+    try:
+        consumer_categories = supabase_client.get_consumer_categories()
+        if consumer_categories:
+            calculator.tariff_book = TariffBook(consumer_categories)
+    except Exception as e:
+        print(f"⚠️  Consumer categories not loaded, using built-in tariffs: {e}")
+
+# Module/inverter catalog for panel counts and string sizing
+EQUIPMENT_CATALOG_FILE = os.getenv('EQUIPMENT_CATALOG_FILE')
+if EQUIPMENT_CATALOG_FILE:
+    try:
+        calculator.load_equipment_catalog(path=EQUIPMENT_CATALOG_FILE)
+    except Exception as e:
+        print(f"⚠️  Equipment catalog not loaded, assuming 400 W panels: {e}")
+
+# Precomputed answer table (built and saved on first start if missing or stale)
+ANSWER_TABLE_FILE = os.getenv('ANSWER_TABLE_FILE')
+if ANSWER_TABLE_FILE:
+    try:
+        os.makedirs(os.path.dirname(ANSWER_TABLE_FILE) or '.', exist_ok=True)
+        calculator.load_answer_table(ANSWER_TABLE_FILE)
+    except Exception as e:
+        print(f"⚠️  Answer table not available: {e}")
+
 # Print initialization status
 print("🌞 Solar Plant Financial Calculator - Full Version")
 print("=" * 60)
@@ -184,16 +224,30 @@ def calculate():
             )
 
             # Perform comprehensive calculations
-            results = calculator.get_comprehensive_analysis(
+            results = calculator.get_cached_analysis(
                 monthly_bill=form_data['monthly_bill'],
                 tariff_rate=solar_data.get('tariff', location_info['tariff']),
                 investment_model=form_data['investment_model'],
                 solar_irradiance=solar_data.get('irradiance', location_info['irradiance']),
-                consumer_type=form_data['consumer_type']
+                consumer_type=form_data['consumer_type'],
+                generation_mode=os.getenv('GENERATION_MODE', 'flat'),
+                solar_data=solar_data,
+                financial_model=os.getenv('FINANCIAL_MODEL', 'simple'),
+                state=location_info.get('state'),
+                consumer_category=form_data['consumer_category'],
+                settlement_mode=os.getenv('SETTLEMENT_MODE') or None,
+                shadow_free=form_data['shadow_analysis'],
+                rooftop_area=form_data['rooftop_area'] if form_data['installation_type'] == 'Rooftop' else None
             )
 
+            # Per-year arrays for the database and the PDF report
+            lifetime = lifetime_columns(calculator.get_lifetime_simulation(
+                results['calculations']['yearly_generation'], results['calculations']['annual_savings'],
+                state=location_info.get('state')
+            ))
+
             # Save to database
-            calculation_id = supabase_client.save_calculation(form_data, solar_data, results)
+            calculation_id = supabase_client.save_calculation(form_data, solar_data, results, lifetime)
 
             # Prepare results for display
             results_data = {
@@ -256,6 +310,142 @@ def api_location_info(city):
     location_info = get_location_info(city)
     return jsonify(location_info)
 
+@app.route('/api/nearest-locations', methods=['POST'])
+def api_nearest_locations():
+    """API endpoint for interpolated location information at coordinates (one point or a lead list)"""
+    data = request.get_json(silent=True) or {}
+    if data.get('latitude') is None or data.get('longitude') is None:
+        return jsonify({'error': 'latitude and longitude are required'}), 400
+
+    try:
+        n = int(data.get('n', 5))
+        if isinstance(data['latitude'], list):
+            result = get_location_index().interpolate_many(data['latitude'], data['longitude'], n)
+            return jsonify({key: values.tolist() for key, values in result.items()})
+        return jsonify(get_location_info_at(float(data['latitude']), float(data['longitude']), n))
+    except (TypeError, ValueError) as e:
+        return jsonify({'error': str(e)}), 400
+
+def optional_float(value):
+    """float() for optional JSON fields (None or "" stay None)"""
+    return None if value is None or value == '' else float(value)
+
+@app.route('/api/optimize-capacity', methods=['POST'])
+def api_optimize_capacity():
+    """API endpoint to find the NPV-optimal capacity under area/budget/load limits"""
+    data = request.get_json(silent=True) or {}
+    if not data.get('monthly_bill'):
+        return jsonify({'error': 'monthly_bill is required'}), 400
+
+    location_info = get_location_info(data.get('location_city', ''))
+    try:
+        result = calculator.optimize_capacity(
+            monthly_bill=float(data['monthly_bill']),
+            tariff_rate=float(data.get('tariff_rate') or location_info['tariff']),
+            solar_irradiance=location_info['irradiance'],
+            consumer_type=data.get('consumer_type', 'Residential'),
+            objective=data.get('objective', 'npv'),
+            rooftop_area=optional_float(data.get('rooftop_area')),
+            budget=optional_float(data.get('budget')),
+            sanctioned_load=optional_float(data.get('sanctioned_load')),
+            export_rate=float(data.get('export_rate') or 0.0)
+        )
+    except (TypeError, ValueError) as e:
+        return jsonify({'error': str(e)}), 400
+
+    result['curve'] = {key: values.tolist() for key, values in result['curve'].items()}
+    return jsonify(result)
+
+@app.route('/api/inverse-analysis', methods=['POST'])
+def api_inverse_analysis():
+    """API endpoint to solve for capacity, price, tariff or bill given a target payback/IRR/savings"""
+    data = request.get_json(silent=True) or {}
+    if not data.get('solve_for') or not data.get('target_metric') or data.get('target') is None:
+        return jsonify({'error': 'solve_for, target_metric and target are required'}), 400
+
+    location_info = get_location_info(data.get('location_city', ''))
+    try:
+        result = calculator.get_inverse_analysis(
+            data['solve_for'],
+            data['target_metric'],
+            data['target'],
+            monthly_bill=data.get('monthly_bill'),
+            tariff_rate=data.get('tariff_rate') or location_info['tariff'],
+            solar_irradiance=location_info['irradiance'],
+            consumer_type=data.get('consumer_type', 'Residential'),
+            capacity=data.get('capacity'),
+            cost_per_kw=data.get('cost_per_kw'),
+            export_rate=float(data.get('export_rate') or 0.0),
+            state=location_info.get('state')
+        )
+    except (TypeError, ValueError) as e:
+        return jsonify({'error': str(e)}), 400
+
+    # NaN (target not reachable) is not valid JSON
+    return jsonify({key: [None if isinstance(value, float) and math.isnan(value) else value
+                          for value in values.reshape(-1).tolist()]
+                    for key, values in result.items()})
+
+@app.route('/api/loan-grid', methods=['POST'])
+def api_loan_grid():
+    """API endpoint for EMI and equity returns over a loan tenor x interest rate grid"""
+    data = request.get_json(silent=True) or {}
+    if not data.get('monthly_bill'):
+        return jsonify({'error': 'monthly_bill is required'}), 400
+
+    location_info = get_location_info(data.get('location_city', ''))
+    options = {key: data[key] for key in ('tenor_years', 'interest_rates', 'loan_fraction',
+                                          'interest_subsidy', 'subsidy_years') if key in data}
+    try:
+        result = calculator.get_loan_grid(
+            float(data['monthly_bill']),
+            float(data.get('tariff_rate') or location_info['tariff']),
+            solar_irradiance=location_info['irradiance'],
+            consumer_type=data.get('consumer_type', 'Residential'),
+            state=location_info.get('state'),
+            **options
+        )
+    except (TypeError, ValueError) as e:
+        return jsonify({'error': str(e)}), 400
+
+    # NaN (no IRR) is not valid JSON
+    def json_safe(value):
+        if isinstance(value, list):
+            return [json_safe(item) for item in value]
+        return None if isinstance(value, float) and math.isnan(value) else value
+
+    return jsonify({key: json_safe(values.tolist() if hasattr(values, 'tolist') else values)
+                    for key, values in result.items()})
+
+@app.route('/api/ppa-rate-card', methods=['POST'])
+def api_ppa_rate_card():
+    """API endpoint for the target-IRR PPA tariff and customer savings in every city"""
+    data = request.get_json(silent=True) or {}
+    try:
+        options = {key: float(data[key]) for key in ('target_irr', 'ppa_escalation', 'grid_escalation')
+                   if data.get(key) is not None}
+        result = calculator.get_ppa_rate_card(
+            capacity=float(data.get('capacity') or 100),
+            consumer_type=data.get('consumer_type', 'Commercial'),
+            cities=data.get('cities'),
+            **options
+        )
+    except (KeyError, TypeError, ValueError) as e:
+        return jsonify({'error': str(e)}), 400
+
+    # NaN (no generation) is not valid JSON
+    return jsonify({key: [None if isinstance(value, float) and math.isnan(value) else value
+                          for value in values.tolist()]
+                    for key, values in result.items()})
+
+@app.route('/api/cache-stats')
+def api_cache_stats():
+    """API endpoint to get analysis cache and answer table counters"""
+    stats = calculator.analysis_cache.stats()
+    if calculator.answer_table is not None:
+        stats['answer_table'] = calculator.answer_table.stats()
+    return jsonify(stats)
+
 @app.route('/demo-info')
 def demo_info():
     """Demo information page"""
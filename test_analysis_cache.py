@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Test the memoizing analysis cache
+"""
+
+import os
+import sys
+
+# Add the current directory to Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from utils.analysis_cache import AnalysisCache
+from utils.calculations import SolarCalculator
+
+
+def test_cache_hits_on_normalized_inputs():
+    """Equivalent inputs share one entry and results match the uncached path"""
+    calculator = SolarCalculator()
+
+    first = calculator.get_cached_analysis(5000, 6.0, "CAPEX", None, "Residential")
+    second = calculator.get_cached_analysis(5000.0, 6.0, "CAPEX", 4.5, " Residential ")
+    direct = calculator.get_comprehensive_analysis(5000, 6.0, "CAPEX", 4.5, "Residential")
+
+    stats = calculator.analysis_cache.stats()
+    assert stats['hits'] == 1 and stats['misses'] == 1
+    assert first == second
+    assert dict(first['calculations']) == direct['calculations']
+
+    # Cached results are shared, so they must be read-only
+    try:
+        first['calculations']['plant_capacity'] = -1
+        assert False, "cached result should be immutable"
+    except TypeError:
+        pass
+    assert calculator.get_cached_analysis(5000, 6.0, "CAPEX", None, "Residential") is first
+    print("✅ Cache hits on normalized inputs")
+
+
+def test_cache_keys_on_fields_the_analysis_reads():
+    """solar_data only splits entries on the fields the analysis uses"""
+    calculator = SolarCalculator()
+    delhi = {'latitude': 28.7, 'longitude': 77.1, 'ghi_annual': 1642.5, 'source': 'atlas'}
+    jaipur = {'latitude': 26.9, 'longitude': 75.8, 'ghi_annual': 1900.0, 'source': 'cache'}
+
+    flat = calculator.get_cached_analysis(5000, 6.0, solar_data=delhi)
+    assert calculator.get_cached_analysis(5000, 6.0, solar_data=jaipur) is flat
+    assert calculator.get_cached_analysis(5000, 6.0, solar_data=dict(delhi, ghi_annual=0),
+                                          shadow_free=False) is \
+        calculator.get_cached_analysis(5000, 6.0, solar_data=delhi, shadow_free=False)
+    shaded = calculator.get_cached_analysis(5000, 6.0, solar_data=jaipur, shadow_free=False)
+    assert shaded == AnalysisCache().get_or_compute(calculator, 5000, 6.0, solar_data=jaipur, shadow_free=False)
+    assert calculator.analysis_cache.stats()['misses'] == 3
+    print("✅ Cache ignores solar_data fields the analysis does not read")
+
+
+def test_cache_eviction_and_ttl():
+    """LRU eviction and TTL expiry are counted"""
+    calculator = SolarCalculator()
+    calculator.analysis_cache = AnalysisCache(maxsize=2, ttl=None)
+
+    for bill in (1000, 2000, 3000):
+        calculator.get_cached_analysis(bill, 6.0)
+    assert calculator.analysis_cache.stats()['evictions'] == 1
+
+    calculator.analysis_cache = AnalysisCache(maxsize=2, ttl=-1)
+    calculator.get_cached_analysis(1000, 6.0)
+    calculator.get_cached_analysis(1000, 6.0)
+    assert calculator.analysis_cache.stats()['expirations'] == 1
+    print("✅ Cache evicts and expires entries")
+
+
+def test_cache_invalidated_by_constants():
+    """Changing pricing or performance constants clears the cache"""
+    calculator = SolarCalculator()
+    before = calculator.get_cached_analysis(5000, 6.0)
+
+    calculator.COST_PER_KW['Residential']['medium'] = 60000
+    after = calculator.get_cached_analysis(5000, 6.0)
+
+    assert after['calculations']['investment'] < before['calculations']['investment']
+    assert calculator.analysis_cache.stats()['invalidations'] == 1
+
+    calculator.PERFORMANCE_RATIO = 0.8
+    assert calculator.get_cached_analysis(5000, 6.0)['calculations']['plant_capacity'] != \
+        after['calculations']['plant_capacity']
+    print("✅ Cache invalidated when constants change")
+
+
+def test_cache_sees_object_state_and_invalidate():
+    """Reconfigured layouts are compared at lookup; built objects are read-only; invalidate() drops entries"""
+    calculator = SolarCalculator()
+    calculator.get_cached_analysis(5000, 6.0, rooftop_area=200)
+
+    calculator.rooftop_layout.module_power = 550
+    calculator.get_cached_analysis(5000, 6.0, rooftop_area=200)
+    assert calculator.analysis_cache.stats()['invalidations'] == 1
+
+    calculator.load_equipment_catalog()
+    for container, key in ((calculator.equipment_catalog.modules['price'], 0),
+                           (calculator.recommendation_engine.rules[0], 'priority')):
+        try:
+            container[key] = 1.0
+            assert False, "built objects must be read-only"
+        except (TypeError, ValueError):
+            pass
+
+    calculator.get_cached_analysis(5000, 6.0)
+    calculator.invalidate()
+    calculator.get_cached_analysis(5000, 6.0)
+    assert calculator.analysis_cache.stats()['invalidations'] == 3
+    print("✅ Cache sees object state and explicit invalidation")
+
+
+def test_result_from_stale_constants_not_stored():
+    """A result computed while the cache was reset for other constants is dropped"""
+    cache = AnalysisCache()
+    calculator, other = SolarCalculator(), SolarCalculator()
+    other.PERFORMANCE_RATIO = 0.8
+    compute = calculator.get_comprehensive_analysis
+
+    def racing_compute(*args, **kwargs):
+        # Another request resets the cache for its own calculator mid-compute
+        cache.get_or_compute(other, 3000, 6.0)
+        return compute(*args, **kwargs)
+
+    calculator.get_comprehensive_analysis = racing_compute
+    result = cache.get_or_compute(calculator, 5000, 6.0)
+    assert result.to_dict() == compute(5000, 6.0)
+    assert cache.stats()['size'] == 1
+
+    stored = cache.get_or_compute(other, 5000, 6.0)
+    assert stored['calculations']['plant_capacity'] != result['calculations']['plant_capacity']
+    print("✅ Stale results are not stored")
+
+
+if __name__ == "__main__":
+    print("🌞 Analysis Cache Test")
+    print("=" * 50)
+    test_cache_hits_on_normalized_inputs()
+    test_cache_keys_on_fields_the_analysis_reads()
+    test_cache_eviction_and_ttl()
+    test_cache_invalidated_by_constants()
+    test_cache_sees_object_state_and_invalidate()
+    test_result_from_stale_constants_not_stored()
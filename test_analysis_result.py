@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Test the slotted AnalysisResult type and structured-array form
+"""
+
+import os
+import pickle
+import sys
+
+import numpy as np
+
+# Add the current directory to Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from utils.analysis_result import AnalysisResult, batch_to_array, results_to_array
+from utils.calculations import SolarCalculator
+
+
+def test_round_trip_dict():
+    """AnalysisResult reproduces the nested dict layout"""
+    calculator = SolarCalculator()
+    for financial_model in ("simple", "cash_flow"):
+        analysis = calculator.get_comprehensive_analysis(50000, 7.0, consumer_type='Commercial',
+                                                         financial_model=financial_model)
+        result = AnalysisResult.from_dict(analysis)
+
+        assert result.to_dict() == analysis
+        assert result['calculations']['investment'] == analysis['calculations']['investment']
+        assert pickle.loads(pickle.dumps(result)) == result
+    print("✅ AnalysisResult round-trips the analysis dict")
+
+
+def test_result_is_immutable():
+    """Attributes and the dict view are read-only"""
+    result = AnalysisResult.from_dict(SolarCalculator().get_comprehensive_analysis(5000, 6.0))
+
+    assert result.recommendations
+    for mutate in (lambda: setattr(result, 'investment', 0),
+                   lambda: result['calculations'].update(investment=0),
+                   lambda: result.recommendations[0].update(title=''),
+                   lambda: result['recommendations'][0].update(title='')):
+        try:
+            mutate()
+            assert False, "mutation should fail"
+        except (AttributeError, TypeError):
+            pass
+    print("✅ AnalysisResult is immutable")
+
+
+def test_structured_array_forms_agree():
+    """Batch columns and per-result packing give the same records"""
+    calculator = SolarCalculator()
+    bills = np.array([5000.0, 50000.0, 500000.0])
+    types = np.array(['Residential', 'Commercial', 'Industrial'])
+
+    packed = batch_to_array(calculator.get_batch_analysis(bills, 7.0, consumer_type=types),
+                            monthly_bill=bills, tariff_rate=7.0, investment_model='CAPEX',
+                            consumer_type=types, solar_irradiance=4.5)
+    results = [calculator.get_comprehensive_analysis(float(bill), 7.0, consumer_type=str(ctype))
+               for bill, ctype in zip(bills, types)]
+
+    expected = results_to_array(results)
+    for name in packed.dtype.names:
+        assert np.array_equal(packed[name], expected[name], equal_nan=packed[name].dtype.kind == 'f'), name
+
+    restored = AnalysisResult.from_record(packed[1])
+    assert dict(restored['calculations']) == results[1]['calculations']
+    print("✅ Structured array forms agree")
+
+
+if __name__ == "__main__":
+    print("🌞 Analysis Result Test")
+    print("=" * 50)
+    test_round_trip_dict()
+    test_result_is_immutable()
+    test_structured_array_forms_agree()
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Test the precomputed answer table
+"""
+
+import os
+import sys
+import tempfile
+
+import numpy as np
+
+# Add the current directory to Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from utils.analysis_result import CALCULATION_DIGITS
+from utils.answer_table import AnswerTable
+from utils.calculations import SolarCalculator
+from utils.location_data import LOCATION_DATA
+from utils.recommendations import RECOMMENDATION_RULES, RecommendationEngine
+
+
+def test_table_matches_exact_analysis():
+    """Grid results equal get_comprehensive_analysis; off-grid ones are within one unit of the last digit"""
+    calculator = SolarCalculator()
+    table = calculator.load_answer_table(bill_max=50000)
+    rng = np.random.default_rng(7)
+    cities = list(LOCATION_DATA.values())
+
+    served = 0
+    for i in range(3000):
+        city = cities[rng.integers(len(cities))]
+        on_grid = i % 2 == 0
+        bill = float(rng.integers(0, 500) * 100) if on_grid else float(np.round(rng.uniform(0, 50000), 2))
+        consumer_type = ('Residential', 'Commercial', 'Industrial')[i % 3]
+        model = ('CAPEX', 'OPEX')[i // 2 % 2]
+        state = city['state'] if i % 5 else None
+
+        result = table.lookup(calculator, bill, city['tariff'], model, city['irradiance'], consumer_type,
+                              state=state)
+        if result is None:
+            continue
+        served += 1
+        expected = calculator.get_comprehensive_analysis(bill, city['tariff'], model,
+                                                         city['irradiance'], consumer_type, state=state)
+        if on_grid:
+            assert result.to_dict() == expected, (bill, city, consumer_type, model)
+            continue
+        assert result['recommendations'] == tuple(expected['recommendations'])
+        for name, value in expected['calculations'].items():
+            unit = 10.0 ** -(CALCULATION_DIGITS[name] or 0)
+            served_value = result['calculations'][name]
+            assert type(served_value) is type(value) and abs(served_value - value) <= unit * (1 + 1e-9), \
+                (name, served_value, value, bill, city)
+
+    stats = table.stats()
+    assert served > 2950 and stats['off_grid'] > 0
+    print(f"✅ {served} table answers match the exact analysis ({stats})")
+
+
+def test_off_table_inputs_fall_back():
+    """Unknown rates, other options and bills off the grid are computed exactly"""
+    calculator = SolarCalculator()
+    calculator.load_answer_table(bill_max=20000)
+    table = calculator.answer_table
+
+    assert table.lookup(calculator, 5000, 6.123, "CAPEX", 4.5, "Residential") is None
+    assert table.lookup(calculator, 5000, 6.5, "CAPEX", 4.5, "Residential",
+                        financial_model="cash_flow") is None
+    assert table.lookup(calculator, 50000, 6.5, "CAPEX", 4.5, "Residential") is None
+
+    result = calculator.get_cached_analysis(50000, 6.5, "CAPEX", 4.5, "Residential")
+    expected = calculator.get_comprehensive_analysis(50000, 6.5, "CAPEX", 4.5, "Residential")
+    assert result.to_dict() == expected
+    assert calculator.analysis_cache.stats()['misses'] == 1
+    print("✅ Off-table inputs computed exactly")
+
+
+def test_memory_mapped_table_and_invalidation():
+    """Saved tables load memory-mapped and are rebuilt when prices change"""
+    calculator = SolarCalculator()
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'answer_table.npy')
+        built = calculator.load_answer_table(path, bill_max=20000)
+        loaded = AnswerTable.load(path)
+        assert isinstance(np.load(path, mmap_mode='r'), np.memmap)
+        assert loaded.matches(calculator)
+        assert np.array_equal(loaded.values, built.values)
+
+        first = loaded.lookup(calculator, 12300, 6.5, "CAPEX", 4.5, "Residential")
+        assert first.to_dict() == calculator.get_comprehensive_analysis(12300, 6.5, "CAPEX", 4.5, "Residential")
+
+        calculator.COST_PER_KW['Residential']['large'] = 60000
+        assert not loaded.matches(calculator)
+        assert loaded.lookup(calculator, 12300, 6.5, "CAPEX", 4.5, "Residential") is None
+
+        rebuilt = calculator.load_answer_table(path, bill_max=20000)
+        second = rebuilt.lookup(calculator, 12300, 6.5, "CAPEX", 4.5, "Residential")
+        assert second['calculations']['investment'] < first['calculations']['investment']
+        # Release the memory maps before the directory is removed
+        del loaded, built, rebuilt
+        calculator.answer_table = None
+    print("✅ Memory-mapped table reloads and invalidates")
+
+
+def test_constant_changes_bypass_the_table():
+    """Any constant change is seen by the fingerprint check; restoring it re-verifies the table"""
+    calculator = SolarCalculator()
+    table = calculator.load_answer_table(bill_max=20000)
+    args = (12300, 6.5, "CAPEX", 4.5, "Residential")
+
+    served = table.lookup(calculator, *args, state='Delhi')
+    assert served.to_dict() == calculator.get_comprehensive_analysis(*args, state='Delhi')
+    assert table.lookup(calculator, *args, state='Gujarat') is None
+
+    calculator.LIFETIME_ASSUMPTIONS['availability'] = 0.95
+    assert table.lookup(calculator, *args) is None
+    calculator.LIFETIME_ASSUMPTIONS['availability'] = 0.99
+    calculator.AREA_PER_KW = 10
+    assert table.lookup(calculator, *args) is None
+    calculator.AREA_PER_KW = 8
+    assert table.lookup(calculator, *args, state='Delhi').to_dict() == served.to_dict()
+
+    other = SolarCalculator()
+    other.recommendation_engine = RecommendationEngine(RECOMMENDATION_RULES[:2])
+    assert table.lookup(other, *args) is None
+    print("✅ Constant changes bypass the answer table")
+
+
+if __name__ == "__main__":
+    test_table_matches_exact_analysis()
+    test_off_table_inputs_fall_back()
+    test_memory_mapped_table_and_invalidation()
+    test_constant_changes_bypass_the_table()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Test that the vectorized batch analysis matches the scalar calculator exactly
+"""
+
+import os
+import sys
+
+import numpy as np
+
+# Add the current directory to Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from utils.calculations import SolarCalculator
+
+
+def _random_inputs(n, seed=42):
+    """Random mix of bills, tariffs and types including the edge cases"""
+    rng = np.random.default_rng(seed)
+    bills = np.round(rng.uniform(100, 2500000, n), 2)
+    tariffs = np.round(rng.uniform(2.5, 12.0, n), 2)
+    irradiance = np.round(rng.uniform(3.5, 6.5, n), 1)
+    types = rng.choice(['Residential', 'Commercial', 'Industrial', 'Agricultural'], n)
+    models = rng.choice(['CAPEX', 'OPEX'], n)
+
+    # Tier boundaries (5/10/50/100/500 kW at 4.0 irradiance, 6.0 tariff),
+    # zero tariff and missing irradiance
+    bills[:6] = [2700, 5400, 27000, 54000, 270000, 0]
+    tariffs[:6] = 6.0
+    irradiance[:6] = 4.0
+    tariffs[6] = 0
+    irradiance[7] = 0
+    return bills, tariffs, irradiance, types, models
+
+
+def test_batch_matches_scalar():
+    """Every calculations field must equal the scalar result"""
+    calculator = SolarCalculator()
+    bills, tariffs, irradiance, types, models = _random_inputs(2000)
+
+    batch = calculator.get_batch_analysis(bills, tariffs, models, irradiance, types)
+
+    for i in range(len(bills)):
+        scalar = calculator.get_comprehensive_analysis(
+            monthly_bill=float(bills[i]),
+            tariff_rate=float(tariffs[i]),
+            investment_model=str(models[i]),
+            solar_irradiance=float(irradiance[i]),
+            consumer_type=str(types[i])
+        )['calculations']
+
+        for field, value in scalar.items():
+            assert batch[field][i] == value, f"Row {i} {field}: {batch[field][i]} != {value}"
+
+    print(f"✅ Batch analysis matches scalar path for {len(bills)} rows")
+
+
+def test_batch_dataframe_input():
+    """DataFrame input returns a DataFrame with the same index"""
+    import pandas as pd
+
+    calculator = SolarCalculator()
+    frame = pd.DataFrame({
+        'monthly_bill': [5000, 50000, 500000],
+        'tariff_rate': [6.0, 7.0, 8.0],
+        'consumer_type': ['Residential', 'Commercial', 'Industrial']
+    }, index=['a', 'b', 'c'])
+
+    result = calculator.get_batch_analysis(frame)
+
+    assert list(result.index) == ['a', 'b', 'c']
+    expected = calculator.get_comprehensive_analysis(50000, 7.0, consumer_type='Commercial')
+    assert result.loc['b', 'investment'] == expected['calculations']['investment']
+    print("✅ Batch analysis accepts DataFrame input")
+
+
+if __name__ == "__main__":
+    print("🌞 Batch Analysis Test")
+    print("=" * 50)
+    test_batch_matches_scalar()
+    test_batch_dataframe_input()
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Test the slab and time-of-use billing engine
+"""
+
+import os
+import sys
+
+import numpy as np
+
+# Add the current directory to Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from utils.billing import TariffBook, TariffSchedule, flat_load_profile
+from utils.calculations import SolarCalculator
+from utils.hourly_simulation import MONTH_INDEX
+
+
+def test_domestic_slabs():
+    """Domestic consumption is billed telescopically over the LT-1 bands"""
+    schedule = TariffBook().schedule('LT-1')
+    assert schedule.code == 'LT-1B'
+    assert schedule.slabs == [(100, 3.25), (300, 5.25), (None, 7.75)]
+
+    charges = schedule.slab_charges(np.array([0, 80, 100, 250, 400]))
+    expected = [0, 80 * 3.25, 325, 325 + 150 * 5.25, 325 + 200 * 5.25 + 100 * 7.75]
+    assert np.allclose(charges, expected)
+    print("✅ Domestic slabs allocated telescopically")
+
+
+def test_bill_matches_hour_by_hour_loop():
+    """Vectorized bills equal a plain loop over consumers, months and hours"""
+    schedule = TariffSchedule('T', 'Test', 'Commercial', 'HT', [(150, 4.0), (None, 6.0)],
+                              fixed_charge=100, demand_charge=200,
+                              tou_adders=np.r_[np.zeros(18), np.full(4, 1.5), np.full(2, -0.5)],
+                              export_rate=2.5)
+    rng = np.random.default_rng(11)
+    imports = rng.uniform(0, 1.2, (3, 8760))
+    exports = rng.uniform(0, 0.4, (3, 8760))
+    bill = schedule.bill(imports, exports)
+
+    for consumer in range(3):
+        for month in range(12):
+            hours = np.flatnonzero(MONTH_INDEX == month)
+            kwh = imports[consumer, hours].sum()
+            energy = min(kwh, 150) * 4.0 + max(kwh - 150, 0) * 6.0
+            tou = sum(imports[consumer, h] * schedule.tou_adders[h % 24] for h in hours)
+            demand = imports[consumer, hours].max() * 200
+            credit = exports[consumer, hours].sum() * 2.5
+            total = energy + tou + 100 + demand - credit
+            assert np.isclose(bill['total'][consumer, month], total), (consumer, month)
+    print("✅ Vectorized bills match the hour-by-hour loop")
+
+
+def test_ht_time_of_use_and_demand():
+    """HT schedules carry peak/off-peak adders and a demand charge"""
+    schedule = TariffBook().schedule('HT-1')
+    assert schedule.slabs == [(None, 7.5)] and schedule.fixed_charge == 0
+    assert schedule.tou_adders[19] > 0 > schedule.tou_adders[2] and schedule.tou_adders[12] == 0
+
+    evening = np.zeros(8760)
+    evening[19::24] = 1.0
+    midday = np.roll(evening, -7)
+    evening_bill = schedule.bill(evening)
+    midday_bill = schedule.bill(midday)
+    assert np.allclose(evening_bill['energy_charge'], midday_bill['energy_charge'])
+    assert np.all(evening_bill['total'] > midday_bill['total'])
+    assert np.allclose(midday_bill['demand_charge'], 350.0)
+    print("✅ HT time-of-use and demand charges applied")
+
+
+def test_solar_savings():
+    """Solar lowers the bill; savings feed the hourly analysis"""
+    calculator = SolarCalculator()
+    generation = calculator.calculate_hourly_generation(2.0, 28.61, 77.21, 4.5)
+    load = flat_load_profile(300)
+
+    bills = calculator.tariff_book.schedule('LT-1').compare(load, generation)
+    assert bills['annual_pre'][0] > bills['annual_post'][0] > 0
+    # Midday surplus is exported without credit, so savings stay below
+    # generation at the marginal (101-300 unit) rate
+    assert 0 < bills['annual_savings'][0] < generation.sum() * 5.25
+
+    solar_data = {'latitude': 28.61, 'longitude': 77.21}
+    flat = calculator.get_comprehensive_analysis(2000, 6.5, "CAPEX", 4.5, "Residential",
+                                                 generation_mode="hourly", solar_data=solar_data)
+    billed = calculator.get_comprehensive_analysis(2000, 6.5, "CAPEX", 4.5, "Residential",
+                                                   generation_mode="hourly", solar_data=solar_data,
+                                                   consumer_category='LT-1')
+    savings = calculator.calculate_bill_savings(
+        calculator.calculate_hourly_generation(billed['calculations']['plant_capacity'], 28.61, 77.21, 4.5),
+        billed['calculations']['monthly_consumption'], 'LT-1'
+    )['annual_savings']
+    assert billed['calculations']['annual_savings'] != flat['calculations']['annual_savings']
+    assert abs(billed['calculations']['annual_savings'] - savings) <= 1
+    assert billed.keys() == flat.keys()
+    print(f"✅ Bill savings ₹{bills['annual_savings'][0]:,.0f} vs flat ₹{generation.sum() * 6.5:,.0f}")
+
+
+def test_unknown_category():
+    """Unknown codes are reported, database rows are accepted"""
+    try:
+        TariffBook().schedule('XX-9')
+        assert False, "expected KeyError"
+    except KeyError:
+        pass
+
+    book = TariffBook([{'category_code': 'LT-2A', 'category_name': 'Commercial', 'voltage_level': 'LT',
+                        'consumer_type': 'Commercial', 'typical_tariff_range_min': '7.00',
+                        'typical_tariff_range_max': '10.00'}])
+    assert book.schedule('LT-2').slabs == [(100, 7.0), (None, 10.0)]
+    print("✅ Category lookup handles form codes and database rows")
+
+
+if __name__ == "__main__":
+    test_domestic_slabs()
+    test_bill_matches_hour_by_hour_loop()
+    test_ht_time_of_use_and_demand()
+    test_solar_savings()
+    test_unknown_category()
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Test the NPV capacity optimizer
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+
+# Add the current directory to Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from utils.calculations import SolarCalculator
+
+
+def test_unconstrained_optimum_matches_consumption():
+    """Without export value the best system offsets consumption exactly"""
+    calculator = SolarCalculator()
+
+    start = time.perf_counter()
+    result = calculator.optimize_capacity(50000, 7.0, 5.0, 'Commercial')
+    elapsed = time.perf_counter() - start
+
+    matching = calculator.get_comprehensive_analysis(50000, 7.0, solar_irradiance=5.0,
+                                                     consumer_type='Commercial')['calculations']
+    assert abs(result['optimal']['capacity'] - matching['plant_capacity']) < 0.05
+    assert result['binding_constraint'] is None
+    assert len(result['curve']['capacity']) == len(result['curve']['npv'])
+    print(f"✅ Optimal capacity {result['optimal']['capacity']} kW in {elapsed * 1000:.1f} ms")
+
+
+def test_constraints_are_respected():
+    """Rooftop area, budget and sanctioned load cap the optimum"""
+    calculator = SolarCalculator()
+
+    by_area = calculator.optimize_capacity(50000, 7.0, 5.0, 'Commercial', rooftop_area=1000)
+    roof = calculator.get_rooftop_capacity(1000)
+    assert by_area['binding_constraint'] == 'rooftop_area'
+    assert abs(by_area['optimal']['capacity'] - roof['capacity_kw']) < 0.01
+    assert abs(by_area['optimal']['area_required']
+               - by_area['optimal']['capacity'] * calculator.get_area_per_kw(roof)) < 0.01
+    assert 100 < calculator.get_area_per_kw(roof) < 250
+
+    # A roof that cannot hold min_capacity has no optimum
+    too_small = calculator.optimize_capacity(50000, 7.0, 5.0, 'Commercial', rooftop_area=150)
+    assert too_small['optimal'] is None and too_small['binding_constraint'] == 'rooftop_area'
+    assert not too_small['curve']['feasible'].any()
+
+    by_budget = calculator.optimize_capacity(50000, 7.0, 5.0, 'Commercial', budget=3000000)
+    assert by_budget['optimal']['investment'] <= 3000000
+    assert by_budget['binding_constraint'] == 'budget'
+
+    by_load = calculator.optimize_capacity(50000, 7.0, 5.0, 'Commercial', sanctioned_load=30)
+    assert by_load['optimal']['capacity'] <= 30
+    assert np.all(by_load['curve']['capacity'] <= 30)
+    print("✅ Area, budget and sanctioned-load limits respected")
+
+
+if __name__ == "__main__":
+    print("🌞 Capacity Optimizer Test")
+    print("=" * 50)
+    test_unconstrained_optimum_matches_consumption()
+    test_constraints_are_respected()
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Test the year-by-year cash-flow engine
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+
+# Add the current directory to Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from utils.calculations import SolarCalculator
+from utils.cash_flow import CashFlowModel
+
+
+def test_irr_known_values():
+    """IRR solver reproduces textbook values and flags unsolvable rows"""
+    model = CashFlowModel(lifetime=2)
+    flows = np.array([[-100.0, 60.0, 60.0], [-100.0, 110.0, 0.0], [-100.0, -5.0, -5.0]])
+    irr = model.irr(flows)
+
+    assert abs(irr[0] - 0.130662) < 1e-6
+    assert abs(irr[1] - 0.10) < 1e-12
+    assert np.isnan(irr[2])
+    print("✅ IRR solver matches known values")
+
+
+def test_irr_vectorized_scenarios():
+    """10k scenarios solve in one call with NPV(IRR) = 0"""
+    model = CashFlowModel()
+    rng = np.random.default_rng(7)
+    investment = rng.uniform(1e5, 1e7, 10000)
+    generation = investment / 70000 * 1500 * rng.uniform(0.6, 1.4, 10000)
+    tariff = rng.uniform(3.0, 10.0, 10000)
+
+    start = time.perf_counter()
+    result = model.analyze(investment, generation, tariff)
+    elapsed = time.perf_counter() - start
+
+    flows = result['cash_flows']['flows']
+    residual = model.npv(flows, result['irr']) / investment
+    assert np.nanmax(np.abs(residual)) < 1e-9
+    assert np.all(result['discounted_payback'] >= result['payback'])
+    print(f"✅ 10k scenario cash flows + IRR in {elapsed * 1000:.1f} ms")
+
+
+def test_cash_flow_mode_in_analysis():
+    """Cash-flow mode replaces payback/lifetime savings and matches batch mode"""
+    calculator = SolarCalculator()
+    simple = calculator.get_comprehensive_analysis(50000, 7.0, consumer_type='Commercial')['calculations']
+    detailed = calculator.get_comprehensive_analysis(50000, 7.0, consumer_type='Commercial',
+                                                     financial_model="cash_flow")['calculations']
+
+    assert detailed['npv'] > 0 and detailed['irr'] > 0
+    assert detailed['lifetime_savings'] != simple['lifetime_savings']
+    for field in ('npv', 'irr', 'discounted_payback', 'lcoe'):
+        assert field in detailed and field not in simple
+
+    batch = calculator.get_batch_analysis(np.array([50000.0]), 7.0, consumer_type='Commercial',
+                                          financial_model="cash_flow")
+    for field, value in detailed.items():
+        assert batch[field][0] == value, field
+    print("✅ Cash-flow mode plugs into comprehensive and batch analysis")
+
+
+if __name__ == "__main__":
+    print("🌞 Cash Flow Engine Test")
+    print("=" * 50)
+    test_irr_known_values()
+    test_irr_vectorized_scenarios()
+    test_cash_flow_mode_in_analysis()
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Test the state and year grid emission factor table
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+
+# Add the current directory to Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from utils.calculations import SolarCalculator
+from utils.emissions import BASE_YEAR, COMMISSIONING_YEAR, NATIONAL, STATE_EMISSION_FACTORS, EmissionFactorTable
+from utils.location_data import LOCATION_DATA
+
+
+def test_table_declines_to_floor():
+    """Factors start at the base values and decline towards the floor"""
+    table = EmissionFactorTable({NATIONAL: 0.8, 'Kerala': 0.42}, annual_decline=0.05, floor=0.3)
+    assert table.factor('Kerala', BASE_YEAR) == 0.42
+    assert table.factor('Atlantis', BASE_YEAR) == 0.8
+    assert table.factor(None, BASE_YEAR + 1) == 0.8 * 0.95
+    assert table.factor('Kerala', BASE_YEAR + 40) == 0.3
+    assert table.factor('Kerala', BASE_YEAR - 5) == 0.42
+
+    factors = table.factors(['Kerala', None, 'Kerala'], BASE_YEAR, 25)
+    assert factors.shape == (3, 25)
+    assert np.all(np.diff(factors, axis=1) <= 0)
+    assert np.array_equal(factors[0], table.factors('Kerala', BASE_YEAR, 25))
+    print("✅ Factors decline from the base year to the floor")
+
+
+def test_every_location_state_has_a_factor():
+    """States in LOCATION_DATA resolve to their own row"""
+    table = EmissionFactorTable.default()
+    states = {info['state'] for info in LOCATION_DATA.values()} - {'Unknown'}
+    for state in states:
+        assert table.factor(state, BASE_YEAR) == STATE_EMISSION_FACTORS[state], state
+    print(f"✅ {len(states)} states have grid factors")
+
+
+def test_lifetime_co2_is_a_dot_product():
+    """Lifetime CO2 equals the per-year generation dotted with the factors"""
+    calculator = SolarCalculator()
+    count = 100000
+    states = np.array(sorted(STATE_EMISSION_FACTORS) * (count // len(STATE_EMISSION_FACTORS) + 1),
+                      dtype=object)[:count]
+    generation = np.linspace(1000, 50000, count)
+
+    start = time.perf_counter()
+    intensity = calculator.get_co2_intensity(states)
+    elapsed = time.perf_counter() - start
+
+    simulation = calculator.get_lifetime_simulation(generation[:1000], 0, state=states[:1000])
+    direct = calculator.emission_factors.lifetime_co2(simulation['generation'], states[:1000],
+                                                      calculator.COMMISSIONING_YEAR)
+    assert np.allclose(generation[:1000] * intensity[:1000] / 1000, direct)
+    assert np.allclose(simulation['co2_saved'].sum(axis=1), direct)
+    print(f"✅ {count} lifetime CO2 intensities in {elapsed * 1000:.1f} ms")
+
+
+def test_analysis_uses_state_factors():
+    """Scalar and batch analyses use the state's factors"""
+    calculator = SolarCalculator()
+    kerala = calculator.get_comprehensive_analysis(10000, 6.0, state='Kerala')['calculations']
+    jharkhand = calculator.get_comprehensive_analysis(10000, 6.0, state='Jharkhand')['calculations']
+    national = calculator.get_comprehensive_analysis(10000, 6.0)['calculations']
+    assert kerala['annual_co2_saved'] < national['annual_co2_saved'] < jharkhand['annual_co2_saved']
+    assert kerala['lifetime_co2_saved'] < kerala['annual_co2_saved'] * calculator.SYSTEM_LIFETIME
+
+    batch = calculator.get_batch_analysis(np.array([10000.0, 10000.0, 10000.0]), 6.0,
+                                          state=np.array(['Kerala', 'Jharkhand', None], dtype=object))
+    for index, expected in enumerate((kerala, jharkhand, national)):
+        for field in ('annual_co2_saved', 'lifetime_co2_saved', 'equivalent_trees'):
+            assert batch[field][index] == expected[field], field
+    print(f"✅ Lifetime CO2 {kerala['lifetime_co2_saved']} t in Kerala vs "
+          f"{jharkhand['lifetime_co2_saved']} t in Jharkhand")
+
+
+def test_scalar_helpers_keep_their_contracts():
+    """Lifetime CO2 still takes first-year tons; weighted factors are cached per curve"""
+    calculator = SolarCalculator()
+    assert calculator.COMMISSIONING_YEAR == COMMISSIONING_YEAR
+    annual = calculator.calculate_co2_saved_annual(12000, 'Kerala')
+    from_generation = calculator.calculate_co2_saved_lifetime_from_generation(12000, 'Kerala')
+    assert abs(calculator.calculate_co2_saved_lifetime(annual, 'Kerala') - from_generation) < 1e-9
+    assert calculator.calculate_equivalent_trees(annual) == annual * 1000 / 22
+
+    table = calculator.emission_factors
+    curve = calculator.get_performance_curve()
+    first = table.weighted_factor(curve, 'Kerala', COMMISSIONING_YEAR)
+    assert table.weighted_factor(curve.copy(), 'Kerala', COMMISSIONING_YEAR) == first
+    assert table.weighted_factor(curve, 'Kerala', COMMISSIONING_YEAR + 5) < first
+    assert table.weighted_factor(curve, np.array(['Kerala']), COMMISSIONING_YEAR)[0] == first
+
+    start = time.perf_counter()
+    for _ in range(10000):
+        calculator.get_co2_intensity('Kerala')
+    elapsed = (time.perf_counter() - start) / 10000
+    print(f"✅ Scalar lifetime intensity in {elapsed * 1e6:.1f} µs")
+
+
+def test_tree_counts_and_national_factor():
+    """equivalent_trees stays the annual count; the lifetime average is its own field"""
+    calculator = SolarCalculator()
+    assert calculator.CO2_FACTOR == calculator.emission_factors.factor(None, COMMISSIONING_YEAR)
+
+    result = calculator.get_comprehensive_analysis(8000, 6.5, state='Kerala')['calculations']
+    yearly_generation = calculator.calculate_monthly_generation_precise(
+        calculator.calculate_plant_capacity_precise(8000 / 6.5, 4.5), 4.5) * 12
+    annual = calculator.calculate_co2_saved_annual(yearly_generation, 'Kerala')
+    lifetime = calculator.calculate_co2_saved_lifetime_from_generation(yearly_generation, 'Kerala')
+    assert result['equivalent_trees'] == round(annual * 1000 / 22, 0)
+    assert result['equivalent_trees_lifetime'] == round(lifetime * 1000 / (22 * calculator.SYSTEM_LIFETIME), 0)
+
+    batch = calculator.get_batch_analysis(np.array([8000.0]), 6.5, state='Kerala')
+    assert batch['equivalent_trees'][0] == result['equivalent_trees']
+    assert batch['equivalent_trees_lifetime'][0] == result['equivalent_trees_lifetime']
+    print(f"✅ {result['equivalent_trees']:.0f} trees a year, "
+          f"{result['equivalent_trees_lifetime']:.0f} on average over the lifetime")
+
+
+if __name__ == "__main__":
+    test_table_declines_to_floor()
+    test_every_location_state_has_a_factor()
+    test_lifetime_co2_is_a_dot_product()
+    test_analysis_uses_state_factors()
+    test_scalar_helpers_keep_their_contracts()
+    test_tree_counts_and_national_factor()
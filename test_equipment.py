@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Test the equipment catalog and string sizing
+"""
+
+import json
+import os
+import sys
+import tempfile
+
+import numpy as np
+
+# Add the current directory to Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from utils.calculations import SolarCalculator
+from utils.equipment import DEFAULT_CATALOG, EquipmentCatalog
+
+
+def _brute_force(catalog, capacity):
+    """Cheapest valid design by string-sizing every module/inverter pair"""
+    module_count = np.ceil(capacity * 1000 / catalog.modules['power_w'])
+    inverter_count = np.maximum(np.ceil(capacity / (catalog.inverters['ac_kw'] * catalog.dc_ac_ratio[1])), 1)
+    modules, inverters = np.meshgrid(np.arange(len(catalog.module_names)),
+                                     np.arange(len(catalog.inverter_names)), indexing='ij')
+    usable = capacity / (inverter_count * catalog.inverters['ac_kw']) >= catalog.dc_ac_ratio[0]
+    keep = usable[inverters]
+    return catalog._best_pair(modules[keep], inverters[keep], module_count, inverter_count)
+
+
+def test_designs_respect_electrical_limits():
+    """String voltages, input currents and DC/AC ratio stay within the windows"""
+    catalog = EquipmentCatalog.default()
+    for capacity in (1.0, 3.3, 9.88, 47.0, 250.0):
+        design = catalog.select(capacity)
+        module = DEFAULT_CATALOG['modules'][[m['name'] for m in DEFAULT_CATALOG['modules']].index(design['module'])]
+        inverter = DEFAULT_CATALOG['inverters'][
+            [i['name'] for i in DEFAULT_CATALOG['inverters']].index(design['inverter'])]
+
+        voc_cold = module['voc'] * (1 + module['voltage_temp_coefficient'] * (5 - 25))
+        vmp_hot = module['vmp'] * (1 + module['voltage_temp_coefficient'] * (70 - 25))
+        assert design['string_length'] * voc_cold <= inverter['max_dc_voltage']
+        assert design['string_length'] * vmp_hot >= inverter['mppt_min_voltage']
+        strings_per_mppt = design['string_count'] / (design['inverter_count'] * inverter['mppt_count'])
+        assert np.ceil(strings_per_mppt) * module['isc'] <= inverter['max_input_current']
+        assert design['dc_capacity'] >= capacity and 0.9 <= design['dc_ac_ratio'] <= 1.35
+        assert design['module_count'] == design['string_count'] * design['string_length']
+    assert catalog.select(0.3) is None
+    print("✅ Designs stay inside voltage, current and DC/AC windows")
+
+
+def test_selection_matches_exhaustive_search():
+    """The pruned search finds the same cost as sizing every pair"""
+    rng = np.random.default_rng(11)
+    power = rng.uniform(300, 600, 60)
+    modules = [{'name': f'M{i}', 'power_w': power[i], 'voc': power[i] / 10 + 10, 'vmp': power[i] / 12 + 8,
+                'isc': rng.uniform(9, 15), 'voltage_temp_coefficient': -0.0028,
+                'price': power[i] * rng.uniform(24, 32)} for i in range(60)]
+    ratings = rng.choice([1, 3, 5, 10, 20, 50, 100], 60)
+    inverters = [{'name': f'I{i}', 'ac_kw': ratings[i], 'max_dc_voltage': 600 if ratings[i] <= 5 else 1100,
+                  'mppt_min_voltage': 90 if ratings[i] <= 5 else 200,
+                  'mppt_max_voltage': 550 if ratings[i] <= 5 else 1000,
+                  'max_input_current': rng.uniform(12, 32), 'mppt_count': max(1, int(ratings[i]) // 10),
+                  'price': ratings[i] * rng.uniform(5000, 12000) + 10000} for i in range(60)]
+    catalog = EquipmentCatalog(modules, inverters)
+
+    for capacity in (2.0, 7.3, 33.0, 120.0, 480.0):
+        design = catalog.select(capacity)
+        reference = _brute_force(catalog, capacity)
+        assert design['equipment_cost'] == round(reference[0])
+    print("✅ Pruned selection matches the exhaustive search")
+
+
+def test_catalog_round_trip_and_analysis():
+    """JSON catalogs load; a loaded catalog sizes panels in scalar and batch analyses"""
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, 'catalog.json')
+        with open(path, 'w', encoding='utf-8') as handle:
+            json.dump(DEFAULT_CATALOG, handle)
+        loaded = EquipmentCatalog.from_file(path)
+    assert loaded.fingerprint == EquipmentCatalog.default().fingerprint
+
+    calculator = SolarCalculator()
+    legacy = calculator.get_cached_analysis(15000, 7.5, "CAPEX", 5.0, "Commercial")
+    calculator.load_equipment_catalog()
+    sized = calculator.get_cached_analysis(15000, 7.5, "CAPEX", 5.0, "Commercial")
+    design = calculator.select_equipment(sized['calculations']['plant_capacity'])
+
+    assert legacy['calculations']['panel_count'] == np.ceil(legacy['calculations']['plant_capacity'] / 0.4)
+    assert sized['calculations']['panel_count'] == design['module_count']
+    assert sized['calculations']['inverter_capacity'] == design['ac_capacity']
+    assert sized['calculations']['investment'] == legacy['calculations']['investment']
+
+    batch = calculator.get_batch_analysis(np.array([15000.0, 15000.0, 40000.0]), 7.5, "CAPEX", 5.0, "Commercial")
+    assert batch['panel_count'][0] == batch['panel_count'][1] == design['module_count']
+    print(f"✅ {design['module_count']} x {design['module']} on {design['inverter_count']} x {design['inverter']}")
+
+
+if __name__ == "__main__":
+    test_designs_respect_electrical_limits()
+    test_selection_matches_exhaustive_search()
+    test_catalog_round_trip_and_analysis()
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Test the loan, EMI and depreciation financing engine
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+
+# Add the current directory to Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from utils.calculations import SolarCalculator
+from utils.cash_flow import CashFlowModel
+from utils.financing import FinancingModel
+
+
+def test_amortization_matches_monthly_schedule():
+    """Closed-form yearly schedule equals stepping through every EMI"""
+    model = FinancingModel(CashFlowModel(lifetime=10))
+    cases = [(1000000, 0.10, 7), (500000, 0.0, 5), (800000, 0.12, 2.5)]
+    principal, rate, tenor = (np.array(column, dtype=float) for column in zip(*cases))
+    schedule = model.amortize(principal, rate, tenor)
+
+    for index, (amount, annual_rate, years) in enumerate(cases):
+        payments = int(round(years * 12))
+        monthly_rate = annual_rate / 12
+        emi = amount * monthly_rate / (1 - (1 + monthly_rate) ** -payments) if monthly_rate else amount / payments
+        balance = amount
+        interest = np.zeros(10)
+        for month in range(payments):
+            interest[month // 12] += balance * monthly_rate
+            balance -= emi - balance * monthly_rate
+        assert abs(schedule['emi'][index] - emi) < 1e-6
+        assert np.allclose(schedule['interest'][index], interest, atol=1e-4)
+        assert abs(schedule['principal'][index].sum() - amount) < 1e-4
+    print("✅ Yearly amortization matches the monthly EMI schedule")
+
+
+def test_no_loan_equals_project_cash_flows():
+    """Without a loan, subsidy or tax the equity IRR is the project IRR"""
+    cash_flow_model = CashFlowModel()
+    model = FinancingModel(cash_flow_model, loan_fraction=0.0, tax_rate=0.0)
+    result = model.analyze(1000000, 15000, 7.0)
+    project = cash_flow_model.analyze(1000000, 15000, 7.0)
+    assert abs(result['equity_irr'][0] - project['irr'][0]) < 1e-9
+    assert np.allclose(result['flows'], project['cash_flows']['flows'])
+    print("✅ Unlevered equity flows equal the project cash flows")
+
+
+def test_subsidy_and_depreciation_raise_returns():
+    """An interest subsidy and a depreciation tax shield both help the equity holder"""
+    model = FinancingModel(CashFlowModel(), tax_rate=0.25)
+    base = model.analyze(1000000, 15000, 7.0)
+    subsidized = model.analyze(1000000, 15000, 7.0, interest_subsidy=0.03)
+    slow_depreciation = model.analyze(1000000, 15000, 7.0, depreciation_rate=0.05)
+    assert subsidized['equity_irr'][0] > base['equity_irr'][0]
+    assert base['equity_irr'][0] > slow_depreciation['equity_irr'][0]
+    assert subsidized['interest_subsidy'][0, 7:].sum() == 0
+    assert abs(subsidized['interest_subsidy'][0].sum() - base['interest'][0].sum() * 0.3) < 1e-6
+    assert np.allclose(base['cash_on_cash'][0], base['flows'][0, 1:] / base['equity'][0])
+    print(f"✅ Equity IRR {base['equity_irr'][0]:.2%}, {subsidized['equity_irr'][0]:.2%} with subsidy")
+
+
+def test_loan_grid_in_one_call():
+    """A tenor x rate grid for one customer is a single vectorized call"""
+    calculator = SolarCalculator()
+    tenors = np.arange(1, 16)
+    rates = np.linspace(0.06, 0.14, 17)
+    start = time.perf_counter()
+    grid = calculator.get_loan_grid(50000, 7.0, 5.0, 'Commercial', tenors, rates)
+    elapsed = time.perf_counter() - start
+
+    assert grid['emi'].shape == (15, 17)
+    assert grid['cash_on_cash'].shape == (15, 17, calculator.SYSTEM_LIFETIME)
+    assert np.all(np.diff(grid['emi'], axis=0) < 0)
+    assert np.all(np.diff(grid['emi'], axis=1) > 0)
+    assert np.all(np.diff(grid['total_interest'], axis=1) > 0)
+    print(f"✅ {grid['emi'].size} loan terms in {elapsed * 1000:.1f} ms")
+
+
+def test_financing_in_analysis():
+    """CAPEX results gain loan fields; batch and cached paths agree"""
+    calculator = SolarCalculator()
+    financed = calculator.get_comprehensive_analysis(50000, 7.0, consumer_type='Commercial',
+                                                     financing={'tenor_years': 5})['calculations']
+    plain = calculator.get_comprehensive_analysis(50000, 7.0, consumer_type='Commercial')['calculations']
+    opex = calculator.get_comprehensive_analysis(50000, 7.0, "OPEX", financing={})['calculations']
+    assert 'emi' in financed and 'emi' not in plain and 'emi' not in opex
+    assert financed['loan_amount'] == round(financed['investment'] * 0.7, 0)
+    assert len(financed['cash_on_cash']) == calculator.SYSTEM_LIFETIME
+
+    batch = calculator.get_batch_analysis(np.array([50000.0]), 7.0, consumer_type='Commercial',
+                                          financing={'tenor_years': 5})
+    for field in ('loan_amount', 'emi', 'equity_irr', 'equity_payback'):
+        assert batch[field][0] == financed[field], field
+
+    cached = calculator.get_cached_analysis(50000, 7.0, consumer_type='Commercial',
+                                            financing={'tenor_years': 5})
+    assert cached.has_financing and cached['calculations']['emi'] == financed['emi']
+    print(f"✅ EMI ₹{financed['emi']:,.0f}, equity IRR {financed['equity_irr']}%")
+
+
+if __name__ == "__main__":
+    test_amortization_matches_monthly_schedule()
+    test_no_loan_equals_project_cash_flows()
+    test_subsidy_and_depreciation_raise_returns()
+    test_loan_grid_in_one_call()
+    test_financing_in_analysis()
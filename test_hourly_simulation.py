@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Test the hourly (8760) generation engine
+"""
+
+import os
+import sys
+
+import numpy as np
+
+# Add the current directory to Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from utils.calculations import SolarCalculator
+from utils.hourly_simulation import HourlySimulator, HOURS_PER_YEAR
+
+
+def test_horizontal_matches_flat_formula():
+    """A flat array with no weather losses reproduces Capacity x Irradiance x PR x 365"""
+    simulator = HourlySimulator(performance_ratio=0.75)
+    hourly = simulator.simulate(10, 28.7041, 77.1025, 4.5, tilt=0)
+
+    assert hourly.shape == (HOURS_PER_YEAR,)
+    assert np.all(hourly >= 0)
+    assert abs(hourly.sum() / (10 * 4.5 * 0.75 * 365) - 1) < 0.001
+    print(f"✅ Horizontal simulation: {hourly.sum():,.0f} kWh/year")
+
+
+def test_night_hours_are_zero():
+    """No generation at midnight, peak around solar noon"""
+    hourly = SolarCalculator().calculate_hourly_generation(5, 19.0760, 72.8777, 4.8)
+    daily = hourly.reshape(365, 24)
+
+    assert np.all(daily[:, 0] == 0)
+    assert 11 <= daily.mean(axis=0).argmax() <= 13
+    print("✅ Hourly profile follows the sun")
+
+
+def test_comprehensive_analysis_hourly_mode():
+    """Hourly mode only changes generation-derived figures"""
+    calculator = SolarCalculator()
+    solar_data = {'latitude': 26.9124, 'longitude': 75.7873,
+                  'weather_factors': {'dust_factor': 0.95}}
+
+    flat = calculator.get_comprehensive_analysis(10000, 5.2, solar_irradiance=6.0)
+    hourly = calculator.get_comprehensive_analysis(10000, 5.2, solar_irradiance=6.0,
+                                                   generation_mode="hourly", solar_data=solar_data)
+
+    assert hourly['input_data']['generation_mode'] == "hourly"
+    assert hourly['calculations']['plant_capacity'] == flat['calculations']['plant_capacity']
+    assert hourly['calculations']['monthly_generation'] != flat['calculations']['monthly_generation']
+    print("✅ Comprehensive analysis supports hourly mode")
+
+
+def test_weather_factors_not_double_counted():
+    """PR-covered losses are not applied again; clouds derate the irradiance"""
+    simulator = HourlySimulator(performance_ratio=0.75)
+    base = simulator.simulate(10, 28.7041, 77.1025, 4.5, tilt=0)
+    covered = simulator.simulate(10, 28.7041, 77.1025, 4.5, tilt=0,
+                                 weather_factors={'dust_factor': 0.95, 'temperature_factor': 0.92})
+    cloudy = simulator.simulate(10, 28.7041, 77.1025, 4.5, tilt=0, weather_factors={'cloud_factor': 0.9})
+
+    assert np.array_equal(covered, base)
+    assert abs(cloudy.sum() / base.sum() - 0.9) < 0.001
+    clear = simulator.get_irradiance_components(28.7041, 77.1025, 4.5)
+    hazy = simulator.get_irradiance_components(28.7041, 77.1025, 4.5, sky_factor=0.9)
+    assert hazy['dhi'].sum() / hazy['ghi'].sum() > clear['dhi'].sum() / clear['ghi'].sum()
+    print(f"✅ Cloud factor 0.9 keeps {cloudy.sum() / base.sum():.3f} of the output")
+
+
+if __name__ == "__main__":
+    print("🌞 Hourly Simulation Test")
+    print("=" * 50)
+    test_horizontal_matches_flat_formula()
+    test_night_hours_are_zero()
+    test_comprehensive_analysis_hourly_mode()
+    test_weather_factors_not_double_counted()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Test the inverse solver (required capacity or price for a target)
+"""
+
+import os
+import sys
+
+import numpy as np
+
+# Add the current directory to Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from utils.calculations import SolarCalculator
+
+
+def test_cost_for_target_payback():
+    """The solved price reproduces the target payback"""
+    calculator = SolarCalculator()
+    result = calculator.get_inverse_analysis('cost_per_kw', 'payback', 4, 10000, 5.2, 6.0)
+    assert result['solved']
+    assert abs(result['payback'] - 4) < 1e-6
+    assert abs(result['investment'] / result['annual_savings'] - 4) < 1e-6
+    assert abs(result['cost_per_kw'] * result['capacity'] - result['investment']) < 1e-3
+    print(f"✅ ₹{float(result['cost_per_kw']):,.0f}/kW gives a 4-year payback")
+
+
+def test_column_of_targets():
+    """A whole column of targets solves in one call"""
+    calculator = SolarCalculator()
+    targets = np.linspace(2, 10, 500)
+    result = calculator.get_inverse_analysis('cost_per_kw', 'payback', targets, 10000, 5.2, 6.0)
+    assert result['cost_per_kw'].shape == targets.shape and result['solved'].all()
+    assert np.all(np.diff(result['cost_per_kw']) > 0)
+    assert np.allclose(result['payback'], targets)
+    print("✅ 500 payback targets solved together")
+
+
+def test_irr_target():
+    """The IRR at the solved tariff matches the target"""
+    calculator = SolarCalculator()
+    targets = np.array([0.08, 0.12, 0.2])
+    result = calculator.get_inverse_analysis('tariff', 'irr', targets, 10000, solar_irradiance=6.0)
+    assert result['solved'].all()
+    assert np.allclose(result['irr'], targets, atol=1e-6)
+    assert np.all(np.diff(result['tariff']) > 0)
+    print(f"✅ Tariffs {np.round(result['tariff'], 2)} give IRRs {targets}")
+
+
+def test_capacity_and_bill():
+    """Capacity and bill solve against an annual savings target"""
+    calculator = SolarCalculator()
+    result = calculator.get_inverse_analysis('capacity', 'annual_savings', 100000, 10000, 5.2, 6.0)
+    assert result['solved'] and abs(result['annual_savings'] - 100000) < 1e-3
+
+    result = calculator.get_inverse_analysis('monthly_bill', 'annual_savings', [60000, 120000],
+                                             tariff_rate=7.0, solar_irradiance=5.0)
+    assert result['solved'].all()
+    assert np.allclose(result['monthly_bill'], [5000, 10000])
+    print("✅ Capacity and bill solved for a savings target")
+
+
+def test_unreachable_and_invalid():
+    """Targets outside the bracket come back unsolved; bad names raise"""
+    calculator = SolarCalculator()
+    result = calculator.get_inverse_analysis('cost_per_kw', 'payback', [-1, 4], 10000, 5.2, 6.0)
+    assert list(result['solved']) == [False, True]
+    assert np.isnan(result['cost_per_kw'][0]) and not np.isnan(result['cost_per_kw'][1])
+
+    for args in (('voltage', 'payback', 4), ('tariff', 'npv', 4)):
+        try:
+            calculator.get_inverse_analysis(*args, monthly_bill=10000, tariff_rate=5.2)
+        except ValueError:
+            continue
+        raise AssertionError(f"{args} should raise")
+    print("✅ Unreachable targets are NaN and unknown names raise")
+
+
+def test_minimum_capacity():
+    """Solved and derived capacities respect the calculator's 1 kW minimum"""
+    calculator = SolarCalculator()
+    # 1 kW already saves more than the target: a smaller system is not offered
+    result = calculator.get_inverse_analysis('capacity', 'annual_savings', [5000, 20000], 10000, 5.2, 6.0,
+                                             bracket=(0.01, 1000))
+    assert list(result['solved']) == [False, True]
+    assert np.isnan(result['capacity'][0]) and result['capacity'][1] >= 1.0
+
+    # A small bill is still served by a 1 kW system, as in the comprehensive analysis
+    result = calculator.get_inverse_analysis('monthly_bill', 'annual_savings', 3000,
+                                             tariff_rate=7.0, solar_irradiance=5.0)
+    assert result['solved'] and result['capacity'] == 1.0
+    expected = calculator.get_comprehensive_analysis(float(result['monthly_bill']), 7.0, solar_irradiance=5.0)
+    assert expected['calculations']['plant_capacity'] == 1.0
+    print(f"✅ A ₹{float(result['monthly_bill']):,.0f} bill is sized at the 1 kW minimum")
+
+
+if __name__ == "__main__":
+    test_cost_for_target_payback()
+    test_column_of_targets()
+    test_irr_target()
+    test_capacity_and_bill()
+    test_unreachable_and_invalid()
+    test_minimum_capacity()
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Test rooftop module layout packing
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+
+# Add the current directory to Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from utils.calculations import SolarCalculator
+from utils.layout import SQ_FT_PER_M2, RooftopLayout, square_roof
+
+
+def test_rectangles_pack_exactly():
+    """Flat modules tile a rectangle; setbacks and tilt spacing remove rows"""
+    layout = RooftopLayout(setback=0, module_gap=0)
+    rectangle = [(0, 0), (10, 0), (10, 5), (0, 5)]
+    assert layout.pack(rectangle, tilt=0, orientation='portrait')['module_count'] == 20
+    assert layout.pack(rectangle, tilt=0, orientation='landscape')['module_count'] == 25
+    assert layout.pack(rectangle, tilt=0)['orientation'] == 'landscape'
+
+    # 1 m setback leaves an 8 x 3 m field: one portrait row of 8
+    with_setback = RooftopLayout(setback=1.0, module_gap=0)
+    assert with_setback.pack(rectangle, tilt=0, orientation='portrait')['module_count'] == 8
+
+    flat = layout.pack(square_roof(5000), tilt=0, orientation='portrait')
+    tilted = layout.pack(square_roof(5000), tilt=25, latitude=28.0, orientation='portrait')
+    assert tilted['module_count'] < flat['module_count']
+    assert tilted['row_pitch'] > 2 * np.cos(np.radians(25))
+    print("✅ Rectangles pack exactly; setbacks and row spacing reduce the count")
+
+
+def test_concave_roof_respects_outline():
+    """An L-shaped roof holds fewer modules than its bounding square"""
+    layout = RooftopLayout()
+    square = layout.pack([(0, 0), (40, 0), (40, 40), (0, 40)], tilt=10)
+    l_shape = layout.pack([(0, 0), (40, 0), (40, 20), (20, 20), (20, 40), (0, 40)], tilt=10)
+    notch = layout.pack([(0, 0), (40, 0), (40, 40), (20, 40), (20, 30), (19, 30), (19, 40), (0, 40)], tilt=10)
+
+    assert l_shape['module_count'] < 0.8 * square['module_count']
+    assert l_shape['module_area'] <= l_shape['roof_area']
+    assert notch['module_count'] < square['module_count']
+    assert layout.pack([(0, 0), (2, 0), (2, 2), (0, 2)])['module_count'] == 0
+    print(f"✅ L-shaped roof holds {l_shape['module_count']} of {square['module_count']} modules")
+
+
+def test_industrial_roof_speed_and_capacity_cap():
+    """A 50,000 sq ft roof packs in well under 100 ms and caps the analysis"""
+    layout = RooftopLayout()
+    angles = np.linspace(0, 2 * np.pi, 200, endpoint=False)
+    radius = 40 + 5 * np.sin(4 * angles)
+    outline = np.column_stack([radius * np.cos(angles), radius * np.sin(angles)])
+    layout.pack(outline)
+
+    start = time.perf_counter()
+    result = layout.pack(square_roof(50000))
+    irregular = layout.pack(outline)
+    elapsed = time.perf_counter() - start
+    assert elapsed < 0.1
+    assert result['module_count'] > 1000 and irregular['module_count'] > 1000
+
+    calculator = SolarCalculator()
+    uncapped = calculator.get_comprehensive_analysis(20000, 7.5, "CAPEX", 5.0, "Commercial")
+    capped = calculator.get_comprehensive_analysis(20000, 7.5, "CAPEX", 5.0, "Commercial", rooftop_area=1000)
+    roof = calculator.get_rooftop_capacity(1000)
+    assert capped['calculations']['plant_capacity'] == round(roof['capacity_kw'], 2)
+    assert capped['calculations']['plant_capacity'] < uncapped['calculations']['plant_capacity']
+    assert capped['calculations']['area_required'] == round(roof['roof_area'] * SQ_FT_PER_M2, 2)
+    roomy = calculator.get_comprehensive_analysis(20000, 7.5, "CAPEX", 5.0, "Commercial", rooftop_area=100000)
+    area_per_kw = calculator.get_area_per_kw(calculator.get_rooftop_capacity(100000))
+    assert abs(roomy['calculations'].pop('area_required')
+               - uncapped['calculations']['plant_capacity'] * area_per_kw) < area_per_kw * 0.01
+    uncapped['calculations'].pop('area_required')
+    assert roomy['calculations'] == uncapped['calculations']
+    try:
+        calculator.get_comprehensive_analysis(20000, 7.5, "CAPEX", 5.0, "Commercial", rooftop_area=150)
+        assert False, "a roof without room for one module should be rejected"
+    except ValueError:
+        pass
+    print(f"✅ 50,000 sq ft packed in {elapsed * 1000:.1f} ms ({result['capacity_kw']} kWp); "
+          f"1,000 sq ft caps the system at {roof['capacity_kw']} kWp")
+
+
+if __name__ == "__main__":
+    test_rectangles_pack_exactly()
+    test_concave_roof_respects_outline()
+    test_industrial_roof_speed_and_capacity_cap()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Test the lifetime degradation, availability and soiling simulation
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+
+# Add the current directory to Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from backend.mock_supabase_client import MockSupabaseClient
+from utils.calculations import SolarCalculator
+from utils.lifetime import LIFETIME_COLUMNS, LifetimeSimulator, lifetime_columns
+
+
+def test_performance_curve():
+    """LID, degradation and availability compound; soiling matches a daily sawtooth"""
+    simulator = LifetimeSimulator(lifetime=25, first_year_lid=0.02, degradation_rate=0.005,
+                                  availability=0.98, soiling_rate=0, cleaning_interval=None)
+    curve = simulator.performance()[0]
+    expected = 0.98 * 0.98 * 0.995 ** np.arange(25)
+    assert np.allclose(curve, expected)
+
+    for interval in (7, 15, 40, None):
+        simulator = LifetimeSimulator(lifetime=3, first_year_lid=0, degradation_rate=0, availability=1,
+                                      soiling_rate=0.003, soiling_cap=0.05, cleaning_interval=interval)
+        days = np.arange(3 * 365)
+        since_cleaning = days % interval if interval else days
+        daily = np.minimum(0.003 * since_cleaning, 0.05)
+        assert np.allclose(simulator.performance()[0], 1 - daily.reshape(3, 365).mean(axis=1))
+    print("✅ Performance curve matches the day-by-day model")
+
+
+def test_batched_scenarios():
+    """Per-scenario overrides give one row per scenario"""
+    simulator = LifetimeSimulator()
+    count = 10000
+    start = time.perf_counter()
+    simulation = simulator.simulate(np.full(count, 12000.0), np.full(count, 84000.0), 0.8,
+                                    cleaning_interval=np.where(np.arange(count) % 2, 7, 30),
+                                    availability=np.linspace(0.95, 1.0, count))
+    elapsed = time.perf_counter() - start
+    assert simulation['generation'].shape == (count, 25)
+    assert simulation['generation'][1].sum() > simulation['generation'][0].sum()
+    assert np.allclose(simulation['co2_saved'], simulation['generation'] * 0.8 / 1000)
+    assert np.allclose(simulation['savings'] / 84000, simulation['generation'] / 12000)
+    print(f"✅ {count} lifetime scenarios in {elapsed * 1000:.1f} ms")
+
+
+def test_analysis_uses_lifetime_arrays():
+    """Lifetime totals are the sums of the per-year arrays in every analysis path"""
+    calculator = SolarCalculator()
+    calculations = calculator.get_comprehensive_analysis(10000, 7.5, "CAPEX", 4.5)['calculations']
+    simulation = calculator.get_lifetime_simulation(calculations['yearly_generation'],
+                                                    calculations['annual_savings'])
+    assert abs(simulation['savings'].sum() - calculations['lifetime_savings']) <= 1
+    assert abs(simulation['co2_saved'].sum() - calculations['lifetime_co2_saved']) <= 0.01
+    assert calculations['lifetime_savings'] < calculations['annual_savings'] * calculator.SYSTEM_LIFETIME
+
+    batch = calculator.get_batch_analysis(np.array([10000.0]), 7.5)
+    assert batch['lifetime_savings'][0] == calculations['lifetime_savings']
+    assert batch['lifetime_co2_saved'][0] == calculations['lifetime_co2_saved']
+
+    calculator.LIFETIME_ASSUMPTIONS['cleaning_interval'] = 60
+    dusty = calculator.get_cached_analysis(10000, 7.5, "CAPEX", 4.5)['calculations']
+    assert dusty['lifetime_savings'] < calculations['lifetime_savings']
+    print(f"✅ Lifetime savings ₹{calculations['lifetime_savings']:,.0f} from the per-year arrays")
+
+
+def test_compact_columns_saved():
+    """Per-year arrays are stored with the calculation"""
+    calculator = SolarCalculator()
+    simulation = calculator.get_lifetime_simulation(12000, 84000)
+    columns = lifetime_columns(simulation)
+    assert set(columns) == set(LIFETIME_COLUMNS)
+    assert all(len(values) == calculator.SYSTEM_LIFETIME for values in columns.values())
+
+    client = MockSupabaseClient()
+    form_data = {'location_city': 'Delhi', 'monthly_bill': 10000, 'investment_model': 'CAPEX',
+                 'consumer_type': 'Residential', 'consumer_category': 'residential',
+                 'installation_type': 'rooftop', 'shadow_analysis': True}
+    results = calculator.get_comprehensive_analysis(10000, 7.5)
+    calculation_id = client.save_calculation(form_data, {}, results, columns)
+    record = client.get_calculation(calculation_id)
+    assert record['generation_by_year'] == columns['generation_by_year']
+    print("✅ Per-year arrays saved with the calculation")
+
+
+if __name__ == "__main__":
+    test_performance_curve()
+    test_batched_scenarios()
+    test_analysis_uses_lifetime_arrays()
+    test_compact_columns_saved()
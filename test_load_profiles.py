@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Test the synthetic hourly load-profile generator
+"""
+
+import os
+import sys
+
+import numpy as np
+
+# Add the current directory to Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from utils.billing import TariffBook
+from utils.calculations import SolarCalculator
+from utils.hourly_simulation import MONTH_INDEX
+from utils.load_profiles import archetype_for, archetype_profile, generate_load_profile
+
+
+def test_profiles_preserve_consumption():
+    """Annual totals match 12 x monthly kWh; monthly values are kept exactly"""
+    profile = generate_load_profile(300, "Residential")
+    assert profile.shape == (8760,) and np.isclose(profile.sum(), 3600)
+
+    monthly = np.bincount(MONTH_INDEX, weights=profile, minlength=12)
+    assert monthly[4] > monthly[0]  # May cooling load above January
+    hours = profile.reshape(365, 24).mean(axis=0)
+    assert hours[19] > hours[3]  # evening peak
+
+    months = np.array([250, 240, 280, 320, 380, 360, 330, 310, 300, 290, 260, 250], dtype=float)
+    by_month = generate_load_profile(months, "Commercial", by_month=True)
+    assert np.allclose(np.bincount(MONTH_INDEX, weights=by_month, minlength=12), months)
+    print("✅ Load profiles preserve monthly consumption")
+
+
+def test_archetypes_cached_and_batched():
+    """Archetypes are built once; a batch is one broadcast"""
+    assert archetype_profile('commercial') is archetype_profile('commercial')
+    assert not archetype_profile('commercial').flags.writeable
+
+    consumption = np.array([120.0, 450.0, 2000.0])
+    batch = generate_load_profile(consumption, "Industrial", dtype=np.float32)
+    assert batch.shape == (3, 8760) and batch.dtype == np.float32
+    assert np.allclose(batch.sum(axis=1), consumption * 12, rtol=1e-5)
+    assert np.allclose(batch[1], generate_load_profile(450.0, "Industrial"), rtol=1e-6)
+    print("✅ Archetypes cached and broadcast over consumers")
+
+
+def test_category_resolution():
+    """Form codes pick the form's meaning; table codes their own archetype"""
+    assert archetype_for("Commercial", "LT-3") == "commercial"    # form: LT-3 (Commercial)
+    assert archetype_for("Commercial", "LT-4") == "industrial"    # form: LT-4 (Industrial)
+    assert archetype_for("Residential", "LT-1C") == "residential"
+    assert archetype_for("Commercial", "HT-6") == "street_lighting"
+    assert archetype_for("Industrial", "XX-1") == "industrial"
+    assert TariffBook().schedule('LT-3').code == 'LT-2A'
+    print("✅ Form and table category codes resolve consistently")
+
+
+def test_self_consumption():
+    """Daytime loads use more of the generation than evening-peaking homes"""
+    calculator = SolarCalculator()
+    generation = calculator.calculate_hourly_generation(2.0, 28.61, 77.21, 4.5)
+    home = calculator.calculate_self_consumption(generation, 300, "Residential")
+    office = calculator.calculate_self_consumption(generation, 300, "Commercial")
+
+    assert 0 < home['self_consumption'] < office['self_consumption'] < 1
+    assert np.isclose(home['self_consumed'] + home['grid_export'], generation.sum())
+    assert np.isclose(home['self_consumed'] + home['grid_import'], 3600)
+    print(f"✅ Self-consumption {home['self_consumption']:.0%} (home) vs {office['self_consumption']:.0%} (office)")
+
+
+if __name__ == "__main__":
+    test_profiles_preserve_consumption()
+    test_archetypes_cached_and_batched()
+    test_category_resolution()
+    test_self_consumption()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Test the Monte Carlo uncertainty mode
+"""
+
+import os
+import sys
+import time
+
+# Add the current directory to Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from utils.calculations import SolarCalculator
+from utils.monte_carlo import MonteCarloAnalyzer
+
+
+def test_monte_carlo_percentiles():
+    """Seeded runs are reproducible, fast and ordered P50 > P90 > P99"""
+    calculator = SolarCalculator()
+
+    start = time.perf_counter()
+    result = calculator.get_monte_carlo_analysis(1000000, 7.5, 5.5, 'Industrial', draws=10000, seed=1)
+    elapsed = time.perf_counter() - start
+    repeat = calculator.get_monte_carlo_analysis(1000000, 7.5, 5.5, 'Industrial', draws=10000, seed=1)
+
+    assert result == repeat
+    assert elapsed < 1.0
+
+    generation = result['percentiles']['yearly_generation']
+    payback = result['percentiles']['payback_period']
+    assert generation['P50'] > generation['P90'] > generation['P99']
+    assert payback['P50'] < payback['P90'] < payback['P99']
+    print(f"✅ 10k Monte Carlo draws in {elapsed * 1000:.0f} ms, P90 payback {payback['P90']} years")
+
+
+def test_monte_carlo_fixed_inputs():
+    """Fixed distributions collapse to the nominal calculation"""
+    calculator = SolarCalculator()
+    fixed = {
+        'irradiance': {'type': 'fixed', 'value': 1.0},
+        'performance_ratio': {'type': 'fixed', 'value': calculator.PERFORMANCE_RATIO},
+        'tariff_escalation': {'type': 'fixed', 'value': calculator.CASH_FLOW_ASSUMPTIONS['tariff_escalation']},
+        'cost_per_kw': {'type': 'fixed', 'value': 1.0}
+    }
+    result = calculator.get_monte_carlo_analysis(50000, 7.0, 5.0, 'Commercial', draws=100,
+                                                 seed=3, distributions=fixed)
+    nominal = calculator.get_comprehensive_analysis(50000, 7.0, solar_irradiance=5.0, consumer_type='Commercial',
+                                                    financial_model='cash_flow')
+
+    savings = result['percentiles']['annual_savings']
+    assert savings['P50'] == savings['P99'] == round(nominal['calculations']['annual_savings'], 2)
+    # Lifetime cash flows follow the same performance curve as the deterministic model
+    lifetime = result['percentiles']['lifetime_savings']
+    assert abs(lifetime['P50'] - nominal['calculations']['lifetime_savings']) < 1
+    print("✅ Fixed distributions reproduce the nominal analysis")
+
+
+def test_monte_carlo_rejects_empty_runs():
+    """Zero draws, or samples with nothing left to summarize, raise ValueError"""
+    calculator = SolarCalculator()
+    for draws in (0, -5):
+        try:
+            calculator.get_monte_carlo_analysis(50000, 7.0, 5.0, 'Commercial', draws=draws, seed=3)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError(f"draws={draws} should be rejected")
+
+    samples = MonteCarloAnalyzer(seed=3).simulate(10, 500000, 7.0, 5.0, calculator.get_cash_flow_model(), draws=50)
+    filtered = {metric: values[values < 0] for metric, values in samples.items()}
+    try:
+        MonteCarloAnalyzer.summarize(filtered)
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("empty samples should be rejected")
+    print("✅ Empty Monte Carlo runs raise ValueError")
+
+
+if __name__ == "__main__":
+    print("🌞 Monte Carlo Test")
+    print("=" * 50)
+    test_monte_carlo_percentiles()
+    test_monte_carlo_fixed_inputs()
+    test_monte_carlo_rejects_empty_runs()
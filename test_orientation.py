@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Test the tilt/azimuth orientation optimizer
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+
+# Add the current directory to Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from utils import location_data
+from utils.hourly_simulation import transpose_to_poa
+from utils.location_data import CITY_COORDINATES, LOCATION_DATA
+from utils.orientation import OrientationOptimizer
+
+
+def test_grid_matches_hourly_transposition():
+    """The expanded grid product equals transpose_to_poa summed over the year"""
+    optimizer = OrientationOptimizer()
+    components = optimizer.simulator.get_irradiance_components(28.7041, 77.1025, 4.5)
+    tilts = np.array([0.0, 15.0, 28.0, 45.0])
+    azimuths = np.array([120.0, 180.0, 240.0])
+
+    grid = optimizer.annual_poa(components, tilts, azimuths)
+    reference = transpose_to_poa(components['ghi'], components['dni'], components['dhi'],
+                                 components['zenith'], components['azimuth'],
+                                 tilts[:, None], azimuths[None, :]).sum(axis=-1) / 1000
+    assert np.allclose(grid, reference)
+    print("✅ Orientation grid matches the hourly transposition")
+
+
+def test_optimum_faces_the_equator():
+    """Optimal tilt tracks latitude and faces south (north in the southern hemisphere)"""
+    optimizer = OrientationOptimizer()
+    delhi = optimizer.optimize(28.7041, 77.1025, 4.5)
+    chennai = optimizer.optimize(13.0827, 80.2707, 5.5)
+    southern = optimizer.optimize(-25.0, 133.0, 5.5)
+
+    assert chennai['tilt'] < delhi['tilt'] < 40 and abs(delhi['azimuth'] - 180) <= 10
+    assert delhi['annual_poa'] >= delhi['latitude_tilt_poa'] > delhi['horizontal_poa']
+    assert delhi['gain'] > chennai['gain'] > 0
+    assert min(southern['azimuth'], 360 - southern['azimuth']) <= 10 and southern['tilt'] > 15
+    print(f"✅ Delhi {delhi['tilt']:.0f}°/{delhi['azimuth']:.0f}° (+{delhi['gain']:.1%}), "
+          f"Chennai {chennai['tilt']:.0f}°/{chennai['azimuth']:.0f}°")
+
+
+def test_all_cities_cached_in_location_store():
+    """Every city has coordinates; optima are computed once and cached"""
+    assert set(CITY_COORDINATES) == set(LOCATION_DATA)
+    location_data.ORIENTATION_CACHE.clear()
+    optimizer = OrientationOptimizer()
+
+    start = time.perf_counter()
+    optima = optimizer.optimize_all()
+    elapsed = time.perf_counter() - start
+    assert len(optima) == len(LOCATION_DATA) and all(optima.values())
+    assert location_data.get_optimal_orientation('Jaipur') is optima['Jaipur']
+    assert optimizer.optimize_city('Jaipur') is optima['Jaipur']
+    assert optimizer.optimize_city('Atlantis') is None
+    print(f"✅ {len(optima)} city optima in {elapsed:.2f}s, cached in the location store")
+
+
+if __name__ == "__main__":
+    test_grid_matches_hourly_transposition()
+    test_optimum_faces_the_equator()
+    test_all_cities_cached_in_location_store()
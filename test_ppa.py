@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Test the OPEX/PPA pricing engine and city rate card
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+
+# Add the current directory to Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from utils.calculations import SolarCalculator
+from utils.cash_flow import CashFlowModel
+from utils.location_data import LOCATION_DATA
+from utils.ppa import PPAModel
+
+
+def test_tariff_earns_target_irr():
+    """Selling at the solved tariff gives the developer exactly the target IRR"""
+    cash_flow_model = CashFlowModel()
+    model = PPAModel(cash_flow_model)
+    targets = np.array([0.08, 0.12, 0.16])
+    escalations = np.array([0.0, 0.02, 0.03])
+    result = model.analyze(1000000, 15000, 7.0, target_irr=targets, ppa_escalation=escalations)
+
+    years = np.arange(cash_flow_model.lifetime)
+    flows = model.cash_flow_model.build_cash_flows(1000000, 15000, 0.0)
+    revenue = flows['generation'] * result['ppa_tariff'][:, np.newaxis] * (1 + escalations[:, np.newaxis]) ** years
+    developer = np.concatenate([np.full((3, 1), -1000000.0), revenue - flows['costs']], axis=1)
+    assert np.allclose(cash_flow_model.irr(developer), targets, atol=1e-6)
+    assert result['ppa_tariff'][0] < result['ppa_tariff'][1]
+    print(f"✅ PPA tariffs {np.round(result['ppa_tariff'], 2)} earn {targets}")
+
+
+def test_tariff_at_discount_rate_is_lcoe():
+    """A flat tariff that earns the discount rate is the LCOE"""
+    cash_flow_model = CashFlowModel(discount_rate=0.09)
+    model = PPAModel(cash_flow_model, target_irr=0.09)
+    result = model.analyze(1000000, 15000, 7.0)
+    project = cash_flow_model.analyze(1000000, 15000, 7.0)
+    assert abs(result['ppa_tariff'][0] - result['lcoe'][0]) < 1e-9
+    assert abs(result['lcoe'][0] - project['lcoe'][0]) < 1e-9
+    assert np.allclose(result['savings'][0],
+                       result['grid_rate'][0] * project['cash_flows']['generation'][0]
+                       - result['ppa_rate'][0] * project['cash_flows']['generation'][0])
+    print(f"✅ LCOE ₹{result['lcoe'][0]:.2f}/kWh")
+
+
+def test_rate_card_in_one_pass():
+    """Every city is priced in one vectorized call"""
+    calculator = SolarCalculator()
+    start = time.perf_counter()
+    card = calculator.get_ppa_rate_card(capacity=100, consumer_type='Commercial')
+    elapsed = time.perf_counter() - start
+
+    assert len(card['city']) == len(LOCATION_DATA)
+    assert all(len(values) == len(LOCATION_DATA) for values in card.values())
+    assert np.all(card['ppa_tariff'] > card['developer_lcoe'])
+    sunny = card['solar_irradiance'] > card['solar_irradiance'].mean()
+    assert card['ppa_tariff'][sunny].mean() < card['ppa_tariff'][~sunny].mean()
+
+    delhi = list(card['city']).index('Delhi')
+    single = calculator.get_ppa_rate_card(capacity=100, consumer_type='Commercial', cities=['Delhi'])
+    assert single['ppa_tariff'][0] == card['ppa_tariff'][delhi]
+    print(f"✅ {len(card['city'])} city PPA rates in {elapsed * 1000:.1f} ms")
+
+
+def test_ppa_in_analysis():
+    """OPEX results gain PPA fields; batch and cached paths agree"""
+    calculator = SolarCalculator()
+    priced = calculator.get_comprehensive_analysis(50000, 7.0, "OPEX", 5.5, 'Commercial', ppa={})['calculations']
+    plain = calculator.get_comprehensive_analysis(50000, 7.0, "OPEX", 5.5, 'Commercial')['calculations']
+    capex = calculator.get_comprehensive_analysis(50000, 7.0, "CAPEX", 5.5, 'Commercial', ppa={})['calculations']
+    assert 'ppa_tariff' in priced and 'ppa_tariff' not in plain and 'ppa_tariff' not in capex
+    assert priced['investment'] == 0 and priced['developer_lcoe'] < priced['ppa_tariff']
+    assert priced['ppa_annual_savings'] < priced['annual_savings']
+    assert 0 < priced['ppa_savings_percent'] < 100
+
+    batch = calculator.get_batch_analysis(np.array([50000.0, 50000.0]), 7.0, np.array(["OPEX", "CAPEX"]),
+                                          5.5, 'Commercial', ppa={})
+    for field in ('ppa_tariff', 'developer_lcoe', 'ppa_annual_savings', 'ppa_lifetime_savings',
+                  'ppa_savings_percent'):
+        assert batch[field][0] == priced[field], field
+        assert np.isnan(batch[field][1])
+
+    cached = calculator.get_cached_analysis(50000, 7.0, "OPEX", 5.5, 'Commercial', ppa={})
+    assert cached.has_ppa and cached['calculations']['ppa_tariff'] == priced['ppa_tariff']
+    print(f"✅ PPA ₹{priced['ppa_tariff']}/kWh saves {priced['ppa_savings_percent']}% of the grid bill")
+
+
+if __name__ == "__main__":
+    test_tariff_earns_target_irr()
+    test_tariff_at_discount_rate_is_lcoe()
+    test_rate_card_in_one_pass()
+    test_ppa_in_analysis()
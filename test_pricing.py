@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Test the tiered cost-per-kW price book
+"""
+
+import json
+import os
+import sys
+import tempfile
+
+import numpy as np
+
+# Add the current directory to Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from utils.calculations import SolarCalculator
+from utils.pricing import PriceBook, PriceBookStore
+
+
+def legacy_cost_per_kw(calculator, consumer_type, capacity):
+    """The if/elif ladder the price book replaced"""
+    cost_matrix = calculator.COST_PER_KW.get(consumer_type, calculator.COST_PER_KW['Residential'])
+    if consumer_type == 'Residential':
+        small, medium = 5, 10
+    elif consumer_type == 'Commercial':
+        small, medium = 50, 100
+    else:
+        small, medium = 100, 500
+    if capacity < small:
+        return cost_matrix['small']
+    elif capacity <= medium:
+        return cost_matrix['medium']
+    return cost_matrix['large']
+
+
+def test_default_book_matches_ladder():
+    """Scalar and array lookups match the old ladder, including exact breakpoints"""
+    calculator = SolarCalculator()
+    capacities = [0.5, 1, 4.99, 5, 7.5, 10, 10.01, 49.9, 50, 100, 250, 500, 500.5, 2000]
+    capacities += [np.nextafter(limit, direction) for limit in (5, 10, 50, 100, 500)
+                   for direction in (0, np.inf)]
+    types = ['Residential', 'Commercial', 'Industrial', 'Unknown']
+
+    for consumer_type in types:
+        expected = [legacy_cost_per_kw(calculator, consumer_type, cap) for cap in capacities]
+        scalar = [calculator.get_cost_per_kw(consumer_type, cap) for cap in capacities]
+        vector = calculator.get_cost_per_kw_array(np.array([consumer_type] * len(capacities)),
+                                                  np.array(capacities))
+        assert scalar == expected, consumer_type
+        assert vector.tolist() == expected, consumer_type
+
+    # The book is only rebuilt when a constant changes; editing COST_PER_KW still takes effect
+    book = calculator.get_price_book()
+    assert calculator.get_price_book() is book
+    calculator.COST_PER_KW['Residential']['small'] = 60000
+    assert calculator.get_cost_per_kw('Residential', 3) == 60000
+    calculator.COST_TIER_BREAKPOINTS = dict(calculator.COST_TIER_BREAKPOINTS, Residential=(2, 10))
+    assert calculator.get_cost_per_kw('Residential', 3) == calculator.COST_PER_KW['Residential']['medium']
+    print("✅ Default price book matches the cost ladder")
+
+
+def test_state_and_installer_overrides():
+    """Installer tiers beat state tiers, which beat the default book"""
+    calculator = SolarCalculator()
+    book = PriceBook.from_dict({
+        'default': calculator.get_price_book().to_dict()['default'],
+        'states': {'Gujarat': {'Residential': [{'below': 3, 'price': 60000}, {'price': 55000}]}},
+        'installers': {'SunCo': {'Residential': [{'price': 50000}]}}
+    })
+
+    assert book.price('Residential', 2, state='Gujarat') == 60000
+    assert book.price('Residential', 4, state='Gujarat') == 55000
+    assert book.price('Residential', 4, state='Gujarat', installer='SunCo') == 50000
+    assert book.price('Commercial', 4, state='Gujarat') == 75000
+    assert book.price('Residential', 4, state='Kerala') == 80000
+
+    prices = book.price_array(np.array(['Residential', 'Residential', 'Commercial']),
+                              np.array([2.0, 4.0, 60.0]),
+                              state=np.array(['Gujarat', 'Kerala', 'Gujarat']))
+    assert prices.tolist() == [60000, 80000, 72000]
+    print("✅ State and installer overrides applied")
+
+
+def test_file_hot_reload_and_records():
+    """File books reload on change; database rows build the same book"""
+    calculator = SolarCalculator()
+    data = calculator.get_price_book().to_dict()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'price_book.json')
+        with open(path, 'w') as handle:
+            json.dump(data, handle)
+
+        calculator.load_price_book(path=path, check_interval=0)
+        assert calculator.get_cost_per_kw('Residential', 3) == 80000
+        first = calculator.get_cached_analysis(5000, 6.0, "CAPEX", 4.5, "Residential")
+
+        data['default']['Residential'][1]['price'] = 70000
+        with open(path, 'w') as handle:
+            json.dump(data, handle)
+        os.utime(path, (os.path.getmtime(path) + 10,) * 2)
+
+        assert calculator.get_cost_per_kw('Residential', 8) == 70000
+        # The cache fingerprint includes the price book, so this recomputes
+        second = calculator.get_cached_analysis(5000, 6.0, "CAPEX", 4.5, "Residential")
+        assert second['calculations']['investment'] < first['calculations']['investment']
+
+    records = [
+        {'consumer_type': 'Residential', 'state': None, 'installer': None, 'tier_order': 1,
+         'max_kw': 5, 'max_inclusive': False, 'price_per_kw': 80000},
+        {'consumer_type': 'Residential', 'state': None, 'installer': None, 'tier_order': 2,
+         'max_kw': 10, 'max_inclusive': True, 'price_per_kw': 78000},
+        {'consumer_type': 'Residential', 'state': None, 'installer': None, 'tier_order': 3,
+         'max_kw': None, 'max_inclusive': False, 'price_per_kw': 76000},
+    ]
+    store = PriceBookStore.from_database(lambda: records)
+    assert [store.get().price('Residential', cap) for cap in (4, 10, 11)] == [80000, 78000, 76000]
+    print("✅ Price book hot reload and database rows")
+
+
+if __name__ == "__main__":
+    test_default_book_matches_ladder()
+    test_state_and_installer_overrides()
+    test_file_hot_reload_and_records()
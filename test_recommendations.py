@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Test the declarative recommendation rule engine
+"""
+
+import os
+import sys
+
+import numpy as np
+
+# Add the current directory to Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from utils.calculations import SolarCalculator
+from utils.recommendations import RecommendationEngine
+
+
+def test_rules_reproduce_calculator_recommendations():
+    """Threshold edges fire the same rules as the original if-chain"""
+    calculator = SolarCalculator()
+
+    small = calculator._generate_recommendations(2.99, 150000, 5.0, "Residential", "CAPEX")
+    assert [item['title'] for item in small] == ["Small System Recommendation", "Excellent Investment"]
+    assert small[0]['message'].startswith("A 3.0 kW system is suitable")
+
+    large = calculator._generate_recommendations(10.01, 800000, 8.01, "Residential", "CAPEX")
+    assert [item['title'] for item in large] == ["Large Residential System", "Consider OPEX Model"]
+
+    commercial = calculator._generate_recommendations(10.01, 0, 0, "Commercial", "OPEX")
+    assert [item['type'] for item in commercial] == ["tax_benefits"]
+
+    assert calculator._generate_recommendations(10, 700000, 8, "Residential", "CAPEX") == []
+    print("✅ Rule table reproduces calculator recommendations")
+
+
+def test_batch_masks_match_scalar_path():
+    """Batch masks fire the same rules and render the same text per row"""
+    calculator = SolarCalculator()
+    rng = np.random.default_rng(3)
+    count = 500
+    bills = np.round(rng.uniform(500, 400000, count), 2)
+    tariffs = np.round(rng.uniform(3.0, 10.0, count), 2)
+    models = rng.choice(['CAPEX', 'OPEX'], count)
+    types = rng.choice(['Residential', 'Commercial', 'Industrial'], count)
+
+    batch = calculator.get_batch_recommendations(bills, tariffs, models, 5.0, types)
+    assert batch.masks.shape == (len(calculator.recommendation_engine.rules), count)
+    assert sum(batch.counts().values()) == int(batch.masks.sum())
+
+    for row in range(0, count, 7):
+        expected = calculator.get_comprehensive_analysis(
+            bills[row], tariffs[row], str(models[row]), 5.0, str(types[row])
+        )['recommendations']
+        assert batch.render(row) == expected, row
+    print(f"✅ Batch rule masks match the scalar path ({batch.counts()})")
+
+
+def test_report_audience():
+    """The report sees every rule; analyses skip report-only advice"""
+    analysis = RecommendationEngine()
+    report = RecommendationEngine(audience=None)
+    facts = dict(plant_capacity=12.0, investment=900000, payback_period=4.0,
+                 consumer_type="Commercial", investment_model="CAPEX")
+
+    analysis_titles = [item['title'] for item in analysis.evaluate(**facts)]
+    report_titles = [item['title'] for item in report.evaluate(**facts)]
+    assert analysis_titles == ["Excellent Investment", "Tax Benefits Available"]
+    assert report_titles[:2] == analysis_titles and "Regular Maintenance" in report_titles
+    print("✅ Report and analysis share the rule table")
+
+
+def test_batch_with_scalar_facts():
+    """Scalar facts evaluate as a one-row batch"""
+    engine = RecommendationEngine()
+    facts = dict(plant_capacity=12.0, investment=900000, payback_period=4.0,
+                 consumer_type="Commercial", investment_model="CAPEX")
+    batch = engine.evaluate_batch(**facts)
+    assert len(batch) == 1
+    assert batch.render(0) == engine.evaluate(**facts)
+    print("✅ Scalar facts give a one-row batch")
+
+
+if __name__ == "__main__":
+    test_rules_reproduce_calculator_recommendations()
+    test_batch_masks_match_scalar_path()
+    test_report_audience()
+    test_batch_with_scalar_facts()
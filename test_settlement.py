@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Test net-metering / net-billing settlement
+"""
+
+import os
+import sys
+
+import numpy as np
+
+# Add the current directory to Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from utils.calculations import SolarCalculator
+from utils.hourly_simulation import MONTH_INDEX
+from utils.load_profiles import generate_load_profile
+from utils.settlement import SettlementModel
+
+
+def _month_profile(kwh_by_month):
+    """Hourly array putting each month's kWh in its first hour"""
+    hourly = np.zeros(8760)
+    first_hours = np.searchsorted(MONTH_INDEX, np.arange(12))
+    hourly[first_hours] = kwh_by_month
+    return hourly
+
+
+def test_net_billing_and_curtailment():
+    """Exports are paid at the export rate after sanctioned-load and export caps"""
+    generation = np.zeros(8760)
+    generation[:3] = [5.0, 3.0, 1.0]
+    load = np.zeros(8760)
+    load[:3] = [1.0, 1.0, 2.0]
+
+    result = SettlementModel('net_billing', export_rate=3.0, export_limit=1.5,
+                             sanctioned_load=4.0).settle(generation, load, 8.0)
+    # Hour 0: 5 kWh capped to 4 (1 curtailed); 1 used, 3 surplus, 1.5 exported (1.5 curtailed)
+    # Hour 1: 1 used, 2 surplus, 1.5 exported (0.5 curtailed); Hour 2: 1 used, 1 imported
+    assert np.isclose(result['self_consumed'][0], 3.0)
+    assert np.isclose(result['exported'][0], 3.0)
+    assert np.isclose(result['curtailed'][0], 3.0)
+    assert np.isclose(result['imported'][0], 1.0)
+    assert np.isclose(result['annual_savings'][0], 3.0 * 8.0 + 3.0 * 3.0)
+    print("✅ Net billing with export and sanctioned-load curtailment")
+
+
+def test_net_metering_banking():
+    """Surplus months are banked first-in first-out and lapse after the banking period"""
+    exports = _month_profile([100, 50, 0, 0, 0, 0, 0, 0, 0, 0, 0, 30])
+    imports = _month_profile([0, 0, 0, 0, 120, 0, 0, 0, 0, 0, 0, 0])
+    generation = exports
+    load = imports
+
+    model = SettlementModel('net_metering', banking_months=3, year_end_rate=2.0)
+    result = model.settle(generation, load, 8.0)
+    # January's 100 lapses before May's draw; February's 50 is drawn in May; December's 30 is paid out
+    assert np.isclose(result['lapsed'][0], 100)
+    assert np.isclose(result['offset'][0], 50)
+    assert np.isclose(result['banked'][0], 30)
+
+    model = SettlementModel('net_metering', banking_months=12, year_end_rate=2.0)
+    result = model.settle(generation, load, 8.0)
+    assert np.isclose(result['offset'][0], 120) and np.isclose(result['lapsed'][0], 0)
+    assert np.isclose(result['banked'][0], 60)
+    assert np.isclose(result['annual_savings'][0], 120 * 8.0 + 60 * 2.0)
+    print("✅ Net-metering bank draws oldest surplus first and lapses on time")
+
+
+def test_portfolio_batch_matches_single_customers():
+    """A portfolio settles in one call, customer by customer identical"""
+    calculator = SolarCalculator()
+    rng = np.random.default_rng(5)
+    consumption = rng.uniform(200, 3000, 40)
+    capacity = consumption / rng.uniform(80, 160, 40)
+    unit_generation = calculator.calculate_hourly_generation(1.0, 19.08, 72.88, 5.2)
+    generation = capacity[:, None] * unit_generation
+    load = generate_load_profile(consumption, "Commercial")
+    tariffs = rng.uniform(6, 11, 40)
+    limits = capacity * 0.5
+
+    for mode in ('net_metering', 'net_billing'):
+        batch = calculator.calculate_settlement(generation, load, tariffs, mode, export_limit=limits)
+        for i in range(0, 40, 9):
+            single = calculator.calculate_settlement(generation[i], load[i], tariffs[i], mode,
+                                                     export_limit=limits[i])
+            for key, values in batch.items():
+                assert np.isclose(values[i], single[key][0]), (mode, key, i)
+
+    retail = calculator.calculate_settlement(generation, load, tariffs, 'retail')
+    billing = calculator.calculate_settlement(generation, load, tariffs, 'net_billing')
+    assert np.allclose(retail['annual_savings'], generation.sum(axis=1) * tariffs)
+    assert np.all(billing['annual_savings'] < retail['annual_savings'])
+    print("✅ Portfolio settlement matches single-customer runs")
+
+
+def test_analysis_settlement_mode():
+    """Hourly analyses can value exports at the export rate instead of retail"""
+    calculator = SolarCalculator()
+    solar_data = {'latitude': 19.08, 'longitude': 72.88}
+    retail = calculator.get_comprehensive_analysis(50000, 8.0, "CAPEX", 5.2, "Commercial",
+                                                   generation_mode="hourly", solar_data=solar_data)
+    settled = calculator.get_comprehensive_analysis(50000, 8.0, "CAPEX", 5.2, "Commercial",
+                                                    generation_mode="hourly", solar_data=solar_data,
+                                                    settlement_mode="net_billing")
+    assert settled['calculations']['annual_savings'] < retail['calculations']['annual_savings']
+    assert settled['calculations']['payback_period'] > retail['calculations']['payback_period']
+
+    cached = calculator.get_cached_analysis(50000, 8.0, "CAPEX", 5.2, "Commercial", generation_mode="hourly",
+                                            solar_data=solar_data, settlement_mode="net_billing")
+    calculator.SETTLEMENT_ASSUMPTIONS['export_rate'] = 0.0
+    recomputed = calculator.get_cached_analysis(50000, 8.0, "CAPEX", 5.2, "Commercial", generation_mode="hourly",
+                                                solar_data=solar_data, settlement_mode="net_billing")
+    assert recomputed['calculations']['annual_savings'] < cached['calculations']['annual_savings']
+    print("✅ Settlement mode feeds the hourly analysis and the cache")
+
+
+def test_form_path_applies_settlement_mode():
+    """/calculate always sends a consumer_category; SETTLEMENT_MODE still credits exports"""
+    calculator = SolarCalculator()
+    solar_data = {'latitude': 19.08, 'longitude': 72.88}
+    # The get_cached_analysis options /calculate passes for an LT-3 form
+    form_options = dict(generation_mode="hourly", solar_data=solar_data, financial_model="simple",
+                        state="Maharashtra", consumer_category="LT-3", shadow_free=True, rooftop_area=None,
+                        ppa=None)
+    billed = calculator.get_cached_analysis(50000, 8.0, "CAPEX", 5.2, "Commercial", settlement_mode=None,
+                                            **form_options)
+    net_billing = calculator.get_cached_analysis(50000, 8.0, "CAPEX", 5.2, "Commercial",
+                                                 settlement_mode="net_billing", **form_options)
+    net_metering = calculator.get_cached_analysis(50000, 8.0, "CAPEX", 5.2, "Commercial",
+                                                  settlement_mode="net_metering", **form_options)
+    assert billed['calculations']['annual_savings'] < net_billing['calculations']['annual_savings']
+    assert net_billing['calculations']['annual_savings'] != net_metering['calculations']['annual_savings']
+
+    generation = calculator.calculate_hourly_generation(20, 19.08, 72.88, 5.2)
+    load = generate_load_profile(3000, consumer_category="LT-3")
+    plain = calculator.calculate_bill_savings(generation, 3000, "LT-3", load)
+    settled = calculator.calculate_bill_savings(generation, 3000, "LT-3", load, settlement_mode="net_billing")
+    exported = calculator.calculate_settlement(generation, load, 8.0, "net_billing")['exported'][0]
+    assert exported > 0 and settled['annual_pre'] == plain['annual_pre']
+    assert abs(settled['annual_savings'] - plain['annual_savings']
+               - exported * calculator.SETTLEMENT_ASSUMPTIONS['export_rate']) < 1e-6 * plain['annual_pre']
+    print(f"✅ Form path credits exports: ₹{billed['calculations']['annual_savings']:,.0f} -> "
+          f"₹{net_billing['calculations']['annual_savings']:,.0f} (net billing)")
+
+
+if __name__ == "__main__":
+    test_net_billing_and_curtailment()
+    test_net_metering_banking()
+    test_portfolio_batch_matches_single_customers()
+    test_analysis_settlement_mode()
+    test_form_path_applies_settlement_mode()
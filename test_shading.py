@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Test the horizon shading model
+"""
+
+import os
+import sys
+
+import numpy as np
+
+# Add the current directory to Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from utils.calculations import SolarCalculator
+from utils.hourly_simulation import MONTH_INDEX
+from utils.shading import ShadingModel, latitude_band, sun_path
+
+
+def test_open_horizon_has_no_loss():
+    """A flat horizon blocks nothing"""
+    model = ShadingModel([0] * 12)
+    assert model.diffuse_loss == 0
+    assert not model.beam_loss(28.7).any()
+    assert model.annual_loss(28.7, 77.1, 4.5) == 0
+    print("✅ Open horizon has no shading loss")
+
+
+def test_southern_wall_shades_winter():
+    """A wall to the south shades the low winter sun, not the summer sun"""
+    horizon = np.zeros(12)
+    horizon[5:7] = 40  # 150°-210°
+    loss = ShadingModel(horizon).beam_loss(28.7)
+    monthly = np.bincount(MONTH_INDEX, weights=loss)
+    assert monthly[11] > 0 and monthly[0] > 0
+    assert monthly[5] == 0
+    assert np.all((loss >= 0) & (loss <= 1))
+    print(f"✅ Southern wall shades {monthly[11]:.0f} December hours, none in June")
+
+
+def test_sun_path_cached_per_band():
+    """Nearby latitudes share one read-only sun path"""
+    assert latitude_band(28.61) == latitude_band(28.7041) == 29.0
+    elevation, azimuth = sun_path(latitude_band(28.61))
+    assert sun_path(latitude_band(28.7041))[0] is elevation
+    assert not elevation.flags.writeable and elevation.shape == azimuth.shape == (8760, 4)
+    print("✅ Sun path is built once per latitude band")
+
+
+def test_shading_reduces_generation():
+    """Hourly and flat analyses both lose generation when the site is shaded"""
+    calculator = SolarCalculator()
+    shading = ShadingModel()
+    open_sky = calculator.calculate_hourly_generation(10, 28.7, 77.1, 4.5)
+    shaded = calculator.calculate_hourly_generation(10, 28.7, 77.1, 4.5,
+                                                    beam_loss=shading.beam_loss(28.7),
+                                                    diffuse_loss=shading.diffuse_loss)
+    assert np.all(shaded <= open_sky + 1e-9) and shaded.sum() < open_sky.sum()
+
+    default = calculator.get_comprehensive_analysis(10000, 7.5, "CAPEX", 4.5, "Residential")
+    shadow_free = calculator.get_comprehensive_analysis(10000, 7.5, "CAPEX", 4.5, "Residential",
+                                                        shadow_free=True)
+    obstructed = calculator.get_comprehensive_analysis(10000, 7.5, "CAPEX", 4.5, "Residential",
+                                                       shadow_free=False)
+    assert shadow_free['calculations'] == default['calculations']
+    assert (obstructed['calculations']['monthly_generation']
+            < default['calculations']['monthly_generation'])
+    assert obstructed['calculations']['annual_savings'] < default['calculations']['annual_savings']
+
+    solar_data = {'latitude': 28.7, 'longitude': 77.1}
+    hourly = calculator.get_comprehensive_analysis(10000, 7.5, "CAPEX", 4.5, "Residential",
+                                                   generation_mode="hourly", solar_data=solar_data)
+    walled = calculator.get_comprehensive_analysis(10000, 7.5, "CAPEX", 4.5, "Residential",
+                                                   generation_mode="hourly", solar_data=solar_data,
+                                                   horizon_profile=[30] * 12)
+    assert walled['calculations']['monthly_generation'] < hourly['calculations']['monthly_generation']
+    print(f"✅ Shading loss {1 - shaded.sum() / open_sky.sum():.1%} on the default obstruction profile")
+
+
+if __name__ == "__main__":
+    test_open_horizon_has_no_loss()
+    test_southern_wall_shades_winter()
+    test_sun_path_cached_per_band()
+    test_shading_reduces_generation()
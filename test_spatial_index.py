@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Test the nearest-location spatial index and coordinate interpolation
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+
+# Add the current directory to Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from utils.location_data import CITY_COORDINATES, LOCATION_DATA, get_location_info_at
+from utils.spatial_index import EARTH_RADIUS_KM, LocationIndex, get_location_index
+
+
+def haversine(lat1, lon1, lat2, lon2):
+    """Reference great-circle distance in km"""
+    lat1, lon1, lat2, lon2 = map(np.radians, (lat1, lon1, lat2, lon2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(a))
+
+
+def test_nearest_matches_brute_force():
+    """Nearest cities and distances equal a haversine scan of every city"""
+    index = get_location_index()
+    assert len(index) == len(LOCATION_DATA)
+    rng = np.random.default_rng(3)
+    for latitude, longitude in zip(rng.uniform(8, 34, 200), rng.uniform(69, 95, 200)):
+        found = index.nearest(latitude, longitude, 4)
+        distance = haversine(latitude, longitude, index.latitude, index.longitude)
+        expected = np.argsort(distance)[:4]
+        assert np.array_equal(found['index'], expected)
+        assert np.allclose(found['distance_km'], distance[expected], atol=1e-6)
+    print("✅ Nearest cities match a brute-force scan")
+
+
+def test_grid_search_equals_bulk_scan():
+    """The grid walk and the bulk scan agree on a large index, inside and outside the grid"""
+    rng = np.random.default_rng(7)
+    names = [f"Site {number}" for number in range(20000)]
+    latitude, longitude = rng.uniform(8, 35, len(names)), rng.uniform(68, 97, len(names))
+    index = LocationIndex({name: {'state': 'Test', 'irradiance': 5.0, 'tariff': 6.0} for name in names},
+                          {name: {'lat': lat, 'lon': lon} for name, lat, lon in zip(names, latitude, longitude)},
+                          cell_size=0.25, scan_limit=0)
+
+    query_lat, query_lon = rng.uniform(0, 45, 500), rng.uniform(60, 105, 500)
+    start = time.perf_counter()
+    found = [index.nearest(lat, lon, 6)['index'] for lat, lon in zip(query_lat.tolist(), query_lon.tolist())]
+    elapsed = time.perf_counter() - start
+    bulk = index.nearest_many(query_lat, query_lon, 6)
+    assert all(np.array_equal(row, expected) for row, expected in zip(found, bulk['index']))
+    print(f"✅ Grid search over {len(index)} sites in {elapsed / len(found) * 1e6:.0f} µs per query")
+
+
+def test_interpolation():
+    """A query on a city returns its values; between cities values are weighted"""
+    delhi = CITY_COORDINATES['Delhi']
+    info = get_location_info_at(delhi['lat'], delhi['lon'])
+    assert info['nearest_city'] == 'Delhi' and info['state'] == 'Delhi'
+    assert abs(info['irradiance'] - LOCATION_DATA['Delhi']['irradiance']) < 1e-6
+    assert abs(info['tariff'] - LOCATION_DATA['Delhi']['tariff']) < 1e-6
+
+    between = get_location_info_at(20.0, 78.0, n=3)
+    neighbours = [LOCATION_DATA[item['city']] for item in between['neighbours']]
+    assert min(item['irradiance'] for item in neighbours) <= between['irradiance'] \
+        <= max(item['irradiance'] for item in neighbours)
+    assert len(between['neighbours']) == 3
+    print(f"✅ (20, 78) interpolates to {between['irradiance']:.2f} kWh/m²/day near {between['nearest_city']}")
+
+
+def test_bulk_lead_list():
+    """A geocoded lead list is resolved in one call, matching single queries"""
+    index = get_location_index()
+    rng = np.random.default_rng(11)
+    latitude, longitude = rng.uniform(8, 34, 100000), rng.uniform(69, 95, 100000)
+
+    start = time.perf_counter()
+    leads = index.interpolate_many(latitude, longitude)
+    elapsed = time.perf_counter() - start
+
+    assert leads['irradiance'].shape == (100000,)
+    for row in range(0, 100000, 9973):
+        single = index.interpolate(latitude[row], longitude[row])
+        assert single['nearest_city'] == leads['nearest_city'][row]
+        assert abs(single['irradiance'] - leads['irradiance'][row]) < 1e-9
+        assert abs(single['tariff'] - leads['tariff'][row]) < 1e-9
+    print(f"✅ {len(latitude)} leads in {elapsed * 1000:.0f} ms")
+
+
+if __name__ == "__main__":
+    test_nearest_matches_brute_force()
+    test_grid_search_equals_bulk_scan()
+    test_interpolation()
+    test_bulk_lead_list()
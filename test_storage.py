@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Test the battery storage dispatch simulator
+"""
+
+import os
+import sys
+
+import numpy as np
+
+# Add the current directory to Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from utils.billing import flat_load_profile
+from utils.calculations import SolarCalculator
+from utils.storage import StorageSimulator, default_outage_hours
+
+
+def _profiles():
+    calculator = SolarCalculator()
+    generation = calculator.calculate_hourly_generation(3.0, 28.61, 77.21, 4.5)
+    hour = np.arange(8760) % 24
+    load = 1 + 0.8 * np.exp(-((hour - 20) / 2.0) ** 2)
+    return calculator, generation, load * 4800 / load.sum()
+
+
+def test_energy_balance_and_limits():
+    """Energy is conserved and the battery stays inside its limits"""
+    _, generation, load = _profiles()
+    simulator = StorageSimulator(round_trip_efficiency=0.81, depth_of_discharge=0.8, c_rate=0.5)
+    sizes = np.array([0, 2, 5, 10, 20])
+    result = simulator.simulate(generation, load, sizes, hourly=True)
+
+    # Baseline: no battery means plain net metering of the hourly surplus
+    assert np.isclose(result['grid_import'][0], np.maximum(load - generation, 0).sum())
+    assert np.isclose(result['grid_export'][0], np.maximum(generation - load, 0).sum())
+
+    # Supply = demand + exports + battery losses (+ any energy left stored)
+    stored = result['charged'] * 0.9 - result['discharged'] / 0.9
+    assert np.all(stored >= -1e-9) and np.all(stored <= sizes * 0.8 + 1e-9)
+    supply = generation.sum() + result['grid_import']
+    demand = load.sum() + result['grid_export'] + result['charged'] - result['discharged']
+    assert np.allclose(supply, demand)
+
+    assert np.all(np.diff(result['grid_import']) <= 1e-9)
+    assert np.all(np.diff(result['self_consumption']) >= -1e-9)
+    assert np.all(result['hourly_import'].max(axis=1) <= load.max() + 1e-9)
+    print(f"✅ Energy balance holds (self-consumption {np.round(result['self_consumption'], 2)})")
+
+
+def test_batched_sizes_match_single_runs():
+    """Sweeping sizes together equals simulating each size alone"""
+    _, generation, load = _profiles()
+    simulator = StorageSimulator(backup_reserve=0.3)
+    prices = np.r_[np.full(6, 6.4), np.full(12, 7.5), np.full(4, 9.0), np.full(2, 6.4)]
+    outages = default_outage_hours()
+    sizes = [0, 3, 7.5, 15]
+
+    batch = simulator.simulate(generation, load, sizes, prices=prices, outages=outages)
+    for index, size in enumerate(sizes):
+        single = simulator.simulate(generation, load, [size], prices=prices, outages=outages)
+        for key in ('grid_import', 'grid_export', 'discharged', 'grid_charged', 'unserved'):
+            assert np.isclose(batch[key][index], single[key][0]), (size, key)
+    assert batch['unserved'][0] > batch['unserved'][-1] == 0
+    print("✅ Batched sweep matches single-size runs")
+
+
+def test_storage_sizing_curve():
+    """Sizing curve bills every size; arbitrage pays on a time-of-use tariff"""
+    calculator, generation, load = _profiles()
+    flat = calculator.get_storage_sizing(generation, 400, 6.5, load_profile=flat_load_profile(400))
+    assert flat['annual_savings'][0] == 0 and np.all(flat['annual_savings'][1:] > 0)
+    assert np.allclose(flat['annual_bill'], flat['grid_import'] * 6.5)
+
+    plain = calculator.get_storage_sizing(generation * 0.5, 400, 6.5, 'HT-1', load_profile=load)
+    arbitrage = calculator.get_storage_sizing(generation * 0.5, 400, 6.5, 'HT-1', load_profile=load,
+                                              arbitrage=True)
+    assert np.all(arbitrage['grid_charged'][1:] > 0)
+    assert np.all(arbitrage['annual_savings'][1:] > plain['annual_savings'][1:])
+    assert np.all(arbitrage['payback_period'] > 0)
+    print(f"✅ Sizing curve savings {np.round(arbitrage['annual_savings'][:5])}")
+
+
+def test_sizing_savings_against_smallest_size():
+    """Savings are measured against the smallest size, whatever the order"""
+    calculator, generation, load = _profiles()
+    ascending = calculator.get_storage_sizing(generation, 400, 6.5, sizes=[0, 5, 10], load_profile=load)
+    shuffled = calculator.get_storage_sizing(generation, 400, 6.5, sizes=[10, 0, 5], load_profile=load)
+    assert shuffled['annual_savings'][1] == 0
+    assert np.allclose(shuffled['annual_savings'][[1, 2, 0]], ascending['annual_savings'])
+    print(f"✅ Shuffled sizes save {np.round(shuffled['annual_savings'])}")
+
+
+if __name__ == "__main__":
+    test_energy_balance_and_limits()
+    test_batched_sizes_match_single_runs()
+    test_storage_sizing_curve()
+    test_sizing_savings_against_smallest_size()
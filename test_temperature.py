@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Test the cell-temperature derating model
+"""
+
+import os
+import sys
+
+import numpy as np
+
+# Add the current directory to Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from backend.solar_data_fetcher import SolarDataFetcher
+from utils import location_data
+from utils.calculations import SolarCalculator
+from utils.hourly_simulation import MONTH_INDEX
+from utils.location_data import get_location_info
+from utils.temperature import TemperatureModel, hourly_weather
+
+
+def test_cell_temperature_models():
+    """Faiman and NOCT give the textbook cell temperatures"""
+    faiman = TemperatureModel()
+    noct = TemperatureModel('noct', noct=45.0)
+    poa = np.array([0.0, 800.0, 1000.0])
+
+    assert np.allclose(faiman.cell_temperature(poa, 30.0, 1.0), 30 + poa / 31.84)
+    assert np.allclose(noct.cell_temperature(poa, 20.0), [20.0, 45.0, 51.25])
+    assert np.isclose(faiman.derate(np.array([0.0]), 25.0)[0], 1.0)
+    # More wind cools the module
+    assert faiman.derate(poa, 35.0, 6.0)[2] > faiman.derate(poa, 35.0, 1.0)[2]
+
+    grid = faiman.derate(np.full((3, 8760), 900.0), hourly_weather('Hot-Dry')['temperature'])
+    assert grid.shape == (3, 8760)
+    print("✅ Faiman and NOCT cell temperatures")
+
+
+def test_hourly_weather_follows_climate():
+    """Summer afternoons are hottest; weather is cached per city in the location store"""
+    weather = hourly_weather('Composite')
+    daily = weather['temperature'].reshape(365, 24)
+    assert daily.mean(axis=0).argmax() in (14, 15)
+    monthly = np.bincount(MONTH_INDEX, weights=weather['temperature']) / np.bincount(MONTH_INDEX)
+    assert monthly.argmax() in (4, 5) and monthly.argmin() in (0, 11)
+    assert not weather['temperature'].flags.writeable
+
+    location_data.WEATHER_CACHE.clear()
+    fetcher = SolarDataFetcher()
+    solar_data = fetcher.get_enhanced_solar_data('Jaipur', get_location_info('Jaipur'))
+    assert location_data.get_hourly_weather('Jaipur') is fetcher.get_hourly_weather('Jaipur')
+    assert solar_data['city'] == 'Jaipur' and solar_data['mean_ambient_temperature'] > 25
+    print("✅ Hourly weather follows the climate zone and is cached per city")
+
+
+def test_temperature_derate_feeds_hourly_engine():
+    """Hot sites lose more than cool ones; the static factor is left to PR"""
+    calculator = SolarCalculator()
+    base = calculator.calculate_hourly_generation(10, 26.9, 75.8, 6.0)
+    hot = calculator.calculate_hourly_generation(10, 26.9, 75.8, 6.0,
+                                                 ambient_temperature=hourly_weather('Hot-Dry')['temperature'],
+                                                 wind_speed=hourly_weather('Hot-Dry')['wind_speed'])
+    cool = calculator.calculate_hourly_generation(10, 26.9, 75.8, 6.0,
+                                                  ambient_temperature=hourly_weather('Temperate')['temperature'],
+                                                  wind_speed=hourly_weather('Temperate')['wind_speed'])
+    assert hot.sum() < cool.sum()
+    # PERFORMANCE_RATIO already includes a hot site's temperature loss
+    assert 0.97 < hot.sum() / base.sum() < 1.03 < cool.sum() / base.sum()
+
+    # The static temperature_factor is part of PERFORMANCE_RATIO, not applied again
+    factors = {'temperature_factor': 0.5}
+    static = calculator.calculate_hourly_generation(10, 26.9, 75.8, 6.0, weather_factors=factors)
+    derated = calculator.calculate_hourly_generation(10, 26.9, 75.8, 6.0, weather_factors=factors,
+                                                     ambient_temperature=hourly_weather('Hot-Dry')['temperature'])
+    assert np.isclose(static.sum(), base.sum()) and derated.sum() < static.sum()
+
+    solar_data = SolarDataFetcher().get_enhanced_solar_data('Jaipur', get_location_info('Jaipur'))
+    analysis = calculator.get_cached_analysis(10000, 5.2, solar_irradiance=6.0,
+                                              generation_mode="hourly", solar_data=solar_data)
+    calculator.TEMPERATURE_ASSUMPTIONS['temperature_coefficient'] = -0.005
+    hotter = calculator.get_cached_analysis(10000, 5.2, solar_irradiance=6.0,
+                                            generation_mode="hourly", solar_data=solar_data)
+    assert hotter['calculations']['monthly_generation'] < analysis['calculations']['monthly_generation']
+    print(f"✅ Hot-dry derate {1 - hot.sum() / base.sum():.1%}, temperate {1 - cool.sum() / base.sum():.1%}")
+
+
+def test_derated_yield_matches_flat_formula():
+    """With the derate, hot-site hourly yield stays within a few percent of capacity x irradiance x PR x 365"""
+    calculator = SolarCalculator()
+    for latitude, longitude, irradiance, zone in ((26.9, 75.8, 6.0, 'Hot-Dry'), (13.1, 80.3, 5.5, 'Hot-Humid'),
+                                                  (28.6, 77.2, 5.2, 'Composite')):
+        weather = hourly_weather(zone)
+        hourly = calculator.calculate_hourly_generation(10, latitude, longitude, irradiance, tilt=0,
+                                                        ambient_temperature=weather['temperature'],
+                                                        wind_speed=weather['wind_speed'])
+        flat = calculator.calculate_monthly_generation_precise(10, irradiance) * 12
+        assert abs(hourly.sum() / flat - 1) < 0.03, (zone, hourly.sum() / flat)
+    print("✅ Derated hourly yield matches the flat formula")
+
+
+if __name__ == "__main__":
+    test_cell_temperature_models()
+    test_hourly_weather_follows_climate()
+    test_temperature_derate_feeds_hourly_engine()
+    test_derated_yield_matches_flat_formula()
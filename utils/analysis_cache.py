@@ -0,0 +1,223 @@
+"""
+Bounded LRU/TTL cache for comprehensive solar analyses
+"""
+import copy
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Any, Optional
+
+from utils.analysis_result import AnalysisResult
+
+
+_ATOMIC_TYPES = frozenset({str, int, bool, type(None)})
+
+
+def _freeze(value):
+    """Hashable, order-independent form of nested dicts/lists"""
+    kind = type(value)
+    if kind in _ATOMIC_TYPES:
+        return value
+    if kind is float:
+        return round(value, 6)
+    if isinstance(value, dict):
+        return tuple(sorted([(key, _freeze(item)) for key, item in value.items()]))
+    if isinstance(value, (list, tuple)):
+        return tuple([_freeze(item) for item in value])
+    if isinstance(value, float):
+        return round(value, 6)
+    return value
+
+
+# solar_data fields get_comprehensive_analysis reads in hourly mode (the
+# rest of the SolarDataFetcher payload never changes a result)
+SOLAR_DATA_FIELDS = ('latitude', 'longitude', 'optimal_tilt', 'optimal_azimuth', 'seasonal_variation',
+                     'weather_factors', 'city', 'climate_zone')
+
+
+def _solar_data_fields(options: Dict[str, Any]) -> tuple:
+    """The SOLAR_DATA_FIELDS get_comprehensive_analysis reads with these options"""
+    if options.get('generation_mode') == "hourly":
+        return SOLAR_DATA_FIELDS
+    fields = ()
+    if options.get('rooftop_area') or options.get('roof_polygon'):
+        fields += ('optimal_tilt', 'latitude')
+    if options.get('horizon_profile') is not None or options.get('shadow_free') is False:
+        fields += ('latitude', 'longitude', 'seasonal_variation')
+    return fields
+
+
+def calculator_fingerprint(calculator) -> tuple:
+    """
+    The calculator inputs that change analysis results
+
+    Constants dicts are returned live (not copied): caches keep a deep
+    copy and compare it on every lookup, so in-place edits are seen as
+    well as reassignments. Objects are represented by their fingerprint
+    (equipment catalogs, emission tables and recommendation rules are
+    read-only once built). The JSON form identifies the inputs a saved
+    answer table was built with.
+    """
+    store = calculator.price_book_store
+    catalog = calculator.equipment_catalog
+    return (
+        calculator.PERFORMANCE_RATIO,
+        calculator.emission_factors.fingerprint,
+        calculator.COMMISSIONING_YEAR,
+        calculator.SYSTEM_LIFETIME,
+        calculator.AREA_PER_KW,
+        calculator.COST_PER_KW,
+        calculator.COST_TIER_BREAKPOINTS,
+        calculator.CASH_FLOW_ASSUMPTIONS,
+        calculator.LIFETIME_ASSUMPTIONS,
+        calculator.FINANCING_ASSUMPTIONS,
+        calculator.PPA_ASSUMPTIONS,
+        calculator.SETTLEMENT_ASSUMPTIONS,
+        calculator.TEMPERATURE_ASSUMPTIONS,
+        store.get().fingerprint if store is not None else None,
+        catalog.fingerprint if catalog is not None else None,
+        calculator.recommendation_engine.fingerprint,
+        calculator.rooftop_layout.fingerprint,
+        calculator.tariff_book.fingerprint
+    )
+
+
+class AnalysisCache:
+    """Memoizes get_comprehensive_analysis on canonical, quantized inputs"""
+
+    def __init__(self, maxsize: int = 1024, ttl: Optional[float] = 3600):
+        """
+        Initialize cache
+
+        Args:
+            maxsize: Maximum number of cached analyses (least recently used
+                entries are evicted first)
+            ttl: Seconds an entry stays valid (None = no expiry)
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._calculator = None
+        self._constants_version = None
+        self._fingerprint = None
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def make_key(monthly_bill: float, tariff_rate: float, investment_model: str = "CAPEX",
+                 solar_irradiance: float = None, consumer_type: str = "Residential",
+                 **options) -> tuple:
+        """
+        Canonical cache key
+
+        Bills are quantized to paise and rates/irradiance to 4 decimals, so
+        5000, 5000.0 and 5000.001 share one entry; a missing irradiance maps
+        to the 4.5 default exactly like the calculator does. Only the
+        solar_data fields the analysis reads with the given options (none
+        in plain flat mode) are part of the key.
+        """
+        irradiance = solar_irradiance if solar_irradiance else 4.5
+        solar_data = options.get('solar_data')
+        if solar_data:
+            options = dict(options, solar_data={name: solar_data[name] for name in _solar_data_fields(options)
+                                                if name in solar_data})
+        return (
+            round(float(monthly_bill), 2),
+            round(float(tariff_rate), 4),
+            round(float(irradiance), 4),
+            str(investment_model).strip(),
+            str(consumer_type).strip(),
+            _freeze(options) if options else ()
+        )
+
+    def get_or_compute(self, calculator, monthly_bill: float, tariff_rate: float,
+                       investment_model: str = "CAPEX", solar_irradiance: float = None,
+                       consumer_type: str = "Residential", **options) -> AnalysisResult:
+        """
+        Return a cached analysis or compute and store it
+
+        Args:
+            calculator: SolarCalculator used on a miss
+            monthly_bill, tariff_rate, investment_model, solar_irradiance,
+            consumer_type, **options: get_comprehensive_analysis arguments
+
+        Returns:
+            Immutable AnalysisResult (read-only mapping in the
+            get_comprehensive_analysis layout); the same object is shared
+            between callers, not copied
+        """
+        key = self.make_key(monthly_bill, tariff_rate, investment_model,
+                            solar_irradiance, consumer_type, **options)
+        # Entries are dropped when the constants differ from the snapshot
+        # they were computed with (or invalidate() was called)
+        version = calculator.constants_version
+        fingerprint = calculator_fingerprint(calculator)
+        now = time.monotonic()
+
+        with self._lock:
+            if (calculator is not self._calculator or version != self._constants_version
+                    or fingerprint != self._fingerprint):
+                if self._entries:
+                    self.invalidations += 1
+                self._entries.clear()
+                self._calculator = calculator
+                self._constants_version = version
+                self._fingerprint = copy.deepcopy(fingerprint)
+            snapshot = self._fingerprint
+
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, result = entry
+                if expires_at is None or expires_at > now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return result
+                del self._entries[key]
+                self.expirations += 1
+            self.misses += 1
+
+        result = AnalysisResult.from_dict(calculator.get_comprehensive_analysis(
+            monthly_bill=key[0], tariff_rate=key[1], investment_model=key[3],
+            solar_irradiance=key[2], consumer_type=key[4], **options
+        ))
+        current = calculator_fingerprint(calculator)
+
+        with self._lock:
+            # Constants may have changed (and the cache been reset) while
+            # computing; a result from other constants is not stored
+            if (snapshot is not self._fingerprint or version != calculator.constants_version
+                    or current != snapshot):
+                return result
+            expires_at = now + self.ttl if self.ttl is not None else None
+            self._entries[key] = (expires_at, result)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+        return result
+
+    def clear(self):
+        """Drop every cached entry"""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss/eviction counters"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'invalidations': self.invalidations,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0
+            }
@@ -0,0 +1,258 @@
+"""
+Compact, immutable result types for solar analyses
+"""
+from itertools import chain
+from types import MappingProxyType
+from typing import Dict, Any, Iterable, Mapping, Optional
+
+import numpy as np
+
+INPUT_FIELDS = ('monthly_bill', 'tariff_rate', 'investment_model', 'consumer_type',
+                'solar_irradiance', 'generation_mode')
+
+CALCULATION_FIELDS = ('monthly_consumption', 'plant_capacity', 'monthly_generation', 'yearly_generation',
+                      'monthly_savings', 'annual_savings', 'lifetime_savings', 'investment', 'payback_period',
+                      'annual_co2_saved', 'lifetime_co2_saved', 'equivalent_trees', 'equivalent_trees_lifetime',
+                      'panel_count', 'inverter_capacity', 'area_required')
+
+# Only present when the cash-flow financial model was used
+CASH_FLOW_FIELDS = ('npv', 'irr', 'discounted_payback', 'lcoe')
+
+# Only present when a CAPEX purchase was financed (cash_on_cash is a per-year
+# tuple and is left out of RESULT_DTYPE)
+FINANCING_FIELDS = ('loan_amount', 'emi', 'equity_irr', 'equity_payback', 'cash_on_cash')
+
+# Only present when an OPEX result was priced as a PPA
+PPA_FIELDS = ('ppa_tariff', 'developer_lcoe', 'ppa_annual_savings', 'ppa_lifetime_savings', 'ppa_savings_percent')
+
+# Decimal places get_comprehensive_analysis rounds each calculation to
+# (None: already an integer)
+CALCULATION_DIGITS = {
+    'monthly_consumption': 2, 'plant_capacity': 2, 'monthly_generation': 2, 'yearly_generation': 0,
+    'monthly_savings': 2, 'annual_savings': 0, 'lifetime_savings': 0, 'investment': 0, 'payback_period': 1,
+    'annual_co2_saved': 2, 'lifetime_co2_saved': 2, 'equivalent_trees': 0, 'equivalent_trees_lifetime': 0,
+    'panel_count': None,
+    'inverter_capacity': 2, 'area_required': 2, 'npv': 0, 'irr': 2, 'discounted_payback': 1, 'lcoe': 2,
+    'loan_amount': 0, 'emi': 0, 'equity_irr': 2, 'equity_payback': 1, 'cash_on_cash': 2,
+    'ppa_tariff': 2, 'developer_lcoe': 2, 'ppa_annual_savings': 0, 'ppa_lifetime_savings': 0,
+    'ppa_savings_percent': 1
+}
+
+# Structured-array layout for batches (recommendations are rendered on demand)
+RESULT_DTYPE = np.dtype(
+    [('monthly_bill', 'f8'), ('tariff_rate', 'f8'), ('investment_model', 'U5'),
+     ('consumer_type', 'U12'), ('solar_irradiance', 'f8')]
+    + [(field, 'i8' if field == 'panel_count' else 'f8') for field in CALCULATION_FIELDS]
+    + [(field, 'f8') for field in CASH_FLOW_FIELDS]
+    + [(field, 'f8') for field in FINANCING_FIELDS if field != 'cash_on_cash']
+    + [(field, 'f8') for field in PPA_FIELDS]
+)
+
+
+class AnalysisResult:
+    """
+    Immutable, slotted form of a get_comprehensive_analysis result
+
+    Supports read-only mapping access (result['calculations'],
+    result.get('recommendations')) so it can be handed to templates and the
+    database clients in place of the nested dict; that dict view is built
+    lazily on first access.
+    """
+
+    __slots__ = (INPUT_FIELDS + CALCULATION_FIELDS + CASH_FLOW_FIELDS + FINANCING_FIELDS + PPA_FIELDS
+                 + ('recommendations', '_view'))
+
+    def __init__(self, recommendations: Iterable[Mapping[str, Any]] = (), **fields):
+        """
+        Initialize result
+
+        Args:
+            recommendations: Recommendation dicts (stored as read-only views)
+            **fields: Input and calculation values (cash-flow, financing
+                and PPA fields optional)
+        """
+        get = fields.get
+        for name, setter in _FIELD_SETTERS:
+            setter(self, get(name))
+        _set_recommendations(self, _freeze_recommendations(recommendations))
+        _set_view(self, None)
+
+    @classmethod
+    def from_values(cls, recommendations: Iterable[Mapping[str, Any]], inputs: Iterable[Any],
+                    calculations: Iterable[Any]) -> 'AnalysisResult':
+        """
+        Build from values in INPUT_FIELDS and CALCULATION_FIELDS order
+
+        Skips the keyword handling of the constructor for hot paths; the
+        cash-flow, financing and PPA fields are left as None.
+        """
+        self = object.__new__(cls)
+        for (_, setter), value in zip(_FIELD_SETTERS, chain(inputs, calculations, _NO_CASH_FLOW)):
+            setter(self, value)
+        _set_recommendations(self, _freeze_recommendations(recommendations))
+        _set_view(self, None)
+        return self
+
+    @classmethod
+    def from_dict(cls, analysis: Dict[str, Any]) -> 'AnalysisResult':
+        """Build from the nested dict returned by get_comprehensive_analysis"""
+        return cls(recommendations=analysis.get('recommendations', ()),
+                   **analysis.get('input_data', {}), **analysis['calculations'])
+
+    @classmethod
+    def from_record(cls, record: np.void, recommendations: Iterable[Mapping[str, Any]] = ()) -> 'AnalysisResult':
+        """Build from one row of a RESULT_DTYPE structured array"""
+        fields = {name: record[name].item() for name in record.dtype.names}
+        for name in CASH_FLOW_FIELDS + FINANCING_FIELDS + PPA_FIELDS:
+            if name in fields and np.isnan(fields[name]):
+                fields[name] = None
+        return cls(recommendations=recommendations, **fields)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __getstate__(self):
+        state = {name: getattr(self, name) for name in self.__slots__ if name != '_view'}
+        state['recommendations'] = [dict(item) for item in self.recommendations]
+        return state
+
+    def __setstate__(self, state):
+        for name, value in state.items():
+            object.__setattr__(self, name, value)
+        object.__setattr__(self, 'recommendations', _freeze_recommendations(state.get('recommendations', ())))
+        object.__setattr__(self, '_view', None)
+
+    def __eq__(self, other):
+        if not isinstance(other, AnalysisResult):
+            return NotImplemented
+        return self.__getstate__() == other.__getstate__()
+
+    __hash__ = None
+
+    def __repr__(self):
+        return (f"AnalysisResult(plant_capacity={self.plant_capacity}, investment={self.investment}, "
+                f"annual_savings={self.annual_savings}, payback_period={self.payback_period})")
+
+    @property
+    def has_cash_flow(self) -> bool:
+        """Whether the cash-flow financial fields were computed"""
+        return self.npv is not None
+
+    @property
+    def has_financing(self) -> bool:
+        """Whether the loan/equity fields were computed"""
+        return self.loan_amount is not None
+
+    @property
+    def has_ppa(self) -> bool:
+        """Whether the PPA pricing fields were computed"""
+        return self.ppa_tariff is not None
+
+    def as_mapping(self) -> Mapping[str, Any]:
+        """Lazily built, read-only nested view matching the dict layout"""
+        if self._view is None:
+            calculation_fields = (CALCULATION_FIELDS + (CASH_FLOW_FIELDS if self.has_cash_flow else ())
+                                  + (FINANCING_FIELDS if self.has_financing else ())
+                                  + (PPA_FIELDS if self.has_ppa else ()))
+            view = MappingProxyType({
+                'input_data': MappingProxyType({name: getattr(self, name) for name in INPUT_FIELDS
+                                                if getattr(self, name) is not None}),
+                'calculations': MappingProxyType({name: getattr(self, name) for name in calculation_fields}),
+                'recommendations': self.recommendations
+            })
+            object.__setattr__(self, '_view', view)
+        return self._view
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain, mutable copy in the get_comprehensive_analysis layout"""
+        view = self.as_mapping()
+        return {
+            'input_data': dict(view['input_data']),
+            'calculations': dict(view['calculations']),
+            'recommendations': [dict(item) for item in self.recommendations]
+        }
+
+    def __getitem__(self, key):
+        return self.as_mapping()[key]
+
+    def __contains__(self, key):
+        return key in self.as_mapping()
+
+    def __iter__(self):
+        return iter(self.as_mapping())
+
+    def get(self, key, default=None):
+        return self.as_mapping().get(key, default)
+
+    def keys(self):
+        return self.as_mapping().keys()
+
+    def to_record(self) -> np.ndarray:
+        """Single-element RESULT_DTYPE array"""
+        return results_to_array([self])
+
+
+def _freeze_recommendations(recommendations: Iterable[Mapping[str, Any]]) -> tuple:
+    """Tuple of read-only views over private copies of the recommendation dicts"""
+    return tuple(MappingProxyType(dict(item)) for item in recommendations)
+
+
+# Slot descriptors, used instead of object.__setattr__ while constructing
+_FIELD_SETTERS = tuple((name, getattr(AnalysisResult, name).__set__)
+                       for name in INPUT_FIELDS + CALCULATION_FIELDS + CASH_FLOW_FIELDS + FINANCING_FIELDS
+                       + PPA_FIELDS)
+_set_recommendations = AnalysisResult.recommendations.__set__
+_set_view = AnalysisResult._view.__set__
+_NO_CASH_FLOW = (None,) * (len(CASH_FLOW_FIELDS) + len(FINANCING_FIELDS) + len(PPA_FIELDS))
+
+
+def results_to_array(results: Iterable[Any]) -> np.ndarray:
+    """
+    Pack AnalysisResult objects (or analysis dicts) into a structured array
+
+    Args:
+        results: AnalysisResult instances or get_comprehensive_analysis dicts
+
+    Returns:
+        RESULT_DTYPE structured array (cash-flow, financing and PPA fields NaN when absent)
+    """
+    results = [result if isinstance(result, AnalysisResult) else AnalysisResult.from_dict(result)
+               for result in results]
+    array = np.zeros(len(results), dtype=RESULT_DTYPE)
+
+    for name in RESULT_DTYPE.names:
+        values = [getattr(result, name) for result in results]
+        if RESULT_DTYPE[name].kind == 'f':
+            values = [np.nan if value is None else value for value in values]
+        array[name] = values
+
+    return array
+
+
+def batch_to_array(columns: Dict[str, np.ndarray], monthly_bill=None, tariff_rate=None,
+                   investment_model: Optional[Any] = None, consumer_type: Optional[Any] = None,
+                   solar_irradiance=None) -> np.ndarray:
+    """
+    Pack get_batch_analysis columns (and optionally their inputs) into a
+    RESULT_DTYPE structured array without creating per-row objects
+
+    Returns:
+        RESULT_DTYPE structured array
+    """
+    length = len(columns['plant_capacity'])
+    array = np.zeros(length, dtype=RESULT_DTYPE)
+
+    for name in CASH_FLOW_FIELDS + FINANCING_FIELDS + PPA_FIELDS:
+        if name in RESULT_DTYPE.names:
+            array[name] = np.nan
+
+    inputs = {'monthly_bill': monthly_bill, 'tariff_rate': tariff_rate, 'investment_model': investment_model,
+              'consumer_type': consumer_type, 'solar_irradiance': solar_irradiance}
+    for name, values in {**inputs, **columns}.items():
+        if values is not None and name in RESULT_DTYPE.names:
+            array[name] = np.asarray(values)
+
+    return array
@@ -0,0 +1,306 @@
+"""
+Precomputed answer table for instant comprehensive analyses
+"""
+import copy
+import json
+import math
+import os
+from typing import Dict, Any, Iterable, List, Optional
+
+import numpy as np
+
+from utils.analysis_cache import calculator_fingerprint
+from utils.analysis_result import AnalysisResult, CALCULATION_DIGITS, CALCULATION_FIELDS
+from utils.location_data import LOCATION_DATA
+
+# Stored per (location, consumer type, bill): every CALCULATION_FIELDS value
+# of the CAPEX analysis, rounded exactly as get_comprehensive_analysis rounds
+# it; the unrounded capacity and payback the recommendation messages format;
+# and what identifies a linear piece of the results: 'segment' (cost per kW
+# from the price book, negated on the 1 kW minimum-size floor) and bitmasks
+# of the recommendation rules that fire under each investment model. OPEX
+# results are the same row with no investment or payback.
+TABLE_FIELDS = CALCULATION_FIELDS + ('capacity_fact', 'payback_fact', 'segment', 'capex_rules', 'opex_rules')
+
+CONSUMER_TYPES = ('Residential', 'Commercial', 'Industrial')
+
+# Columns that must agree for a bill between two grid points to be interpolated
+PIECE_COLUMNS = len(TABLE_FIELDS) - 3
+
+_CAPACITY = TABLE_FIELDS.index('capacity_fact')
+_PAYBACK = TABLE_FIELDS.index('payback_fact')
+_PANELS = CALCULATION_FIELDS.index('panel_count')
+_INVESTMENT = CALCULATION_FIELDS.index('investment')
+_PAYBACK_PERIOD = CALCULATION_FIELDS.index('payback_period')
+
+# 10 ** digits for each stored output (1 for the integer panel count)
+_SCALE = np.array([10.0 ** (CALCULATION_DIGITS[name] or 0) for name in CALCULATION_FIELDS])
+
+# Options under which get_comprehensive_analysis is fully determined by the table
+TABLE_OPTIONS = {'generation_mode': 'flat', 'financial_model': 'simple', 'shadow_free': True}
+
+
+def _metadata_path(path: str) -> str:
+    return os.path.splitext(path)[0] + '.json'
+
+
+def _rule_bits(engine, plant_capacity: np.ndarray, investment, payback_period, consumer_type: str,
+               investment_model: str) -> np.ndarray:
+    """Fired rules of each row as a bitmask (bit i: engine.rules[i])"""
+    masks = engine.evaluate_batch(plant_capacity=plant_capacity, investment=investment,
+                                  payback_period=payback_period, consumer_type=consumer_type,
+                                  investment_model=investment_model).masks
+    return (np.int64(1) << np.arange(len(masks), dtype=np.int64)) @ masks
+
+
+class AnswerTable:
+    """Comprehensive analyses precomputed over locations x consumer types x a bill grid"""
+
+    def __init__(self, values: np.ndarray, entries: List[Dict[str, Any]],
+                 consumer_types: Iterable[str], bill_start: float, bill_step: float,
+                 fingerprint: Optional[list] = None):
+        """
+        Initialize table
+
+        Args:
+            values: Array (entries, consumer types, bills, TABLE_FIELDS), may be memory-mapped
+            entries: One dict per location entry with tariff_rate, solar_irradiance
+                and state (None for the national emission factors and prices)
+            consumer_types: Consumer types along the second axis
+            bill_start: First bill on the grid in ₹
+            bill_step: Grid spacing in ₹
+            fingerprint: JSON form of calculator_fingerprint at build time
+        """
+        # Plain ndarray view: memmap subclass indexing is several times slower
+        self.values = values.view(np.ndarray) if isinstance(values, np.memmap) else values
+        self.entries = list(entries)
+        self.consumer_types = tuple(consumer_types)
+        self.bill_start = float(bill_start)
+        self.bill_step = float(bill_step)
+        self.last_index = values.shape[2] - 1
+        self.fingerprint = fingerprint
+        self._entry_index = {(entry['tariff_rate'], entry['solar_irradiance'], entry['state']): index
+                             for index, entry in enumerate(self.entries)}
+        self._type_index = {ctype: index for index, ctype in enumerate(self.consumer_types)}
+        # (calculator, constants_version, fingerprint snapshot) last verified
+        # against the stored fingerprint
+        self._verified = None
+        self.hits = 0
+        self.off_grid = 0
+        self.misses = 0
+
+    @classmethod
+    def build(cls, calculator, locations: Optional[Dict[str, Dict[str, Any]]] = None,
+              consumer_types: Iterable[str] = CONSUMER_TYPES, bill_max: float = 200000,
+              bill_step: float = 100, path: Optional[str] = None) -> 'AnswerTable':
+        """
+        Precompute the table with the vectorized batch analysis
+
+        Args:
+            calculator: SolarCalculator whose constants and price book are used
+            locations: City -> {state, irradiance, tariff} (default LOCATION_DATA)
+            consumer_types: Consumer types to include
+            bill_max: Largest bill on the grid in ₹ (grid starts at 0)
+            bill_step: Grid spacing in ₹
+            path: Optional .npy file; the table is written there as a
+                memory-mapped array with a .json metadata file alongside
+
+        Returns:
+            AnswerTable
+        """
+        locations = LOCATION_DATA if locations is None else locations
+        consumer_types = tuple(consumer_types)
+
+        # Each location with its state (price overrides and grid emission
+        # factors) and without one (national factors)
+        keys = set()
+        for info in locations.values():
+            keys.add((float(info['tariff']), float(info['irradiance']), None))
+            keys.add((float(info['tariff']), float(info['irradiance']), info.get('state')))
+        entries = [{'tariff_rate': tariff, 'solar_irradiance': irradiance, 'state': state}
+                   for tariff, irradiance, state in sorted(keys, key=lambda key: (key[0], key[1], key[2] or ''))]
+
+        bills = np.arange(0, int(round(bill_max / bill_step)) + 1) * float(bill_step)
+        shape = (len(entries), len(consumer_types), len(bills), len(TABLE_FIELDS))
+        if path:
+            values = np.lib.format.open_memmap(path, mode='w+', dtype=np.float64, shape=shape)
+        else:
+            values = np.empty(shape, dtype=np.float64)
+
+        for entry_index, entry in enumerate(entries):
+            for type_index, ctype in enumerate(consumer_types):
+                arguments = (bills, entry['tariff_rate'], "CAPEX", entry['solar_irradiance'], ctype)
+                exact = calculator.get_batch_analysis(*arguments, state=entry['state'], rounded=False)
+                columns = calculator.get_batch_analysis(*arguments, state=entry['state'])
+                capacity = exact['plant_capacity']
+                cost_per_kw = calculator.get_cost_per_kw_array(np.array([ctype]), capacity, entry['state'])
+                columns['capacity_fact'] = capacity
+                columns['payback_fact'] = exact['payback_period']
+                columns['segment'] = np.where(capacity > 1.0, cost_per_kw, -cost_per_kw)
+                columns['capex_rules'] = _rule_bits(calculator.recommendation_engine, capacity, exact['investment'],
+                                                    exact['payback_period'], ctype, "CAPEX")
+                columns['opex_rules'] = _rule_bits(calculator.recommendation_engine, capacity, 0, 0, ctype, "OPEX")
+                values[entry_index, type_index] = np.stack([columns[name] for name in TABLE_FIELDS], axis=-1)
+
+        fingerprint = json.loads(json.dumps(list(calculator_fingerprint(calculator))))
+        table = cls(values, entries, consumer_types, 0.0, bill_step, fingerprint)
+        if path:
+            values.flush()
+            table.save_metadata(path)
+        return table
+
+    @classmethod
+    def load(cls, path: str) -> 'AnswerTable':
+        """Open a saved table as a read-only memory map"""
+        with open(_metadata_path(path)) as handle:
+            metadata = json.load(handle)
+        if tuple(metadata['fields']) != TABLE_FIELDS:
+            raise ValueError(f"Answer table {path} has an unsupported layout")
+        return cls(np.load(path, mmap_mode='r'), metadata['entries'], metadata['consumer_types'],
+                   metadata['bill_start'], metadata['bill_step'], metadata['fingerprint'])
+
+    def save_metadata(self, path: str):
+        """Write the .json metadata that accompanies the .npy values"""
+        with open(_metadata_path(path), 'w') as handle:
+            json.dump({
+                'fields': list(TABLE_FIELDS),
+                'entries': self.entries,
+                'consumer_types': list(self.consumer_types),
+                'bill_start': self.bill_start,
+                'bill_step': self.bill_step,
+                'fingerprint': self.fingerprint
+            }, handle)
+
+    def matches(self, calculator) -> bool:
+        """
+        True if the calculator inputs are the ones the table was built with
+
+        The live calculator_fingerprint is compared with a snapshot of the
+        last verified one on every call (in-place edits of the constants
+        dicts included); the JSON form is only compared again when it, the
+        calculator or its constants_version changes.
+        """
+        fingerprint = calculator_fingerprint(calculator)
+        verified = self._verified
+        if (verified is not None and verified[0] is calculator
+                and verified[1] == calculator.constants_version and verified[2] == fingerprint):
+            return True
+        if json.loads(json.dumps(list(fingerprint))) != self.fingerprint:
+            return False
+        self._verified = (calculator, calculator.constants_version, copy.deepcopy(fingerprint))
+        return True
+
+    def lookup(self, calculator, monthly_bill: float, tariff_rate: float,
+               investment_model: str = "CAPEX", solar_irradiance: float = None,
+               consumer_type: str = "Residential", **options) -> Optional[AnalysisResult]:
+        """
+        Serve get_comprehensive_analysis from the table
+
+        Bills on the grid get the stored, already rounded results, equal to
+        the exact computation. A bill between two grid points with the same
+        price tier, side of the 1 kW floor and rules is interpolated from
+        them: within that piece every result except the panel count is
+        linear in the bill, so each value is within one unit of its last
+        rounded digit of the exact one (the panel count is recomputed).
+
+        Args:
+            calculator: SolarCalculator the table must match (and whose rules are rendered)
+            monthly_bill, tariff_rate, investment_model, solar_irradiance,
+            consumer_type, **options: get_comprehensive_analysis arguments
+
+        Returns:
+            AnalysisResult, or None when the inputs are off the table and
+            must be computed exactly
+        """
+        result = self._lookup(calculator, monthly_bill, tariff_rate, investment_model,
+                              solar_irradiance, consumer_type, options)
+        if result is None:
+            self.misses += 1
+        return result
+
+    def _lookup(self, calculator, monthly_bill, tariff_rate, investment_model,
+                solar_irradiance, consumer_type, options):
+        if investment_model not in ("CAPEX", "OPEX") or calculator.equipment_catalog is not None:
+            return None
+        state = None
+        for name, value in options.items():
+            if name == 'state':
+                state = value
+            elif name in ('solar_data', 'consumer_category', 'settlement_mode'):
+                continue  # only used by the hourly generation mode
+            elif value is not None and TABLE_OPTIONS.get(name) != value:
+                return None
+
+        avg_irradiance = solar_irradiance if solar_irradiance else 4.5
+        entry = self._entry_index.get((tariff_rate, avg_irradiance, state))
+        type_index = self._type_index.get(consumer_type)
+        if entry is None or type_index is None:
+            return None
+
+        position = (monthly_bill - self.bill_start) / self.bill_step
+        if not 0 <= position <= self.last_index or not self.matches(calculator):
+            return None
+
+        rows = self.values[entry, type_index]
+        index = int(position)
+        fraction = position - index
+        if fraction:
+            low, high = rows[index], rows[index + 1]
+            if low[PIECE_COLUMNS:].tolist() != high[PIECE_COLUMNS:].tolist():
+                return None
+            row = low + (high - low) * fraction
+            calculations = (np.rint(row[:len(_SCALE)] * _SCALE) / _SCALE).tolist()
+            row = row.tolist()
+            calculations[_PANELS] = math.ceil(row[_CAPACITY] / 0.4)
+        else:
+            row = rows[index].tolist()
+            calculations = row[:len(_SCALE)]
+            calculations[_PANELS] = int(calculations[_PANELS])
+
+        if investment_model == "CAPEX":
+            payback_period = row[_PAYBACK]
+            fired = int(row[-2])
+        else:
+            calculations[_INVESTMENT] = calculations[_PAYBACK_PERIOD] = payback_period = 0
+            fired = int(row[-1])
+
+        engine = calculator.recommendation_engine
+        facts = {'plant_capacity': row[_CAPACITY], 'investment': calculations[_INVESTMENT],
+                 'payback_period': payback_period, 'consumer_type': consumer_type,
+                 'investment_model': investment_model}
+        recommendations = [engine.render(rule, facts) for bit, rule in enumerate(engine.rules) if fired >> bit & 1]
+        self.hits += 1
+        if fraction:
+            self.off_grid += 1
+        return AnalysisResult.from_values(
+            recommendations,
+            (monthly_bill, tariff_rate, investment_model, consumer_type, avg_irradiance, "flat"),
+            calculations
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        """Table size and hit/off-grid/miss counters"""
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self.entries),
+            'consumer_types': len(self.consumer_types),
+            'bills': self.last_index + 1,
+            'bill_max': self.bill_start + self.bill_step * self.last_index,
+            'size_mb': round(self.values.nbytes / 1e6, 1),
+            'hits': self.hits,
+            'off_grid': self.off_grid,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0
+        }
+
+
+if __name__ == "__main__":
+    # Offline job: python -m utils.answer_table data/answer_table.npy
+    import sys
+
+    from utils.calculations import SolarCalculator
+
+    output = sys.argv[1] if len(sys.argv) > 1 else os.path.join('data', 'answer_table.npy')
+    os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+    table = AnswerTable.build(SolarCalculator(), path=output)
+    print(f"✅ Answer table written to {output}: {table.stats()}")
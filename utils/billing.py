@@ -0,0 +1,281 @@
+"""
+Slab and time-of-use electricity billing on hourly import/export arrays
+"""
+import json
+from typing import Dict, Any, Iterable, Mapping, Optional, Tuple
+
+import numpy as np
+
+from utils.hourly_simulation import DAYS_PER_MONTH, HOURS_PER_YEAR, MONTH_INDEX
+
+# Mirror of the consumer_categories seed rows in backend/database_schema.sql:
+# (category_code, category_name, voltage_level, consumer_type,
+#  typical_tariff_range_min, typical_tariff_range_max)
+CONSUMER_CATEGORIES = (
+    ('LT-1A', 'Domestic (0-100 units)', 'LT', 'Residential', 2.50, 4.00),
+    ('LT-1B', 'Domestic (101-300 units)', 'LT', 'Residential', 4.00, 6.50),
+    ('LT-1C', 'Domestic (Above 300 units)', 'LT', 'Residential', 6.50, 9.00),
+    ('LT-2A', 'Non-Domestic (Commercial)', 'LT', 'Commercial', 7.00, 10.00),
+    ('LT-2B', 'Non-Domestic (Small Industries)', 'LT', 'Commercial', 8.00, 11.00),
+    ('LT-3', 'Agricultural', 'LT', 'Commercial', 1.50, 3.00),
+    ('LT-4', 'Street Lighting', 'LT', 'Commercial', 6.00, 8.00),
+    ('LT-5', 'Temporary Supply', 'LT', 'Commercial', 10.00, 15.00),
+    ('HT-1', 'Industrial (General)', 'HT', 'Industrial', 6.00, 9.00),
+    ('HT-2', 'Industrial (Continuous Process)', 'HT', 'Industrial', 5.50, 8.50),
+    ('HT-3', 'Commercial (Large)', 'HT', 'Commercial', 8.00, 12.00),
+    ('HT-4', 'Railway Traction', 'HT', 'Commercial', 4.00, 6.00),
+    ('HT-5', 'Bulk Supply', 'HT', 'Industrial', 5.00, 7.50),
+    ('HT-6', 'Public Lighting', 'HT', 'Commercial', 7.00, 9.00),
+    ('HT-7', 'Mixed Load', 'HT', 'Commercial', 7.50, 10.50)
+)
+
+# Codes offered by the calculator form -> consumer_categories codes
+FORM_CATEGORY_CODES = {
+    'LT-1': 'LT-1B',   # Domestic (all LT-1 bands share one slab schedule)
+    'LT-2': 'LT-2A',   # Non-Domestic
+    'LT-3': 'LT-2A',   # Commercial
+    'LT-4': 'LT-2B',   # Industrial (small)
+    'HT-1': 'HT-1',    # Industrial
+    'HT-2': 'HT-3'     # Commercial
+}
+
+# Domestic slabs follow the LT-1A/1B/1C bands (monthly kWh); other LT
+# categories bill the first LT_FIRST_SLAB units at the low end of their range
+LT_FIRST_SLAB = 100
+
+# Fixed charges in ₹/month; HT consumers pay a demand charge on the monthly
+# maximum hourly import (kW) instead
+FIXED_CHARGES = {'Residential': 50.0, 'Commercial': 150.0, 'Industrial': 250.0}
+HT_DEMAND_CHARGE = 350.0
+
+# HT time-of-use windows: (start hour, end hour, adder as a fraction of the
+# energy rate); windows may wrap past midnight
+HT_TOU_WINDOWS = ((18, 22, 0.20), (22, 6, -0.15))
+
+# Hour-of-year -> month one-hot, and the first hour of each month
+MONTH_MATRIX = np.eye(12, dtype=np.float64)[MONTH_INDEX]
+MONTH_STARTS = np.concatenate(([0], np.cumsum(DAYS_PER_MONTH * 24)[:-1]))
+HOUR_OF_DAY_INDEX = np.tile(np.arange(24), 365)
+
+
+class TariffSchedule:
+    """One consumer category: energy slabs, fixed/demand charges and time-of-use adders"""
+
+    def __init__(self, code: str, name: str, consumer_type: str, voltage_level: str,
+                 slabs: Iterable[Tuple[Optional[float], float]], fixed_charge: float = 0.0,
+                 demand_charge: float = 0.0, tou_adders: Optional[np.ndarray] = None,
+                 export_rate: float = 0.0):
+        """
+        Initialize schedule
+
+        Args:
+            code: consumer_categories code (e.g. LT-1B)
+            name: Category name
+            consumer_type: Residential/Commercial/Industrial
+            voltage_level: LT or HT
+            slabs: (monthly kWh upper limit or None for the last slab, ₹/kWh)
+                in ascending order; rates apply telescopically
+            fixed_charge: ₹ per month
+            demand_charge: ₹ per kW of monthly maximum hourly import
+            tou_adders: ₹/kWh added for each hour of the day (24 values)
+            export_rate: ₹/kWh credited for exported energy
+        """
+        self.code = code
+        self.name = name
+        self.consumer_type = consumer_type
+        self.voltage_level = voltage_level
+        self.slabs = [(limit, float(rate)) for limit, rate in slabs]
+        self.fixed_charge = float(fixed_charge)
+        self.demand_charge = float(demand_charge)
+        self.tou_adders = np.zeros(24) if tou_adders is None else np.asarray(tou_adders, dtype=float)
+        self.export_rate = float(export_rate)
+
+        upper = np.array([np.inf if limit is None else limit for limit, _ in self.slabs], dtype=float)
+        self._slab_lower = np.concatenate(([0.0], upper[:-1]))
+        self._slab_width = upper - self._slab_lower
+        self._slab_rates = np.array([rate for _, rate in self.slabs])
+        self._weights = {}
+
+    def _weights_for(self, dtype) -> np.ndarray:
+        """(8760, 24) matrix: one matmul gives monthly kWh and monthly time-of-use charges"""
+        if dtype not in self._weights:
+            weights = np.hstack([MONTH_MATRIX, MONTH_MATRIX * self.tou_adders[HOUR_OF_DAY_INDEX, None]])
+            self._weights[dtype] = weights.astype(dtype)
+        return self._weights[dtype]
+
+    @property
+    def average_rate(self) -> float:
+        """Mean slab rate, a stand-in for the flat tariff"""
+        return float(self._slab_rates.mean())
+
+    def slab_charges(self, monthly_kwh: np.ndarray) -> np.ndarray:
+        """Energy charge for monthly consumption, every slab allocated at once"""
+        monthly_kwh = np.asarray(monthly_kwh, dtype=float)
+        allocated = np.clip(monthly_kwh[..., None] - self._slab_lower, 0.0, self._slab_width)
+        return allocated @ self._slab_rates
+
+    def bill(self, imports: np.ndarray, exports: Optional[np.ndarray] = None) -> Dict[str, np.ndarray]:
+        """
+        Monthly bills for hourly grid imports (and exports)
+
+        Args:
+            imports: Array (consumers, 8760) or (8760,) of hourly grid import in kWh
+            exports: Optional array of the same shape of hourly export in kWh
+
+        Returns:
+            Dict of (consumers, 12) arrays: energy_kwh, energy_charge,
+            tou_charge, fixed_charge, demand_charge, export_kwh,
+            export_credit and total (₹)
+        """
+        imports = np.atleast_2d(imports)
+        if imports.dtype not in (np.float32, np.float64):
+            imports = imports.astype(float)
+        sums = imports @ self._weights_for(imports.dtype)
+        energy_kwh, tou_charge = sums[:, :12].astype(float), sums[:, 12:].astype(float)
+
+        energy_charge = self.slab_charges(energy_kwh)
+        fixed_charge = np.full(energy_kwh.shape, self.fixed_charge)
+        demand_charge = np.zeros(energy_kwh.shape)
+        if self.demand_charge:
+            demand_charge = np.maximum.reduceat(imports, MONTH_STARTS, axis=1).astype(float) * self.demand_charge
+
+        export_kwh = np.zeros(energy_kwh.shape)
+        if exports is not None:
+            exports = np.atleast_2d(exports).astype(imports.dtype, copy=False)
+            export_kwh = (exports @ self._weights_for(imports.dtype)[:, :12]).astype(float)
+        export_credit = export_kwh * self.export_rate
+
+        return {
+            'energy_kwh': energy_kwh,
+            'energy_charge': energy_charge,
+            'tou_charge': tou_charge,
+            'fixed_charge': fixed_charge,
+            'demand_charge': demand_charge,
+            'export_kwh': export_kwh,
+            'export_credit': export_credit,
+            'total': energy_charge + tou_charge + fixed_charge + demand_charge - export_credit
+        }
+
+    def compare(self, load: np.ndarray, generation: np.ndarray,
+                chunk_size: int = 1024) -> Dict[str, np.ndarray]:
+        """
+        Bills without and with solar
+
+        Args:
+            load: Hourly consumption (consumers, 8760) or (8760,) in kWh
+            generation: Hourly solar generation, same shape or broadcastable
+            chunk_size: Consumers billed per chunk (bounds temporary memory)
+
+        Returns:
+            Dict with pre_solar and post_solar (consumers, 12) monthly totals
+            and annual_pre, annual_post and annual_savings per consumer
+        """
+        load = np.atleast_2d(load)
+        generation = np.atleast_2d(generation)
+        pre, post = [], []
+        for start in range(0, load.shape[0], chunk_size):
+            load_chunk = load[start:start + chunk_size]
+            generation_chunk = generation if generation.shape[0] == 1 else generation[start:start + chunk_size]
+            net = load_chunk - generation_chunk
+            pre.append(self.bill(load_chunk)['total'])
+            post.append(self.bill(np.maximum(net, 0), np.maximum(-net, 0))['total'])
+
+        pre_solar, post_solar = np.concatenate(pre), np.concatenate(post)
+        annual_pre, annual_post = pre_solar.sum(axis=1), post_solar.sum(axis=1)
+        return {
+            'pre_solar': pre_solar,
+            'post_solar': post_solar,
+            'annual_pre': annual_pre,
+            'annual_post': annual_post,
+            'annual_savings': annual_pre - annual_post
+        }
+
+
+def schedule_from_category(row: Mapping[str, Any], domestic_rows: Iterable[Mapping[str, Any]] = (),
+                           export_rate: float = 0.0) -> TariffSchedule:
+    """
+    Tariff schedule for one consumer_categories row
+
+    Domestic (LT Residential) categories share one telescopic schedule built
+    from all domestic bands; other LT categories bill the first
+    LT_FIRST_SLAB units at the low end of their range and the rest at the
+    high end; HT categories pay the mid-range rate with time-of-use adders
+    and a demand charge.
+
+    Args:
+        row: Dict with category_code, category_name, voltage_level,
+            consumer_type, typical_tariff_range_min/max
+        domestic_rows: Every LT Residential row (for the domestic slabs)
+        export_rate: ₹/kWh credited for exports
+    """
+    low = float(row['typical_tariff_range_min'])
+    high = float(row['typical_tariff_range_max'])
+    consumer_type = row['consumer_type']
+    tou_adders = None
+    demand_charge = 0.0
+    fixed_charge = FIXED_CHARGES.get(consumer_type, FIXED_CHARGES['Commercial'])
+
+    if row['voltage_level'] == 'HT':
+        rate = (low + high) / 2
+        slabs = [(None, rate)]
+        tou_adders = np.zeros(24)
+        for start, end, fraction in HT_TOU_WINDOWS:
+            hours = np.arange(start, end) if start < end else np.r_[start:24, 0:end]
+            tou_adders[hours] = rate * fraction
+        demand_charge = HT_DEMAND_CHARGE
+        fixed_charge = 0.0
+    elif consumer_type == 'Residential' and domestic_rows:
+        bands = sorted(domestic_rows, key=lambda band: float(band['typical_tariff_range_min']))
+        limits = [100, 300][:len(bands) - 1] + [None]
+        slabs = [(limit, (float(band['typical_tariff_range_min']) + float(band['typical_tariff_range_max'])) / 2)
+                 for limit, band in zip(limits, bands)]
+    else:
+        slabs = [(LT_FIRST_SLAB, low), (None, high)]
+
+    return TariffSchedule(row['category_code'], row['category_name'], consumer_type, row['voltage_level'],
+                          slabs, fixed_charge=fixed_charge, demand_charge=demand_charge,
+                          tou_adders=tou_adders, export_rate=export_rate)
+
+
+class TariffBook:
+    """Tariff schedules for every consumer category"""
+
+    def __init__(self, records: Optional[Iterable[Mapping[str, Any]]] = None, export_rate: float = 0.0):
+        """
+        Initialize book
+
+        Args:
+            records: consumer_categories rows (default CONSUMER_CATEGORIES)
+            export_rate: ₹/kWh credited for exports on every schedule
+        """
+        if records is None:
+            keys = ('category_code', 'category_name', 'voltage_level', 'consumer_type',
+                    'typical_tariff_range_min', 'typical_tariff_range_max')
+            records = [dict(zip(keys, row)) for row in CONSUMER_CATEGORIES]
+        records = list(records)
+        self.fingerprint = json.dumps([[dict(row) for row in records], export_rate], sort_keys=True, default=str)
+        domestic = [row for row in records if row['voltage_level'] == 'LT' and row['consumer_type'] == 'Residential']
+        self.schedules = {row['category_code']: schedule_from_category(row, domestic, export_rate)
+                          for row in records}
+
+    def schedule(self, code: str) -> TariffSchedule:
+        """Schedule for a calculator form code or a consumer_categories code"""
+        resolved = resolve_category_code(code)
+        if resolved in self.schedules:
+            return self.schedules[resolved]
+        raise KeyError(f"Unknown consumer category: {code}")
+
+
+def resolve_category_code(code: str) -> str:
+    """
+    consumer_categories code for a calculator form code
+
+    Form codes win where they overlap table codes (the form's LT-3 is
+    Commercial, the table's LT-3 Agricultural); other codes pass through.
+    """
+    return FORM_CATEGORY_CODES.get(code, code)
+
+
+def flat_load_profile(monthly_consumption: float) -> np.ndarray:
+    """Hourly load spreading the annual consumption (12 x monthly) evenly over the year"""
+    return np.full(HOURS_PER_YEAR, monthly_consumption * 12 / HOURS_PER_YEAR)
@@ -1,17 +1,70 @@
 """
 Enhanced Solar benefit calculation logic with precise formulas
 """
+import copy
 import math
-from typing import Dict, Any, Optional
+import os
+from typing import Dict, Any, List, Optional
+
+import numpy as np
+
+from utils.analysis_cache import AnalysisCache
+from utils.analysis_result import AnalysisResult, CALCULATION_DIGITS
+from utils.answer_table import AnswerTable
+from utils.billing import TariffBook
+from utils.capacity_optimizer import CapacityOptimizer
+from utils.cash_flow import CashFlowModel
+from utils.emissions import COMMISSIONING_YEAR, TREE_ABSORPTION, EmissionFactorTable
+from utils.equipment import EquipmentCatalog
+from utils.financing import FinancingModel
+from utils.hourly_simulation import HourlySimulator
+from utils.inverse_solver import InverseSolver
+from utils.layout import DEFAULT_TILT, SQ_FT_PER_M2, RooftopLayout
+from utils.lifetime import LifetimeSimulator, performance_curve
+from utils.load_profiles import generate_load_profile
+from utils.location_data import LOCATION_DATA, get_hourly_weather
+from utils.monte_carlo import MonteCarloAnalyzer
+from utils.ppa import PPAModel
+from utils.pricing import PriceBook, PriceBookStore
+from utils.recommendations import RecommendationEngine
+from utils.settlement import SettlementModel
+from utils.shading import DEFAULT_LATITUDE, DEFAULT_LONGITUDE, ShadingModel
+from utils.storage import BATTERY_COST_PER_KWH, DEFAULT_BATTERY_SIZES, StorageSimulator
+from utils.temperature import REFERENCE_DERATE, TemperatureModel, hourly_weather
+
+
+def _round_half_even(values: np.ndarray, ndigits: int) -> np.ndarray:
+    """
+    Round an array exactly like Python's built-in round()
+
+    np.round scales by 10**ndigits before rounding, which can disagree with
+    round() when the scaled value lands on (or next to) a .5 tie. Those rare
+    elements are re-rounded with round() so batch results match the scalar
+    path bit for bit.
+    """
+    rounded = np.round(values, ndigits)
+    if ndigits == 0:
+        return rounded
+
+    scaled = values * (10.0 ** ndigits)
+    near_tie = np.abs(np.abs(scaled - np.trunc(scaled)) - 0.5) < 1e-6
+    if np.any(near_tie):
+        rounded[near_tie] = [round(float(v), ndigits) for v in values[near_tie]]
+    return rounded
+
 
 class SolarCalculator:
     def __init__(self):
         # Enhanced constants based on your specifications
         self.PERFORMANCE_RATIO = 0.75  # PR (Performance Ratio)
         self.SYSTEM_LIFETIME = 25  # years
-        self.CO2_FACTOR = 0.8  # kg CO2 per unit
+        # Grid emission factors by state and year (kg CO2 per unit); the
+        # commissioning year is the first column a plant's lifetime uses
+        self.emission_factors = EmissionFactorTable.default()
+        self.COMMISSIONING_YEAR = COMMISSIONING_YEAR
         self.DAYS_PER_MONTH = 30
         self.MONTHS_PER_YEAR = 12
+        self.AREA_PER_KW = 8  # sq ft of rooftop per kW
 
         # Cost per kW based on consumer type and system size
         self.COST_PER_KW = {
@@ -32,6 +85,120 @@ class SolarCalculator:
             }
         }
 
+        # Tier breakpoints (kW): small is below the first value, medium up to
+        # and including the second. Unknown consumer types are priced from the
+        # Residential row on the fallback (Industrial) breakpoints.
+        self.COST_TIER_BREAKPOINTS = {
+            'Residential': (5, 10),
+            'Commercial': (50, 100),
+            'Industrial': (100, 500)
+        }
+        self.price_book_store = None
+        self._default_price_book = None
+        self._default_price_book_inputs = None
+
+        # Year-by-year assumptions for the cash-flow financial model
+        self.CASH_FLOW_ASSUMPTIONS = {
+            'degradation_rate': 0.005,           # 0.5% module degradation per year
+            'tariff_escalation': 0.03,           # 3% grid tariff increase per year
+            'om_cost_rate': 0.01,                # O&M at 1% of investment per year
+            'om_escalation': 0.05,               # 5% O&M cost increase per year
+            'inverter_replacement_year': 12,
+            'inverter_replacement_cost': 0.08,   # 8% of investment
+            'discount_rate': 0.08
+        }
+
+        # Loan and tax terms for financed CAPEX purchases (see get_financing_analysis)
+        self.FINANCING_ASSUMPTIONS = {
+            'loan_fraction': 0.7,          # 70% of the investment borrowed
+            'interest_rate': 0.10,
+            'tenor_years': 7,
+            'interest_subsidy': 0.0,       # interest rate points refunded to the borrower
+            'subsidy_years': None,         # None = whole tenor
+            'depreciation_rate': 0.40,     # accelerated depreciation, written-down value
+            'tax_rates': {                 # income tax on savings / shield on interest and depreciation
+                'Residential': 0.0,
+                'Commercial': 0.2517,
+                'Industrial': 0.2517
+            }
+        }
+
+        # Developer terms for OPEX systems sold as a power purchase agreement
+        # (see get_ppa_analysis)
+        self.PPA_ASSUMPTIONS = {
+            'target_irr': 0.12,            # developer project IRR the tariff must earn
+            'ppa_escalation': 0.0          # flat PPA tariff (fraction per year)
+        }
+
+        # Per-year losses on top of CASH_FLOW_ASSUMPTIONS['degradation_rate']
+        # for the lifetime arrays (see get_lifetime_simulation)
+        self.LIFETIME_ASSUMPTIONS = {
+            'first_year_lid': 0.015,     # light-induced degradation in year one
+            'availability': 0.99,        # plant uptime
+            'soiling_rate': 0.002,       # 0.2% generation lost per day since cleaning
+            'soiling_cap': 0.06,         # dust loss levels off at 6%
+            'cleaning_interval': 15      # days between module cleanings
+        }
+
+        # Export settlement rules for hourly analyses (see calculate_settlement)
+        self.SETTLEMENT_ASSUMPTIONS = {
+            'export_rate': 3.0,          # ₹/kWh paid for exports (net billing)
+            'export_limit': None,        # kW hourly export cap (None = no cap)
+            'sanctioned_load': None,     # kW; AC output above it is curtailed
+            'banking_months': 12,        # months a net-metering surplus stays banked
+            'year_end_rate': 2.5         # ₹/kWh for the bank left at year end
+        }
+
+        # Cell-temperature derate for hourly analyses with weather data
+        self.TEMPERATURE_ASSUMPTIONS = {
+            'model': 'faiman',
+            'temperature_coefficient': -0.0035,  # mono PERC, per °C above 25 °C
+            'u0': 25.0,                          # W/m²K
+            'u1': 6.84,                          # W·s/m³K
+            'noct': 45.0,                        # °C (NOCT model only)
+            'reference_derate': REFERENCE_DERATE # derate PERFORMANCE_RATIO already includes
+        }
+
+        # Memoized analyses for repeated inputs (see get_cached_analysis)
+        self.analysis_cache = AnalysisCache(maxsize=1024, ttl=3600)
+        self.answer_table = None
+        self.recommendation_engine = RecommendationEngine()
+
+        # Slab/time-of-use schedules for the consumer_categories codes
+        self.tariff_book = TariffBook()
+
+        # Battery dispatch and installed storage cost (see get_storage_sizing)
+        self.storage_simulator = StorageSimulator()
+        self.BATTERY_COST_PER_KWH = BATTERY_COST_PER_KWH
+
+        # Module/inverter catalog (see load_equipment_catalog); without one
+        # the 400 W panel / 80% inverter assumption is used
+        self.equipment_catalog = None
+
+        # Module rows packed into the roof (see get_rooftop_capacity)
+        self.rooftop_layout = RooftopLayout()
+
+        # Bumped by invalidate(); caches compare it along with the constants
+        self.constants_version = 0
+
+    def invalidate(self):
+        """
+        Drop everything derived from the constants
+
+        Caches compare the inputs an analysis reads (see
+        calculator_fingerprint) on every lookup, so reassigning a constant
+        or editing a constants dict in place needs no call. Call this after
+        changing state the fingerprint does not cover, such as a tariff
+        book's schedules edited in place.
+        """
+        self.constants_version += 1
+        self._default_price_book_inputs = None
+
+    @property
+    def CO2_FACTOR(self) -> float:
+        """National grid factor in the commissioning year (kg CO2 per unit), the former single constant"""
+        return self.emission_factors.factor(None, self.COMMISSIONING_YEAR)
+
     def calculate_monthly_consumption(self, monthly_bill, tariff_rate):
         """Calculate monthly electricity consumption from bill amount"""
         if tariff_rate <= 0:
@@ -69,57 +236,169 @@ class SolarCalculator:
             return float('inf')
         return investment / annual_savings
 
-    def calculate_co2_saved_annual(self, yearly_generation):
-        """Calculate CO2 saved per year using: CO₂ Saved = Yearly Generation × 0.8"""
-        co2_saved_kg = yearly_generation * self.CO2_FACTOR
+    def calculate_co2_saved_annual(self, yearly_generation, state=None):
+        """Calculate first-year CO2 saved in tons: Yearly Generation × the state's grid factor"""
+        co2_saved_kg = self.calculate_co2_saved(yearly_generation, state)
         return co2_saved_kg / 1000  # Convert to tons
 
-    def calculate_co2_saved_lifetime(self, annual_co2_saved):
-        """Calculate total CO2 saved over 25 years"""
-        return annual_co2_saved * self.SYSTEM_LIFETIME
+    def calculate_co2_saved_lifetime(self, annual_co2_saved, state=None):
+        """Calculate total CO2 saved in tons from the first-year tons (scaled by the state's lifetime/year-one factor)"""
+        year_one_factor = self.emission_factors.factor(state, self.COMMISSIONING_YEAR)
+        return annual_co2_saved * self.get_co2_intensity(state) / year_one_factor
+
+    def calculate_co2_saved_lifetime_from_generation(self, yearly_generation, state=None):
+        """Calculate total CO2 saved in tons: per-year generation · per-year grid factor"""
+        return yearly_generation * self.get_co2_intensity(state) / 1000
 
     def calculate_lifetime_savings(self, annual_savings):
-        """Calculate total savings over system lifetime"""
-        return annual_savings * self.SYSTEM_LIFETIME
+        """Calculate total savings over system lifetime (year-one savings x performance curve)"""
+        return annual_savings * self.get_lifetime_factor()
 
     def calculate_equivalent_trees(self, annual_co2_saved):
         """Calculate equivalent trees planted (1 tree = ~22 kg CO2/year)"""
-        return (annual_co2_saved * 1000) / 22  # Convert tons to kg, then divide by 22 kg/tree
+        return (annual_co2_saved * 1000) / TREE_ABSORPTION  # Convert tons to kg, then divide by 22 kg/tree
+
+    def calculate_equivalent_trees_lifetime(self, lifetime_co2_saved):
+        """Calculate trees absorbing the lifetime CO2 over the system lifetime (1 tree = ~22 kg CO2/year)"""
+        return (lifetime_co2_saved * 1000) / (TREE_ABSORPTION * self.SYSTEM_LIFETIME)
+
+    def get_price_book(self) -> PriceBook:
+        """
+        Active cost-per-kW price book
+
+        A book loaded with load_price_book (file or database, hot reloaded)
+        takes precedence; otherwise one is built from COST_PER_KW and
+        COST_TIER_BREAKPOINTS and rebuilt when either of them changes.
+        """
+        if self.price_book_store is not None:
+            return self.price_book_store.get()
+
+        inputs = (self.COST_PER_KW, self.COST_TIER_BREAKPOINTS)
+        if inputs != self._default_price_book_inputs:
+            self._default_price_book = PriceBook.from_cost_matrix(self.COST_PER_KW, self.COST_TIER_BREAKPOINTS)
+            self._default_price_book_inputs = copy.deepcopy(inputs)
+        return self._default_price_book
+
+    def load_price_book(self, path: Optional[str] = None, fetch_records=None,
+                        check_interval: Optional[float] = None):
+        """
+        Use a price book from a JSON file or database rows instead of COST_PER_KW
 
-    def get_cost_per_kw(self, consumer_type: str, capacity: float) -> float:
+        Args:
+            path: JSON price book file (reloaded when it changes)
+            fetch_records: Callable returning price book rows from the database
+                (re-read periodically)
+            check_interval: Seconds between reload checks
+        """
+        if path:
+            self.price_book_store = PriceBookStore.from_file(
+                path, 5.0 if check_interval is None else check_interval)
+        elif fetch_records:
+            self.price_book_store = PriceBookStore.from_database(
+                fetch_records, 300.0 if check_interval is None else check_interval)
+        else:
+            self.price_book_store = None
+
+    def load_equipment_catalog(self, path: Optional[str] = None, fetch_records=None):
+        """
+        Size panels and inverters from an equipment catalog
+
+        Args:
+            path: JSON catalog file ({'modules': [...], 'inverters': [...]})
+            fetch_records: Callable returning catalog rows from the database
+
+        Without either, the built-in catalog is used.
+        """
+        if path:
+            self.equipment_catalog = EquipmentCatalog.from_file(path)
+        elif fetch_records:
+            self.equipment_catalog = EquipmentCatalog.from_records(fetch_records())
+        else:
+            self.equipment_catalog = EquipmentCatalog.default()
+
+    def select_equipment(self, plant_capacity: float) -> Optional[Dict[str, Any]]:
+        """
+        Cheapest valid module/inverter combination and string layout
+
+        Args:
+            plant_capacity: DC capacity in kW
+
+        Returns:
+            EquipmentCatalog.select design dict (loaded catalog, else the
+            built-in one), or None if nothing fits
+        """
+        catalog = self.equipment_catalog or EquipmentCatalog.default()
+        return catalog.select(plant_capacity)
+
+    def get_rooftop_capacity(self, rooftop_area: Optional[float] = None, roof_polygon=None,
+                             tilt: float = DEFAULT_TILT, latitude: float = DEFAULT_LATITUDE) -> Dict[str, Any]:
+        """
+        Maximum installable capacity on a roof
+
+        Args:
+            rooftop_area: Usable rooftop area in sq ft (packed as a square roof)
+            roof_polygon: Roof outline vertices in metres (x east, y north);
+                takes precedence over rooftop_area
+            tilt: Module tilt in degrees (sets the row spacing)
+            latitude: Site latitude in degrees
+
+        Returns:
+            RooftopLayout.pack result (module_count, capacity_kw, rows, ...)
+        """
+        return self.rooftop_layout.max_capacity(rooftop_area, roof_polygon, tilt, latitude)
+
+    def get_area_per_kw(self, layout: Optional[Dict[str, Any]] = None) -> float:
+        """
+        Roof area needed per kW in sq ft
+
+        Args:
+            layout: Optional get_rooftop_capacity result; the roof area per kW
+                its module rows (spacing included) achieve replaces the
+                AREA_PER_KW rule of thumb
+
+        Returns:
+            Area per kW in sq ft
+        """
+        if not layout or not layout['capacity_kw']:
+            return self.AREA_PER_KW
+        return layout['roof_area'] * SQ_FT_PER_M2 / layout['capacity_kw']
+
+    def get_cost_per_kw(self, consumer_type: str, capacity: float, state: Optional[str] = None,
+                        installer: Optional[str] = None) -> float:
         """
         Get cost per kW based on consumer type and system size
 
         Args:
             consumer_type: Type of consumer (Residential/Commercial/Industrial)
             capacity: System capacity in kW
+            state: Optional state for a state-specific price book
+            installer: Optional installer for an installer-specific price book
 
         Returns:
             Cost per kW in ₹
         """
-        cost_matrix = self.COST_PER_KW.get(consumer_type, self.COST_PER_KW['Residential'])
-
-        if consumer_type == 'Residential':
-            if capacity < 5:
-                return cost_matrix['small']
-            elif capacity <= 10:
-                return cost_matrix['medium']
-            else:
-                return cost_matrix['large']
-        elif consumer_type == 'Commercial':
-            if capacity < 50:
-                return cost_matrix['small']
-            elif capacity <= 100:
-                return cost_matrix['medium']
-            else:
-                return cost_matrix['large']
-        else:  # Industrial
-            if capacity < 100:
-                return cost_matrix['small']
-            elif capacity <= 500:
-                return cost_matrix['medium']
-            else:
-                return cost_matrix['large']
+        return self.get_price_book().price(consumer_type, capacity, state, installer)
+
+    def get_cost_breakpoints(self, consumer_type: str, state: Optional[str] = None,
+                             installer: Optional[str] = None) -> tuple:
+        """Capacity breakpoints (kW) between the price tiers for a consumer type"""
+        return self.get_price_book().tiers(consumer_type, state, installer).breakpoints
+
+    def get_cost_per_kw_array(self, consumer_type: np.ndarray, capacity: np.ndarray,
+                              state=None, installer=None) -> np.ndarray:
+        """
+        Vectorized version of get_cost_per_kw for whole columns
+
+        Args:
+            consumer_type: Array of consumer types (Residential/Commercial/Industrial)
+            capacity: Array of system capacities in kW
+            state: Optional array or scalar of states
+            installer: Optional array or scalar of installers
+
+        Returns:
+            Array of cost per kW in ₹
+        """
+        return self.get_price_book().price_array(consumer_type, capacity, state, installer)
 
     def calculate_plant_capacity_precise(self, monthly_consumption: float, avg_irradiance: float) -> float:
         """
@@ -153,7 +432,52 @@ class SolarCalculator:
         """
         return capacity * avg_irradiance * self.PERFORMANCE_RATIO * 30
 
-    def calculate_investment_capex(self, capacity: float, consumer_type: str) -> float:
+    def calculate_hourly_generation(self, capacity: float, latitude: float, longitude: float,
+                                    avg_irradiance: float, weather_factors: Optional[Dict[str, float]] = None,
+                                    seasonal_variation: Optional[Dict[str, float]] = None,
+                                    tilt: Optional[float] = None,
+                                    surface_azimuth: Optional[float] = None,
+                                    beam_loss: Optional[np.ndarray] = None,
+                                    diffuse_loss: float = 0.0,
+                                    ambient_temperature: Optional[np.ndarray] = None,
+                                    wind_speed: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Simulate a full year of hourly generation (opt-in alternative to
+        calculate_monthly_generation_precise)
+
+        Args:
+            capacity: System capacity in kW
+            latitude: Site latitude in degrees
+            longitude: Site longitude in degrees
+            avg_irradiance: Average solar irradiance in kWh/m²/day
+            weather_factors: Weather impact factors from SolarDataFetcher
+                (cloud/humidity derate the irradiance; dust and temperature
+                are covered by PERFORMANCE_RATIO)
+            seasonal_variation: Seasonal irradiance from SolarDataFetcher
+            tilt: Module tilt in degrees (defaults to latitude)
+            surface_azimuth: Module azimuth in degrees (defaults to south)
+            beam_loss: Optional hourly shaded beam fraction (ShadingModel.beam_loss)
+            diffuse_loss: Fraction of sky diffuse blocked (ShadingModel.diffuse_loss)
+            ambient_temperature: Optional hourly ambient temperature in °C
+                for a cell-temperature derate (TEMPERATURE_ASSUMPTIONS),
+                relative to the temperature loss PERFORMANCE_RATIO includes
+            wind_speed: Optional hourly wind speed in m/s
+
+        Returns:
+            Hourly generation in kWh (8760 values)
+        """
+        simulator = HourlySimulator(performance_ratio=self.PERFORMANCE_RATIO,
+                                    temperature_model=TemperatureModel(**self.TEMPERATURE_ASSUMPTIONS))
+        return simulator.simulate(
+            capacity, latitude, longitude, avg_irradiance,
+            tilt=tilt, surface_azimuth=surface_azimuth,
+            weather_factors=weather_factors, seasonal_variation=seasonal_variation,
+            beam_loss=beam_loss, diffuse_loss=diffuse_loss,
+            ambient_temperature=ambient_temperature, wind_speed=wind_speed
+        )
+
+    def calculate_investment_capex(self, capacity: float, consumer_type: str, state: Optional[str] = None,
+                                   installer: Optional[str] = None) -> float:
         """
         Calculate investment for CAPEX model:
         Investment (CAPEX) = Capacity x Cost per kW
@@ -161,11 +485,13 @@ class SolarCalculator:
         Args:
             capacity: System capacity in kW
             consumer_type: Type of consumer
+            state: Optional state for state-specific pricing
+            installer: Optional installer for installer-specific pricing
 
         Returns:
             Total investment in ₹
         """
-        cost_per_kw = self.get_cost_per_kw(consumer_type, capacity)
+        cost_per_kw = self.get_cost_per_kw(consumer_type, capacity, state, installer)
         return capacity * cost_per_kw
 
     def calculate_annual_savings_precise(self, yearly_generation: float, tariff_rate: float) -> float:
@@ -182,6 +508,152 @@ class SolarCalculator:
         """
         return yearly_generation * tariff_rate
 
+    def calculate_bill_savings(self, hourly_generation: np.ndarray, monthly_consumption: float,
+                               consumer_category: str, load_profile: Optional[np.ndarray] = None,
+                               settlement_mode: Optional[str] = None) -> Dict[str, float]:
+        """
+        Annual savings from billing the hourly load before and after solar
+        under the category's slab, fixed, demand and time-of-use charges
+
+        Args:
+            hourly_generation: 8760 hourly generation values in kWh
+            monthly_consumption: Monthly consumption in kWh
+            consumer_category: consumer_categories or calculator form code
+            load_profile: Optional 8760 hourly load in kWh (default expands
+                the consumption with the category's load archetype)
+            settlement_mode: Optional "retail", "net_metering" or
+                "net_billing"; grid imports are billed under the category and
+                exports are credited under SETTLEMENT_ASSUMPTIONS (energy
+                netted or credited at retail is valued at the category's
+                average slab rate) instead of the tariff book's export rate
+
+        Returns:
+            Dict with annual_pre, annual_post and annual_savings in ₹
+        """
+        if load_profile is None:
+            load_profile = generate_load_profile(monthly_consumption, consumer_category=consumer_category)
+        schedule = self.tariff_book.schedule(consumer_category)
+        if settlement_mode is None:
+            bills = schedule.compare(load_profile, hourly_generation)
+            return {key: float(bills[key][0]) for key in ('annual_pre', 'annual_post', 'annual_savings')}
+
+        settlement = self.calculate_settlement(hourly_generation, load_profile, schedule.average_rate,
+                                               settlement_mode)
+        # Whatever the settlement pays beyond the self-consumed energy is the export credit
+        credit = float(settlement['annual_savings'][0] - settlement['self_consumed'][0] * schedule.average_rate)
+        usable = np.asarray(hourly_generation, dtype=float)
+        sanctioned_load = self.SETTLEMENT_ASSUMPTIONS.get('sanctioned_load')
+        if sanctioned_load is not None:
+            usable = np.minimum(usable, sanctioned_load)
+        annual_pre = float(schedule.bill(load_profile)['total'].sum())
+        annual_post = float(schedule.bill(np.maximum(load_profile - usable, 0))['total'].sum()) - credit
+        return {'annual_pre': annual_pre, 'annual_post': annual_post, 'annual_savings': annual_pre - annual_post}
+
+    def calculate_self_consumption(self, hourly_generation: np.ndarray, monthly_consumption: float,
+                                   consumer_type: str = "Residential",
+                                   consumer_category: Optional[str] = None,
+                                   load_profile: Optional[np.ndarray] = None) -> Dict[str, float]:
+        """
+        How much generation is used on site hour by hour
+
+        Args:
+            hourly_generation: 8760 hourly generation values in kWh
+            monthly_consumption: Monthly consumption in kWh
+            consumer_type: Consumer type for the default load profile
+            consumer_category: Optional category for the default load profile
+            load_profile: Optional 8760 hourly load in kWh
+
+        Returns:
+            Dict with self_consumed, grid_export and grid_import (kWh/year),
+            self_consumption (share of generation used on site) and
+            self_sufficiency (share of load met by solar)
+        """
+        if load_profile is None:
+            load_profile = generate_load_profile(monthly_consumption, consumer_type, consumer_category)
+        generation = np.asarray(hourly_generation, dtype=float)
+        self_consumed = float(np.minimum(generation, load_profile).sum())
+        total_generation = float(generation.sum())
+        total_load = float(np.sum(load_profile))
+        return {
+            'self_consumed': self_consumed,
+            'grid_export': total_generation - self_consumed,
+            'grid_import': total_load - self_consumed,
+            'self_consumption': self_consumed / total_generation if total_generation > 0 else 0.0,
+            'self_sufficiency': self_consumed / total_load if total_load > 0 else 0.0
+        }
+
+    def calculate_settlement(self, hourly_generation: np.ndarray, load_profile: np.ndarray,
+                             tariff_rate, settlement_mode: str = "net_billing",
+                             **overrides) -> Dict[str, np.ndarray]:
+        """
+        Settle hourly generation against load for one customer or a portfolio
+
+        Args:
+            hourly_generation: Hourly generation in kWh, (customers, 8760) or (8760,)
+            load_profile: Hourly load in kWh, same shape or broadcastable
+            tariff_rate: Retail tariff in ₹/kWh (scalar or per customer)
+            settlement_mode: "retail", "net_metering" or "net_billing"
+            **overrides: Per-run SETTLEMENT_ASSUMPTIONS values (scalars or
+                per-customer arrays for export_limit and sanctioned_load)
+
+        Returns:
+            Dict of per-customer arrays from SettlementModel.settle
+        """
+        assumptions = dict(self.SETTLEMENT_ASSUMPTIONS, **overrides)
+        return SettlementModel(settlement_mode, **assumptions).settle(hourly_generation, load_profile, tariff_rate)
+
+    def get_storage_sizing(self, hourly_generation: np.ndarray, monthly_consumption: float,
+                           tariff_rate: float, consumer_category: Optional[str] = None,
+                           sizes=DEFAULT_BATTERY_SIZES, load_profile: Optional[np.ndarray] = None,
+                           outages: Optional[np.ndarray] = None, arbitrage: bool = False,
+                           consumer_type: str = "Residential") -> Dict[str, np.ndarray]:
+        """
+        Storage-sizing curve: dispatch and bill every battery size in one pass
+
+        Args:
+            hourly_generation: 8760 hourly generation values in kWh
+            monthly_consumption: Monthly consumption in kWh
+            tariff_rate: Flat tariff in ₹/unit (used without a consumer_category)
+            consumer_category: Optional consumer_categories code; bills use its
+                slab/time-of-use schedule
+            sizes: Battery capacities in kWh (0 is the solar-only baseline)
+            load_profile: Optional 8760 hourly load in kWh (default expands
+                the consumption with the category or consumer-type archetype)
+            outages: Optional boolean mask of grid outage hours
+            arbitrage: Charge from the grid in the cheapest time-of-use hours
+            consumer_type: Consumer type for the default load profile
+
+        Returns:
+            Dict of per-size arrays: the StorageSimulator results plus
+            annual_bill, annual_savings (vs. the smallest size), battery_cost
+            and payback_period
+        """
+        if load_profile is None:
+            load_profile = generate_load_profile(monthly_consumption, consumer_type, consumer_category)
+        schedule = self.tariff_book.schedule(consumer_category) if consumer_category else None
+        prices = None
+        if arbitrage and schedule is not None:
+            prices = schedule.average_rate + schedule.tou_adders
+
+        curve = self.storage_simulator.simulate(hourly_generation, load_profile, sizes,
+                                                prices=prices, outages=outages, hourly=True)
+        if schedule is not None:
+            annual_bill = schedule.bill(curve.pop('hourly_import'), curve.pop('hourly_export'))['total'].sum(axis=1)
+        else:
+            curve.pop('hourly_import'), curve.pop('hourly_export')
+            annual_bill = curve['grid_import'] * tariff_rate
+
+        annual_savings = annual_bill[np.argmin(curve['size'])] - annual_bill
+        battery_cost = curve['size'] * self.BATTERY_COST_PER_KWH
+        curve.update({
+            'annual_bill': annual_bill,
+            'annual_savings': annual_savings,
+            'battery_cost': battery_cost,
+            'payback_period': np.divide(battery_cost, annual_savings, out=np.full(annual_bill.shape, 999.0),
+                                        where=annual_savings > 0)
+        })
+        return curve
+
     def calculate_payback_period_precise(self, investment: float, annual_savings: float) -> float:
         """
         Calculate payback period:
@@ -198,22 +670,293 @@ class SolarCalculator:
             return 999  # Invalid case
         return investment / annual_savings
 
-    def calculate_co2_saved(self, yearly_generation: float) -> float:
+    def get_cash_flow_model(self) -> CashFlowModel:
+        """Cash-flow model built from SYSTEM_LIFETIME and CASH_FLOW_ASSUMPTIONS"""
+        return CashFlowModel(lifetime=self.SYSTEM_LIFETIME, **self.CASH_FLOW_ASSUMPTIONS)
+
+    def get_lifetime_simulator(self) -> LifetimeSimulator:
+        """Lifetime simulator built from SYSTEM_LIFETIME, the cash-flow degradation rate and LIFETIME_ASSUMPTIONS"""
+        return LifetimeSimulator(lifetime=self.SYSTEM_LIFETIME,
+                                 degradation_rate=self.CASH_FLOW_ASSUMPTIONS['degradation_rate'],
+                                 **self.LIFETIME_ASSUMPTIONS)
+
+    def get_performance_curve(self) -> np.ndarray:
+        """
+        Each year's output relative to the nameplate year-one estimate
+
+        Returns:
+            Read-only array of SYSTEM_LIFETIME multipliers (shared between calls)
+        """
+        assumptions = self.LIFETIME_ASSUMPTIONS
+        return performance_curve(self.SYSTEM_LIFETIME, assumptions['first_year_lid'],
+                                 self.CASH_FLOW_ASSUMPTIONS['degradation_rate'], assumptions['availability'],
+                                 assumptions['soiling_rate'], assumptions['soiling_cap'],
+                                 assumptions['cleaning_interval'])
+
+    def get_lifetime_factor(self) -> float:
+        """
+        Lifetime total as a multiple of the nameplate year-one value (sum of
+        the performance curve, so year one itself counts below 1)
+        """
+        return float(self.get_performance_curve().sum())
+
+    def get_emission_factors(self, state=None) -> np.ndarray:
+        """
+        Grid emission factor for each year of the plant's life
+
+        Args:
+            state: State name, or an array of states (None: national factors)
+
+        Returns:
+            (SYSTEM_LIFETIME,) kg CO2 per unit, or (states, SYSTEM_LIFETIME)
+            for an array of states
+        """
+        return self.emission_factors.factors(state, self.COMMISSIONING_YEAR, self.SYSTEM_LIFETIME)
+
+    def get_co2_intensity(self, state=None):
+        """
+        Lifetime kg CO2 avoided per unit of year-one generation
+
+        The performance curve dotted with the state's per-year factors.
+
+        Args:
+            state: State name, or an array of states
+
+        Returns:
+            float for one state, array for an array of states
+        """
+        intensity = self.emission_factors.weighted_factor(self.get_performance_curve(), state,
+                                                          self.COMMISSIONING_YEAR)
+        return float(intensity) if np.ndim(intensity) == 0 else intensity
+
+    def get_lifetime_simulation(self, yearly_generation, annual_savings, state=None,
+                                **overrides) -> Dict[str, np.ndarray]:
+        """
+        Per-year generation, savings and CO2 for one or many scenarios
+
+        Args:
+            yearly_generation: Year-one generation in kWh (scalar or array)
+            annual_savings: Year-one savings in ₹ (scalar or array)
+            state: State name or per-scenario array for the grid emission factors
+            **overrides: Per-scenario first_year_lid, degradation_rate,
+                availability, soiling_rate, soiling_cap or cleaning_interval
+
+        Returns:
+            Dict with (scenarios, SYSTEM_LIFETIME) performance, generation,
+            savings and co2_saved (tons) matrices
+        """
+        return self.get_lifetime_simulator().simulate(yearly_generation, annual_savings,
+                                                      self.get_emission_factors(state), **overrides)
+
+    def calculate_cash_flow_analysis(self, investment: float, yearly_generation: float,
+                                     tariff_rate: float) -> Dict[str, float]:
+        """
+        Year-by-year financial analysis with the lifetime performance curve,
+        tariff escalation, O&M, inverter replacement and discounting
+
+        Args:
+            investment: Total investment in ₹
+            yearly_generation: First-year generation in kWh
+            tariff_rate: First-year tariff in ₹/unit
+
+        Returns:
+            Dict with npv, irr (fraction, NaN if undefined), payback,
+            discounted_payback, lcoe and lifetime_savings
+        """
+        analysis = self.get_cash_flow_model().analyze(
+            investment, yearly_generation, tariff_rate,
+            generation=yearly_generation * self.get_performance_curve()[np.newaxis, :]
+        )
+        return {key: float(analysis[key][0]) for key in
+                ('npv', 'irr', 'payback', 'discounted_payback', 'lcoe', 'lifetime_savings')}
+
+    def get_financing_model(self) -> FinancingModel:
+        """Financing model built from the cash-flow model and FINANCING_ASSUMPTIONS"""
+        terms = {key: value for key, value in self.FINANCING_ASSUMPTIONS.items() if key != 'tax_rates'}
+        return FinancingModel(self.get_cash_flow_model(), **terms)
+
+    def get_financing_analysis(self, investment, yearly_generation, tariff_rate, consumer_type="Residential",
+                               **overrides) -> Dict[str, np.ndarray]:
+        """
+        Loan, EMI, subsidy and depreciation analysis of a CAPEX purchase
+
+        Every argument may be an array (one row per scenario), so a grid of
+        loan terms for one customer is a single call.
+
+        Args:
+            investment: Total investment in ₹
+            yearly_generation: First-year generation in kWh
+            tariff_rate: First-year tariff (savings per unit) in ₹
+            consumer_type: Consumer type(s); sets the default tax rate
+            **overrides: Per-scenario loan_fraction, interest_rate,
+                tenor_years, interest_subsidy, subsidy_years, tax_rate or
+                depreciation_rate
+
+        Returns:
+            FinancingModel.analyze() dict (equity_irr and cash_on_cash as
+            fractions)
+        """
+        if overrides.get('tax_rate') is None:
+            tax_rates = self.FINANCING_ASSUMPTIONS['tax_rates']
+            types = np.asarray(consumer_type, dtype=object)
+            overrides['tax_rate'] = (tax_rates.get(consumer_type, 0.0) if types.ndim == 0 else
+                                     np.array([tax_rates.get(name, 0.0) for name in types.tolist()]))
+        generation = np.atleast_1d(np.asarray(yearly_generation, dtype=float))
+        return self.get_financing_model().analyze(
+            investment, generation, tariff_rate,
+            generation=generation[:, np.newaxis] * self.get_performance_curve(), **overrides
+        )
+
+    def get_loan_grid(self, monthly_bill: float, tariff_rate: float, solar_irradiance: float = None,
+                      consumer_type: str = "Residential", tenor_years=(3, 5, 7, 10),
+                      interest_rates=(0.08, 0.09, 0.10, 0.11, 0.12), state: Optional[str] = None,
+                      **overrides) -> Dict[str, Any]:
+        """
+        Financing outcomes for every loan tenor x interest rate for one customer
+
+        Args:
+            monthly_bill: Monthly electricity bill in ₹
+            tariff_rate: Electricity tariff rate in ₹/unit
+            solar_irradiance: Solar irradiance for location
+            consumer_type: Type of consumer
+            tenor_years: Loan tenors (rows of the grid)
+            interest_rates: Annual interest rates as fractions (columns)
+            state: Optional state for state-specific cost per kW
+            **overrides: Other FINANCING_ASSUMPTIONS overrides
+
+        Returns:
+            Dict with plant_capacity, investment, the two axes and
+            (tenors, rates) arrays of emi, total_interest, equity_irr,
+            equity_npv and equity_payback, plus cash_on_cash
+            (tenors, rates, years)
+        """
+        avg_irradiance = solar_irradiance if solar_irradiance else 4.5
+        monthly_consumption = self.calculate_monthly_consumption(monthly_bill, tariff_rate)
+        plant_capacity = self.calculate_plant_capacity_precise(monthly_consumption, avg_irradiance)
+        yearly_generation = self.calculate_monthly_generation_precise(plant_capacity, avg_irradiance) * 12
+        investment = self.calculate_investment_capex(plant_capacity, consumer_type, state)
+
+        tenors, rates = np.meshgrid(np.asarray(tenor_years, dtype=float),
+                                    np.asarray(interest_rates, dtype=float), indexing='ij')
+        result = self.get_financing_analysis(investment, yearly_generation, tariff_rate, consumer_type,
+                                             tenor_years=tenors.ravel(), interest_rate=rates.ravel(),
+                                             **overrides)
+        grid = {name: result[name].reshape(tenors.shape)
+                for name in ('emi', 'equity_irr', 'equity_npv', 'equity_payback')}
+        grid['total_interest'] = result['interest'].sum(axis=1).reshape(tenors.shape)
+        grid['cash_on_cash'] = result['cash_on_cash'].reshape(tenors.shape + (-1,))
+
+        return {
+            'plant_capacity': plant_capacity,
+            'investment': investment,
+            'tenor_years': tenors[:, 0],
+            'interest_rate': rates[0],
+            **grid
+        }
+
+    def get_ppa_model(self) -> PPAModel:
+        """PPA model built from the cash-flow model and PPA_ASSUMPTIONS"""
+        return PPAModel(self.get_cash_flow_model(), **self.PPA_ASSUMPTIONS)
+
+    def get_ppa_analysis(self, investment, yearly_generation, tariff_rate, **overrides) -> Dict[str, np.ndarray]:
+        """
+        Developer LCOE, target-IRR PPA tariff and customer savings of an OPEX system
+
+        Every argument may be an array (one row per scenario).
+
+        Args:
+            investment: Developer investment in ₹
+            yearly_generation: First-year generation in kWh
+            tariff_rate: First-year grid tariff (savings per unit) in ₹
+            **overrides: Per-scenario target_irr, ppa_escalation or
+                grid_escalation
+
+        Returns:
+            PPAModel.analyze() dict (savings_percent in %)
+        """
+        generation = np.atleast_1d(np.asarray(yearly_generation, dtype=float))
+        return self.get_ppa_model().analyze(
+            investment, generation, tariff_rate,
+            generation=generation[:, np.newaxis] * self.get_performance_curve(), **overrides
+        )
+
+    def get_ppa_rate_card(self, capacity: float = 100.0, consumer_type: str = "Commercial",
+                          cities: Optional[List[str]] = None, **overrides) -> Dict[str, np.ndarray]:
+        """
+        PPA tariff and customer savings for a reference plant in every city
+
+        All cities are priced in one vectorized pass: each city's irradiance
+        sets the generation, its state the cost per kW and its default tariff
+        the grid price the PPA competes with.
+
+        Args:
+            capacity: Plant capacity in kW
+            consumer_type: Type of consumer (selects the price tiers)
+            cities: Cities to price (default: every city in LOCATION_DATA)
+            **overrides: target_irr, ppa_escalation or grid_escalation
+                (scalars or per-city arrays)
+
+        Returns:
+            Dict of column name -> array, one row per city: city, state,
+            solar_irradiance, grid_tariff, yearly_generation, investment,
+            developer_lcoe, ppa_tariff, annual_savings, lifetime_savings and
+            savings_percent
+        """
+        cities = list(LOCATION_DATA) if cities is None else list(cities)
+        info = [LOCATION_DATA[city] for city in cities]
+        states = np.array([item['state'] for item in info], dtype=object)
+        irradiance = np.array([item['irradiance'] for item in info], dtype=float)
+        grid_tariff = np.array([item['tariff'] for item in info], dtype=float)
+
+        plant_capacity = np.full(len(cities), float(capacity))
+        yearly_generation = plant_capacity * irradiance * self.PERFORMANCE_RATIO * 30 * 12
+        investment = plant_capacity * self.get_cost_per_kw_array(
+            np.full(len(cities), consumer_type, dtype=object), plant_capacity, states)
+        ppa = self.get_ppa_analysis(investment, yearly_generation, grid_tariff, **overrides)
+
+        return {
+            'city': np.array(cities, dtype=object),
+            'state': states,
+            'solar_irradiance': irradiance,
+            'grid_tariff': grid_tariff,
+            'yearly_generation': yearly_generation,
+            'investment': investment,
+            'developer_lcoe': ppa['lcoe'],
+            'ppa_tariff': ppa['ppa_tariff'],
+            'annual_savings': ppa['annual_savings'],
+            'lifetime_savings': ppa['lifetime_savings'],
+            'savings_percent': ppa['savings_percent']
+        }
+
+    def calculate_co2_saved(self, yearly_generation: float, state: Optional[str] = None) -> float:
         """
         Calculate CO2 saved:
-        CO2 Saved = Yearly Generation x 0.8 (kg CO2/unit)
+        CO2 Saved = Yearly Generation x grid factor (kg CO2/unit) of the
+        state in the commissioning year
 
         Args:
             yearly_generation: Annual generation in kWh
+            state: Optional state (None or unknown: national factor)
 
         Returns:
-            CO2 saved in kg per year
+            CO2 saved in kg in the first year
         """
-        return yearly_generation * self.CO2_FACTOR
+        return yearly_generation * self.emission_factors.factor(state, self.COMMISSIONING_YEAR)
 
     def get_comprehensive_analysis(self, monthly_bill: float, tariff_rate: float,
                                  investment_model: str = "CAPEX", solar_irradiance: float = None,
-                                 consumer_type: str = "Residential") -> Dict[str, Any]:
+                                 consumer_type: str = "Residential", generation_mode: str = "flat",
+                                 solar_data: Optional[Dict[str, Any]] = None,
+                                 financial_model: str = "simple", state: Optional[str] = None,
+                                 installer: Optional[str] = None,
+                                 consumer_category: Optional[str] = None,
+                                 settlement_mode: Optional[str] = None,
+                                 shadow_free: Optional[bool] = None,
+                                 horizon_profile: Optional[List[float]] = None,
+                                 rooftop_area: Optional[float] = None,
+                                 roof_polygon: Optional[List[List[float]]] = None,
+                                 financing: Optional[Dict[str, Any]] = None,
+                                 ppa: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """
         Get comprehensive solar analysis using your precise formulas
 
@@ -223,9 +966,48 @@ class SolarCalculator:
             investment_model: "CAPEX" or "OPEX"
             solar_irradiance: Solar irradiance for location
             consumer_type: Type of consumer
+            generation_mode: "flat" (Capacity x Irradiance x PR x 30) or "hourly"
+                (8760 simulation; needs latitude/longitude in solar_data and
+                uses optimal_tilt/optimal_azimuth and the city's hourly
+                temperatures when present)
+            solar_data: Enhanced location data from SolarDataFetcher
+            financial_model: "simple" (payback = Investment / Savings, lifetime =
+                25 x annual) or "cash_flow" (year-by-year engine, adds NPV,
+                IRR, discounted payback and LCOE)
+            state: Optional state for state-specific cost per kW
+            installer: Optional installer for installer-specific cost per kW
+            consumer_category: Optional consumer_categories code; in hourly
+                mode savings are the difference between the slab/time-of-use
+                bills before and after solar instead of generation x tariff
+            settlement_mode: Optional "net_metering" or "net_billing"; in
+                hourly mode savings come from self-consumed and exported
+                energy under SETTLEMENT_ASSUMPTIONS (with a consumer_category
+                the exports are credited this way against the category bills)
+            shadow_free: The form's shadow-free flag; False applies the
+                default obstruction profile when no horizon_profile is given
+            horizon_profile: Optional obstruction elevations (degrees) per
+                equal azimuth bin from north; derates generation for shading
+            rooftop_area: Usable rooftop area in sq ft; capacity is capped at
+                what the module rows packed into it can hold and area_required
+                follows the packed layout (ValueError if no module fits)
+            roof_polygon: Roof outline in metres, used instead of a square
+                roof of rooftop_area
+            financing: Optional FINANCING_ASSUMPTIONS overrides ({} for the
+                defaults); CAPEX results then add loan_amount, emi,
+                equity_irr, equity_payback and per-year cash_on_cash (%)
+            ppa: Optional PPA_ASSUMPTIONS overrides ({} for the defaults);
+                OPEX results then add the developer's ppa_tariff and
+                developer_lcoe and the customer's ppa_annual_savings,
+                ppa_lifetime_savings and ppa_savings_percent against grid
+                escalation
 
         Returns:
-            Dictionary with all calculations and recommendations
+            Dictionary with all calculations and recommendations.
+            monthly/yearly_generation and monthly/annual_savings are nameplate
+            year-one estimates (irradiance x PERFORMANCE_RATIO only); the
+            lifetime figures, cash flows and CO2 totals also apply the
+            LIFETIME_ASSUMPTIONS performance curve, whose first year is
+            already below 1 (LID, availability, soiling)
         """
         # Use provided solar irradiance or default
         avg_irradiance = solar_irradiance if solar_irradiance else 4.5
@@ -235,115 +1017,580 @@ class SolarCalculator:
 
         # Step 2: Calculate plant capacity using precise formula
         plant_capacity = self.calculate_plant_capacity_precise(monthly_consumption, avg_irradiance)
+        layout = None
+        if rooftop_area or roof_polygon:
+            site = solar_data or {}
+            layout = self.get_rooftop_capacity(rooftop_area, roof_polygon,
+                                               site.get('optimal_tilt', DEFAULT_TILT),
+                                               site.get('latitude', DEFAULT_LATITUDE))
+            if not layout['module_count']:
+                raise ValueError("Rooftop is too small to fit a single solar module")
+            plant_capacity = min(plant_capacity, layout['capacity_kw'])
+
+        shading = None
+        if horizon_profile is not None:
+            shading = ShadingModel(horizon_profile)
+        elif shadow_free is False:
+            shading = ShadingModel()
 
-        # Step 3: Calculate generation using precise formulas
-        monthly_generation = self.calculate_monthly_generation_precise(plant_capacity, avg_irradiance)
+        # Step 3: Calculate generation using precise formulas (or the hourly engine)
+        if generation_mode == "hourly" and solar_data and 'latitude' in solar_data:
+            site_losses = {}
+            if shading is not None:
+                site_losses = {'beam_loss': shading.beam_loss(solar_data['latitude']),
+                               'diffuse_loss': shading.diffuse_loss}
+            weather = get_hourly_weather(solar_data.get('city'))
+            if weather is None and 'climate_zone' in solar_data:
+                weather = hourly_weather(solar_data['climate_zone'])
+            if weather is not None:
+                site_losses.update(ambient_temperature=weather['temperature'],
+                                   wind_speed=weather['wind_speed'])
+            hourly_generation = self.calculate_hourly_generation(
+                plant_capacity, solar_data['latitude'], solar_data['longitude'], avg_irradiance,
+                weather_factors=solar_data.get('weather_factors'),
+                seasonal_variation=solar_data.get('seasonal_variation'),
+                tilt=solar_data.get('optimal_tilt'),
+                surface_azimuth=solar_data.get('optimal_azimuth'),
+                **site_losses
+            )
+            monthly_generation = float(hourly_generation.sum()) / 12
+        else:
+            generation_mode = "flat"
+            monthly_generation = self.calculate_monthly_generation_precise(plant_capacity, avg_irradiance)
+            if shading is not None:
+                site = solar_data or {}
+                monthly_generation *= 1 - shading.annual_loss(
+                    site.get('latitude', DEFAULT_LATITUDE), site.get('longitude', DEFAULT_LONGITUDE),
+                    avg_irradiance, site.get('seasonal_variation')
+                )
         yearly_generation = monthly_generation * 12
 
-        # Step 4: Calculate savings using precise formulas
-        annual_savings = self.calculate_annual_savings_precise(yearly_generation, tariff_rate)
+        # Step 4: Calculate savings using precise formulas (or the billing engine)
+        if generation_mode == "hourly" and consumer_category:
+            annual_savings = self.calculate_bill_savings(
+                hourly_generation, monthly_consumption, consumer_category, settlement_mode=settlement_mode
+            )['annual_savings']
+        elif generation_mode == "hourly" and settlement_mode:
+            load_profile = generate_load_profile(monthly_consumption, consumer_type)
+            annual_savings = float(self.calculate_settlement(
+                hourly_generation, load_profile, tariff_rate, settlement_mode
+            )['annual_savings'][0])
+        else:
+            annual_savings = self.calculate_annual_savings_precise(yearly_generation, tariff_rate)
         monthly_savings = annual_savings / 12
-        lifetime_savings = annual_savings * self.SYSTEM_LIFETIME
+        lifetime_factor = self.get_lifetime_factor()
+        lifetime_savings = annual_savings * lifetime_factor
 
         # Step 5: Calculate environmental impact using precise formulas
-        annual_co2_saved_kg = self.calculate_co2_saved(yearly_generation)
+        annual_co2_saved_kg = self.calculate_co2_saved(yearly_generation, state)
         annual_co2_saved = annual_co2_saved_kg / 1000  # Convert to tons
-        lifetime_co2_saved = annual_co2_saved * self.SYSTEM_LIFETIME
+        lifetime_co2_saved = self.calculate_co2_saved_lifetime_from_generation(yearly_generation, state)
         equivalent_trees = self.calculate_equivalent_trees(annual_co2_saved)
+        equivalent_trees_lifetime = self.calculate_equivalent_trees_lifetime(lifetime_co2_saved)
 
         # Step 6: Calculate investment and payback (only for CAPEX)
         investment = 0
         payback_period = 0
         if investment_model == "CAPEX":
-            investment = self.calculate_investment_capex(plant_capacity, consumer_type)
+            investment = self.calculate_investment_capex(plant_capacity, consumer_type, state, installer)
             payback_period = self.calculate_payback_period_precise(investment, annual_savings)
 
+        cash_flow = None
+        if financial_model == "cash_flow":
+            cash_flow = self.calculate_cash_flow_analysis(investment, yearly_generation, tariff_rate)
+            lifetime_savings = cash_flow['lifetime_savings']
+            if investment_model == "CAPEX":
+                payback_period = cash_flow['payback']
+
         # Step 7: Calculate additional system specifications
         panel_count = math.ceil(plant_capacity / 0.4)  # Assuming 400W panels
         inverter_capacity = plant_capacity * 0.8  # 80% of DC capacity
-        area_required = plant_capacity * 8  # ~8 sq ft per kW for rooftop
+        if self.equipment_catalog is not None:
+            design = self.equipment_catalog.select(plant_capacity)
+            if design:
+                panel_count = design['module_count']
+                inverter_capacity = design['ac_capacity']
+        area_required = plant_capacity * self.get_area_per_kw(layout)
 
         # Step 8: Generate recommendations
         recommendations = self._generate_recommendations(
             plant_capacity, investment, payback_period, consumer_type, investment_model
         )
 
+        calculations = {
+            "monthly_consumption": round(monthly_consumption, 2),
+            "plant_capacity": round(plant_capacity, 2),
+            "monthly_generation": round(monthly_generation, 2),
+            "yearly_generation": round(yearly_generation, 0),
+            "monthly_savings": round(monthly_savings, 2),
+            "annual_savings": round(annual_savings, 0),
+            "lifetime_savings": round(lifetime_savings, 0),
+            "investment": round(investment, 0),
+            "payback_period": round(payback_period, 1),
+            "annual_co2_saved": round(annual_co2_saved, 2),
+            "lifetime_co2_saved": round(lifetime_co2_saved, 2),
+            "equivalent_trees": round(equivalent_trees, 0),
+            "equivalent_trees_lifetime": round(equivalent_trees_lifetime, 0),
+            "panel_count": panel_count,
+            "inverter_capacity": round(inverter_capacity, 2),
+            "area_required": round(area_required, 2)
+        }
+
+        if cash_flow and investment_model == "CAPEX":
+            calculations.update({
+                "npv": round(cash_flow['npv'], 0),
+                "irr": None if math.isnan(cash_flow['irr']) else round(cash_flow['irr'] * 100, 2),
+                "discounted_payback": round(cash_flow['discounted_payback'], 1),
+                "lcoe": round(cash_flow['lcoe'], 2)
+            })
+
+        if financing is not None and investment_model == "CAPEX":
+            savings_per_unit = annual_savings / yearly_generation if yearly_generation > 0 else 0.0
+            loan = self.get_financing_analysis(investment, yearly_generation, savings_per_unit,
+                                               consumer_type, **financing)
+            equity_irr = float(loan['equity_irr'][0])
+            calculations.update({
+                "loan_amount": round(float(loan['loan_amount'][0]), 0),
+                "emi": round(float(loan['emi'][0]), 0),
+                "equity_irr": None if math.isnan(equity_irr) else round(equity_irr * 100, 2),
+                "equity_payback": round(float(loan['equity_payback'][0]), 1),
+                "cash_on_cash": tuple(round(value * 100, 2) for value in loan['cash_on_cash'][0].tolist())
+            })
+
+        if ppa is not None and investment_model == "OPEX":
+            savings_per_unit = annual_savings / yearly_generation if yearly_generation > 0 else 0.0
+            project_cost = self.calculate_investment_capex(plant_capacity, consumer_type, state, installer)
+            pricing = self.get_ppa_analysis(project_cost, yearly_generation, savings_per_unit, **ppa)
+            calculations.update({
+                "ppa_tariff": round(float(pricing['ppa_tariff'][0]), 2),
+                "developer_lcoe": round(float(pricing['lcoe'][0]), 2),
+                "ppa_annual_savings": round(float(pricing['annual_savings'][0]), 0),
+                "ppa_lifetime_savings": round(float(pricing['lifetime_savings'][0]), 0),
+                "ppa_savings_percent": round(float(pricing['savings_percent'][0]), 1)
+            })
+
         return {
             "input_data": {
                 "monthly_bill": monthly_bill,
                 "tariff_rate": tariff_rate,
                 "investment_model": investment_model,
                 "consumer_type": consumer_type,
-                "solar_irradiance": avg_irradiance
-            },
-            "calculations": {
-                "monthly_consumption": round(monthly_consumption, 2),
-                "plant_capacity": round(plant_capacity, 2),
-                "monthly_generation": round(monthly_generation, 2),
-                "yearly_generation": round(yearly_generation, 0),
-                "monthly_savings": round(monthly_savings, 2),
-                "annual_savings": round(annual_savings, 0),
-                "lifetime_savings": round(lifetime_savings, 0),
-                "investment": round(investment, 0),
-                "payback_period": round(payback_period, 1),
-                "annual_co2_saved": round(annual_co2_saved, 2),
-                "lifetime_co2_saved": round(lifetime_co2_saved, 2),
-                "equivalent_trees": round(equivalent_trees, 0),
-                "panel_count": panel_count,
-                "inverter_capacity": round(inverter_capacity, 2),
-                "area_required": round(area_required, 2)
+                "solar_irradiance": avg_irradiance,
+                "generation_mode": generation_mode
             },
+            "calculations": calculations,
             "recommendations": recommendations
         }
 
+    def optimize_capacity(self, monthly_bill: float, tariff_rate: float, solar_irradiance: float = None,
+                          consumer_type: str = "Residential", objective: str = "npv",
+                          rooftop_area: Optional[float] = None, budget: Optional[float] = None,
+                          sanctioned_load: Optional[float] = None, export_rate: float = 0.0) -> Dict[str, Any]:
+        """
+        Capacity that maximizes NPV (or minimizes payback) within rooftop
+        area, budget and sanctioned-load limits
+
+        Args:
+            monthly_bill: Monthly electricity bill in ₹
+            tariff_rate: Electricity tariff rate in ₹/unit
+            solar_irradiance: Solar irradiance for location
+            consumer_type: Type of consumer
+            objective: "npv" or "payback"
+            rooftop_area: Available rooftop area in sq ft
+            budget: Maximum investment in ₹
+            sanctioned_load: Sanctioned load in kW
+            export_rate: Value of generation beyond consumption in ₹/unit
+
+        Returns:
+            Dictionary with the optimal point and the full capacity curve
+        """
+        avg_irradiance = solar_irradiance if solar_irradiance else 4.5
+        monthly_consumption = self.calculate_monthly_consumption(monthly_bill, tariff_rate)
+
+        return CapacityOptimizer(self).optimize(
+            monthly_consumption, tariff_rate, avg_irradiance, consumer_type, objective=objective,
+            rooftop_area=rooftop_area, budget=budget, sanctioned_load=sanctioned_load,
+            export_rate=export_rate
+        )
+
+    def get_inverse_analysis(self, solve_for: str, target_metric: str, target, monthly_bill=None,
+                             tariff_rate=None, solar_irradiance=None, consumer_type="Residential",
+                             capacity=None, cost_per_kw=None, export_rate: float = 0.0,
+                             state: Optional[str] = None, bracket=None) -> Dict[str, np.ndarray]:
+        """
+        Solve for the capacity, cost per kW, tariff or bill that gives a
+        target payback, IRR or annual savings
+
+        e.g. get_inverse_analysis("cost_per_kw", "payback", 4, 10000, 5.2, 6.0)
+        is the highest price per kW that still pays back in 4 years.
+
+        Args:
+            solve_for: "capacity", "cost_per_kw", "tariff" or "monthly_bill"
+            target_metric: "payback" (years), "irr" (fraction) or
+                "annual_savings" (₹)
+            target: Target value, or an array of targets solved in one call
+            monthly_bill: Monthly electricity bill in ₹ (scalar or array)
+            tariff_rate: Electricity tariff in ₹/unit (scalar or array)
+            solar_irradiance: Solar irradiance for location
+            consumer_type: Type of consumer (selects the price tiers)
+            capacity: Fixed capacity in kW (default: consumption-matched)
+            cost_per_kw: Fixed cost per kW in ₹ (default: price book)
+            export_rate: Value of generation beyond consumption in ₹/unit
+            state: Optional state for a state-specific price book
+            bracket: Optional (low, high) search range
+
+        Returns:
+            Dict of arrays: the solution under solve_for (NaN where the
+            target is unreachable), solved flags and capacity, cost_per_kw,
+            investment, annual_savings, payback and irr at the solution
+        """
+        avg_irradiance = solar_irradiance if solar_irradiance else 4.5
+        return InverseSolver(self).solve(
+            solve_for, target_metric, target, monthly_bill=monthly_bill, tariff_rate=tariff_rate,
+            avg_irradiance=avg_irradiance, consumer_type=consumer_type, capacity=capacity,
+            cost_per_kw=cost_per_kw, export_rate=export_rate, state=state, bracket=bracket
+        )
+
+    def get_monte_carlo_analysis(self, monthly_bill: float, tariff_rate: float,
+                                 solar_irradiance: float = None, consumer_type: str = "Residential",
+                                 draws: int = 10000, seed: Optional[int] = None,
+                                 distributions: Optional[Dict[str, Dict[str, Any]]] = None,
+                                 workers: int = 1) -> Dict[str, Any]:
+        """
+        Monte Carlo uncertainty analysis for a CAPEX system
+
+        The system is sized and priced with the nominal formulas; irradiance,
+        performance ratio, tariff escalation and cost per kW are then sampled
+        to get exceedance probabilities for generation, savings and payback.
+        Lifetime cash flows follow the same performance curve (LID,
+        degradation, availability, soiling) as the deterministic analysis.
+
+        Args:
+            monthly_bill: Monthly electricity bill in ₹
+            tariff_rate: Electricity tariff rate in ₹/unit
+            solar_irradiance: Solar irradiance for location
+            consumer_type: Type of consumer
+            draws: Number of Monte Carlo draws
+            seed: Seed for reproducible results
+            distributions: Overrides for the default input distributions
+            workers: Number of processes (1 = in-process)
+
+        Returns:
+            Dictionary with P50/P90/P99 and mean for each metric
+        """
+        avg_irradiance = solar_irradiance if solar_irradiance else 4.5
+        monthly_consumption = self.calculate_monthly_consumption(monthly_bill, tariff_rate)
+        plant_capacity = self.calculate_plant_capacity_precise(monthly_consumption, avg_irradiance)
+        investment = self.calculate_investment_capex(plant_capacity, consumer_type)
+
+        analyzer = MonteCarloAnalyzer(distributions=distributions, seed=seed)
+        samples = analyzer.simulate(
+            plant_capacity, investment, tariff_rate, avg_irradiance,
+            self.get_cash_flow_model(), draws=draws, workers=workers,
+            performance=self.get_performance_curve()
+        )
+
+        return {
+            "plant_capacity": round(plant_capacity, 2),
+            "investment": round(investment, 0),
+            "draws": draws,
+            "seed": seed,
+            "percentiles": analyzer.summarize(samples)
+        }
+
     def _generate_recommendations(self, capacity: float, investment: float,
                                 payback_period: float, consumer_type: str,
                                 investment_model: str) -> list:
         """Generate personalized recommendations based on calculations"""
-        recommendations = []
-
-        # System size recommendations
-        if capacity < 3:
-            recommendations.append({
-                "type": "system_size",
-                "title": "Small System Recommendation",
-                "message": f"A {capacity:.1f} kW system is suitable for your consumption. Consider energy-efficient appliances to maximize benefits.",
-                "priority": "medium"
-            })
-        elif capacity > 10 and consumer_type == "Residential":
-            recommendations.append({
-                "type": "system_size",
-                "title": "Large Residential System",
-                "message": f"Your {capacity:.1f} kW requirement is quite large for residential use. Consider splitting into phases or reviewing consumption patterns.",
-                "priority": "high"
-            })
+        return self.recommendation_engine.evaluate(
+            plant_capacity=capacity, investment=investment, payback_period=payback_period,
+            consumer_type=consumer_type, investment_model=investment_model
+        )
 
-        # Payback period recommendations
-        if investment_model == "CAPEX":
-            if payback_period <= 5:
-                recommendations.append({
-                    "type": "financial",
-                    "title": "Excellent Investment",
-                    "message": f"With a {payback_period:.1f} year payback period, this is an excellent investment opportunity.",
-                    "priority": "high"
-                })
-            elif payback_period > 8:
-                recommendations.append({
-                    "type": "financial",
-                    "title": "Consider OPEX Model",
-                    "message": f"With a {payback_period:.1f} year payback, you might want to consider the OPEX/lease model instead.",
-                    "priority": "medium"
-                })
-
-        # Consumer type specific recommendations
-        if consumer_type == "Commercial":
-            recommendations.append({
-                "type": "tax_benefits",
-                "title": "Tax Benefits Available",
-                "message": "Commercial installations are eligible for accelerated depreciation and other tax benefits. Consult a tax advisor.",
-                "priority": "medium"
-            })
+    def get_batch_recommendations(self, monthly_bill, tariff_rate=None, investment_model="CAPEX",
+                                  solar_irradiance=None, consumer_type="Residential", **options):
+        """
+        Recommendation rule masks for a whole batch
+
+        Rules are evaluated on the unrounded batch values, so each row fires
+        exactly the rules get_comprehensive_analysis would; message text is
+        only built for rows passed to render().
+
+        Args:
+            Same as get_batch_analysis
+
+        Returns:
+            RecommendationMasks (masks, counts(), render(row))
+        """
+        if hasattr(monthly_bill, 'columns'):
+            frame = monthly_bill
+            if 'investment_model' in frame:
+                investment_model = frame['investment_model'].to_numpy()
+            if 'consumer_type' in frame:
+                consumer_type = frame['consumer_type'].to_numpy()
+
+        columns = self.get_batch_analysis(monthly_bill, tariff_rate, investment_model, solar_irradiance,
+                                          consumer_type, rounded=False, **options)
+        capacity = np.asarray(columns['plant_capacity'])
+        return self.recommendation_engine.evaluate_batch(
+            plant_capacity=capacity, investment=np.asarray(columns['investment']),
+            payback_period=np.asarray(columns['payback_period']),
+            consumer_type=np.broadcast_to(np.asarray(consumer_type), capacity.shape),
+            investment_model=np.broadcast_to(np.asarray(investment_model), capacity.shape)
+        )
+
+    def get_cached_analysis(self, monthly_bill: float, tariff_rate: float,
+                            investment_model: str = "CAPEX", solar_irradiance: float = None,
+                            consumer_type: str = "Residential", **options) -> AnalysisResult:
+        """
+        get_comprehensive_analysis behind a bounded LRU/TTL cache
+
+        Inputs on a loaded answer table (see load_answer_table) are served
+        from it directly (bills between its grid points interpolated, see
+        AnswerTable.lookup). Otherwise inputs are normalized and quantized (bill
+        to paise, rates to 4 decimals) before lookup. The cache is cleared
+        automatically when COST_PER_KW, PERFORMANCE_RATIO, the emission factors
+        or the other financial constants change; counters are available via
+        analysis_cache.stats().
+
+        Args:
+            Same as get_comprehensive_analysis
+
+        Returns:
+            Immutable AnalysisResult; result['calculations'] etc. give the
+            same layout as get_comprehensive_analysis, read-only
+        """
+        if self.answer_table is not None:
+            result = self.answer_table.lookup(self, monthly_bill, tariff_rate, investment_model,
+                                              solar_irradiance, consumer_type, **options)
+            if result is not None:
+                return result
 
-        return recommendations
+        return self.analysis_cache.get_or_compute(
+            self, monthly_bill, tariff_rate, investment_model, solar_irradiance, consumer_type, **options
+        )
+
+    def load_answer_table(self, path: Optional[str] = None, build: bool = True, **build_options):
+        """
+        Serve get_cached_analysis from a precomputed answer table
+
+        A saved table is memory-mapped from ``path``; it is rebuilt (and
+        saved there) when missing or built with different constants or
+        prices. Off-table inputs still go through the cache.
+
+        Args:
+            path: .npy table file (None keeps the table in memory only)
+            build: Build the table when it cannot be loaded
+            **build_options: AnswerTable.build options (bill_max, bill_step, ...)
+
+        Returns:
+            The active AnswerTable, or None
+        """
+        table = None
+        if path and os.path.exists(path):
+            try:
+                table = AnswerTable.load(path)
+                if not table.matches(self):
+                    table = None
+            except (OSError, ValueError, KeyError) as e:
+                print(f"Error loading answer table: {str(e)}")
+                table = None
+
+        if table is None and build:
+            table = AnswerTable.build(self, path=path, **build_options)
+
+        self.answer_table = table
+        return table
+
+    def get_batch_analysis(self, monthly_bill, tariff_rate=None, investment_model="CAPEX",
+                           solar_irradiance=None, consumer_type="Residential", financial_model="simple",
+                           state=None, installer=None, rounded=True, financing=None, ppa=None):
+        """
+        Vectorized get_comprehensive_analysis for many bills at once
+
+        Every field of the scalar ``calculations`` dict is computed as a
+        whole-column array operation and rounded exactly like the scalar path.
+        Recommendations are evaluated separately by get_batch_recommendations.
+
+        Args:
+            monthly_bill: Array of monthly bills in ₹, or a pandas DataFrame with
+                monthly_bill, tariff_rate, investment_model, solar_irradiance
+                and consumer_type columns (missing columns use the defaults)
+            tariff_rate: Array or scalar tariff in ₹/unit
+            investment_model: Array or scalar of "CAPEX"/"OPEX"
+            solar_irradiance: Array or scalar irradiance in kWh/m²/day
+            consumer_type: Array or scalar consumer type
+            financial_model: "simple" or "cash_flow" (adds npv, irr,
+                discounted_payback and lcoe columns, NaN for OPEX rows)
+            state: Optional array or scalar of states for state-specific pricing
+                (also read from a ``state`` DataFrame column)
+            installer: Optional array or scalar of installers (also read from
+                an ``installer`` DataFrame column)
+            rounded: Round like the scalar path (False returns the unrounded
+                values, e.g. for interpolation tables)
+            financing: Optional FINANCING_ASSUMPTIONS overrides (scalars or
+                per-row arrays); adds loan_amount, emi, equity_irr and
+                equity_payback columns (NaN for OPEX rows)
+            ppa: Optional PPA_ASSUMPTIONS overrides (scalars or per-row
+                arrays); adds ppa_tariff, developer_lcoe, ppa_annual_savings,
+                ppa_lifetime_savings and ppa_savings_percent columns (NaN for
+                CAPEX rows)
+
+        Returns:
+            Dict of column name -> NumPy array, or a DataFrame (same index)
+            when a DataFrame was passed in
+        """
+        frame = None
+        if hasattr(monthly_bill, 'columns'):
+            frame = monthly_bill
+            tariff_rate = frame['tariff_rate'].to_numpy()
+            if 'investment_model' in frame:
+                investment_model = frame['investment_model'].to_numpy()
+            if 'solar_irradiance' in frame:
+                solar_irradiance = frame['solar_irradiance'].to_numpy()
+            if 'consumer_type' in frame:
+                consumer_type = frame['consumer_type'].to_numpy()
+            if 'state' in frame:
+                state = frame['state'].to_numpy()
+            if 'installer' in frame:
+                installer = frame['installer'].to_numpy()
+            monthly_bill = frame['monthly_bill'].to_numpy()
+
+        if solar_irradiance is None:
+            solar_irradiance = 4.5
+
+        bill, tariff, irradiance, model, ctype = np.broadcast_arrays(
+            np.asarray(monthly_bill, dtype=float),
+            np.asarray(tariff_rate, dtype=float),
+            np.asarray(solar_irradiance, dtype=float),
+            np.asarray(investment_model),
+            np.asarray(consumer_type)
+        )
+
+        # Step 1: Monthly consumption (0 for non-positive tariffs)
+        positive_tariff = tariff > 0
+        monthly_consumption = np.divide(bill, tariff, out=np.zeros(bill.shape), where=positive_tariff)
+
+        # Step 2: Plant capacity (missing irradiance -> 4.5, minimum 1 kW)
+        avg_irradiance = np.where(irradiance == 0, 4.5, irradiance)
+        sizing_irradiance = np.where(avg_irradiance <= 0, 4.5, avg_irradiance)
+        plant_capacity = np.maximum(
+            1.0, monthly_consumption / (sizing_irradiance * self.PERFORMANCE_RATIO * 30)
+        )
+
+        # Step 3: Generation
+        monthly_generation = plant_capacity * avg_irradiance * self.PERFORMANCE_RATIO * 30
+        yearly_generation = monthly_generation * 12
+
+        # Step 4: Savings
+        annual_savings = yearly_generation * tariff
+        monthly_savings = annual_savings / 12
+        performance = self.get_performance_curve()
+        lifetime_factor = float(performance.sum())
+        lifetime_savings = annual_savings * lifetime_factor
+
+        # Step 5: Environmental impact (per-state grid factors)
+        emission_state = np.broadcast_to(np.asarray(state, dtype=object), bill.shape)
+        year_one_factor = self.emission_factors.factors(emission_state, self.COMMISSIONING_YEAR, 1)[..., 0]
+        annual_co2_saved = (yearly_generation * year_one_factor) / 1000
+        lifetime_co2_saved = yearly_generation * self.get_co2_intensity(emission_state) / 1000
+        equivalent_trees = (annual_co2_saved * 1000) / TREE_ABSORPTION
+        equivalent_trees_lifetime = (lifetime_co2_saved * 1000) / (TREE_ABSORPTION * self.SYSTEM_LIFETIME)
+
+        # Step 6: Investment and payback (only for CAPEX rows)
+        capex = model == "CAPEX"
+        project_cost = plant_capacity * self.get_cost_per_kw_array(ctype, plant_capacity, state, installer)
+        investment = np.where(capex, project_cost, 0.0)
+        payback_period = np.where(
+            capex,
+            np.divide(investment, annual_savings, out=np.full(bill.shape, 999.0), where=annual_savings > 0),
+            0.0
+        )
+
+        cash_flow = None
+        if financial_model == "cash_flow":
+            cash_flow = self.get_cash_flow_model().analyze(
+                investment.ravel(), yearly_generation.ravel(), tariff.ravel(),
+                generation=yearly_generation.reshape(-1, 1) * performance
+            )
+            cash_flow = {key: value.reshape(bill.shape) for key, value in cash_flow.items()
+                         if key != 'cash_flows'}
+            lifetime_savings = cash_flow['lifetime_savings']
+            payback_period = np.where(capex, cash_flow['payback'], payback_period)
+
+        # Step 7: System specifications
+        if self.equipment_catalog is not None:
+            panel_count, inverter_capacity = self.equipment_catalog.select_many(plant_capacity)
+        else:
+            panel_count = np.ceil(plant_capacity / 0.4).astype(np.int64)
+            inverter_capacity = plant_capacity * 0.8
+        area_required = plant_capacity * self.AREA_PER_KW
+
+        columns = {
+            "monthly_consumption": monthly_consumption,
+            "plant_capacity": plant_capacity,
+            "monthly_generation": monthly_generation,
+            "yearly_generation": yearly_generation,
+            "monthly_savings": monthly_savings,
+            "annual_savings": annual_savings,
+            "lifetime_savings": lifetime_savings,
+            "investment": investment,
+            "payback_period": payback_period,
+            "annual_co2_saved": annual_co2_saved,
+            "lifetime_co2_saved": lifetime_co2_saved,
+            "equivalent_trees": equivalent_trees,
+            "equivalent_trees_lifetime": equivalent_trees_lifetime,
+            "panel_count": panel_count,
+            "inverter_capacity": inverter_capacity,
+            "area_required": area_required
+        }
+        if rounded:
+            columns = {name: values if CALCULATION_DIGITS[name] is None
+                       else _round_half_even(values, CALCULATION_DIGITS[name])
+                       for name, values in columns.items()}
+
+        if cash_flow:
+            cash_flow_columns = {
+                "npv": np.where(capex, cash_flow['npv'], np.nan),
+                "irr": np.where(capex, cash_flow['irr'] * 100, np.nan),
+                "discounted_payback": np.where(capex, cash_flow['discounted_payback'], np.nan),
+                "lcoe": np.where(capex, cash_flow['lcoe'], np.nan)
+            }
+            columns.update({name: _round_half_even(values, CALCULATION_DIGITS[name]) if rounded else values
+                            for name, values in cash_flow_columns.items()})
+
+        if financing is not None:
+            savings_per_unit = np.divide(annual_savings, yearly_generation, out=np.zeros(bill.shape),
+                                         where=yearly_generation > 0)
+            loan = self.get_financing_analysis(investment.ravel(), yearly_generation.ravel(),
+                                               savings_per_unit.ravel(), ctype.ravel(), **financing)
+            financing_columns = {
+                "loan_amount": np.where(capex, loan['loan_amount'].reshape(bill.shape), np.nan),
+                "emi": np.where(capex, loan['emi'].reshape(bill.shape), np.nan),
+                "equity_irr": np.where(capex, loan['equity_irr'].reshape(bill.shape) * 100, np.nan),
+                "equity_payback": np.where(capex, loan['equity_payback'].reshape(bill.shape), np.nan)
+            }
+            columns.update({name: _round_half_even(values, CALCULATION_DIGITS[name]) if rounded else values
+                            for name, values in financing_columns.items()})
+
+        if ppa is not None:
+            opex = model == "OPEX"
+            savings_per_unit = np.divide(annual_savings, yearly_generation, out=np.zeros(bill.shape),
+                                         where=yearly_generation > 0)
+            pricing = self.get_ppa_analysis(project_cost.ravel(), yearly_generation.ravel(),
+                                            savings_per_unit.ravel(), **ppa)
+            ppa_columns = {
+                "ppa_tariff": np.where(opex, pricing['ppa_tariff'].reshape(bill.shape), np.nan),
+                "developer_lcoe": np.where(opex, pricing['lcoe'].reshape(bill.shape), np.nan),
+                "ppa_annual_savings": np.where(opex, pricing['annual_savings'].reshape(bill.shape), np.nan),
+                "ppa_lifetime_savings": np.where(opex, pricing['lifetime_savings'].reshape(bill.shape), np.nan),
+                "ppa_savings_percent": np.where(opex, pricing['savings_percent'].reshape(bill.shape), np.nan)
+            }
+            columns.update({name: _round_half_even(values, CALCULATION_DIGITS[name]) if rounded else values
+                            for name, values in ppa_columns.items()})
 
+        if frame is not None:
+            import pandas as pd
+            return pd.DataFrame(columns, index=frame.index)
 
+        return columns
@@ -0,0 +1,177 @@
+"""
+Capacity optimizer: NPV / payback maximizing plant size under constraints
+"""
+from typing import Dict, Any, Optional
+
+import numpy as np
+
+
+class CapacityOptimizer:
+    """Searches plant capacity on a dense vectorized grid"""
+
+    def __init__(self, calculator, grid_points: int = 400, refine_points: int = 200):
+        """
+        Initialize optimizer
+
+        Args:
+            calculator: SolarCalculator providing pricing, PR and the cash-flow model
+            grid_points: Points in the coarse capacity grid
+            refine_points: Points in the refinement around the best coarse point
+        """
+        self.calculator = calculator
+        self.grid_points = grid_points
+        self.refine_points = refine_points
+
+    def evaluate(self, capacity: np.ndarray, monthly_consumption: float, tariff_rate: float,
+                 avg_irradiance: float, consumer_type: str, export_rate: float = 0.0) -> Dict[str, np.ndarray]:
+        """
+        Financials for every candidate capacity at once
+
+        Generation up to the annual consumption offsets the retail tariff;
+        any surplus is valued at export_rate.
+
+        Returns:
+            Dict of arrays: capacity, investment, yearly_generation,
+            annual_savings, npv and payback
+        """
+        calculator = self.calculator
+        capacity = np.asarray(capacity, dtype=float)
+        consumer_types = np.full(capacity.shape, consumer_type)
+
+        investment = capacity * calculator.get_cost_per_kw_array(consumer_types, capacity)
+        yearly_generation = capacity * avg_irradiance * calculator.PERFORMANCE_RATIO * 30 * 12
+        annual_consumption = monthly_consumption * 12
+
+        self_consumed = np.minimum(yearly_generation, annual_consumption)
+        annual_savings = self_consumed * tariff_rate + (yearly_generation - self_consumed) * export_rate
+        effective_tariff = np.divide(annual_savings, yearly_generation,
+                                     out=np.zeros(capacity.shape), where=yearly_generation > 0)
+
+        cash_flow_model = calculator.get_cash_flow_model()
+        cash_flows = cash_flow_model.build_cash_flows(
+            investment, yearly_generation, effective_tariff,
+            generation=yearly_generation.reshape(-1, 1) * calculator.get_performance_curve()
+        )
+
+        return {
+            'capacity': capacity,
+            'investment': investment,
+            'yearly_generation': yearly_generation,
+            'annual_savings': annual_savings,
+            'npv': cash_flow_model.npv(cash_flows['flows']),
+            'payback': cash_flow_model.payback(cash_flows['flows'])
+        }
+
+    def _candidate_grid(self, low: float, high: float, consumer_type: str) -> np.ndarray:
+        """Dense grid plus both sides of every price-tier breakpoint"""
+        grid = np.linspace(low, high, self.grid_points)
+
+        edges = []
+        for breakpoint in self.calculator.get_cost_breakpoints(consumer_type):
+            edges.extend([np.nextafter(breakpoint, -np.inf), breakpoint, np.nextafter(breakpoint, np.inf)])
+        edges = np.asarray(edges)
+        edges = edges[(edges >= low) & (edges <= high)]
+
+        return np.unique(np.concatenate([grid, edges]))
+
+    def optimize(self, monthly_consumption: float, tariff_rate: float, avg_irradiance: float,
+                 consumer_type: str = "Residential", objective: str = "npv",
+                 rooftop_area: Optional[float] = None, budget: Optional[float] = None,
+                 sanctioned_load: Optional[float] = None, export_rate: float = 0.0,
+                 min_capacity: float = 1.0, max_capacity: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Find the capacity that maximizes NPV or minimizes payback
+
+        Args:
+            monthly_consumption: Monthly consumption in kWh
+            tariff_rate: Retail tariff in ₹/unit
+            avg_irradiance: Average irradiance in kWh/m²/day
+            consumer_type: Type of consumer (selects the price tiers)
+            objective: "npv" (maximize) or "payback" (minimize)
+            rooftop_area: Usable rooftop area in sq ft (packed with module rows)
+            budget: Maximum investment in ₹
+            sanctioned_load: Sanctioned load in kW (caps capacity)
+            export_rate: Value of surplus generation in ₹/unit
+            min_capacity: Smallest system considered in kW
+            max_capacity: Search limit in kW (defaults to twice the
+                consumption-matching capacity)
+
+        Returns:
+            Dict with the optimal point (None when no capacity is feasible,
+            e.g. a roof that cannot hold min_capacity), the binding
+            constraint and the whole curve as arrays
+        """
+        if objective not in ("npv", "payback"):
+            raise ValueError(f"Unknown objective: {objective}")
+
+        calculator = self.calculator
+        if max_capacity is None:
+            matching = calculator.calculate_plant_capacity_precise(monthly_consumption, avg_irradiance)
+            max_capacity = 2 * matching
+
+        limits = {'search_range': max_capacity}
+        layout = None
+        if rooftop_area:
+            layout = calculator.get_rooftop_capacity(rooftop_area)
+            limits['rooftop_area'] = layout['capacity_kw']
+        if sanctioned_load:
+            limits['sanctioned_load'] = sanctioned_load
+        # Below min_capacity the grid collapses to min_capacity, which is then infeasible
+        limit = min(limits.values())
+        upper = max(limit, min_capacity)
+
+        def feasible_curve(capacity):
+            curve = self.evaluate(capacity, monthly_consumption, tariff_rate,
+                                  avg_irradiance, consumer_type, export_rate)
+            curve['feasible'] = capacity <= limit
+            if budget:
+                curve['feasible'] &= curve['investment'] <= budget
+            return curve
+
+        def best_index(curve):
+            score = curve['npv'] if objective == "npv" else -curve['payback']
+            score = np.where(curve['feasible'], score, -np.inf)
+            return int(np.argmax(score)), bool(np.isfinite(score).any())
+
+        curve = feasible_curve(self._candidate_grid(min_capacity, upper, consumer_type))
+        index, found = best_index(curve)
+
+        # Refine between the neighbours of the best coarse point
+        if found:
+            capacity = curve['capacity']
+            low = capacity[max(index - 1, 0)]
+            high = capacity[min(index + 1, len(capacity) - 1)]
+            refined = feasible_curve(np.linspace(low, high, self.refine_points))
+            refined_index, _ = best_index(refined)
+            score = refined['npv'] if objective == "npv" else -refined['payback']
+            current = curve['npv'][index] if objective == "npv" else -curve['payback'][index]
+            if refined['feasible'][refined_index] and score[refined_index] > current:
+                optimum = {key: values[refined_index] for key, values in refined.items()}
+            else:
+                optimum = {key: values[index] for key, values in curve.items()}
+        else:
+            optimum = None
+
+        binding = None
+        if limit < min_capacity:
+            binding = min(limits, key=limits.get)
+        elif optimum is not None:
+            if np.isclose(optimum['capacity'], upper):
+                binding = min(limits, key=limits.get)
+            elif budget and np.isclose(optimum['investment'], budget, rtol=0.01):
+                binding = 'budget'
+
+        return {
+            'objective': objective,
+            'optimal': None if optimum is None else {
+                'capacity': round(float(optimum['capacity']), 2),
+                'investment': round(float(optimum['investment']), 0),
+                'annual_savings': round(float(optimum['annual_savings']), 0),
+                'npv': round(float(optimum['npv']), 0),
+                'payback_period': round(float(optimum['payback']), 1),
+                'area_required': round(float(optimum['capacity']) * calculator.get_area_per_kw(layout), 2)
+            },
+            'binding_constraint': binding,
+            'limits': {key: round(float(value), 2) for key, value in limits.items()},
+            'curve': {key: curve[key] for key in ('capacity', 'investment', 'npv', 'payback', 'feasible')}
+        }
@@ -0,0 +1,195 @@
+"""
+Year-by-year cash-flow engine with NPV, IRR, payback and LCOE
+"""
+from typing import Dict, Optional
+
+import numpy as np
+
+
+class CashFlowModel:
+    """Vectorized lifetime cash flows for a (scenarios x years) matrix"""
+
+    def __init__(self, lifetime: int = 25, degradation_rate: float = 0.005,
+                 tariff_escalation: float = 0.03, om_cost_rate: float = 0.01,
+                 om_escalation: float = 0.05, inverter_replacement_year: int = 12,
+                 inverter_replacement_cost: float = 0.08, discount_rate: float = 0.08):
+        """
+        Initialize cash-flow model
+
+        Args:
+            lifetime: System lifetime in years
+            degradation_rate: Annual module degradation (fraction)
+            tariff_escalation: Annual grid tariff escalation (fraction)
+            om_cost_rate: Yearly O&M cost as a fraction of investment
+            om_escalation: Annual O&M cost escalation (fraction)
+            inverter_replacement_year: Year in which the inverter is replaced
+            inverter_replacement_cost: Inverter replacement as a fraction of investment
+            discount_rate: Discount rate for NPV, discounted payback and LCOE
+        """
+        self.lifetime = lifetime
+        self.degradation_rate = degradation_rate
+        self.tariff_escalation = tariff_escalation
+        self.om_cost_rate = om_cost_rate
+        self.om_escalation = om_escalation
+        self.inverter_replacement_year = inverter_replacement_year
+        self.inverter_replacement_cost = inverter_replacement_cost
+        self.discount_rate = discount_rate
+
+    @staticmethod
+    def _column(values) -> np.ndarray:
+        """Scalar or per-scenario parameter as a (scenarios, 1) column"""
+        return np.atleast_1d(np.asarray(values, dtype=float))[:, np.newaxis]
+
+    def build_cash_flows(self, investment, first_year_generation, tariff_rate,
+                         generation: Optional[np.ndarray] = None,
+                         tariff_escalation=None, degradation_rate=None) -> Dict[str, np.ndarray]:
+        """
+        Build the yearly cash-flow matrix
+
+        Args:
+            investment: Investment per scenario in ₹
+            first_year_generation: Year-one generation per scenario in kWh
+            tariff_rate: Year-one tariff per scenario in ₹/unit
+            generation: Optional (scenarios, lifetime) generation matrix that
+                replaces the degradation model
+            tariff_escalation: Optional per-scenario tariff escalation
+            degradation_rate: Optional per-scenario degradation rate
+
+        Returns:
+            Dict with generation, savings, costs and net (scenarios, lifetime)
+            matrices plus flows (scenarios, lifetime + 1) including year 0
+        """
+        investment = self._column(investment)
+        elapsed = np.arange(self.lifetime)
+
+        if tariff_escalation is None:
+            tariff_escalation = self.tariff_escalation
+        if degradation_rate is None:
+            degradation_rate = self.degradation_rate
+
+        if generation is None:
+            generation = self._column(first_year_generation) * (1 - self._column(degradation_rate)) ** elapsed
+        tariff = self._column(tariff_rate) * (1 + self._column(tariff_escalation)) ** elapsed
+        savings = generation * tariff
+
+        costs = investment * self.om_cost_rate * (1 + self.om_escalation) ** elapsed
+        if 0 < self.inverter_replacement_year <= self.lifetime:
+            costs[:, self.inverter_replacement_year - 1] += investment[:, 0] * self.inverter_replacement_cost
+
+        net = savings - costs
+        flows = np.concatenate([-investment, net], axis=1)
+
+        return {'generation': generation, 'savings': savings, 'costs': costs, 'net': net, 'flows': flows}
+
+    def discount_factors(self, rate=None) -> np.ndarray:
+        """Discount factors for years 0..lifetime"""
+        if rate is None:
+            rate = self.discount_rate
+        return (1 + self._column(rate)) ** -np.arange(self.lifetime + 1)
+
+    def npv(self, flows: np.ndarray, rate=None) -> np.ndarray:
+        """Net present value of each row of a flows matrix"""
+        return np.sum(flows * self.discount_factors(rate), axis=1)
+
+    def irr(self, flows: np.ndarray, iterations: int = 60, tolerance: float = 1e-10) -> np.ndarray:
+        """
+        Internal rate of return for every scenario at once
+
+        Safeguarded Newton iteration inside a [-0.99, 10] bracket: a Newton step
+        that leaves the bracket is replaced by bisection, so all scenarios are
+        solved together without a Python loop over rows.
+
+        Args:
+            flows: (scenarios, lifetime + 1) cash flows including year 0
+
+        Returns:
+            IRR per scenario as a fraction (NaN where no sign change exists)
+        """
+        flows = np.atleast_2d(flows)
+        periods = np.arange(flows.shape[1])
+
+        def npv_and_slope(rate):
+            discounted = flows * np.exp(-periods * np.log1p(rate)[:, np.newaxis])
+            value = discounted.sum(axis=1)
+            slope = -(discounted @ periods) / (1 + rate)
+            return value, slope
+
+        low = np.full(flows.shape[0], -0.99)
+        high = np.full(flows.shape[0], 10.0)
+        low_value, _ = npv_and_slope(low)
+        high_value, _ = npv_and_slope(high)
+        solvable = np.sign(low_value) != np.sign(high_value)
+
+        rate = np.full(flows.shape[0], 0.1)
+        for _ in range(iterations):
+            value, slope = npv_and_slope(rate)
+
+            # Keep the bracket around the root
+            same_side = np.sign(value) == np.sign(low_value)
+            low = np.where(same_side, rate, low)
+            low_value = np.where(same_side, value, low_value)
+            high = np.where(same_side, high, rate)
+
+            with np.errstate(divide='ignore', invalid='ignore'):
+                newton = rate - value / slope
+            inside = np.isfinite(newton) & (newton >= low) & (newton <= high)
+            next_rate = np.where(inside, newton, (low + high) / 2)
+
+            converged = np.all(np.abs(next_rate - rate)[solvable] < tolerance)
+            rate = next_rate
+            if converged:
+                break
+
+        return np.where(solvable, rate, np.nan)
+
+    @staticmethod
+    def payback(flows: np.ndarray) -> np.ndarray:
+        """
+        Years until cumulative flows turn non-negative (interpolated within
+        the year); 999 when the investment is never recovered
+        """
+        cumulative = np.cumsum(flows, axis=1)
+        recovered = cumulative >= 0
+        year = np.argmax(recovered, axis=1)
+        rows = np.arange(flows.shape[0])
+
+        previous = cumulative[rows, np.maximum(year - 1, 0)]
+        fraction = np.divide(-previous, flows[rows, year],
+                             out=np.zeros(flows.shape[0]), where=flows[rows, year] != 0)
+        result = np.where(year == 0, 0.0, year - 1 + fraction)
+        return np.where(recovered.any(axis=1), result, 999.0)
+
+    def analyze(self, investment, first_year_generation, tariff_rate,
+                generation: Optional[np.ndarray] = None, **overrides) -> Dict[str, np.ndarray]:
+        """
+        Full lifetime financial analysis for every scenario
+
+        Args:
+            investment: Investment per scenario in ₹
+            first_year_generation: Year-one generation per scenario in kWh
+            tariff_rate: Year-one tariff per scenario in ₹/unit
+            generation: Optional (scenarios, lifetime) generation matrix
+            **overrides: Per-scenario tariff_escalation / degradation_rate
+
+        Returns:
+            Dict with npv, irr, payback, discounted_payback, lcoe and
+            lifetime_savings arrays plus the cash_flows matrices
+        """
+        cash_flows = self.build_cash_flows(investment, first_year_generation, tariff_rate,
+                                           generation=generation, **overrides)
+        flows = cash_flows['flows']
+        factors = self.discount_factors()
+
+        discounted_generation = np.sum(cash_flows['generation'] * factors[:, 1:], axis=1)
+        discounted_cost = -flows[:, 0] + np.sum(cash_flows['costs'] * factors[:, 1:], axis=1)
+
+        return {
+            'npv': self.npv(flows),
+            'irr': self.irr(flows),
+            'payback': self.payback(flows),
+            'discounted_payback': self.payback(flows * factors),
+            'lcoe': np.divide(discounted_cost, discounted_generation,
+                              out=np.zeros(flows.shape[0]), where=discounted_generation > 0),
+            'lifetime_savings': np.sum(cash_flows['net'], axis=1),
+            'cash_flows': cash_flows
+        }
@@ -0,0 +1,202 @@
+"""
+Grid emission factors by state and year for CO₂ accounting
+"""
+import json
+from typing import Dict, Optional, Union
+
+import numpy as np
+
+# Key for the factor used when a state has no entry of its own
+NATIONAL = '*'
+
+# Year the base factors describe
+BASE_YEAR = 2024
+
+# Base-year grid emission factors (kg CO₂ per kWh) from each state's
+# generation mix; indicative values, coal-heavy grids highest. The national
+# fallback keeps the 0.8 kg/kWh the calculator used before.
+STATE_EMISSION_FACTORS = {
+    NATIONAL: 0.80,
+    'Andhra Pradesh': 0.78,
+    'Assam': 0.62,
+    'Bihar': 0.92,
+    'Chandigarh': 0.72,
+    'Chhattisgarh': 0.98,
+    'Delhi': 0.70,
+    'Gujarat': 0.76,
+    'Haryana': 0.84,
+    'Jammu and Kashmir': 0.30,
+    'Jharkhand': 0.97,
+    'Karnataka': 0.58,
+    'Kerala': 0.42,
+    'Madhya Pradesh': 0.86,
+    'Maharashtra': 0.80,
+    'Odisha': 0.93,
+    'Punjab': 0.68,
+    'Rajasthan': 0.74,
+    'Tamil Nadu': 0.64,
+    'Telangana': 0.83,
+    'Uttar Pradesh': 0.88,
+    'Uttarakhand': 0.40,
+    'West Bengal': 0.94
+}
+
+# Yearly fall in grid intensity as renewables grow, and the level it
+# levels off at (kg CO₂ per kWh)
+ANNUAL_DECLINE = 0.025
+FACTOR_FLOOR = 0.2
+
+# Years tabulated from BASE_YEAR; later years reuse the last column
+HORIZON = 60
+
+# Default first calendar year of operation for new plants (the first table
+# column a lifetime uses); SolarCalculator.COMMISSIONING_YEAR overrides it
+COMMISSIONING_YEAR = 2026
+
+# (start year, performance curve) combinations whose per-row lifetime
+# factors are kept by weighted_factor
+WEIGHTED_CACHE_SIZE = 64
+
+# kg CO₂ one tree absorbs per year
+TREE_ABSORPTION = 22
+
+
+class EmissionFactorTable:
+    """(state, year) grid emission factor matrix with vectorized lookups"""
+
+    def __init__(self, base_factors: Dict[str, float], base_year: int = BASE_YEAR,
+                 annual_decline: Union[float, Dict[str, float]] = ANNUAL_DECLINE,
+                 floor: float = FACTOR_FLOOR, horizon: int = HORIZON):
+        """
+        Initialize table
+
+        Args:
+            base_factors: {state: kg CO₂/kWh in base_year}; the NATIONAL key
+                is used for states without an entry
+            base_year: Calendar year of base_factors
+            annual_decline: Yearly fractional decline, one value or a
+                {state: decline} dict (missing states use the NATIONAL
+                entry, or ANNUAL_DECLINE)
+            floor: Lowest factor any state declines to
+            horizon: Number of years tabulated
+        """
+        if NATIONAL not in base_factors:
+            raise ValueError(f"Emission factors need a national '{NATIONAL}' entry")
+        if not isinstance(annual_decline, dict):
+            annual_decline = {NATIONAL: annual_decline}
+
+        self.states = tuple(sorted(state for state in base_factors if state != NATIONAL))
+        self.base_year = base_year
+        self.floor = floor
+        self._state_index = {state: index for index, state in enumerate(self.states)}
+
+        # One row per state plus the national row last
+        keys = self.states + (NATIONAL,)
+        base = np.array([base_factors[key] for key in keys], dtype=float)
+        default_decline = annual_decline.get(NATIONAL, ANNUAL_DECLINE)
+        decline = np.array([annual_decline.get(key, default_decline) for key in keys], dtype=float)
+        table = np.maximum(base[:, np.newaxis] * (1 - decline[:, np.newaxis]) ** np.arange(horizon),
+                           np.minimum(base, floor)[:, np.newaxis])
+        table.flags.writeable = False
+        self.table = table
+        self._national_row = len(self.states)
+        self._weighted_rows = {}
+
+        self._base_factors = dict(base_factors)
+        self._annual_decline = dict(annual_decline)
+        self.fingerprint = json.dumps([self._base_factors, self._annual_decline, base_year, floor, horizon],
+                                      sort_keys=True)
+
+    @classmethod
+    def default(cls) -> 'EmissionFactorTable':
+        """Table from STATE_EMISSION_FACTORS with the default decline"""
+        return cls(STATE_EMISSION_FACTORS)
+
+    def state_index(self, state) -> np.ndarray:
+        """
+        Row of the table for each state (the national row for unknown or missing states)
+
+        Args:
+            state: State name, None, or an array of them
+
+        Returns:
+            Integer array shaped like state
+        """
+        national = len(self.states)
+        states = np.asarray(state, dtype=object)
+        if states.ndim == 0:
+            return np.asarray(self._state_index.get(state, national))
+        unique, inverse = np.unique(states.astype(str), return_inverse=True)
+        rows = np.array([self._state_index.get(name, national) for name in unique], dtype=np.int64)
+        return rows[inverse].reshape(states.shape)
+
+    def year_columns(self, start_year: int, years: int) -> np.ndarray:
+        """Table columns for years start_year .. start_year + years - 1"""
+        offset = np.arange(start_year - self.base_year, start_year - self.base_year + years)
+        return np.clip(offset, 0, self.table.shape[1] - 1)
+
+    def factor(self, state: Optional[str], year: int) -> float:
+        """kg CO₂ per kWh for one state and calendar year"""
+        column = min(max(year - self.base_year, 0), self.table.shape[1] - 1)
+        return float(self.table[self._state_index.get(state, self._national_row), column])
+
+    def factors(self, state, start_year: int, years: int) -> np.ndarray:
+        """
+        Per-year factors for one or many scenarios
+
+        Args:
+            state: State name or array of state names
+            start_year: Calendar year of the first year of operation
+            years: Number of years
+
+        Returns:
+            (years,) vector for a single state, else a (scenarios, years) matrix
+        """
+        return self.table[np.asarray(self.state_index(state))[..., np.newaxis],
+                          self.year_columns(start_year, years)]
+
+    def weighted_factor(self, performance: np.ndarray, state, start_year: int) -> np.ndarray:
+        """
+        Lifetime kg CO₂ per kWh of year-one generation
+
+        The dot product of the per-year output multipliers with each state's
+        factor vector, taken once per table row and then gathered, so a
+        batch costs one small matrix-vector product however many rows it has.
+        The per-row products are cached by start year and curve, so repeated
+        scalar calls are a dict lookup.
+
+        Args:
+            performance: Per-year output relative to year one (LifetimeSimulator.performance)
+            state: State name or array of state names
+            start_year: Calendar year of the first year of operation
+
+        Returns:
+            Array shaped like state
+        """
+        key = (start_year, performance.tobytes())
+        rows = self._weighted_rows.get(key)
+        if rows is None:
+            if len(self._weighted_rows) >= WEIGHTED_CACHE_SIZE:
+                self._weighted_rows.clear()
+            rows = self.table[:, self.year_columns(start_year, len(performance))] @ performance
+            rows.flags.writeable = False
+            self._weighted_rows[key] = rows
+        if state is None or isinstance(state, str):
+            return rows[self._state_index.get(state, self._national_row)]
+        return rows[self.state_index(state)]
+
+    def lifetime_co2(self, generation: np.ndarray, state, start_year: int) -> np.ndarray:
+        """
+        Lifetime CO₂ avoided for per-year generation matrices
+
+        Args:
+            generation: (scenarios, years) generation in kWh
+            state: State name or array of state names (one per scenario)
+            start_year: Calendar year of the first year of operation
+
+        Returns:
+            Tons of CO₂ per scenario
+        """
+        generation = np.atleast_2d(generation)
+        factors = np.broadcast_to(self.factors(state, start_year, generation.shape[1]), generation.shape)
+        return np.einsum('ij,ij->i', generation, factors) / 1000
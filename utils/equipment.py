@@ -0,0 +1,292 @@
+"""
+Module/inverter catalog with cheapest-combination selection and string sizing
+"""
+import json
+import math
+from typing import Dict, Any, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+MODULE_FIELDS = ('power_w', 'voc', 'vmp', 'isc', 'voltage_temp_coefficient', 'price', 'length_m', 'width_m')
+INVERTER_FIELDS = ('ac_kw', 'max_dc_voltage', 'mppt_min_voltage', 'mppt_max_voltage',
+                   'max_input_current', 'mppt_count', 'price')
+
+# Module footprint used when a catalog row has no dimensions
+DEFAULT_MODULE_SIZE = {'length_m': 2.0, 'width_m': 1.0}
+
+# Design cell temperatures (°C) for the string voltage limits
+MIN_CELL_TEMPERATURE = 5.0
+MAX_CELL_TEMPERATURE = 70.0
+
+# Longest string considered (modules in series)
+MAX_STRING_LENGTH = 40
+
+# Cheapest modules/inverters paired in the first search round, and pairs
+# string-sized per array operation
+SEARCH_WIDTH = 32
+PAIR_CHUNK = 256
+
+DEFAULT_CATALOG = {
+    'modules': [
+        {'name': 'Poly 335 W', 'power_w': 335, 'voc': 46.0, 'vmp': 37.5, 'isc': 9.3,
+         'voltage_temp_coefficient': -0.0031, 'price': 8700, 'length_m': 1.956, 'width_m': 0.992},
+        {'name': 'Mono PERC 400 W', 'power_w': 400, 'voc': 49.5, 'vmp': 41.5, 'isc': 10.4,
+         'voltage_temp_coefficient': -0.0028, 'price': 11000, 'length_m': 2.008, 'width_m': 1.002},
+        {'name': 'Mono PERC 450 W', 'power_w': 450, 'voc': 49.8, 'vmp': 41.8, 'isc': 11.5,
+         'voltage_temp_coefficient': -0.0027, 'price': 12200, 'length_m': 2.094, 'width_m': 1.038},
+        {'name': 'Mono PERC 540 W', 'power_w': 540, 'voc': 49.6, 'vmp': 41.6, 'isc': 13.9,
+         'voltage_temp_coefficient': -0.0027, 'price': 14000, 'length_m': 2.278, 'width_m': 1.134},
+        {'name': 'TOPCon 580 W', 'power_w': 580, 'voc': 51.5, 'vmp': 43.0, 'isc': 14.2,
+         'voltage_temp_coefficient': -0.0025, 'price': 15800, 'length_m': 2.278, 'width_m': 1.134}
+    ],
+    'inverters': [
+        {'name': 'String 1 kW', 'ac_kw': 1, 'max_dc_voltage': 400, 'mppt_min_voltage': 80,
+         'mppt_max_voltage': 350, 'max_input_current': 13, 'mppt_count': 1, 'price': 18000},
+        {'name': 'String 3 kW', 'ac_kw': 3, 'max_dc_voltage': 550, 'mppt_min_voltage': 90,
+         'mppt_max_voltage': 520, 'max_input_current': 14, 'mppt_count': 1, 'price': 32000},
+        {'name': 'String 5 kW', 'ac_kw': 5, 'max_dc_voltage': 600, 'mppt_min_voltage': 100,
+         'mppt_max_voltage': 550, 'max_input_current': 15, 'mppt_count': 2, 'price': 45000},
+        {'name': 'String 10 kW', 'ac_kw': 10, 'max_dc_voltage': 1100, 'mppt_min_voltage': 200,
+         'mppt_max_voltage': 1000, 'max_input_current': 15, 'mppt_count': 2, 'price': 85000},
+        {'name': 'String 20 kW', 'ac_kw': 20, 'max_dc_voltage': 1100, 'mppt_min_voltage': 200,
+         'mppt_max_voltage': 1000, 'max_input_current': 26, 'mppt_count': 2, 'price': 150000},
+        {'name': 'String 50 kW', 'ac_kw': 50, 'max_dc_voltage': 1100, 'mppt_min_voltage': 200,
+         'mppt_max_voltage': 1000, 'max_input_current': 30, 'mppt_count': 4, 'price': 320000},
+        {'name': 'String 100 kW', 'ac_kw': 100, 'max_dc_voltage': 1100, 'mppt_min_voltage': 200,
+         'mppt_max_voltage': 1000, 'max_input_current': 30, 'mppt_count': 10, 'price': 580000}
+    ]
+}
+
+
+def _columns(rows: List[Dict[str, Any]], fields: Tuple[str, ...], sort_field: str):
+    """Names and read-only float columns for catalog rows, sorted by one field"""
+    if not rows:
+        raise ValueError("Equipment catalog needs at least one module and one inverter")
+    rows = sorted(rows, key=lambda row: float(row[sort_field]))
+    names = tuple(str(row['name']) for row in rows)
+    columns = {field: np.array([float(row.get(field, DEFAULT_MODULE_SIZE.get(field, np.nan))) for row in rows])
+               for field in fields}
+    # The catalog fingerprint is taken once, so the columns must not change
+    for values in columns.values():
+        values.flags.writeable = False
+    return names, columns
+
+
+class EquipmentCatalog:
+    """Modules and inverters held as sorted column arrays"""
+
+    def __init__(self, modules: List[Dict[str, Any]], inverters: List[Dict[str, Any]],
+                 dc_ac_ratio: Tuple[float, float] = (0.9, 1.35), source: Optional[str] = None):
+        """
+        Initialize catalog
+
+        Args:
+            modules: Module dicts (name plus MODULE_FIELDS; power in W,
+                voltages in V, current in A, temperature coefficient of Voc
+                per °C, price in ₹ per module, size in metres)
+            inverters: Inverter dicts (name plus INVERTER_FIELDS; AC power in
+                kW, input current per MPPT in A, price in ₹ per inverter)
+            dc_ac_ratio: Allowed (min, max) DC/AC ratio
+            source: Where the catalog was loaded from
+        """
+        self.module_names, self.modules = _columns(modules, MODULE_FIELDS, 'power_w')
+        self.inverter_names, self.inverters = _columns(inverters, INVERTER_FIELDS, 'ac_kw')
+        self.dc_ac_ratio = dc_ac_ratio
+        self.source = source
+        self.fingerprint = json.dumps([self.to_dict(), list(dc_ac_ratio)], sort_keys=True)
+
+        # String limits that depend only on the module
+        modules = self.modules
+        coefficient = modules['voltage_temp_coefficient']
+        self._voc_cold = modules['voc'] * (1 + coefficient * (MIN_CELL_TEMPERATURE - 25))
+        self._vmp_cold = modules['vmp'] * (1 + coefficient * (MIN_CELL_TEMPERATURE - 25))
+        self._vmp_hot = modules['vmp'] * (1 + coefficient * (MAX_CELL_TEMPERATURE - 25))
+        self._string_lengths = np.arange(1, MAX_STRING_LENGTH + 1)
+
+    @classmethod
+    def default(cls) -> 'EquipmentCatalog':
+        """Small built-in catalog of common residential/commercial equipment"""
+        return cls.from_dict(DEFAULT_CATALOG, source='default')
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], source: Optional[str] = None) -> 'EquipmentCatalog':
+        """Build from {'modules': [...], 'inverters': [...], 'dc_ac_ratio': [min, max]}"""
+        return cls(data['modules'], data['inverters'], tuple(data.get('dc_ac_ratio', (0.9, 1.35))),
+                   source=source)
+
+    @classmethod
+    def from_file(cls, path: str) -> 'EquipmentCatalog':
+        """Load a JSON catalog"""
+        with open(path, 'r', encoding='utf-8') as handle:
+            return cls.from_dict(json.load(handle), source=path)
+
+    @classmethod
+    def from_records(cls, records: Iterable[Dict[str, Any]], source: Optional[str] = 'database') -> 'EquipmentCatalog':
+        """Build from flat database rows with a 'kind' of 'module' or 'inverter'"""
+        grouped = {'modules': [], 'inverters': []}
+        for row in records:
+            grouped['modules' if row['kind'] == 'module' else 'inverters'].append(row)
+        return cls.from_dict(grouped, source=source)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serializable form (same layout as from_dict/from_file)"""
+        def dump(names, columns):
+            return [dict({'name': name}, **{field: float(values[i]) for field, values in columns.items()})
+                    for i, name in enumerate(names)]
+
+        return {'modules': dump(self.module_names, self.modules),
+                'inverters': dump(self.inverter_names, self.inverters)}
+
+    def select(self, capacity: float) -> Optional[Dict[str, Any]]:
+        """
+        Cheapest module/inverter combination with a valid string layout
+
+        Module and inverter costs are ranked separately and the cheapest
+        SEARCH_WIDTH of each are paired. Pairs are string-sized in chunks in
+        order of their cost lower bound (modules before rounding up to full
+        strings), stopping once no remaining pair can beat the best valid
+        one; the pool is widened only if a pair outside it still could.
+
+        Args:
+            capacity: Required DC capacity in kW
+
+        Returns:
+            Design dict (module, inverter, counts, string layout, capacities
+            and costs), or None if no combination fits
+        """
+        if capacity <= 0:
+            return None
+        modules, inverters = self.modules, self.inverters
+
+        module_count = np.ceil(capacity * 1000 / modules['power_w'])
+        module_cost = module_count * modules['price']
+
+        inverter_count = np.maximum(np.ceil(capacity / (inverters['ac_kw'] * self.dc_ac_ratio[1])), 1)
+        ratio = capacity / (inverter_count * inverters['ac_kw'])
+        inverter_cost = np.where(ratio >= self.dc_ac_ratio[0], inverter_count * inverters['price'], np.inf)
+
+        module_order = np.argsort(module_cost, kind='stable')
+        inverter_order = np.argsort(inverter_cost, kind='stable')
+        inverter_order = inverter_order[np.isfinite(inverter_cost[inverter_order])]
+        if not len(inverter_order):
+            return None
+
+        width = SEARCH_WIDTH
+        while True:
+            module_pool = module_order[:width]
+            inverter_pool = inverter_order[:width]
+            # Every pair outside the pool costs at least this much
+            outside = min(
+                module_cost[module_order[width]] + inverter_cost[inverter_order[0]]
+                if width < len(module_order) else np.inf,
+                module_cost[module_order[0]] + inverter_cost[inverter_order[width]]
+                if width < len(inverter_order) else np.inf
+            )
+
+            lower_bound = (module_cost[module_pool, None] + inverter_cost[None, inverter_pool]).ravel()
+            pair_order = np.argsort(lower_bound, kind='stable')
+            best = None
+            for start in range(0, len(pair_order), PAIR_CHUNK):
+                chunk = pair_order[start:start + PAIR_CHUNK]
+                floor = lower_bound[chunk[0]]
+                if floor > outside or (best is not None and floor >= best[0]):
+                    break
+                candidate = self._best_pair(module_pool[chunk // len(inverter_pool)],
+                                            inverter_pool[chunk % len(inverter_pool)],
+                                            module_count, inverter_count)
+                if candidate is not None and (best is None or candidate[0] < best[0]):
+                    best = candidate
+
+            if (best is not None and best[0] <= outside) or np.isinf(outside):
+                break
+            width *= 4
+
+        if best is None:
+            return None
+        cost, m, i, strings, length = best
+        count = strings * length
+        dc_capacity = count * modules['power_w'][m] / 1000
+        ac_capacity = inverter_count[i] * inverters['ac_kw'][i]
+        return {
+            'module': self.module_names[m],
+            'inverter': self.inverter_names[i],
+            'module_count': int(count),
+            'string_length': int(length),
+            'string_count': int(strings),
+            'inverter_count': int(inverter_count[i]),
+            'dc_capacity': round(float(dc_capacity), 3),
+            'ac_capacity': round(float(ac_capacity), 3),
+            'dc_ac_ratio': round(float(dc_capacity / ac_capacity), 3),
+            'module_area': round(float(count * modules['length_m'][m] * modules['width_m'][m]), 2),
+            'module_cost': round(float(count * modules['price'][m]), 0),
+            'inverter_cost': round(float(inverter_count[i] * inverters['price'][i]), 0),
+            'equipment_cost': round(float(cost), 0)
+        }
+
+    def _best_pair(self, module_index: np.ndarray, inverter_index: np.ndarray,
+                   module_count: np.ndarray, inverter_count: np.ndarray):
+        """
+        Cheapest valid string layout over a list of (module, inverter) pairs
+
+        Returns:
+            Tuple (cost, module index, inverter index, strings, string
+            length), or None if no pair has a valid layout
+        """
+        modules, inverters = self.modules, self.inverters
+        count = inverter_count[inverter_index]
+
+        # Series limits per pair
+        shortest = np.ceil(inverters['mppt_min_voltage'][inverter_index] / self._vmp_hot[module_index])
+        longest = np.minimum(np.floor(np.minimum(
+            inverters['max_dc_voltage'][inverter_index] / self._voc_cold[module_index],
+            inverters['mppt_max_voltage'][inverter_index] / self._vmp_cold[module_index]
+        )), MAX_STRING_LENGTH)
+        low, high = max(int(shortest.min()), 1), int(longest.max())
+        if high < low:
+            return None
+        lengths = np.arange(low, high + 1)
+
+        # Parallel limit: strings per MPPT from the input current, times MPPTs and inverters
+        per_mppt = np.floor(inverters['max_input_current'][inverter_index] / modules['isc'][module_index])
+        max_strings = per_mppt * inverters['mppt_count'][inverter_index] * count
+
+        # (pairs, lengths): strings needed and modules installed; strings round the count up
+        strings = np.ceil(module_count[module_index, None] / lengths)
+        installed = strings * lengths
+        ratio = (installed * (modules['power_w'][module_index] / 1000
+                              / (count * inverters['ac_kw'][inverter_index]))[:, None])
+
+        valid = ((lengths >= shortest[:, None]) & (lengths <= longest[:, None])
+                 & (strings <= max_strings[:, None])
+                 & (ratio >= self.dc_ac_ratio[0]) & (ratio <= self.dc_ac_ratio[1]))
+        cost = installed * modules['price'][module_index, None] + (count * inverters['price'][inverter_index])[:, None]
+        cost = np.where(valid, cost, np.inf)
+
+        flat = int(np.argmin(cost))
+        pair, column = divmod(flat, len(lengths))
+        if not np.isfinite(cost[pair, column]):
+            return None
+        return (float(cost[pair, column]), int(module_index[pair]), int(inverter_index[pair]),
+                int(strings[pair, column]), int(lengths[column]))
+
+    def select_many(self, capacities: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Module counts and AC capacities for an array of capacities
+
+        Each distinct capacity is selected once; capacities with no valid
+        combination get the 400 W / 80% AC assumption.
+
+        Returns:
+            Tuple of (module_count, inverter_capacity) arrays
+        """
+        capacities = np.asarray(capacities, dtype=float)
+        unique, inverse = np.unique(capacities, return_inverse=True)
+        counts = np.empty(len(unique), dtype=np.int64)
+        ac = np.empty(len(unique))
+        for index, capacity in enumerate(unique):
+            design = self.select(float(capacity))
+            if design is None:
+                counts[index], ac[index] = math.ceil(capacity / 0.4), capacity * 0.8
+            else:
+                counts[index], ac[index] = design['module_count'], design['ac_capacity']
+        return counts[inverse].reshape(capacities.shape), ac[inverse].reshape(capacities.shape)
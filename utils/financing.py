@@ -0,0 +1,176 @@
+"""
+Loan, EMI, interest subsidy and depreciation tax shields for financed CAPEX systems
+"""
+from typing import Dict, Optional
+
+import numpy as np
+
+from utils.cash_flow import CashFlowModel
+
+PAYMENTS_PER_YEAR = 12
+
+# Income-tax depreciation on solar plants (written-down value)
+ACCELERATED_DEPRECIATION_RATE = 0.40
+
+
+class FinancingModel:
+    """Vectorized loan amortization and equity cash flows on top of CashFlowModel"""
+
+    def __init__(self, cash_flow_model: CashFlowModel, loan_fraction: float = 0.7,
+                 interest_rate: float = 0.10, tenor_years: float = 7, interest_subsidy: float = 0.0,
+                 subsidy_years: Optional[float] = None, tax_rate: float = 0.0,
+                 depreciation_rate: float = ACCELERATED_DEPRECIATION_RATE,
+                 payments_per_year: int = PAYMENTS_PER_YEAR):
+        """
+        Initialize financing model
+
+        Args:
+            cash_flow_model: Project cash flows (savings, O&M, lifetime, discounting)
+            loan_fraction: Share of the investment borrowed
+            interest_rate: Annual loan interest rate (fraction)
+            tenor_years: Loan tenor in years
+            interest_subsidy: Interest rate points refunded to the borrower
+            subsidy_years: Years the subsidy is paid (None: the whole tenor)
+            tax_rate: Income-tax rate; savings are taxed and interest and
+                depreciation deducted (0 for consumers who pay no tax on them)
+            depreciation_rate: Written-down-value depreciation rate
+            payments_per_year: EMIs per year
+        """
+        self.cash_flow_model = cash_flow_model
+        self.loan_fraction = loan_fraction
+        self.interest_rate = interest_rate
+        self.tenor_years = tenor_years
+        self.interest_subsidy = interest_subsidy
+        self.subsidy_years = subsidy_years
+        self.tax_rate = tax_rate
+        self.depreciation_rate = depreciation_rate
+        self.payments_per_year = payments_per_year
+
+    _column = staticmethod(CashFlowModel._column)
+
+    def amortize(self, principal, interest_rate=None, tenor_years=None) -> Dict[str, np.ndarray]:
+        """
+        Yearly amortization schedule for every scenario
+
+        Uses the closed-form balance after k equal monthly payments, so each
+        year's interest and principal come from the balances at the year
+        boundaries without stepping through the months.
+
+        Args:
+            principal: Loan amount per scenario in ₹
+            interest_rate: Optional per-scenario annual rate
+            tenor_years: Optional per-scenario tenor (capped at the lifetime)
+
+        Returns:
+            Dict with emi (scenarios,) and (scenarios, lifetime) matrices of
+            opening balance, interest, principal and payment
+        """
+        lifetime = self.cash_flow_model.lifetime
+        per_year = self.payments_per_year
+        principal = self._column(principal)
+        rate = self._column(self.interest_rate if interest_rate is None else interest_rate) / per_year
+        tenor = self._column(self.tenor_years if tenor_years is None else tenor_years)
+        payments = np.clip(np.round(tenor * per_year), 1, lifetime * per_year)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            emi = np.where(rate > 0, principal * rate / -np.expm1(-payments * np.log1p(rate)),
+                           principal / payments)
+
+            def balance(paid):
+                growth = np.exp(paid * np.log1p(rate))
+                remaining = np.where(rate > 0, principal * growth - emi * (growth - 1) / rate,
+                                     principal - emi * paid)
+                return np.where(paid < payments, np.maximum(remaining, 0.0), 0.0)
+
+            boundaries = balance(np.arange(lifetime + 1) * per_year)
+
+        opening = boundaries[:, :-1]
+        repaid = opening - boundaries[:, 1:]
+        count = np.clip(payments - np.arange(lifetime) * per_year, 0, per_year)
+        payment = count * emi
+
+        return {
+            'emi': emi[:, 0],
+            'opening_balance': opening,
+            'interest': payment - repaid,
+            'principal': repaid,
+            'payment': payment
+        }
+
+    def depreciation(self, investment, depreciation_rate=None) -> np.ndarray:
+        """Written-down-value depreciation per year, (scenarios, lifetime)"""
+        rate = self._column(self.depreciation_rate if depreciation_rate is None else depreciation_rate)
+        years = np.arange(self.cash_flow_model.lifetime)
+        return self._column(investment) * rate * (1 - rate) ** years
+
+    def analyze(self, investment, first_year_generation, tariff_rate,
+                generation: Optional[np.ndarray] = None, loan_fraction=None, interest_rate=None,
+                tenor_years=None, interest_subsidy=None, subsidy_years=None, tax_rate=None,
+                depreciation_rate=None) -> Dict[str, np.ndarray]:
+        """
+        Equity cash flows of a part-loan purchase for every scenario
+
+        Args:
+            investment: Investment per scenario in ₹
+            first_year_generation: Year-one generation per scenario in kWh
+            tariff_rate: Year-one tariff (or savings per kWh) per scenario
+            generation: Optional (scenarios, lifetime) generation matrix
+            loan_fraction, interest_rate, tenor_years, interest_subsidy,
+                subsidy_years, tax_rate, depreciation_rate: Optional
+                per-scenario overrides
+
+        Returns:
+            Dict with loan_amount, equity, emi, equity_irr, equity_npv and
+            equity_payback per scenario, cash_on_cash and the schedule
+            matrices (scenarios, lifetime) and equity flows
+            (scenarios, lifetime + 1)
+        """
+        def value(override, default):
+            return self._column(default if override is None else override)
+
+        model = self.cash_flow_model
+        cash_flows = model.build_cash_flows(investment, first_year_generation, tariff_rate, generation=generation)
+        investment = self._column(investment)
+        scenarios = np.broadcast_shapes(investment.shape, cash_flows['savings'].shape[:1] + (1,),
+                                        *(np.shape(self._column(override)) for override in
+                                          (loan_fraction, interest_rate, tenor_years, interest_subsidy,
+                                           subsidy_years, tax_rate, depreciation_rate) if override is not None))
+
+        investment = np.broadcast_to(investment, scenarios)
+        loan_amount = investment * value(loan_fraction, self.loan_fraction)
+        schedule = self.amortize(loan_amount[:, 0], interest_rate, tenor_years)
+        years = np.arange(model.lifetime)
+
+        rate = value(interest_rate, self.interest_rate)
+        subsidy_rate = np.minimum(value(interest_subsidy, self.interest_subsidy), rate)
+        tenor = value(tenor_years, self.tenor_years)
+        subsidy_period = tenor if subsidy_years is None and self.subsidy_years is None \
+            else value(subsidy_years, self.subsidy_years)
+        subsidy_share = np.divide(subsidy_rate, rate, where=rate > 0,
+                                  out=np.zeros(np.broadcast_shapes(subsidy_rate.shape, rate.shape)))
+        subsidy = np.where(years < subsidy_period, schedule['interest'] * subsidy_share, 0.0)
+
+        depreciation = self.depreciation(investment[:, 0], depreciation_rate)
+        tax = value(tax_rate, self.tax_rate) * (cash_flows['savings'] - cash_flows['costs']
+                                                - schedule['interest'] - depreciation)
+
+        equity = investment - loan_amount
+        net = cash_flows['savings'] - cash_flows['costs'] - schedule['payment'] + subsidy - tax
+        flows = np.concatenate([-equity, net], axis=1)
+
+        return {
+            'loan_amount': loan_amount[:, 0],
+            'equity': equity[:, 0],
+            'emi': schedule['emi'],
+            'equity_irr': model.irr(flows),
+            'equity_npv': model.npv(flows),
+            'equity_payback': model.payback(flows),
+            'cash_on_cash': np.divide(net, equity, out=np.full(net.shape, np.nan), where=equity > 0),
+            'interest': schedule['interest'],
+            'principal': schedule['principal'],
+            'opening_balance': schedule['opening_balance'],
+            'interest_subsidy': subsidy,
+            'depreciation': depreciation,
+            'tax': tax,
+            'flows': flows
+        }
@@ -0,0 +1,267 @@
+"""
+Hourly (8760) solar generation simulation engine
+"""
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+HOURS_PER_YEAR = 8760
+DAYS_PER_MONTH = np.array([31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31])
+SOLAR_CONSTANT = 1367.0  # W/m²
+IST_OFFSET = 5.5  # hours ahead of UTC
+
+# Months covered by each SolarDataFetcher season
+SEASON_MONTHS = {
+    'winter': (11, 0, 1),         # Dec-Feb
+    'summer': (2, 3, 4),          # Mar-May
+    'monsoon': (5, 6, 7, 8),      # Jun-Sep
+    'post_monsoon': (9, 10)       # Oct-Nov
+}
+
+# Time axis shared by every simulation (non-leap year, mid-hour timestamps)
+DAY_OF_YEAR = np.repeat(np.arange(1, 366), 24)
+HOUR_OF_DAY = np.tile(np.arange(24) + 0.5, 365)
+MONTH_INDEX = np.repeat(np.repeat(np.arange(12), DAYS_PER_MONTH), 24)
+
+# SolarDataFetcher weather factors for losses the performance ratio already
+# includes (soiling, module temperature); the remaining, atmospheric factors
+# derate the irradiance instead of the output
+PR_LOSS_FACTORS = ('dust_factor', 'temperature_factor')
+
+
+def solar_position(latitude: float, longitude: float, timezone: float = IST_OFFSET,
+                   day_of_year: Optional[np.ndarray] = None,
+                   hour_of_day: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Sun zenith and azimuth for every hour of the year (Spencer equations)
+
+    Args:
+        latitude: Site latitude in degrees
+        longitude: Site longitude in degrees
+        timezone: Local standard time offset from UTC in hours
+        day_of_year: Optional day numbers (default DAY_OF_YEAR)
+        hour_of_day: Optional local clock hours, same shape (default the
+            mid-hour HOUR_OF_DAY)
+
+    Returns:
+        Tuple of (zenith, azimuth) arrays in degrees, azimuth measured
+        clockwise from north
+    """
+    if day_of_year is None:
+        day_of_year, hour_of_day = DAY_OF_YEAR, HOUR_OF_DAY
+    day_angle = 2 * np.pi * (day_of_year - 1) / 365
+    declination = (0.006918 - 0.399912 * np.cos(day_angle) + 0.070257 * np.sin(day_angle)
+                   - 0.006758 * np.cos(2 * day_angle) + 0.000907 * np.sin(2 * day_angle)
+                   - 0.002697 * np.cos(3 * day_angle) + 0.00148 * np.sin(3 * day_angle))
+    equation_of_time = 229.18 * (0.000075 + 0.001868 * np.cos(day_angle) - 0.032077 * np.sin(day_angle)
+                                 - 0.014615 * np.cos(2 * day_angle) - 0.040849 * np.sin(2 * day_angle))
+
+    solar_time = hour_of_day + (4 * (longitude - 15 * timezone) + equation_of_time) / 60
+    hour_angle = np.radians(15 * (solar_time - 12))
+    phi = np.radians(latitude)
+
+    cos_zenith = (np.sin(phi) * np.sin(declination)
+                  + np.cos(phi) * np.cos(declination) * np.cos(hour_angle))
+    zenith = np.degrees(np.arccos(np.clip(cos_zenith, -1, 1)))
+    azimuth = np.degrees(np.arctan2(
+        np.sin(hour_angle),
+        np.cos(hour_angle) * np.sin(phi) - np.tan(declination) * np.cos(phi)
+    )) + 180
+
+    return zenith, azimuth
+
+
+def extraterrestrial_horizontal(zenith: np.ndarray) -> np.ndarray:
+    """Extraterrestrial irradiance on a horizontal plane in W/m²"""
+    day_angle = 2 * np.pi * (DAY_OF_YEAR - 1) / 365
+    normal = SOLAR_CONSTANT * (1.00011 + 0.034221 * np.cos(day_angle) + 0.00128 * np.sin(day_angle)
+                               + 0.000719 * np.cos(2 * day_angle) + 0.000077 * np.sin(2 * day_angle))
+    return normal * np.maximum(np.cos(np.radians(zenith)), 0)
+
+
+def monthly_irradiance_profile(avg_irradiance: float,
+                               seasonal_variation: Optional[Dict[str, float]] = None) -> np.ndarray:
+    """
+    Daily irradiance for each month, preserving the annual average
+
+    Args:
+        avg_irradiance: Annual average irradiance in kWh/m²/day
+        seasonal_variation: SolarDataFetcher seasonal irradiance values
+
+    Returns:
+        Array of 12 daily irradiance values in kWh/m²/day
+    """
+    monthly = np.ones(12)
+    if seasonal_variation:
+        for season, months in SEASON_MONTHS.items():
+            if season in seasonal_variation:
+                monthly[list(months)] = seasonal_variation[season]
+
+    annual_mean = np.dot(monthly, DAYS_PER_MONTH) / 365
+    return avg_irradiance * monthly / annual_mean
+
+
+def decompose_ghi(ghi: np.ndarray, zenith: np.ndarray, etr_horizontal: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Split GHI into DNI and DHI using the Erbs diffuse-fraction correlation
+
+    Returns:
+        Tuple of (dni, dhi) arrays in W/m²
+    """
+    clearness = np.divide(ghi, etr_horizontal, out=np.zeros_like(ghi), where=etr_horizontal > 0)
+    clearness = np.clip(clearness, 0, 1)
+
+    diffuse_fraction = np.where(
+        clearness <= 0.22, 1 - 0.09 * clearness,
+        np.where(clearness <= 0.8,
+                 0.9511 - 0.1604 * clearness + 4.388 * clearness ** 2
+                 - 16.638 * clearness ** 3 + 12.336 * clearness ** 4,
+                 0.165)
+    )
+
+    dhi = ghi * diffuse_fraction
+    cos_zenith = np.maximum(np.cos(np.radians(zenith)), 0.065)
+    dni = np.maximum((ghi - dhi) / cos_zenith, 0)
+    return dni, dhi
+
+
+def transpose_to_poa(ghi: np.ndarray, dni: np.ndarray, dhi: np.ndarray,
+                     zenith: np.ndarray, azimuth: np.ndarray,
+                     tilt, surface_azimuth, albedo: float = 0.2,
+                     beam_factor=1.0, diffuse_factor=1.0) -> np.ndarray:
+    """
+    Plane-of-array irradiance with the isotropic sky model
+
+    Tilt and surface azimuth may be arrays; they broadcast against the
+    trailing hourly axis so a grid of orientations is one operation.
+    beam_factor (hourly array or scalar) and diffuse_factor scale the
+    beam and sky-diffuse terms, e.g. for horizon shading.
+
+    Returns:
+        Plane-of-array irradiance in W/m²
+    """
+    beta = np.radians(np.asarray(tilt, dtype=float))[..., np.newaxis]
+    gamma = np.radians(np.asarray(surface_azimuth, dtype=float))[..., np.newaxis]
+    zenith_rad = np.radians(zenith)
+
+    cos_aoi = (np.cos(zenith_rad) * np.cos(beta)
+               + np.sin(zenith_rad) * np.sin(beta) * np.cos(np.radians(azimuth) - gamma))
+
+    beam = dni * np.maximum(cos_aoi, 0) * beam_factor
+    sky_diffuse = dhi * (1 + np.cos(beta)) / 2 * diffuse_factor
+    ground_reflected = ghi * albedo * (1 - np.cos(beta)) / 2
+    return beam + sky_diffuse + ground_reflected
+
+
+class HourlySimulator:
+    """Simulates a year of hourly PV generation from location data"""
+
+    def __init__(self, performance_ratio: float = 0.75, albedo: float = 0.2, temperature_model=None):
+        """
+        Initialize simulator
+
+        Args:
+            performance_ratio: System performance ratio
+            albedo: Ground reflectance
+            temperature_model: Optional utils.temperature.TemperatureModel
+                used when simulate() is given ambient temperatures
+        """
+        self.performance_ratio = performance_ratio
+        self.albedo = albedo
+        self.temperature_model = temperature_model
+
+    def synthesize_ghi(self, zenith: np.ndarray, avg_irradiance: float,
+                       seasonal_variation: Optional[Dict[str, float]] = None) -> np.ndarray:
+        """
+        Hourly GHI whose monthly totals match the location's irradiance
+
+        A clear-sky shape proportional to extraterrestrial irradiance is
+        scaled month by month to the seasonal daily irradiance.
+
+        Returns:
+            Hourly GHI in W/m² (8760 values)
+        """
+        shape = extraterrestrial_horizontal(zenith)
+        shape_monthly_kwh = np.bincount(MONTH_INDEX, weights=shape, minlength=12) / 1000
+        target_monthly_kwh = monthly_irradiance_profile(avg_irradiance, seasonal_variation) * DAYS_PER_MONTH
+
+        scale = np.divide(target_monthly_kwh, shape_monthly_kwh,
+                          out=np.zeros(12), where=shape_monthly_kwh > 0)
+        return shape * scale[MONTH_INDEX]
+
+    def get_irradiance_components(self, latitude: float, longitude: float, avg_irradiance: float,
+                                  seasonal_variation: Optional[Dict[str, float]] = None,
+                                  sky_factor: float = 1.0) -> Dict[str, np.ndarray]:
+        """
+        Hourly sun position and irradiance components for a location
+
+        Args:
+            sky_factor: Atmospheric derate applied to GHI before it is split
+                into beam and diffuse (a cloudier sky also shifts the split
+                towards diffuse)
+
+        Returns:
+            Dict with zenith, azimuth, ghi, dni and dhi arrays
+        """
+        zenith, azimuth = solar_position(latitude, longitude)
+        ghi = self.synthesize_ghi(zenith, avg_irradiance, seasonal_variation) * sky_factor
+        dni, dhi = decompose_ghi(ghi, zenith, extraterrestrial_horizontal(zenith))
+
+        return {'zenith': zenith, 'azimuth': azimuth, 'ghi': ghi, 'dni': dni, 'dhi': dhi}
+
+    def simulate(self, capacity: float, latitude: float, longitude: float, avg_irradiance: float,
+                 tilt: Optional[float] = None, surface_azimuth: Optional[float] = None,
+                 weather_factors: Optional[Dict[str, float]] = None,
+                 seasonal_variation: Optional[Dict[str, float]] = None,
+                 beam_loss: Optional[np.ndarray] = None, diffuse_loss: float = 0.0,
+                 ambient_temperature: Optional[np.ndarray] = None,
+                 wind_speed: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Simulate hourly generation for one year
+
+        Args:
+            capacity: System capacity in kW
+            latitude: Site latitude in degrees
+            longitude: Site longitude in degrees
+            avg_irradiance: Annual average irradiance in kWh/m²/day
+            tilt: Module tilt in degrees (defaults to latitude)
+            surface_azimuth: Module azimuth in degrees (defaults to equator-facing)
+            weather_factors: SolarDataFetcher weather impact factors; the
+                atmospheric ones (cloud, humidity) derate the irradiance,
+                PR_LOSS_FACTORS are already part of the performance ratio
+            seasonal_variation: SolarDataFetcher seasonal irradiance values
+            beam_loss: Optional hourly fraction of beam irradiance shaded
+                (see utils.shading)
+            diffuse_loss: Fraction of sky-diffuse irradiance blocked by the horizon
+            ambient_temperature: Optional hourly ambient temperature in °C;
+                with a temperature_model it applies an hourly cell-temperature
+                derate relative to the loss the performance ratio includes
+            wind_speed: Optional hourly wind speed in m/s
+
+        Returns:
+            Hourly AC generation in kWh (8760 values)
+        """
+        if tilt is None:
+            tilt = abs(latitude)
+        if surface_azimuth is None:
+            surface_azimuth = 180.0 if latitude >= 0 else 0.0
+
+        sky_factor = 1.0
+        for name, factor in (weather_factors or {}).items():
+            if name not in PR_LOSS_FACTORS:
+                sky_factor *= factor
+
+        components = self.get_irradiance_components(latitude, longitude, avg_irradiance,
+                                                    seasonal_variation, sky_factor)
+        poa = transpose_to_poa(
+            components['ghi'], components['dni'], components['dhi'],
+            components['zenith'], components['azimuth'],
+            tilt, surface_azimuth, self.albedo,
+            beam_factor=1.0 if beam_loss is None else 1.0 - beam_loss,
+            diffuse_factor=1.0 - diffuse_loss
+        )
+
+        generation = capacity * poa / 1000 * self.performance_ratio
+        if ambient_temperature is not None and self.temperature_model is not None:
+            generation *= self.temperature_model.relative_derate(poa, ambient_temperature, wind_speed)
+        return generation
@@ -0,0 +1,179 @@
+"""
+Inverse analysis: capacity, cost per kW, tariff or bill that hits a target
+payback, IRR or annual savings
+"""
+from typing import Dict, Any, Optional, Tuple
+
+import numpy as np
+
+SOLVE_FOR = ('capacity', 'cost_per_kw', 'tariff', 'monthly_bill')
+TARGET_METRICS = ('payback', 'irr', 'annual_savings')
+
+# Smallest system the calculator sizes (calculate_plant_capacity_precise)
+MIN_CAPACITY = 1.0  # kW
+
+# Default search bracket for each unknown
+BRACKETS = {
+    'capacity': (MIN_CAPACITY, 100000.0),  # kW
+    'cost_per_kw': (0.0, 1000000.0),     # ₹/kW
+    'tariff': (0.01, 100.0),             # ₹/unit
+    'monthly_bill': (1.0, 1.0e9)         # ₹
+}
+
+
+class InverseSolver:
+    """Vectorized bisection on the analysis formulas, one root per target"""
+
+    def __init__(self, calculator, iterations: int = 200, tolerance: float = 1e-10):
+        """
+        Initialize solver
+
+        Args:
+            calculator: SolarCalculator providing PR, pricing and the cash-flow model
+            iterations: Maximum bisection steps
+            tolerance: Stop once every bracket is narrower than this
+                fraction of its upper end
+        """
+        self.calculator = calculator
+        self.iterations = iterations
+        self.tolerance = tolerance
+
+    def evaluate(self, monthly_bill, tariff_rate, avg_irradiance, consumer_type="Residential",
+                 capacity=None, cost_per_kw=None, export_rate=0.0, state=None) -> Dict[str, np.ndarray]:
+        """
+        Capacity, investment, savings and payback for whole columns
+
+        The system matches consumption with the MIN_CAPACITY floor (the
+        get_comprehensive_analysis sizing) unless capacity is given; generation beyond consumption is
+        valued at export_rate. Prices come from the price book unless
+        cost_per_kw is given.
+
+        Returns:
+            Dict of arrays: capacity, cost_per_kw, investment,
+            yearly_generation, annual_savings and payback
+        """
+        calculator = self.calculator
+        bill, tariff, irradiance = np.broadcast_arrays(*(np.asarray(value, dtype=float) for value in
+                                                         (monthly_bill, tariff_rate, avg_irradiance)))
+        monthly_consumption = np.divide(bill, tariff, out=np.zeros(bill.shape), where=tariff > 0)
+        monthly_yield = irradiance * calculator.PERFORMANCE_RATIO * calculator.DAYS_PER_MONTH
+
+        if capacity is None:
+            capacity = np.maximum(MIN_CAPACITY, monthly_consumption / monthly_yield)
+        capacity = np.asarray(capacity, dtype=float)
+        shape = np.broadcast_shapes(bill.shape, capacity.shape, np.shape(cost_per_kw), np.shape(consumer_type))
+        capacity = np.broadcast_to(capacity, shape)
+
+        yearly_generation = capacity * monthly_yield * calculator.MONTHS_PER_YEAR
+        annual_consumption = monthly_consumption * calculator.MONTHS_PER_YEAR
+        self_consumed = np.minimum(yearly_generation, annual_consumption)
+        annual_savings = self_consumed * tariff + (yearly_generation - self_consumed) * export_rate
+
+        if cost_per_kw is None:
+            cost_per_kw = calculator.get_cost_per_kw_array(np.broadcast_to(consumer_type, shape), capacity, state)
+        cost_per_kw = np.broadcast_to(np.asarray(cost_per_kw, dtype=float), shape)
+        investment = capacity * cost_per_kw
+
+        return {
+            'capacity': capacity,
+            'cost_per_kw': cost_per_kw,
+            'investment': investment,
+            'yearly_generation': yearly_generation,
+            'annual_savings': annual_savings,
+            'payback': np.divide(investment, annual_savings, out=np.full(shape, 999.0), where=annual_savings > 0)
+        }
+
+    def _cash_flows(self, values: Dict[str, np.ndarray]) -> np.ndarray:
+        """Lifetime cash-flow rows for evaluate() output (flattened)"""
+        generation = values['yearly_generation'].ravel()
+        effective_tariff = np.divide(values['annual_savings'].ravel(), generation,
+                                     out=np.zeros(generation.shape), where=generation > 0)
+        model = self.calculator.get_cash_flow_model()
+        return model.build_cash_flows(values['investment'].ravel(), generation, effective_tariff,
+                                      generation=generation[:, np.newaxis] * self.calculator.get_performance_curve()
+                                      )['flows']
+
+    def _residual(self, values: Dict[str, np.ndarray], target_metric: str, target: np.ndarray) -> np.ndarray:
+        """Signed distance from the target (IRR via the NPV at the target rate)"""
+        if target_metric == 'irr':
+            flows = self._cash_flows(values)
+            model = self.calculator.get_cash_flow_model()
+            return model.npv(flows, np.broadcast_to(target, values['investment'].shape).ravel()).reshape(target.shape)
+        return values[target_metric] - target
+
+    def solve(self, solve_for: str, target_metric: str, target, monthly_bill=None, tariff_rate=None,
+              avg_irradiance=4.5, consumer_type="Residential", capacity=None, cost_per_kw=None,
+              export_rate=0.0, state=None, bracket: Optional[Tuple[float, float]] = None) -> Dict[str, Any]:
+        """
+        Value of one input that makes the analysis hit a target
+
+        Every target (and every row of array inputs) is bracketed and
+        bisected at once; rows whose target is not reached inside the
+        bracket come back as NaN. Capacities are searched from
+        MIN_CAPACITY up, so a target only a smaller system would hit is
+        reported unsolved.
+
+        Args:
+            solve_for: One of SOLVE_FOR
+            target_metric: One of TARGET_METRICS (payback in years, irr as a
+                fraction, annual_savings in ₹)
+            target: Target value or array of targets
+            monthly_bill, tariff_rate, avg_irradiance, consumer_type,
+                capacity, cost_per_kw, export_rate, state: Fixed inputs
+                (scalars or arrays); the solved one is ignored
+            bracket: Optional (low, high) search range for the unknown
+
+        Returns:
+            Dict with the solved values under solve_for, 'solved' flags and
+            capacity, cost_per_kw, investment, annual_savings, payback and
+            irr at the solution
+        """
+        if solve_for not in SOLVE_FOR:
+            raise ValueError(f"Unknown variable to solve for: {solve_for}")
+        if target_metric not in TARGET_METRICS:
+            raise ValueError(f"Unknown target metric: {target_metric}")
+
+        inputs = {'monthly_bill': monthly_bill, 'tariff_rate': tariff_rate, 'avg_irradiance': avg_irradiance,
+                  'consumer_type': consumer_type, 'capacity': capacity, 'cost_per_kw': cost_per_kw,
+                  'export_rate': export_rate, 'state': state}
+        unknown = 'tariff_rate' if solve_for == 'tariff' else solve_for
+        for name in ('monthly_bill', 'tariff_rate'):
+            if name != unknown and inputs[name] is None:
+                raise ValueError(f"{name} is required to solve for {solve_for}")
+
+        def evaluate(value):
+            return self.evaluate(**dict(inputs, **{unknown: value}))
+
+        target = np.asarray(target, dtype=float)
+        low, high = bracket or BRACKETS[solve_for]
+        if solve_for == 'capacity':
+            low = max(low, MIN_CAPACITY)
+        shape = evaluate(np.broadcast_to(float(low), target.shape))['investment'].shape
+        target = np.broadcast_to(target, shape)
+        low = np.full(shape, float(low))
+        high = np.full(shape, float(high))
+
+        low_residual = self._residual(evaluate(low), target_metric, target)
+        high_residual = self._residual(evaluate(high), target_metric, target)
+        solved = (np.sign(low_residual) != np.sign(high_residual)) | (low_residual == 0)
+
+        for _ in range(self.iterations):
+            middle = (low + high) / 2
+            residual = self._residual(evaluate(middle), target_metric, target)
+            same_side = (np.sign(residual) == np.sign(low_residual)) & (low_residual != 0)
+            low = np.where(same_side, middle, low)
+            low_residual = np.where(same_side, residual, low_residual)
+            high = np.where(same_side, high, middle)
+            if np.all((high - low)[solved] <= self.tolerance * np.maximum(np.abs(high[solved]), 1.0)):
+                break
+
+        solution = np.where(solved, np.where(low_residual == 0, low, (low + high) / 2), np.nan)
+        values = evaluate(np.where(solved, solution, low))
+        irr = self.calculator.get_cash_flow_model().irr(self._cash_flows(values)).reshape(shape)
+
+        result = {solve_for: solution, 'solved': solved}
+        for name in ('capacity', 'cost_per_kw', 'investment', 'annual_savings', 'payback'):
+            result[name] = np.where(solved, values[name], np.nan)
+        result['irr'] = np.where(solved, irr, np.nan)
+        result[solve_for] = solution
+        return result
@@ -0,0 +1,221 @@
+"""
+Rooftop module layout: rows of module rectangles packed into a roof polygon
+"""
+import math
+from typing import Dict, Any, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from utils.equipment import DEFAULT_MODULE_SIZE
+from utils.shading import DEFAULT_LATITUDE
+
+SQ_FT_PER_M2 = 10.7639
+
+# Fire-code walkway kept clear along the roof edge (metres)
+DEFAULT_SETBACK = 1.0
+
+# Clearance between neighbouring modules in a row (metres)
+MODULE_GAP = 0.02
+
+# Module tilt on racking when none is given (degrees)
+DEFAULT_TILT = 10.0
+
+# Lowest sun elevation rows are spaced for (degrees), so winter noon
+# shadows at high latitudes do not force absurd row pitches
+MIN_DESIGN_ELEVATION = 15.0
+
+WINTER_DECLINATION = 23.45
+
+
+def square_roof(rooftop_area: float) -> List[Tuple[float, float]]:
+    """
+    Square roof polygon for an area given in sq ft
+
+    Returns:
+        Vertices in metres
+    """
+    side = math.sqrt(rooftop_area / SQ_FT_PER_M2)
+    return [(0.0, 0.0), (side, 0.0), (side, side), (0.0, side)]
+
+
+def _crossings(vertices: np.ndarray, heights: np.ndarray) -> np.ndarray:
+    """
+    Sorted x positions where horizontal lines cross the polygon boundary
+
+    Returns:
+        Array (heights, edges) with NaN padding after the crossings
+    """
+    start = vertices
+    end = np.roll(vertices, -1, axis=0)
+    y = heights[:, np.newaxis]
+    # Half-open rule so a line through a vertex counts each edge once
+    crosses = (start[:, 1] <= y) != (end[:, 1] <= y)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        x = start[:, 0] + (y - start[:, 1]) * (end[:, 0] - start[:, 0]) / (end[:, 1] - start[:, 1])
+    return np.sort(np.where(crosses, x, np.nan), axis=1)
+
+
+def _intersect(first: List[Tuple[float, float]], second: List[Tuple[float, float]]) -> List[Tuple[float, float]]:
+    """Intersection of two sorted interval lists"""
+    result = []
+    i = j = 0
+    while i < len(first) and j < len(second):
+        low = max(first[i][0], second[j][0])
+        high = min(first[i][1], second[j][1])
+        if low < high:
+            result.append((low, high))
+        if first[i][1] < second[j][1]:
+            i += 1
+        else:
+            j += 1
+    return result
+
+
+class RooftopLayout:
+    """Packs tilted module rows into a roof outline with setbacks"""
+
+    def __init__(self, module_length: float = DEFAULT_MODULE_SIZE['length_m'],
+                 module_width: float = DEFAULT_MODULE_SIZE['width_m'], module_power: float = 400.0,
+                 setback: float = DEFAULT_SETBACK, module_gap: float = MODULE_GAP):
+        """
+        Initialize layout
+
+        Args:
+            module_length: Long side of a module in metres
+            module_width: Short side of a module in metres
+            module_power: Module rating in W
+            setback: Clear distance from the roof edge in metres
+            module_gap: Clearance between modules in a row in metres
+        """
+        self.module_length = module_length
+        self.module_width = module_width
+        self.module_power = module_power
+        self.setback = setback
+        self.module_gap = module_gap
+
+    @property
+    def fingerprint(self) -> Tuple[float, ...]:
+        """Current settings (caches compare them to spot a reconfigured layout)"""
+        return (self.module_length, self.module_width, self.module_power, self.setback, self.module_gap)
+
+    def row_pitch(self, slope_length: float, tilt: float, latitude: float) -> Tuple[float, float]:
+        """
+        Row depth on the roof and row-to-row pitch
+
+        Rows are spaced so they do not shade each other at winter-solstice
+        noon (sun no lower than MIN_DESIGN_ELEVATION).
+
+        Returns:
+            Tuple of (depth, pitch) in metres
+        """
+        beta = math.radians(tilt)
+        depth = slope_length * math.cos(beta)
+        elevation = max(90 - abs(latitude) - WINTER_DECLINATION, MIN_DESIGN_ELEVATION)
+        shadow = slope_length * math.sin(beta) / math.tan(math.radians(elevation))
+        return depth, depth + max(shadow, self.module_gap)
+
+    def pack(self, polygon: Sequence[Tuple[float, float]], tilt: float = DEFAULT_TILT,
+             latitude: float = DEFAULT_LATITUDE, orientation: str = 'best') -> Dict[str, Any]:
+        """
+        Maximum number of modules that fit on a roof
+
+        Rows run east-west (along x) and step north (along y). A module
+        fits where its rectangle grown by the setback lies inside the
+        polygon; for each row band the inside x-intervals are intersected
+        at the band edges and every vertex height within the band, which is
+        exact for any simple polygon, and each interval is filled with
+        modules.
+
+        Args:
+            polygon: Roof outline vertices in metres (x east, y north)
+            tilt: Module tilt in degrees
+            latitude: Site latitude (sets the inter-row shading gap)
+            orientation: 'portrait', 'landscape' or 'best'
+
+        Returns:
+            Dict with module_count, capacity_kw, rows, row_pitch,
+            orientation, roof_area (m²) and module_area (m²)
+        """
+        vertices = np.asarray(polygon, dtype=float)
+        x, y = vertices[:, 0], vertices[:, 1]
+        roof_area = 0.5 * abs(np.dot(x, np.roll(y, -1)) - np.dot(y, np.roll(x, -1)))
+
+        options = ('portrait', 'landscape') if orientation == 'best' else (orientation,)
+        best = None
+        for option in options:
+            if option == 'portrait':
+                slope_length, across = self.module_length, self.module_width
+            elif option == 'landscape':
+                slope_length, across = self.module_width, self.module_length
+            else:
+                raise ValueError(f"Unknown orientation: {orientation}")
+            result = self._pack_rows(vertices, slope_length, across, tilt, latitude)
+            result['orientation'] = option
+            if best is None or result['module_count'] > best['module_count']:
+                best = result
+
+        best.update({
+            'capacity_kw': round(best['module_count'] * self.module_power / 1000, 3),
+            'roof_area': round(float(roof_area), 2),
+            'module_area': round(best['module_count'] * self.module_length * self.module_width, 2)
+        })
+        return best
+
+    def _pack_rows(self, vertices: np.ndarray, slope_length: float, across: float,
+                   tilt: float, latitude: float) -> Dict[str, Any]:
+        """Module count for one module orientation"""
+        depth, pitch = self.row_pitch(slope_length, tilt, latitude)
+        setback = self.setback
+        y_min, y_max = vertices[:, 1].min(), vertices[:, 1].max()
+
+        # Row bands (setback included) from the south edge northwards
+        starts = y_min + np.arange(0, max(y_max - y_min - depth - 2 * setback, -1) + 1e-9, pitch)
+        if not len(starts):
+            return {'module_count': 0, 'rows': 0, 'row_pitch': round(pitch, 3)}
+        band_low = starts
+        band_high = starts + depth + 2 * setback
+
+        # Crossings at both band edges and every vertex height, in one array operation
+        vertex_heights = np.unique(vertices[:, 1])
+        # (band edges nudged inward: a line exactly along a roof edge has no inside)
+        heights = np.concatenate([band_low + 1e-9, band_high - 1e-9, vertex_heights])
+        crossings = _crossings(vertices, heights)
+
+        def intervals(row):
+            values = row[~np.isnan(row)]
+            return list(zip(values[0::2], values[1::2]))
+
+        rows = len(starts)
+        edge_intervals = [intervals(row) for row in crossings[:2 * rows]]
+        vertex_intervals = [intervals(row) for row in crossings[2 * rows:]]
+        first_vertex = np.searchsorted(vertex_heights, band_low, side='right')
+        last_vertex = np.searchsorted(vertex_heights, band_high, side='left')
+
+        count = 0
+        filled_rows = 0
+        step = across + self.module_gap
+        for row in range(rows):
+            inside = _intersect(edge_intervals[row], edge_intervals[rows + row])
+            for index in range(first_vertex[row], last_vertex[row]):
+                if not inside:
+                    break
+                inside = _intersect(inside, vertex_intervals[index])
+            modules = sum(int((high - low - 2 * setback + self.module_gap) // step)
+                          for low, high in inside if high - low - 2 * setback >= across)
+            count += modules
+            filled_rows += modules > 0
+
+        return {'module_count': count, 'rows': filled_rows, 'row_pitch': round(pitch, 3)}
+
+    def max_capacity(self, rooftop_area: Optional[float] = None,
+                     polygon: Optional[Sequence[Tuple[float, float]]] = None,
+                     tilt: float = DEFAULT_TILT, latitude: float = DEFAULT_LATITUDE) -> Dict[str, Any]:
+        """
+        Installable kWp for a roof outline, or a square roof of rooftop_area sq ft
+
+        Returns:
+            pack() result
+        """
+        if polygon is None:
+            polygon = square_roof(rooftop_area)
+        return self.pack(polygon, tilt, latitude)
@@ -0,0 +1,158 @@
+"""
+Year-by-year plant performance: LID, degradation, availability and soiling
+"""
+from functools import lru_cache
+from typing import Dict, List, Optional
+
+import numpy as np
+
+DAYS_PER_YEAR = 365
+
+# Database/report column -> (simulate() matrix, decimal places kept)
+LIFETIME_COLUMNS = {
+    'generation_by_year': ('generation', 0),
+    'savings_by_year': ('savings', 0),
+    'co2_saved_by_year': ('co2_saved', 3)
+}
+
+
+def _soiled_days(days: np.ndarray, soiling_rate: np.ndarray, soiling_cap: np.ndarray,
+                 cleaning_interval: np.ndarray) -> np.ndarray:
+    """
+    Cumulative soiling loss (loss-days) over the first ``days`` days
+
+    The daily loss grows by soiling_rate from each cleaning until it
+    reaches soiling_cap, so it is a sawtooth with period cleaning_interval;
+    summing it per period keeps this closed-form for any number of years.
+    """
+    def ramp(count):
+        # Sum of min(rate * j, cap) for j in 0..count-1
+        with np.errstate(divide='ignore', invalid='ignore'):
+            saturate = np.where(soiling_rate > 0, np.ceil(soiling_cap / soiling_rate), np.inf)
+        rising = np.minimum(count, saturate)
+        return soiling_rate * rising * (rising - 1) / 2 + np.maximum(count - saturate, 0) * soiling_cap
+
+    cycles, remainder = np.divmod(days, cleaning_interval)
+    with np.errstate(invalid='ignore'):
+        cleaned = np.where(np.isinf(cleaning_interval), 0.0, cycles * ramp(cleaning_interval))
+    return cleaned + ramp(remainder)
+
+
+class LifetimeSimulator:
+    """Per-year generation, savings and CO₂ for a (scenarios x years) matrix"""
+
+    def __init__(self, lifetime: int = 25, first_year_lid: float = 0.015,
+                 degradation_rate: float = 0.005, availability: float = 0.99,
+                 soiling_rate: float = 0.002, soiling_cap: float = 0.06,
+                 cleaning_interval: Optional[float] = 15):
+        """
+        Initialize simulator
+
+        Args:
+            lifetime: System lifetime in years
+            first_year_lid: Light-induced degradation in the first year (fraction)
+            degradation_rate: Annual module degradation after the first year (fraction)
+            availability: Fraction of the year the plant is up (grid and
+                inverter outages)
+            soiling_rate: Generation lost to dust per day since the last
+                cleaning (fraction)
+            soiling_cap: Largest soiling loss an uncleaned array reaches (fraction)
+            cleaning_interval: Days between cleanings (None: never cleaned)
+        """
+        self.lifetime = lifetime
+        self.first_year_lid = first_year_lid
+        self.degradation_rate = degradation_rate
+        self.availability = availability
+        self.soiling_rate = soiling_rate
+        self.soiling_cap = soiling_cap
+        self.cleaning_interval = cleaning_interval
+
+    @staticmethod
+    def _column(values) -> np.ndarray:
+        """Scalar or per-scenario parameter as a (scenarios, 1) column"""
+        return np.atleast_1d(np.asarray(values, dtype=float))[:, np.newaxis]
+
+    def performance(self, first_year_lid=None, degradation_rate=None, availability=None,
+                    soiling_rate=None, soiling_cap=None, cleaning_interval=None) -> np.ndarray:
+        """
+        Output of each year relative to the year-one estimate
+
+        Args:
+            first_year_lid, degradation_rate, availability, soiling_rate,
+                soiling_cap, cleaning_interval: Optional per-scenario
+                overrides of the defaults
+
+        Returns:
+            (scenarios, lifetime) matrix of multipliers
+        """
+        def value(override, default):
+            return self._column(default if override is None else override)
+
+        lid = value(first_year_lid, self.first_year_lid)
+        degradation = value(degradation_rate, self.degradation_rate)
+        interval = value(cleaning_interval, self.cleaning_interval or np.inf)
+        interval = np.where(np.isfinite(interval) & (interval > 0), interval, np.inf)
+
+        years = np.arange(self.lifetime)
+        boundaries = np.arange(self.lifetime + 1) * DAYS_PER_YEAR
+        soiled = _soiled_days(boundaries, value(soiling_rate, self.soiling_rate),
+                              value(soiling_cap, self.soiling_cap), interval)
+        soiling = np.diff(soiled, axis=1) / DAYS_PER_YEAR
+
+        return (1 - lid) * (1 - degradation) ** years * value(availability, self.availability) * (1 - soiling)
+
+    def simulate(self, first_year_generation, first_year_savings=0.0, co2_factor=0.8,
+                 **overrides) -> Dict[str, np.ndarray]:
+        """
+        Per-year arrays for every scenario
+
+        Args:
+            first_year_generation: Year-one generation estimate per scenario in kWh
+            first_year_savings: Year-one savings per scenario in ₹
+            co2_factor: kg CO₂ avoided per kWh; one value, a per-year vector
+                or a (scenarios, lifetime) matrix (see EmissionFactorTable.factors)
+            **overrides: Per-scenario performance() parameters
+
+        Returns:
+            Dict with performance, generation (kWh), savings (₹) and
+            co2_saved (tons) (scenarios, lifetime) matrices
+        """
+        performance = self.performance(**overrides)
+        generation = self._column(first_year_generation) * performance
+        return {
+            'performance': performance,
+            'generation': generation,
+            'savings': self._column(first_year_savings) * performance,
+            'co2_saved': generation * co2_factor / 1000
+        }
+
+
+@lru_cache(maxsize=32)
+def performance_curve(lifetime: int, first_year_lid: float, degradation_rate: float,
+                      availability: float, soiling_rate: float, soiling_cap: float,
+                      cleaning_interval: Optional[float]) -> np.ndarray:
+    """
+    Shared, read-only single-scenario performance() curve
+
+    Returns:
+        Array of lifetime multipliers
+    """
+    curve = LifetimeSimulator(lifetime, first_year_lid, degradation_rate, availability,
+                              soiling_rate, soiling_cap, cleaning_interval).performance()[0]
+    curve.flags.writeable = False
+    return curve
+
+
+def lifetime_columns(simulation: Dict[str, np.ndarray], scenario: int = 0) -> Dict[str, List[float]]:
+    """
+    One scenario of a simulate() result as compact, rounded per-year lists
+
+    Args:
+        simulation: LifetimeSimulator.simulate() output
+        scenario: Row to extract
+
+    Returns:
+        Dict of LIFETIME_COLUMNS name -> list with one value per year
+    """
+    return {column: np.round(simulation[key][scenario], digits).tolist()
+            for column, (key, digits) in LIFETIME_COLUMNS.items()}
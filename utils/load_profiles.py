@@ -0,0 +1,142 @@
+"""
+Synthetic hourly (8760) load profiles from monthly consumption
+"""
+from functools import lru_cache
+from typing import Optional
+
+import numpy as np
+
+from utils.billing import resolve_category_code
+from utils.hourly_simulation import DAY_OF_YEAR, MONTH_INDEX
+
+# Relative demand for each hour of the day (00:00-01:00 first)
+DAILY_SHAPES = {
+    'residential': (0.55, 0.5, 0.45, 0.45, 0.5, 0.7, 1.1, 1.3, 1.2, 0.9, 0.8, 0.8,
+                    0.85, 0.85, 0.8, 0.8, 0.9, 1.1, 1.5, 1.8, 1.8, 1.6, 1.2, 0.8),
+    'commercial': (0.3, 0.3, 0.3, 0.3, 0.3, 0.35, 0.5, 0.8, 1.3, 1.6, 1.7, 1.7,
+                   1.6, 1.7, 1.7, 1.6, 1.5, 1.3, 1.0, 0.8, 0.6, 0.45, 0.35, 0.3),
+    'industrial': (0.7, 0.7, 0.7, 0.7, 0.7, 0.75, 0.9, 1.1, 1.25, 1.3, 1.3, 1.3,
+                   1.2, 1.3, 1.3, 1.3, 1.25, 1.1, 0.95, 0.85, 0.8, 0.75, 0.7, 0.7),
+    'continuous': (1.0,) * 24,
+    'agricultural': (0.4, 0.4, 0.4, 0.4, 0.4, 0.6, 1.2, 1.6, 1.8, 1.8, 1.8, 1.6,
+                     1.5, 1.5, 1.5, 1.4, 1.2, 0.8, 0.5, 0.4, 0.4, 0.4, 0.4, 0.4),
+    'street_lighting': (1.0, 1.0, 1.0, 1.0, 1.0, 0.6, 0.05, 0.0, 0.0, 0.0, 0.0, 0.0,
+                        0.0, 0.0, 0.0, 0.0, 0.0, 0.05, 0.6, 1.0, 1.0, 1.0, 1.0, 1.0)
+}
+
+# Month multipliers (January first): cooling in summer, irrigation seasons,
+# longer winter nights for lighting
+SEASONAL_FACTORS = {
+    'residential': (0.85, 0.85, 0.95, 1.1, 1.25, 1.2, 1.05, 1.0, 1.0, 0.95, 0.85, 0.85),
+    'commercial': (0.9, 0.9, 1.0, 1.1, 1.15, 1.1, 1.0, 1.0, 1.0, 1.0, 0.95, 0.9),
+    'industrial': (0.97, 0.97, 1.0, 1.03, 1.05, 1.03, 0.98, 0.98, 1.0, 1.0, 1.0, 0.99),
+    'continuous': (1.0,) * 12,
+    'agricultural': (1.1, 1.1, 1.2, 1.2, 1.3, 1.0, 0.6, 0.6, 0.8, 1.0, 1.1, 1.0),
+    'street_lighting': (1.1, 1.05, 1.0, 0.95, 0.9, 0.9, 0.9, 0.92, 0.97, 1.02, 1.08, 1.1)
+}
+
+# Sunday demand relative to a weekday
+SUNDAY_FACTORS = {
+    'residential': 1.1,
+    'commercial': 0.5,
+    'industrial': 0.6,
+    'continuous': 1.0,
+    'agricultural': 1.0,
+    'street_lighting': 1.0
+}
+
+# consumer_categories code -> archetype
+CATEGORY_ARCHETYPES = {
+    'LT-1A': 'residential',
+    'LT-1B': 'residential',
+    'LT-1C': 'residential',
+    'LT-2A': 'commercial',
+    'LT-2B': 'industrial',
+    'LT-3': 'agricultural',
+    'LT-4': 'street_lighting',
+    'LT-5': 'commercial',
+    'HT-1': 'industrial',
+    'HT-2': 'continuous',
+    'HT-3': 'commercial',
+    'HT-4': 'continuous',
+    'HT-5': 'industrial',
+    'HT-6': 'street_lighting',
+    'HT-7': 'commercial'
+}
+
+# Consumer type -> archetype when no category is given
+CONSUMER_TYPE_ARCHETYPES = {
+    'Residential': 'residential',
+    'Commercial': 'commercial',
+    'Industrial': 'industrial'
+}
+
+# The simulated year starts on a Monday, so Sundays are days 7, 14, ...
+SUNDAY = DAY_OF_YEAR % 7 == 0
+
+
+def archetype_for(consumer_type: str = "Residential", consumer_category: Optional[str] = None) -> str:
+    """Archetype name for a consumer category (form or table code) or consumer type"""
+    if consumer_category:
+        archetype = CATEGORY_ARCHETYPES.get(resolve_category_code(consumer_category))
+        if archetype:
+            return archetype
+    return CONSUMER_TYPE_ARCHETYPES.get(consumer_type, 'residential')
+
+
+@lru_cache(maxsize=None)
+def archetype_profile(archetype: str, per_month: bool = False) -> np.ndarray:
+    """
+    Normalized 8760 shape for an archetype, built once and cached
+
+    Args:
+        archetype: Key of DAILY_SHAPES
+        per_month: Normalize every month to sum to 1 (for 12 monthly
+            values); otherwise the year sums to 12 (for one average month,
+            seasonal shaping included)
+
+    Returns:
+        Read-only array of 8760 weights
+    """
+    hourly = np.tile(np.asarray(DAILY_SHAPES[archetype], dtype=float), 365)
+    hourly *= np.where(SUNDAY, SUNDAY_FACTORS[archetype], 1.0)
+    month_totals = np.bincount(MONTH_INDEX, weights=hourly, minlength=12)
+
+    if per_month:
+        profile = hourly / month_totals[MONTH_INDEX]
+    else:
+        seasonal = np.asarray(SEASONAL_FACTORS[archetype], dtype=float)
+        profile = hourly / month_totals[MONTH_INDEX] * seasonal[MONTH_INDEX]
+        profile *= 12 / profile.sum()
+
+    profile.flags.writeable = False
+    return profile
+
+
+def generate_load_profile(monthly_consumption, consumer_type: str = "Residential",
+                          consumer_category: Optional[str] = None, by_month: bool = False,
+                          dtype=np.float64) -> np.ndarray:
+    """
+    Expand monthly kWh into hourly load with a cached archetype
+
+    Args:
+        monthly_consumption: Average monthly kWh (scalar or one value per
+            consumer), seasonally shaped; with by_month, 12 monthly values
+            (or one row of 12 per consumer) kept as given
+        consumer_type: Residential/Commercial/Industrial
+        consumer_category: Optional consumer_categories or form code
+        by_month: The last axis of monthly_consumption holds 12 months
+        dtype: Output dtype (float32 halves memory for large batches)
+
+    Returns:
+        Hourly load in kWh, shape (8760,) or (consumers, 8760)
+    """
+    archetype = archetype_for(consumer_type, consumer_category)
+    consumption = np.asarray(monthly_consumption, dtype=float)
+
+    if by_month:
+        profile = archetype_profile(archetype, per_month=True)
+        return (consumption[..., MONTH_INDEX] * profile).astype(dtype, copy=False)
+
+    profile = archetype_profile(archetype)
+    return (consumption[..., np.newaxis] * profile).astype(dtype, copy=False)
@@ -106,6 +106,116 @@ LOCATION_DATA = {
     "Pen": {"state": "Maharashtra", "irradiance": 5.0, "tariff": 7.0}
 }
 
+# City coordinates (degrees) for sun-position and orientation calculations
+CITY_COORDINATES = {
+    "Delhi": {"lat": 28.7041, "lon": 77.1025},
+    "Mumbai": {"lat": 19.0760, "lon": 72.8777},
+    "Bangalore": {"lat": 12.9716, "lon": 77.5946},
+    "Chennai": {"lat": 13.0827, "lon": 80.2707},
+    "Hyderabad": {"lat": 17.3850, "lon": 78.4867},
+    "Pune": {"lat": 18.5204, "lon": 73.8567},
+    "Kolkata": {"lat": 22.5726, "lon": 88.3639},
+    "Ahmedabad": {"lat": 23.0225, "lon": 72.5714},
+    "Jaipur": {"lat": 26.9124, "lon": 75.7873},
+    "Lucknow": {"lat": 26.8467, "lon": 80.9462},
+    "Kanpur": {"lat": 26.4499, "lon": 80.3319},
+    "Nagpur": {"lat": 21.1458, "lon": 79.0882},
+    "Indore": {"lat": 22.7196, "lon": 75.8577},
+    "Thane": {"lat": 19.2183, "lon": 72.9781},
+    "Bhopal": {"lat": 23.2599, "lon": 77.4126},
+    "Visakhapatnam": {"lat": 17.6868, "lon": 83.2185},
+    "Pimpri-Chinchwad": {"lat": 18.6298, "lon": 73.7997},
+    "Patna": {"lat": 25.5941, "lon": 85.1376},
+    "Vadodara": {"lat": 22.3072, "lon": 73.1812},
+    "Ghaziabad": {"lat": 28.6692, "lon": 77.4538},
+    "Ludhiana": {"lat": 30.9010, "lon": 75.8573},
+    "Agra": {"lat": 27.1767, "lon": 78.0081},
+    "Nashik": {"lat": 19.9975, "lon": 73.7898},
+    "Faridabad": {"lat": 28.4089, "lon": 77.3178},
+    "Meerut": {"lat": 28.9845, "lon": 77.7064},
+    "Rajkot": {"lat": 22.3039, "lon": 70.8022},
+    "Kalyan-Dombivali": {"lat": 19.2403, "lon": 73.1305},
+    "Vasai-Virar": {"lat": 19.3919, "lon": 72.8397},
+    "Varanasi": {"lat": 25.3176, "lon": 82.9739},
+    "Srinagar": {"lat": 34.0837, "lon": 74.7973},
+    "Aurangabad": {"lat": 19.8762, "lon": 75.3433},
+    "Dhanbad": {"lat": 23.7957, "lon": 86.4304},
+    "Amritsar": {"lat": 31.6340, "lon": 74.8723},
+    "Navi Mumbai": {"lat": 19.0330, "lon": 73.0297},
+    "Allahabad": {"lat": 25.4358, "lon": 81.8463},
+    "Ranchi": {"lat": 23.3441, "lon": 85.3096},
+    "Howrah": {"lat": 22.5958, "lon": 88.2636},
+    "Coimbatore": {"lat": 11.0168, "lon": 76.9558},
+    "Jabalpur": {"lat": 23.1815, "lon": 79.9864},
+    "Gwalior": {"lat": 26.2183, "lon": 78.1828},
+    "Vijayawada": {"lat": 16.5062, "lon": 80.6480},
+    "Jodhpur": {"lat": 26.2389, "lon": 73.0243},
+    "Madurai": {"lat": 9.9252, "lon": 78.1198},
+    "Raipur": {"lat": 21.2514, "lon": 81.6296},
+    "Kota": {"lat": 25.2138, "lon": 75.8648},
+    "Chandigarh": {"lat": 30.7333, "lon": 76.7794},
+    "Guwahati": {"lat": 26.1445, "lon": 91.7362},
+    "Solapur": {"lat": 17.6599, "lon": 75.9064},
+    "Hubli-Dharwad": {"lat": 15.3647, "lon": 75.1240},
+    "Bareilly": {"lat": 28.3670, "lon": 79.4304},
+    "Moradabad": {"lat": 28.8386, "lon": 78.7733},
+    "Mysore": {"lat": 12.2958, "lon": 76.6394},
+    "Gurgaon": {"lat": 28.4595, "lon": 77.0266},
+    "Aligarh": {"lat": 27.8974, "lon": 78.0880},
+    "Jalandhar": {"lat": 31.3260, "lon": 75.5762},
+    "Tiruchirappalli": {"lat": 10.7905, "lon": 78.7047},
+    "Bhubaneswar": {"lat": 20.2961, "lon": 85.8245},
+    "Salem": {"lat": 11.6643, "lon": 78.1460},
+    "Warangal": {"lat": 17.9689, "lon": 79.5941},
+    "Mira-Bhayandar": {"lat": 19.2952, "lon": 72.8544},
+    "Thiruvananthapuram": {"lat": 8.5241, "lon": 76.9366},
+    "Bhiwandi": {"lat": 19.2813, "lon": 73.0483},
+    "Saharanpur": {"lat": 29.9680, "lon": 77.5552},
+    "Guntur": {"lat": 16.3067, "lon": 80.4365},
+    "Amravati": {"lat": 20.9374, "lon": 77.7796},
+    "Bikaner": {"lat": 28.0229, "lon": 73.3119},
+    "Noida": {"lat": 28.5355, "lon": 77.3910},
+    "Jamshedpur": {"lat": 22.8046, "lon": 86.2029},
+    "Bhilai Nagar": {"lat": 21.1938, "lon": 81.3509},
+    "Cuttack": {"lat": 20.4625, "lon": 85.8830},
+    "Firozabad": {"lat": 27.1592, "lon": 78.3957},
+    "Kochi": {"lat": 9.9312, "lon": 76.2673},
+    "Bhavnagar": {"lat": 21.7645, "lon": 72.1519},
+    "Dehradun": {"lat": 30.3165, "lon": 78.0322},
+    "Durgapur": {"lat": 23.5204, "lon": 87.3119},
+    "Asansol": {"lat": 23.6739, "lon": 86.9524},
+    "Nanded": {"lat": 19.1383, "lon": 77.3210},
+    "Kolhapur": {"lat": 16.7050, "lon": 74.2433},
+    "Ajmer": {"lat": 26.4499, "lon": 74.6399},
+    "Akola": {"lat": 20.7002, "lon": 77.0082},
+    "Gulbarga": {"lat": 17.3297, "lon": 76.8343},
+    "Jamnagar": {"lat": 22.4707, "lon": 70.0577},
+    "Ujjain": {"lat": 23.1765, "lon": 75.7885},
+    "Loni": {"lat": 28.7515, "lon": 77.2880},
+    "Siliguri": {"lat": 26.7271, "lon": 88.3953},
+    "Jhansi": {"lat": 25.4484, "lon": 78.5685},
+    "Ulhasnagar": {"lat": 19.2215, "lon": 73.1645},
+    "Jammu": {"lat": 32.7266, "lon": 74.8570},
+    "Sangli-Miraj & Kupwad": {"lat": 16.8524, "lon": 74.5815},
+    "Mangalore": {"lat": 12.9141, "lon": 74.8560},
+    "Erode": {"lat": 11.3410, "lon": 77.7172},
+    "Belgaum": {"lat": 15.8497, "lon": 74.4977},
+    "Ambattur": {"lat": 13.1143, "lon": 80.1548},
+    "Tirunelveli": {"lat": 8.7139, "lon": 77.7567},
+    "Malegaon": {"lat": 20.5579, "lon": 74.5089},
+    "Gaya": {"lat": 24.7914, "lon": 85.0002},
+    "Jalgaon": {"lat": 21.0077, "lon": 75.5626},
+    "Udaipur": {"lat": 24.5854, "lon": 73.7125},
+    "Maheshtala": {"lat": 22.5086, "lon": 88.2532},
+    "Pen": {"lat": 18.7376, "lon": 73.0960}
+}
+
+# Optimal module orientation per city (see utils.orientation), filled on demand
+ORIENTATION_CACHE = {}
+
+# Hourly ambient temperature / wind series per city (see utils.temperature), filled on demand
+WEATHER_CACHE = {}
+
 def get_cities():
     """Return list of available cities"""
     return sorted(LOCATION_DATA.keys())
@@ -114,6 +224,11 @@ def get_location_info(city):
     """Get location information for a city"""
     return LOCATION_DATA.get(city, {"state": "Unknown", "irradiance": 4.5, "tariff": 6.0})
 
+def get_location_info_at(latitude, longitude, n=5):
+    """Get location information for any coordinate, interpolated from the n nearest cities"""
+    from utils.spatial_index import get_location_index
+    return get_location_index().interpolate(latitude, longitude, n)
+
 def get_default_tariff(city):
     """Get default electricity tariff for a city"""
     location_info = get_location_info(city)
@@ -123,3 +238,23 @@ def get_solar_irradiance(city):
     """Get solar irradiance for a city"""
     location_info = get_location_info(city)
     return location_info.get("irradiance", 4.5)
+
+def get_coordinates(city):
+    """Get {lat, lon} for a city, or None if unknown"""
+    return CITY_COORDINATES.get(city)
+
+def get_optimal_orientation(city):
+    """Get the cached optimal orientation for a city, or None if not computed yet"""
+    return ORIENTATION_CACHE.get(city)
+
+def set_optimal_orientation(city, orientation):
+    """Store the optimal orientation for a city"""
+    ORIENTATION_CACHE[city] = orientation
+
+def get_hourly_weather(city):
+    """Get the cached hourly temperature and wind series for a city, or None"""
+    return WEATHER_CACHE.get(city)
+
+def set_hourly_weather(city, weather):
+    """Store the hourly temperature and wind series for a city"""
+    WEATHER_CACHE[city] = weather
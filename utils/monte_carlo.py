@@ -0,0 +1,163 @@
+"""
+Monte Carlo uncertainty analysis (P50/P90/P99) for solar projects
+"""
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Any, Optional
+
+import numpy as np
+
+from utils.cash_flow import CashFlowModel
+
+# Irradiance and cost are multipliers on the nominal value; performance
+# ratio and tariff escalation are absolute values
+DEFAULT_DISTRIBUTIONS = {
+    'irradiance': {'type': 'normal', 'mean': 1.0, 'std': 0.05},
+    'performance_ratio': {'type': 'triangular', 'low': 0.70, 'mode': 0.75, 'high': 0.80},
+    'tariff_escalation': {'type': 'uniform', 'low': 0.01, 'high': 0.05},
+    'cost_per_kw': {'type': 'normal', 'mean': 1.0, 'std': 0.07}
+}
+
+EXCEEDANCE_LEVELS = (50, 90, 99)
+
+
+def sample_distribution(rng: np.random.Generator, spec: Dict[str, Any], size: int) -> np.ndarray:
+    """
+    Draw samples from a distribution spec
+
+    Args:
+        rng: NumPy random generator
+        spec: {'type': 'normal'|'lognormal'|'uniform'|'triangular'|'fixed', ...parameters}
+        size: Number of samples
+
+    Returns:
+        Array of samples
+    """
+    kind = spec.get('type', 'fixed')
+
+    if kind == 'normal':
+        return rng.normal(spec['mean'], spec['std'], size)
+    elif kind == 'lognormal':
+        return rng.lognormal(spec['mean'], spec['sigma'], size)
+    elif kind == 'uniform':
+        return rng.uniform(spec['low'], spec['high'], size)
+    elif kind == 'triangular':
+        return rng.triangular(spec['low'], spec['mode'], spec['high'], size)
+    elif kind == 'fixed':
+        return np.full(size, float(spec['value']))
+    else:
+        raise ValueError(f"Unknown distribution type: {kind}")
+
+
+def _simulate_chunk(task: Dict[str, Any]) -> Dict[str, np.ndarray]:
+    """Simulate one chunk of draws (module level so process pools can pickle it)"""
+    rng = np.random.default_rng(task['seed'])
+    size = task['size']
+    distributions = task['distributions']
+
+    irradiance = task['irradiance'] * sample_distribution(rng, distributions['irradiance'], size)
+    performance_ratio = sample_distribution(rng, distributions['performance_ratio'], size)
+    escalation = sample_distribution(rng, distributions['tariff_escalation'], size)
+    cost_multiplier = sample_distribution(rng, distributions['cost_per_kw'], size)
+
+    yearly_generation = task['capacity'] * np.maximum(irradiance, 0) * np.maximum(performance_ratio, 0) * 360
+    annual_savings = yearly_generation * task['tariff_rate']
+    investment = task['investment'] * np.maximum(cost_multiplier, 0)
+
+    cash_flow_model: CashFlowModel = task['cash_flow_model']
+    generation = None
+    if task['performance'] is not None:
+        generation = yearly_generation[:, np.newaxis] * task['performance']
+    cash_flows = cash_flow_model.build_cash_flows(investment, yearly_generation, task['tariff_rate'],
+                                                  generation=generation, tariff_escalation=escalation)
+
+    return {
+        'yearly_generation': yearly_generation,
+        'annual_savings': annual_savings,
+        'lifetime_savings': cash_flows['net'].sum(axis=1),
+        'payback_period': cash_flow_model.payback(cash_flows['flows'])
+    }
+
+
+class MonteCarloAnalyzer:
+    """Samples uncertain inputs and reports exceedance percentiles"""
+
+    def __init__(self, distributions: Optional[Dict[str, Dict[str, Any]]] = None,
+                 seed: Optional[int] = None, chunk_size: int = 10000):
+        """
+        Initialize analyzer
+
+        Args:
+            distributions: Overrides for DEFAULT_DISTRIBUTIONS, keyed by input
+            seed: Seed for reproducible results
+            chunk_size: Draws per chunk; each chunk gets its own spawned seed,
+                so results do not depend on the number of workers
+        """
+        self.distributions = {**DEFAULT_DISTRIBUTIONS, **(distributions or {})}
+        if chunk_size < 1:
+            raise ValueError(f"chunk_size must be at least 1, got {chunk_size}")
+        self.seed = seed
+        self.chunk_size = chunk_size
+
+    def simulate(self, capacity: float, investment: float, tariff_rate: float, irradiance: float,
+                 cash_flow_model: CashFlowModel, draws: int = 10000, workers: int = 1,
+                 performance: Optional[np.ndarray] = None) -> Dict[str, np.ndarray]:
+        """
+        Run all draws and return the raw samples
+
+        Args:
+            capacity: System capacity in kW
+            investment: Nominal investment in ₹
+            tariff_rate: Year-one tariff in ₹/unit
+            irradiance: Nominal irradiance in kWh/m²/day
+            cash_flow_model: Model used for escalation and payback
+            draws: Number of Monte Carlo draws
+            workers: Processes to spread chunks over (1 runs in-process)
+            performance: Optional per-year multipliers on year-one
+                generation (SolarCalculator.get_performance_curve); default
+                is the cash-flow model's degradation alone
+
+        Returns:
+            Dict of metric -> array of draws
+        """
+        if draws < 1:
+            raise ValueError(f"Monte Carlo needs at least one draw, got {draws}")
+        sizes = [self.chunk_size] * (draws // self.chunk_size)
+        if draws % self.chunk_size:
+            sizes.append(draws % self.chunk_size)
+
+        seeds = np.random.SeedSequence(self.seed).spawn(len(sizes))
+        tasks = [{
+            'seed': seed, 'size': size, 'distributions': self.distributions,
+            'capacity': capacity, 'investment': investment, 'tariff_rate': tariff_rate,
+            'irradiance': irradiance, 'cash_flow_model': cash_flow_model, 'performance': performance
+        } for seed, size in zip(seeds, sizes)]
+
+        if workers > 1 and len(tasks) > 1:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                chunks = list(executor.map(_simulate_chunk, tasks))
+        else:
+            chunks = [_simulate_chunk(task) for task in tasks]
+
+        return {key: np.concatenate([chunk[key] for chunk in chunks]) for key in chunks[0]}
+
+    @staticmethod
+    def summarize(samples: Dict[str, np.ndarray]) -> Dict[str, Dict[str, float]]:
+        """
+        Exceedance percentiles for each metric
+
+        P90 is the value met with 90% probability: the 10th percentile for
+        generation and savings, the 90th percentile for payback.
+        """
+        summary = {}
+        for metric, values in samples.items():
+            if len(values) == 0:
+                raise ValueError(f"No draws to summarize for {metric}")
+            lower_is_better = metric == 'payback_period'
+            percentiles = [level if lower_is_better else 100 - level for level in EXCEEDANCE_LEVELS]
+            results = np.percentile(values, percentiles)
+
+            summary[metric] = {f"P{level}": round(float(value), 2)
+                               for level, value in zip(EXCEEDANCE_LEVELS, results)}
+            summary[metric]['mean'] = round(float(values.mean()), 2)
+
+        return summary
@@ -0,0 +1,143 @@
+"""
+Module tilt/azimuth optimizer: plane-of-array irradiance over an orientation grid
+"""
+from typing import Dict, Any, Iterable, Optional
+
+import numpy as np
+
+from utils.hourly_simulation import HourlySimulator
+from utils.location_data import (LOCATION_DATA, get_coordinates, get_optimal_orientation,
+                                 set_optimal_orientation)
+
+# Coarse search grid (degrees); the best cell is refined on a 1° grid
+TILT_GRID = np.arange(0, 61, 5)
+AZIMUTH_GRID = np.arange(90, 271, 15)
+REFINE_SPAN = {'tilt': 5, 'azimuth': 15}
+
+
+class OrientationOptimizer:
+    """Finds the tilt and azimuth with the highest annual plane-of-array irradiance"""
+
+    def __init__(self, albedo: float = 0.2, tilts: np.ndarray = TILT_GRID,
+                 azimuths: np.ndarray = AZIMUTH_GRID):
+        """
+        Initialize optimizer
+
+        Args:
+            albedo: Ground reflectance
+            tilts: Coarse tilt grid in degrees
+            azimuths: Coarse azimuth grid in degrees (180 = south)
+        """
+        self.simulator = HourlySimulator(albedo=albedo)
+        self.albedo = albedo
+        self.tilts = np.asarray(tilts, dtype=float)
+        self.azimuths = np.asarray(azimuths, dtype=float)
+
+    def annual_poa(self, components: Dict[str, np.ndarray], tilts: np.ndarray,
+                   azimuths: np.ndarray) -> np.ndarray:
+        """
+        Annual plane-of-array irradiance for every tilt x azimuth pair
+
+        Same isotropic model as transpose_to_poa, with the angle of
+        incidence expanded so the whole grid is one (orientations x 3) @
+        (3 x daylight hours) product; only the beam term needs the hourly
+        matrix, the diffuse and reflected terms are annual sums.
+
+        Args:
+            components: get_irradiance_components output
+            tilts: Tilt angles in degrees
+            azimuths: Azimuth angles in degrees
+
+        Returns:
+            Array (tilts, azimuths) in kWh/m²/year
+        """
+        daylight = components['ghi'] > 0
+        zenith = np.radians(components['zenith'][daylight])
+        sun_azimuth = np.radians(components['azimuth'][daylight])
+        sun_terms = np.vstack([np.cos(zenith),
+                               np.sin(zenith) * np.cos(sun_azimuth),
+                               np.sin(zenith) * np.sin(sun_azimuth)])
+
+        beta = np.radians(np.asarray(tilts, dtype=float))[:, np.newaxis]
+        gamma = np.radians(np.asarray(azimuths, dtype=float))[np.newaxis, :]
+        beta, gamma = np.broadcast_arrays(beta, gamma)
+        plane_terms = np.stack([np.cos(beta), np.sin(beta) * np.cos(gamma),
+                                np.sin(beta) * np.sin(gamma)], axis=-1).reshape(-1, 3)
+
+        cos_aoi = plane_terms @ sun_terms
+        beam = np.maximum(cos_aoi, 0, out=cos_aoi) @ components['dni'][daylight]
+        cos_beta = plane_terms[:, 0]
+        sky_diffuse = components['dhi'].sum() * (1 + cos_beta) / 2
+        ground_reflected = components['ghi'].sum() * self.albedo * (1 - cos_beta) / 2
+        return ((beam + sky_diffuse + ground_reflected) / 1000).reshape(beta.shape)
+
+    def optimize(self, latitude: float, longitude: float, avg_irradiance: float,
+                 seasonal_variation: Optional[Dict[str, float]] = None) -> Dict[str, Any]:
+        """
+        Best orientation for a site
+
+        Args:
+            latitude: Site latitude in degrees
+            longitude: Site longitude in degrees
+            avg_irradiance: Annual average irradiance in kWh/m²/day
+            seasonal_variation: SolarDataFetcher seasonal irradiance values
+
+        Returns:
+            Dict with tilt, azimuth, annual_poa (kWh/m²/year),
+            horizontal_poa, latitude_tilt_poa and gain (fraction over
+            horizontal)
+        """
+        components = self.simulator.get_irradiance_components(latitude, longitude, avg_irradiance,
+                                                              seasonal_variation)
+        # The azimuth grid is centred on south; flip it to face north below the equator
+        azimuths = self.azimuths if latitude >= 0 else (self.azimuths + 180) % 360
+        coarse = self.annual_poa(components, self.tilts, azimuths)
+        tilt_index, azimuth_index = np.unravel_index(np.argmax(coarse), coarse.shape)
+        best_tilt, best_azimuth = self.tilts[tilt_index], azimuths[azimuth_index]
+
+        fine_tilts = np.arange(max(best_tilt - REFINE_SPAN['tilt'], 0), best_tilt + REFINE_SPAN['tilt'] + 1)
+        fine_azimuths = np.arange(best_azimuth - REFINE_SPAN['azimuth'],
+                                  best_azimuth + REFINE_SPAN['azimuth'] + 1) % 360
+        fine = self.annual_poa(components, fine_tilts, fine_azimuths)
+        tilt_index, azimuth_index = np.unravel_index(np.argmax(fine), fine.shape)
+
+        reference = self.annual_poa(components, np.array([0.0, abs(latitude)]),
+                                    np.array([180.0 if latitude >= 0 else 0.0]))[:, 0]
+        annual_poa = float(fine[tilt_index, azimuth_index])
+        return {
+            'tilt': float(fine_tilts[tilt_index]),
+            'azimuth': float(fine_azimuths[azimuth_index]),
+            'annual_poa': round(annual_poa, 1),
+            'horizontal_poa': round(float(reference[0]), 1),
+            'latitude_tilt_poa': round(float(reference[1]), 1),
+            'gain': round(annual_poa / float(reference[0]) - 1, 4)
+        }
+
+    def optimize_city(self, city: str, refresh: bool = False) -> Optional[Dict[str, Any]]:
+        """
+        Best orientation for a LOCATION_DATA city, cached in the location store
+
+        Args:
+            city: City name
+            refresh: Recompute even if cached
+
+        Returns:
+            optimize() result, or None for cities without coordinates
+        """
+        cached = get_optimal_orientation(city)
+        if cached is not None and not refresh:
+            return cached
+
+        coordinates = get_coordinates(city)
+        if coordinates is None:
+            return None
+        irradiance = LOCATION_DATA.get(city, {}).get('irradiance', 4.5)
+        orientation = self.optimize(coordinates['lat'], coordinates['lon'], irradiance)
+        set_optimal_orientation(city, orientation)
+        return orientation
+
+    def optimize_all(self, cities: Optional[Iterable[str]] = None,
+                     refresh: bool = False) -> Dict[str, Dict[str, Any]]:
+        """Optimal orientation for every city (default all of LOCATION_DATA)"""
+        cities = LOCATION_DATA if cities is None else cities
+        return {city: self.optimize_city(city, refresh) for city in cities}
@@ -0,0 +1,94 @@
+"""
+OPEX/PPA pricing: developer LCOE, PPA tariff for a target IRR and customer savings
+"""
+from typing import Dict, Optional
+
+import numpy as np
+
+from utils.cash_flow import CashFlowModel
+
+
+class PPAModel:
+    """Developer-side pricing of a power purchase agreement, vectorized over scenarios"""
+
+    def __init__(self, cash_flow_model: CashFlowModel, target_irr: float = 0.12,
+                 ppa_escalation: float = 0.0):
+        """
+        Initialize PPA model
+
+        Args:
+            cash_flow_model: Lifetime, O&M, inverter replacement, discount
+                rate and grid tariff escalation
+            target_irr: Developer project IRR the tariff must earn
+            ppa_escalation: Annual escalation of the PPA tariff (fraction)
+        """
+        self.cash_flow_model = cash_flow_model
+        self.target_irr = target_irr
+        self.ppa_escalation = ppa_escalation
+
+    _column = staticmethod(CashFlowModel._column)
+
+    def _unit_cost(self, investment, generation: np.ndarray, costs: np.ndarray, rate, escalation) -> np.ndarray:
+        """
+        Year-one price per kWh whose escalating revenue has zero NPV at rate
+
+        (investment + PV of costs) / PV of escalated generation: the NPV is
+        linear in the year-one price, so this is exact.
+        """
+        elapsed = np.arange(generation.shape[1])
+        discount = (1 + self._column(rate)) ** -(elapsed + 1)
+        revenue_weight = np.sum(generation * (1 + self._column(escalation)) ** elapsed * discount, axis=1)
+        cost = self._column(investment)[:, 0] + np.sum(costs * discount, axis=1)
+        return np.divide(cost, revenue_weight, out=np.full(revenue_weight.shape, np.nan), where=revenue_weight > 0)
+
+    def analyze(self, investment, first_year_generation, grid_tariff, generation: Optional[np.ndarray] = None,
+                target_irr=None, ppa_escalation=None, grid_escalation=None) -> Dict[str, np.ndarray]:
+        """
+        Developer LCOE, PPA tariff and customer savings for every scenario
+
+        Args:
+            investment: Developer investment per scenario in ₹
+            first_year_generation: Year-one generation per scenario in kWh
+            grid_tariff: Year-one grid tariff (savings per kWh) the customer
+                would otherwise pay
+            generation: Optional (scenarios, lifetime) generation matrix
+            target_irr, ppa_escalation, grid_escalation: Optional
+                per-scenario overrides (grid escalation defaults to the
+                cash-flow model's tariff escalation)
+
+        Returns:
+            Dict with lcoe, ppa_tariff (year one), annual_savings (year one),
+            lifetime_savings, savings_percent and customer_npv per scenario,
+            plus (scenarios, lifetime) ppa_rate, grid_rate and savings
+        """
+        model = self.cash_flow_model
+        cash_flows = model.build_cash_flows(investment, first_year_generation, 0.0, generation=generation)
+        generation, costs = np.broadcast_arrays(cash_flows['generation'], cash_flows['costs'])
+
+        target_irr = self.target_irr if target_irr is None else target_irr
+        ppa_escalation = self.ppa_escalation if ppa_escalation is None else ppa_escalation
+        grid_escalation = model.tariff_escalation if grid_escalation is None else grid_escalation
+
+        lcoe = self._unit_cost(investment, generation, costs, model.discount_rate, 0.0)
+        ppa_tariff = self._unit_cost(investment, generation, costs, target_irr, ppa_escalation)
+
+        elapsed = np.arange(model.lifetime)
+        ppa_rate = ppa_tariff[:, np.newaxis] * (1 + self._column(ppa_escalation)) ** elapsed
+        grid_rate = self._column(grid_tariff) * (1 + self._column(grid_escalation)) ** elapsed
+        generation, ppa_rate, grid_rate = np.broadcast_arrays(generation, ppa_rate, grid_rate)
+        savings = generation * (grid_rate - ppa_rate)
+        grid_cost = np.sum(generation * grid_rate, axis=1)
+        lifetime_savings = np.sum(savings, axis=1)
+
+        return {
+            'lcoe': np.broadcast_to(lcoe, savings.shape[:1]),
+            'ppa_tariff': np.broadcast_to(ppa_tariff, savings.shape[:1]),
+            'annual_savings': savings[:, 0],
+            'lifetime_savings': lifetime_savings,
+            'savings_percent': np.divide(lifetime_savings, grid_cost, out=np.zeros(grid_cost.shape),
+                                         where=grid_cost > 0) * 100,
+            'customer_npv': model.npv(np.concatenate([np.zeros((savings.shape[0], 1)), savings], axis=1)),
+            'ppa_rate': ppa_rate,
+            'grid_rate': grid_rate,
+            'savings': savings
+        }
@@ -0,0 +1,262 @@
+"""
+Data-driven cost-per-kW price books with breakpoint lookup
+"""
+import bisect
+import json
+import os
+import time
+from typing import Dict, Any, Callable, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+# Key for the tiers used when a consumer type has no entry of its own
+FALLBACK_TYPE = '*'
+
+
+class PriceTiers:
+    """Sorted breakpoints and prices for one consumer type"""
+
+    __slots__ = ('breakpoints', 'edges', 'prices', '_edge_list', '_price_list')
+
+    def __init__(self, tiers: List[Dict[str, Any]]):
+        """
+        Initialize from tier dicts in ascending order
+
+        Args:
+            tiers: [{'below': 5, 'price': 80000}, {'up_to': 10, 'price': 78000},
+                    {'price': 76000}] - 'below' is an exclusive upper limit,
+                    'up_to' an inclusive one, and the last tier is open-ended
+        """
+        breakpoints, edges = [], []
+        for tier in tiers[:-1]:
+            if 'below' in tier:
+                limit = float(tier['below'])
+                edges.append(limit)
+            else:
+                limit = float(tier['up_to'])
+                edges.append(float(np.nextafter(limit, np.inf)))
+            breakpoints.append(limit)
+
+        if edges != sorted(edges):
+            raise ValueError("Price tiers must be in ascending order")
+
+        self.breakpoints = tuple(breakpoints)
+        self.edges = np.asarray(edges)
+        self.prices = np.asarray([float(tier['price']) for tier in tiers])
+        self._edge_list = edges
+        self._price_list = [float(tier['price']) for tier in tiers]
+
+    def price(self, capacity: float) -> float:
+        """Cost per kW for one capacity (pure-Python bisect, no NumPy overhead)"""
+        return self._price_list[bisect.bisect_right(self._edge_list, capacity)]
+
+    def price_array(self, capacity: np.ndarray) -> np.ndarray:
+        """Cost per kW for an array of capacities"""
+        return self.prices[np.searchsorted(self.edges, capacity, side='right')]
+
+    def to_list(self) -> List[Dict[str, Any]]:
+        """Serializable tier dicts"""
+        tiers = []
+        for limit, edge, price in zip(self.breakpoints, self._edge_list, self._price_list):
+            tiers.append({'below': limit, 'price': price} if edge == limit else {'up_to': limit, 'price': price})
+        tiers.append({'price': self._price_list[-1]})
+        return tiers
+
+
+class PriceBook:
+    """Cost-per-kW tiers by consumer type, with per-state and per-installer overrides"""
+
+    def __init__(self, default: Dict[str, List[Dict[str, Any]]],
+                 states: Optional[Dict[str, Dict[str, List[Dict[str, Any]]]]] = None,
+                 installers: Optional[Dict[str, Dict[str, List[Dict[str, Any]]]]] = None,
+                 source: Optional[str] = None):
+        """
+        Initialize price book
+
+        Args:
+            default: Consumer type -> tier list (FALLBACK_TYPE for unknown types)
+            states: State -> consumer type -> tier list
+            installers: Installer -> consumer type -> tier list
+            source: Where the book was loaded from (for reload checks)
+        """
+        self.default = {ctype: PriceTiers(tiers) for ctype, tiers in default.items()}
+        if FALLBACK_TYPE not in self.default:
+            self.default[FALLBACK_TYPE] = self.default.get('Residential') or next(iter(self.default.values()))
+        self.states = {state: {ctype: PriceTiers(tiers) for ctype, tiers in book.items()}
+                       for state, book in (states or {}).items()}
+        self.installers = {name: {ctype: PriceTiers(tiers) for ctype, tiers in book.items()}
+                           for name, book in (installers or {}).items()}
+        self.source = source
+        self.fingerprint = json.dumps(self.to_dict(), sort_keys=True)
+
+    @classmethod
+    def from_cost_matrix(cls, cost_matrix: Dict[str, Dict[str, float]],
+                         breakpoints: Dict[str, Tuple[float, float]],
+                         fallback_prices: str = 'Residential',
+                         fallback_breakpoints: Tuple[float, float] = (100, 500)) -> 'PriceBook':
+        """
+        Build from the SolarCalculator.COST_PER_KW small/medium/large matrix
+
+        Small is below the first breakpoint, medium up to and including the
+        second, large above it.
+        """
+        def tiers(prices, limits):
+            return [{'below': limits[0], 'price': prices['small']},
+                    {'up_to': limits[1], 'price': prices['medium']},
+                    {'price': prices['large']}]
+
+        default = {ctype: tiers(prices, breakpoints.get(ctype, fallback_breakpoints))
+                   for ctype, prices in cost_matrix.items()}
+        default[FALLBACK_TYPE] = tiers(cost_matrix[fallback_prices], fallback_breakpoints)
+        return cls(default)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], source: Optional[str] = None) -> 'PriceBook':
+        """Build from {'default': ..., 'states': ..., 'installers': ...}"""
+        return cls(data['default'], data.get('states'), data.get('installers'), source=source)
+
+    @classmethod
+    def from_file(cls, path: str) -> 'PriceBook':
+        """Load a JSON price book"""
+        with open(path, 'r', encoding='utf-8') as handle:
+            return cls.from_dict(json.load(handle), source=path)
+
+    @classmethod
+    def from_records(cls, records: Iterable[Dict[str, Any]], source: Optional[str] = 'database') -> 'PriceBook':
+        """
+        Build from flat database rows
+
+        Args:
+            records: Rows with consumer_type, state, installer, tier_order,
+                max_kw, max_inclusive and price_per_kw (state/installer null
+                for the default book, max_kw null for the open-ended tier)
+        """
+        grouped = {}
+        for row in sorted(records, key=lambda item: item.get('tier_order') or 0):
+            if row.get('installer'):
+                book = grouped.setdefault('installers', {}).setdefault(row['installer'], {})
+            elif row.get('state'):
+                book = grouped.setdefault('states', {}).setdefault(row['state'], {})
+            else:
+                book = grouped.setdefault('default', {})
+
+            tier = {'price': float(row['price_per_kw'])}
+            if row.get('max_kw') is not None:
+                tier['up_to' if row.get('max_inclusive') else 'below'] = float(row['max_kw'])
+            book.setdefault(row['consumer_type'], []).append(tier)
+
+        if 'default' not in grouped:
+            raise ValueError("Price book records must include a default book")
+        return cls.from_dict(grouped, source=source)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serializable form (same layout as from_dict/from_file)"""
+        def dump(book):
+            return {ctype: tiers.to_list() for ctype, tiers in book.items()}
+
+        return {
+            'default': dump(self.default),
+            'states': {state: dump(book) for state, book in self.states.items()},
+            'installers': {name: dump(book) for name, book in self.installers.items()}
+        }
+
+    def tiers(self, consumer_type: str, state: Optional[str] = None,
+              installer: Optional[str] = None) -> PriceTiers:
+        """Most specific tiers: installer, then state, then default"""
+        for book in (self.installers.get(installer) if installer else None,
+                     self.states.get(state) if state else None):
+            if book and consumer_type in book:
+                return book[consumer_type]
+        return self.default.get(consumer_type) or self.default[FALLBACK_TYPE]
+
+    def price(self, consumer_type: str, capacity: float, state: Optional[str] = None,
+              installer: Optional[str] = None) -> float:
+        """Cost per kW for one system"""
+        tiers = None if state or installer else self.default.get(consumer_type)
+        if tiers is None:
+            tiers = self.tiers(consumer_type, state, installer)
+        return tiers._price_list[bisect.bisect_right(tiers._edge_list, capacity)]
+
+    def price_array(self, consumer_type, capacity, state=None, installer=None) -> np.ndarray:
+        """
+        Cost per kW for whole columns
+
+        Args:
+            consumer_type: Array (or scalar) of consumer types
+            capacity: Array of capacities in kW
+            state: Optional array (or scalar) of states
+            installer: Optional array (or scalar) of installers
+
+        Returns:
+            Array of cost per kW
+        """
+        capacity = np.asarray(capacity, dtype=float)
+        consumer_type, state, installer = np.broadcast_arrays(
+            np.asarray(consumer_type), np.asarray(state if state is not None else ''),
+            np.asarray(installer if installer is not None else '')
+        )
+        consumer_type, state, installer = (np.broadcast_to(values, capacity.shape)
+                                           for values in (consumer_type, state, installer))
+
+        # One searchsorted per distinct (type, state, installer) combination
+        keys = np.char.add(np.char.add(consumer_type.astype(str), '|'),
+                           np.char.add(np.char.add(state.astype(str), '|'), installer.astype(str)))
+        unique_keys, inverse = np.unique(keys, return_inverse=True)
+        inverse = inverse.reshape(capacity.shape)
+
+        cost = np.empty(capacity.shape, dtype=float)
+        for index, key in enumerate(unique_keys):
+            ctype, key_state, key_installer = str(key).split('|')
+            mask = inverse == index
+            cost[mask] = self.tiers(ctype, key_state or None, key_installer or None).price_array(capacity[mask])
+        return cost
+
+
+class PriceBookStore:
+    """Hot-reloading holder for a price book loaded from a file or the database"""
+
+    def __init__(self, loader: Callable[[], PriceBook], check_interval: float = 5.0,
+                 change_token: Optional[Callable[[], Any]] = None):
+        """
+        Initialize store
+
+        Args:
+            loader: Callable returning a fresh PriceBook
+            check_interval: Minimum seconds between reload checks
+            change_token: Optional cheap callable (e.g. file mtime); the book is
+                only reloaded when its value changes
+        """
+        self.loader = loader
+        self.check_interval = check_interval
+        self.change_token = change_token
+        self._token = change_token() if change_token else None
+        self._checked_at = time.monotonic()
+        self.book = loader()
+
+    @classmethod
+    def from_file(cls, path: str, check_interval: float = 5.0) -> 'PriceBookStore':
+        """Store that reloads a JSON price book when its modification time changes"""
+        return cls(lambda: PriceBook.from_file(path), check_interval,
+                   change_token=lambda: os.path.getmtime(path))
+
+    @classmethod
+    def from_database(cls, fetch_records: Callable[[], Iterable[Dict[str, Any]]],
+                      check_interval: float = 300.0) -> 'PriceBookStore':
+        """Store that re-reads price book rows from the database periodically"""
+        return cls(lambda: PriceBook.from_records(fetch_records()), check_interval)
+
+    def get(self) -> PriceBook:
+        """Current book, reloaded if the source changed since the last check"""
+        now = time.monotonic()
+        if now - self._checked_at >= self.check_interval:
+            self._checked_at = now
+            try:
+                token = self.change_token() if self.change_token else None
+                if self.change_token is None or token != self._token:
+                    book = self.loader()
+                    if book.fingerprint != self.book.fingerprint:
+                        self.book = book
+                    self._token = token
+            except (OSError, ValueError, KeyError) as e:
+                print(f"Error reloading price book: {str(e)}")
+        return self.book
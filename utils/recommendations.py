@@ -0,0 +1,192 @@
+"""
+Declarative recommendation rules shared by the calculator and the PDF report
+"""
+import json
+import operator
+from types import MappingProxyType
+from typing import Dict, Any, Iterable, List, Mapping, Optional, Tuple
+
+import numpy as np
+
+# Comparison operators usable in rule conditions; they work the same on
+# scalars and (elementwise) on NumPy columns
+OPERATORS = {
+    '<': operator.lt,
+    '<=': operator.le,
+    '>': operator.gt,
+    '>=': operator.ge,
+    '==': operator.eq,
+    '!=': operator.ne
+}
+
+# Facts rules can test or mention in messages
+RULE_FACTS = ('plant_capacity', 'investment', 'payback_period', 'consumer_type', 'investment_model')
+
+# Rules in display order. Every condition must hold; 'audience' limits a rule
+# to the analysis results ('analysis') or the PDF report ('report').
+RECOMMENDATION_RULES = (
+    {
+        'type': 'system_size',
+        'title': 'Small System Recommendation',
+        'priority': 'medium',
+        'when': [('plant_capacity', '<', 3)],
+        'message': ("A {plant_capacity:.1f} kW system is suitable for your consumption. "
+                    "Consider energy-efficient appliances to maximize benefits.")
+    },
+    {
+        'type': 'system_size',
+        'title': 'Large Residential System',
+        'priority': 'high',
+        'when': [('plant_capacity', '>', 10), ('consumer_type', '==', 'Residential')],
+        'message': ("Your {plant_capacity:.1f} kW requirement is quite large for residential use. "
+                    "Consider splitting into phases or reviewing consumption patterns.")
+    },
+    {
+        'type': 'financial',
+        'title': 'Excellent Investment',
+        'priority': 'high',
+        'when': [('investment_model', '==', 'CAPEX'), ('payback_period', '<=', 5)],
+        'message': ("With a {payback_period:.1f} year payback period, this is an excellent "
+                    "investment opportunity.")
+    },
+    {
+        'type': 'financial',
+        'title': 'Consider OPEX Model',
+        'priority': 'medium',
+        'when': [('investment_model', '==', 'CAPEX'), ('payback_period', '>', 8)],
+        'message': ("With a {payback_period:.1f} year payback, you might want to consider the "
+                    "OPEX/lease model instead.")
+    },
+    {
+        'type': 'tax_benefits',
+        'title': 'Tax Benefits Available',
+        'priority': 'medium',
+        'when': [('consumer_type', '==', 'Commercial')],
+        'message': ("Commercial installations are eligible for accelerated depreciation and other "
+                    "tax benefits. Consult a tax advisor.")
+    },
+    {
+        'type': 'maintenance',
+        'title': 'Regular Maintenance',
+        'priority': 'low',
+        'audience': 'report',
+        'message': "Ensure regular cleaning and maintenance for optimal performance"
+    },
+    {
+        'type': 'storage',
+        'title': 'Battery Backup',
+        'priority': 'low',
+        'audience': 'report',
+        'message': "Consider battery storage for backup power during outages"
+    },
+    {
+        'type': 'monitoring',
+        'title': 'Performance Monitoring',
+        'priority': 'low',
+        'audience': 'report',
+        'message': "Monitor system performance through mobile app or web portal"
+    },
+    {
+        'type': 'monitoring',
+        'title': 'Bill Review',
+        'priority': 'low',
+        'audience': 'report',
+        'message': "Review electricity bill patterns after installation"
+    }
+)
+
+
+class RecommendationMasks:
+    """Rule matches for a batch; message text is rendered only for requested rows"""
+
+    def __init__(self, engine: 'RecommendationEngine', masks: np.ndarray, facts: Dict[str, np.ndarray]):
+        """
+        Initialize masks
+
+        Args:
+            engine: Engine whose rules the mask rows follow
+            masks: Boolean array (rules, rows)
+            facts: Fact columns used to render messages
+        """
+        self.engine = engine
+        self.masks = masks
+        self.facts = facts
+
+    def __len__(self) -> int:
+        return self.masks.shape[1]
+
+    def counts(self) -> Dict[str, int]:
+        """Number of rows each rule fired for (portfolio summaries)"""
+        return {rule['title']: int(count) for rule, count in zip(self.engine.rules, self.masks.sum(axis=1))}
+
+    def render(self, row: int) -> List[Dict[str, Any]]:
+        """Recommendation dicts for one row"""
+        facts = {name: values[row].item() for name, values in self.facts.items()}
+        return [self.engine.render(rule, facts)
+                for rule, fired in zip(self.engine.rules, self.masks[:, row]) if fired]
+
+
+class RecommendationEngine:
+    """Evaluates RECOMMENDATION_RULES for single results or whole batches"""
+
+    def __init__(self, rules: Iterable[Mapping[str, Any]] = RECOMMENDATION_RULES,
+                 audience: Optional[str] = 'analysis'):
+        """
+        Initialize engine
+
+        Args:
+            rules: Rule dicts (see RECOMMENDATION_RULES)
+            audience: Keep rules for this audience plus unrestricted ones
+                (None keeps every rule)
+        """
+        rules = [dict(rule) for rule in rules if audience is None or rule.get('audience', audience) == audience]
+        # Read-only: conditions are compiled and the fingerprint taken once
+        self.rules = tuple(MappingProxyType(rule) for rule in rules)
+        self._conditions: List[Tuple[Tuple[str, Any, Any], ...]] = [
+            tuple((fact, OPERATORS[op], value) for fact, op, value in rule.get('when', ()))
+            for rule in self.rules
+        ]
+        self.fingerprint = json.dumps(rules, sort_keys=True)
+
+    @staticmethod
+    def render(rule: Mapping[str, Any], facts: Mapping[str, Any]) -> Dict[str, Any]:
+        """Recommendation dict for one rule, message formatted from the facts"""
+        return {
+            "type": rule['type'],
+            "title": rule['title'],
+            "message": rule['message'].format(**facts),
+            "priority": rule['priority']
+        }
+
+    def evaluate(self, **facts) -> List[Dict[str, Any]]:
+        """
+        Recommendations for a single result
+
+        Args:
+            **facts: Scalar values for RULE_FACTS
+
+        Returns:
+            List of recommendation dicts in rule order
+        """
+        return [self.render(rule, facts) for rule, conditions in zip(self.rules, self._conditions)
+                if all(compare(facts[fact], value) for fact, compare, value in conditions)]
+
+    def evaluate_batch(self, **facts) -> RecommendationMasks:
+        """
+        Rule masks for a whole batch without building any message text
+
+        Args:
+            **facts: Arrays (or scalars, broadcast) for RULE_FACTS
+
+        Returns:
+            RecommendationMasks (rules x rows)
+        """
+        names = list(facts)
+        columns = dict(zip(names, np.broadcast_arrays(*(np.atleast_1d(facts[name]) for name in names))))
+        rows = next(iter(columns.values())).shape[0] if columns else 0
+
+        masks = np.ones((len(self.rules), rows), dtype=bool)
+        for mask, conditions in zip(masks, self._conditions):
+            for fact, compare, value in conditions:
+                mask &= compare(columns[fact], value)
+        return RecommendationMasks(self, masks, columns)
@@ -0,0 +1,138 @@
+"""
+Net-metering / net-billing settlement of hourly generation against load
+"""
+from typing import Dict, Optional
+
+import numpy as np
+
+from utils.billing import MONTH_MATRIX
+
+# retail: every generated unit offsets a retail unit (the flat formula)
+# net_metering: monthly kWh netting, surplus banked, year-end payout
+# net_billing: imports at retail, every exported unit at the export rate
+SETTLEMENT_MODES = ('retail', 'net_metering', 'net_billing')
+
+
+class SettlementModel:
+    """Settles hourly generation and load for one customer or a whole portfolio"""
+
+    def __init__(self, mode: str = 'net_billing', export_rate: float = 3.0,
+                 export_limit=None, sanctioned_load=None, banking_months: int = 12,
+                 year_end_rate: float = 0.0):
+        """
+        Initialize model
+
+        Args:
+            mode: One of SETTLEMENT_MODES
+            export_rate: ₹/kWh paid for exports under net billing
+            export_limit: Maximum hourly export in kW (scalar or per
+                customer; None for no limit); the excess is curtailed
+            sanctioned_load: Sanctioned load in kW (scalar or per customer);
+                AC output above it is curtailed
+            banking_months: Months after the month it was earned that a
+                net-metering surplus can still be drawn before it lapses
+            year_end_rate: ₹/kWh paid for the bank left at the end of the
+                year (0 lets it lapse)
+        """
+        if mode not in SETTLEMENT_MODES:
+            raise ValueError(f"Unknown settlement mode: {mode}")
+        self.mode = mode
+        self.export_rate = export_rate
+        self.export_limit = export_limit
+        self.sanctioned_load = sanctioned_load
+        self.banking_months = banking_months
+        self.year_end_rate = year_end_rate
+
+    def settle(self, generation: np.ndarray, load: np.ndarray, tariff_rate) -> Dict[str, np.ndarray]:
+        """
+        Self-consumed, exported, curtailed and imported energy and the
+        resulting savings
+
+        Args:
+            generation: Hourly generation in kWh, (customers, 8760) or (8760,)
+            load: Hourly load in kWh, same shape or broadcastable
+            tariff_rate: Retail tariff in ₹/kWh (scalar or per customer)
+
+        Returns:
+            Dict of per-customer arrays (kWh/year unless noted): generation,
+            self_consumed, exported, curtailed, imported, offset (exports
+            netted against imports), banked (paid out at year end), lapsed,
+            export_credit (₹) and annual_savings (₹)
+        """
+        generation = np.atleast_2d(generation)
+        load = np.atleast_2d(load)
+        customers = max(generation.shape[0], load.shape[0])
+        tariff = np.broadcast_to(np.asarray(tariff_rate, dtype=float), (customers,))
+
+        if self.sanctioned_load is not None:
+            cap = np.asarray(self.sanctioned_load, dtype=float).reshape(-1, 1)
+            usable = np.minimum(generation, cap)
+        else:
+            usable = generation
+        surplus = usable - load
+        exported = np.maximum(surplus, 0)
+        if self.export_limit is not None:
+            exported = np.minimum(exported, np.asarray(self.export_limit, dtype=float).reshape(-1, 1))
+
+        weights = MONTH_MATRIX.astype(generation.dtype, copy=False)
+        total_generation = np.broadcast_to(generation.sum(axis=1, dtype=float), (customers,))
+        self_consumed = np.broadcast_to(np.minimum(usable, load).sum(axis=1, dtype=float), (customers,))
+        monthly_export = np.broadcast_to((exported @ weights).astype(float), (customers, 12))
+        monthly_import = np.broadcast_to((np.maximum(-surplus, 0) @ weights).astype(float), (customers, 12))
+        exported_total = monthly_export.sum(axis=1)
+        imported_total = monthly_import.sum(axis=1)
+
+        offset = np.zeros(customers)
+        banked = np.zeros(customers)
+        lapsed = np.zeros(customers)
+        export_credit = np.zeros(customers)
+
+        if self.mode == 'retail':
+            annual_savings = total_generation * tariff
+        elif self.mode == 'net_billing':
+            export_credit = exported_total * self.export_rate
+            annual_savings = self_consumed * tariff + export_credit
+        else:
+            offset, banked, lapsed = self._bank(monthly_export, monthly_import)
+            export_credit = banked * self.year_end_rate
+            annual_savings = (self_consumed + offset) * tariff + export_credit
+
+        return {
+            'generation': total_generation,
+            'self_consumed': self_consumed,
+            'exported': exported_total,
+            'curtailed': total_generation - self_consumed - exported_total,
+            'imported': imported_total,
+            'offset': offset,
+            'banked': banked,
+            'lapsed': lapsed,
+            'export_credit': export_credit,
+            'annual_savings': annual_savings
+        }
+
+    def _bank(self, monthly_export: np.ndarray, monthly_import: np.ndarray):
+        """
+        Net exports against imports month by month, first-in first-out
+
+        Returns:
+            Tuple of (offset, banked at year end, lapsed) kWh per customer
+        """
+        customers = monthly_export.shape[0]
+        deposits = np.zeros((customers, 12))
+        offset = np.minimum(monthly_export, monthly_import).sum(axis=1)
+        lapsed = np.zeros(customers)
+
+        for month in range(12):
+            expired = month - self.banking_months - 1
+            if expired >= 0:
+                lapsed += deposits[:, expired]
+                deposits[:, expired] = 0
+            need = np.maximum(monthly_import[:, month] - monthly_export[:, month], 0)
+            # Draw the oldest deposits first
+            drawn_before = np.cumsum(deposits[:, :month], axis=1)
+            drawn = np.clip(need[:, None] - (drawn_before - deposits[:, :month]), 0, deposits[:, :month])
+            deposits[:, :month] -= drawn
+            offset += drawn.sum(axis=1)
+            deposits[:, month] = np.maximum(monthly_export[:, month] - monthly_import[:, month], 0)
+
+        return offset, deposits.sum(axis=1), lapsed
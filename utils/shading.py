@@ -0,0 +1,110 @@
+"""
+Horizon / obstruction shading losses from cached sun-path arrays
+"""
+from functools import lru_cache
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+from utils.hourly_simulation import DAY_OF_YEAR, HOURS_PER_YEAR, IST_OFFSET, HourlySimulator, solar_position
+
+# Sun positions are sampled SUN_PATH_STEPS times per hour and cached per
+# LATITUDE_BAND degrees of latitude (at the time-zone meridian)
+SUN_PATH_STEPS = 4
+LATITUDE_BAND = 1.0
+
+# Obstruction elevation (degrees) per 30° azimuth bin from north, used when
+# the form reports no shadow-free area: neighbouring buildings and trees,
+# highest to the east and west of a typical urban rooftop
+DEFAULT_OBSTRUCTION_PROFILE = (10, 10, 15, 20, 20, 12, 8, 12, 20, 20, 15, 10)
+
+# Site used for the flat-formula shading derate when no coordinates are known
+# (central India)
+DEFAULT_LATITUDE = 22.0
+DEFAULT_LONGITUDE = 79.0
+
+
+@lru_cache(maxsize=64)
+def sun_path(latitude_band: float, timezone: float = IST_OFFSET) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Sub-hourly sun elevation and azimuth for a latitude band, built once
+
+    Args:
+        latitude_band: Band centre latitude in degrees
+        timezone: Time zone offset from UTC in hours (its meridian is used
+            as the longitude)
+
+    Returns:
+        Read-only (8760, SUN_PATH_STEPS) arrays of elevation and azimuth
+        in degrees
+    """
+    offsets = (np.arange(SUN_PATH_STEPS) + 0.5) / SUN_PATH_STEPS
+    day_of_year = np.repeat(DAY_OF_YEAR, SUN_PATH_STEPS)
+    hour_of_day = (np.arange(HOURS_PER_YEAR)[:, np.newaxis] % 24 + offsets).ravel()
+    zenith, azimuth = solar_position(latitude_band, 15 * timezone, timezone, day_of_year, hour_of_day)
+
+    elevation = (90 - zenith).reshape(HOURS_PER_YEAR, SUN_PATH_STEPS)
+    azimuth = azimuth.reshape(HOURS_PER_YEAR, SUN_PATH_STEPS)
+    elevation.flags.writeable = False
+    azimuth.flags.writeable = False
+    return elevation, azimuth
+
+
+def latitude_band(latitude: float) -> float:
+    """Centre of the cached latitude band containing a latitude"""
+    return round(latitude / LATITUDE_BAND) * LATITUDE_BAND
+
+
+class ShadingModel:
+    """Beam and diffuse losses for a horizon profile (elevation per azimuth bin)"""
+
+    def __init__(self, horizon_profile: Sequence[float] = DEFAULT_OBSTRUCTION_PROFILE):
+        """
+        Initialize model
+
+        Args:
+            horizon_profile: Obstruction elevation in degrees for equal
+                azimuth bins starting at north, clockwise
+        """
+        self.horizon = np.asarray(horizon_profile, dtype=float)
+        width = 360.0 / len(self.horizon)
+        self._centres = (np.arange(len(self.horizon)) + 0.5) * width
+
+    @property
+    def diffuse_loss(self) -> float:
+        """Share of an isotropic sky hidden by the horizon (mean sin² of its elevation)"""
+        return float(np.mean(np.sin(np.radians(self.horizon)) ** 2))
+
+    def beam_loss(self, latitude: float) -> np.ndarray:
+        """
+        Hourly fraction of beam irradiance blocked by the horizon
+
+        Args:
+            latitude: Site latitude in degrees
+
+        Returns:
+            Array of 8760 fractions (0 = unshaded, 1 = fully shaded)
+        """
+        elevation, azimuth = sun_path(latitude_band(latitude))
+        horizon_at_sun = np.interp(azimuth, self._centres, self.horizon, period=360)
+        sun_up = elevation > 0
+        blocked = sun_up & (elevation < horizon_at_sun)
+        return np.divide(blocked.sum(axis=1), sun_up.sum(axis=1),
+                         out=np.zeros(HOURS_PER_YEAR), where=sun_up.any(axis=1))
+
+    def annual_loss(self, latitude: float, longitude: float, avg_irradiance: float,
+                    seasonal_variation: Optional[Dict[str, float]] = None) -> float:
+        """
+        Irradiance-weighted annual shading loss on a horizontal plane
+
+        Used to derate the flat monthly generation formula.
+
+        Returns:
+            Fraction of annual irradiance lost to shading
+        """
+        components = HourlySimulator().get_irradiance_components(latitude, longitude, avg_irradiance,
+                                                                 seasonal_variation)
+        direct = components['ghi'] - components['dhi']
+        lost = np.dot(direct, self.beam_loss(latitude)) + components['dhi'].sum() * self.diffuse_loss
+        total = components['ghi'].sum()
+        return float(lost / total) if total > 0 else 0.0
@@ -0,0 +1,274 @@
+"""
+Spatial index over known locations: nearest cities and interpolated irradiance/tariff for any coordinate
+"""
+import math
+from functools import lru_cache
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+from utils.location_data import CITY_COORDINATES, LOCATION_DATA
+
+EARTH_RADIUS_KM = 6371.0
+
+# Below this many locations a single query scans every point: one small
+# matrix product beats walking the grid
+SCAN_LIMIT = 1024
+
+# Inverse-distance weights stop growing inside this distance, so a query on
+# top of a city returns (almost exactly) that city's values
+MIN_DISTANCE_KM = 0.001
+
+
+def _unit_vectors(latitude, longitude) -> np.ndarray:
+    """(..., 3) points on the unit sphere"""
+    lat = np.radians(np.asarray(latitude, dtype=float))
+    lon = np.radians(np.asarray(longitude, dtype=float))
+    return np.stack([np.cos(lat) * np.cos(lon), np.cos(lat) * np.sin(lon), np.sin(lat)], axis=-1)
+
+
+def _great_circle(cosine: np.ndarray) -> np.ndarray:
+    """Great-circle distance in km from the dot product of unit vectors (via the chord length)"""
+    chord = np.sqrt(np.maximum(2.0 - 2.0 * cosine, 0.0))
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.minimum(chord / 2, 1.0))
+
+
+class LocationIndex:
+    """
+    Latitude/longitude grid over locations with irradiance and tariff
+
+    Points are sorted row-major by grid cell, so the cells of any block of
+    grid rows are contiguous slices. A single query grows a square block of
+    cells around the query until the n-th nearest candidate is closer than
+    anything outside the block can be (indexes under scan_limit points are
+    simply scanned); bulk queries compute exact distances to every location
+    in chunks.
+    """
+
+    def __init__(self, locations: Dict[str, Dict[str, Any]], coordinates: Dict[str, Dict[str, float]],
+                 cell_size: float = 2.0, power: float = 2.0, scan_limit: int = SCAN_LIMIT):
+        """
+        Initialize index
+
+        Args:
+            locations: City -> {state, irradiance, tariff} (LOCATION_DATA layout)
+            coordinates: City -> {lat, lon} (CITY_COORDINATES layout); cities
+                without coordinates are left out
+            cell_size: Grid cell size in degrees
+            power: Inverse-distance weighting power for interpolation
+            scan_limit: Largest index that single queries scan exhaustively
+                instead of searching the grid
+        """
+        names = [city for city in locations if city in coordinates]
+        if not names:
+            raise ValueError("No locations with coordinates to index")
+
+        self.cell_size = cell_size
+        self.power = power
+        self.scan_limit = scan_limit
+        latitude = np.array([coordinates[city]['lat'] for city in names], dtype=float)
+        longitude = np.array([coordinates[city]['lon'] for city in names], dtype=float)
+
+        self.row_origin = int(np.floor(latitude.min() / cell_size))
+        self.col_origin = int(np.floor(longitude.min() / cell_size))
+        rows = np.floor(latitude / cell_size).astype(np.int64) - self.row_origin
+        cols = np.floor(longitude / cell_size).astype(np.int64) - self.col_origin
+        self.rows = int(rows.max()) + 1
+        self.cols = int(cols.max()) + 1
+
+        cells = rows * self.cols + cols
+        order = np.argsort(cells, kind='stable')
+        self.cell_start = np.searchsorted(cells[order], np.arange(self.rows * self.cols + 1))
+        self._cell_start = self.cell_start.tolist()
+        self._order = np.arange(len(names))
+
+        self.names = np.array(names, dtype=object)[order]
+        self.states = np.array([locations[city].get('state', 'Unknown') for city in names], dtype=object)[order]
+        self.latitude = latitude[order]
+        self.longitude = longitude[order]
+        self.irradiance = np.array([locations[city]['irradiance'] for city in names], dtype=float)[order]
+        self.tariff = np.array([locations[city]['tariff'] for city in names], dtype=float)[order]
+        self.points = _unit_vectors(self.latitude, self.longitude)
+
+    @classmethod
+    def default(cls) -> 'LocationIndex':
+        """Index over LOCATION_DATA and CITY_COORDINATES"""
+        return cls(LOCATION_DATA, CITY_COORDINATES)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def _block(self, row: int, col: int, radius: int):
+        """(start, stop) point ranges of the (2 * radius + 1) square of cells around (row, col)"""
+        col_low = min(max(col - radius, 0), self.cols)
+        col_high = min(max(col + radius + 1, 0), self.cols)
+        cell_start = self._cell_start
+        return [(cell_start[base + col_low], cell_start[base + col_high])
+                for base in range(max(row - radius, 0) * self.cols,
+                                  min(row + radius + 1, self.rows) * self.cols, self.cols)]
+
+    def _outside_bound(self, latitude: float, radius: int) -> float:
+        """
+        Lower bound in km on the distance to any point outside the block
+
+        Such a point differs by at least radius cells in latitude or
+        longitude; the longitude bound shrinks with cos(latitude), taken at
+        the highest latitude the point could have (anything further north
+        or south is already radius cells away in latitude).
+        """
+        span = math.radians(radius * self.cell_size)
+        highest = min(abs(latitude) + (radius + 1) * self.cell_size, 90.0)
+        return 2 * EARTH_RADIUS_KM * math.asin(min(math.sin(span / 2) * math.cos(math.radians(highest)), 1.0))
+
+    def nearest(self, latitude: float, longitude: float, n: int = 5) -> Dict[str, np.ndarray]:
+        """
+        The n locations nearest to one coordinate
+
+        Small indexes are scanned exhaustively. Otherwise candidate counts
+        come from the cell offsets alone, so distances are only computed once
+        the block holds n points. Longitudes are not wrapped across the
+        antimeridian.
+
+        Args:
+            latitude: Latitude in degrees
+            longitude: Longitude in degrees
+            n: Number of neighbours (capped at the number of locations)
+
+        Returns:
+            Dict with index and distance_km arrays, nearest first
+        """
+        n = min(n, len(self))
+        lat, lon = math.radians(latitude), math.radians(longitude)
+        target = np.array([math.cos(lat) * math.cos(lon), math.cos(lat) * math.sin(lon), math.sin(lat)])
+        if len(self) <= self.scan_limit:
+            return self._select(None, target, n)
+
+        row = math.floor(latitude / self.cell_size) - self.row_origin
+        col = math.floor(longitude / self.cell_size) - self.col_origin
+        # Start from the smallest block that reaches the grid
+        radius = max(-row, row - self.rows + 1, -col, col - self.cols + 1, 0)
+        last = max(row, self.rows - 1 - row, col, self.cols - 1 - col)
+        while sum(stop - begin for begin, stop in self._block(row, col, radius)) < n:
+            radius += 1
+
+        # The n-th distance in this block bounds the final answer: widen the
+        # block until nothing outside it can be closer, then search it once
+        for attempt in range(2):
+            found = self._select(np.concatenate([self._order[begin:stop] for begin, stop
+                                                 in self._block(row, col, radius)]), target, n)
+            reach = found['distance_km'][-1]
+            if attempt or radius >= last or reach <= self._outside_bound(latitude, radius):
+                return found
+            while radius < last and self._outside_bound(latitude, radius) < reach:
+                radius += 1
+
+    def _select(self, candidates: Optional[np.ndarray], target: np.ndarray, n: int) -> Dict[str, np.ndarray]:
+        """
+        The n candidates (None: every point) nearest to one target unit
+        vector, nearest first
+
+        Neighbours are ranked by dot product, which falls monotonically with
+        distance, so distances are only computed for the n that are kept.
+        """
+        cosine = (self.points if candidates is None else self.points[candidates]) @ target
+        best = np.argpartition(-cosine, n - 1)[:n] if len(cosine) > n else np.arange(len(cosine))
+        best = best[np.argsort(-cosine[best], kind='stable')]
+        return {'index': best if candidates is None else candidates[best],
+                'distance_km': _great_circle(cosine[best])}
+
+    def nearest_many(self, latitude, longitude, n: int = 5, chunk_size: int = 4096) -> Dict[str, np.ndarray]:
+        """
+        The n nearest locations for every coordinate (bulk mode)
+
+        Args:
+            latitude: Array of latitudes in degrees
+            longitude: Array of longitudes in degrees
+            n: Number of neighbours per coordinate
+            chunk_size: Coordinates per distance matrix (bounds memory)
+
+        Returns:
+            Dict with (coordinates, n) index and distance_km arrays, nearest first
+        """
+        n = min(n, len(self))
+        targets = _unit_vectors(*np.broadcast_arrays(np.ravel(latitude), np.ravel(longitude)))
+        index = np.empty((len(targets), n), dtype=np.int64)
+        distance = np.empty((len(targets), n))
+
+        for start in range(0, len(targets), chunk_size):
+            cosine = targets[start:start + chunk_size] @ self.points.T
+            best = np.argpartition(-cosine, n - 1, axis=1)[:, :n] if n < len(self) else \
+                np.broadcast_to(np.arange(n), cosine.shape)
+            nearest = np.take_along_axis(cosine, best, axis=1)
+            order = np.argsort(-nearest, axis=1, kind='stable')
+            index[start:start + chunk_size] = np.take_along_axis(best, order, axis=1)
+            distance[start:start + chunk_size] = _great_circle(np.take_along_axis(nearest, order, axis=1))
+
+        return {'index': index, 'distance_km': distance}
+
+    def _interpolate(self, index: np.ndarray, distance: np.ndarray) -> Dict[str, np.ndarray]:
+        """Inverse-distance-weighted irradiance and tariff over the neighbours (last axis)"""
+        weights = np.maximum(distance, MIN_DISTANCE_KM) ** -self.power
+        weights /= weights.sum(axis=-1, keepdims=True)
+        return {
+            'irradiance': np.sum(weights * self.irradiance[index], axis=-1),
+            'tariff': np.sum(weights * self.tariff[index], axis=-1)
+        }
+
+    def interpolate(self, latitude: float, longitude: float, n: int = 5) -> Dict[str, Any]:
+        """
+        Location info for any coordinate from its n nearest cities
+
+        Args:
+            latitude: Latitude in degrees
+            longitude: Longitude in degrees
+            n: Number of neighbours to weight
+
+        Returns:
+            Dict in the get_location_info layout (state of the nearest city,
+            interpolated irradiance and tariff) plus nearest_city,
+            distance_km and the neighbours' cities and distances
+        """
+        found = self.nearest(latitude, longitude, n)
+        values = self._interpolate(found['index'], found['distance_km'])
+        nearest = found['index'][0]
+        return {
+            'state': self.states[nearest],
+            'irradiance': float(values['irradiance']),
+            'tariff': float(values['tariff']),
+            'nearest_city': self.names[nearest],
+            'distance_km': float(found['distance_km'][0]),
+            'neighbours': [{'city': city, 'distance_km': distance} for city, distance
+                           in zip(self.names[found['index']].tolist(), found['distance_km'].tolist())]
+        }
+
+    def interpolate_many(self, latitude, longitude, n: int = 5,
+                         chunk_size: Optional[int] = 4096) -> Dict[str, np.ndarray]:
+        """
+        Vectorized interpolate for a list of coordinates (e.g. geocoded leads)
+
+        Args:
+            latitude: Array of latitudes in degrees
+            longitude: Array of longitudes in degrees
+            n: Number of neighbours to weight
+            chunk_size: Coordinates per distance matrix
+
+        Returns:
+            Dict of column name -> array: state, irradiance, tariff,
+            nearest_city and distance_km (to the nearest city)
+        """
+        found = self.nearest_many(latitude, longitude, n, chunk_size)
+        values = self._interpolate(found['index'], found['distance_km'])
+        nearest = found['index'][:, 0]
+        return {
+            'state': self.states[nearest],
+            'irradiance': values['irradiance'],
+            'tariff': values['tariff'],
+            'nearest_city': self.names[nearest],
+            'distance_km': found['distance_km'][:, 0]
+        }
+
+
+@lru_cache(maxsize=1)
+def get_location_index() -> LocationIndex:
+    """Shared index over LOCATION_DATA and CITY_COORDINATES (built on first use)"""
+    return LocationIndex.default()
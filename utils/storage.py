@@ -0,0 +1,189 @@
+"""
+Battery storage dispatch simulation on hourly generation and load profiles
+"""
+from typing import Dict, Optional
+
+import numpy as np
+
+from utils.hourly_simulation import HOURS_PER_YEAR
+
+# Battery sizes (kWh) swept by default for a storage-sizing curve
+DEFAULT_BATTERY_SIZES = (0, 2.5, 5, 7.5, 10, 12.5, 15, 20, 25, 30, 40, 50)
+
+# Cost of installed lithium-ion storage in ₹ per kWh of nameplate capacity
+BATTERY_COST_PER_KWH = 18000
+
+
+class StorageSimulator:
+    """Hour-by-hour battery dispatch, every battery size simulated together"""
+
+    def __init__(self, round_trip_efficiency: float = 0.9, depth_of_discharge: float = 0.9,
+                 c_rate: float = 0.5, backup_reserve: float = 0.0):
+        """
+        Initialize simulator
+
+        Args:
+            round_trip_efficiency: Energy out / energy in (split evenly
+                between charging and discharging)
+            depth_of_discharge: Usable fraction of nameplate capacity
+            c_rate: Maximum charge/discharge power as a fraction of
+                capacity per hour
+            backup_reserve: Fraction of usable capacity held back for
+                outages (only discharged during outage hours)
+        """
+        self.round_trip_efficiency = round_trip_efficiency
+        self.depth_of_discharge = depth_of_discharge
+        self.c_rate = c_rate
+        self.backup_reserve = backup_reserve
+
+    def simulate(self, generation: np.ndarray, load: np.ndarray, sizes=DEFAULT_BATTERY_SIZES,
+                 prices: Optional[np.ndarray] = None, outages: Optional[np.ndarray] = None,
+                 hourly: bool = False) -> Dict[str, np.ndarray]:
+        """
+        Dispatch batteries of every size over one year
+
+        Solar surplus charges the battery and deficits discharge it
+        (self-consumption). With hourly prices, the battery also charges
+        from the grid in the cheapest hours (only as much as the coming
+        peak hours need beyond the solar surplus, without importing more
+        than the peak load) and only discharges in dearer hours (time-of-use
+        arbitrage). The backup reserve is only used in outage hours, when
+        the grid is unavailable and load the battery cannot cover goes
+        unserved.
+
+        Args:
+            generation: Hourly solar generation in kWh (8760 values)
+            load: Hourly consumption in kWh (8760 values)
+            sizes: Battery nameplate capacities in kWh
+            prices: Optional hourly import price in ₹/kWh (24 or 8760 values)
+            outages: Optional boolean array of grid outage hours (8760 values)
+            hourly: Also return the (sizes, 8760) grid import/export arrays
+
+        Returns:
+            Dict of per-size arrays: size, grid_import, grid_export,
+            charged, discharged, grid_charged, unserved, cycles,
+            self_consumption and self_sufficiency (fractions); plus
+            hourly_import and hourly_export when requested
+        """
+        generation = np.asarray(generation, dtype=float)
+        load = np.asarray(load, dtype=float)
+        size = np.asarray(sizes, dtype=float)
+        hours = generation.shape[0]
+
+        charge_efficiency = discharge_efficiency = np.sqrt(self.round_trip_efficiency)
+        floor = size * (1 - self.depth_of_discharge)
+        reserve = floor + size * self.depth_of_discharge * self.backup_reserve
+        power = size * self.c_rate
+
+        surplus = generation - load
+        grid_target = np.zeros(hours)
+        discharge_hours = np.ones(hours, dtype=bool)
+        if prices is not None:
+            prices = np.asarray(prices, dtype=float)
+            if prices.shape[0] == 24:
+                prices = np.tile(prices, hours // 24)
+            cheapest = prices.min()
+            discharge_hours = prices > cheapest
+            if prices.max() * self.round_trip_efficiency > cheapest:
+                # Off-peak grid charging only covers the next day's peak
+                # deficit that solar surplus will not refill
+                peak_need = np.where(prices >= prices.max(), np.maximum(-surplus, 0), 0)
+                shortfall = (_next_day_total(peak_need) / discharge_efficiency
+                             - _next_day_total(np.maximum(surplus, 0)) * charge_efficiency)
+                grid_target = np.where(prices <= cheapest, np.maximum(shortfall, 0), 0)
+        # Grid charging never lifts imports above the peak load (no extra demand charge)
+        import_limit = load.max()
+        if outages is None:
+            outages = np.zeros(hours, dtype=bool)
+        else:
+            outages = np.asarray(outages, dtype=bool)
+
+        soc = reserve.copy()
+        grid_import = np.zeros((size.shape[0], hours)) if hourly else None
+        grid_export = np.zeros((size.shape[0], hours)) if hourly else None
+        totals = {name: np.zeros(size.shape) for name in
+                  ('grid_import', 'grid_export', 'charged', 'discharged', 'grid_charged', 'unserved')}
+
+        for hour in range(hours):
+            net = surplus[hour]
+            outage = outages[hour]
+            if net >= 0:
+                # Store solar surplus, export the rest (nothing during an outage)
+                stored = np.minimum(np.minimum(net, power), (size - soc) / charge_efficiency)
+                soc += stored * charge_efficiency
+                exported = 0.0 if outage else net - stored
+                imported = 0.0
+                totals['charged'] += stored
+                if grid_target[hour] and not outage:
+                    top_up = np.clip(np.minimum(np.minimum(power - stored, import_limit),
+                                                reserve + grid_target[hour] - soc),
+                                     0, (size - soc) / charge_efficiency)
+                    soc += top_up * charge_efficiency
+                    imported = top_up
+                    totals['grid_charged'] += top_up
+                    totals['charged'] += top_up
+            else:
+                deficit = -net
+                exported = 0.0
+                lowest = floor if outage else reserve
+                if outage or discharge_hours[hour]:
+                    delivered = np.minimum(np.minimum(deficit, power),
+                                           np.maximum(soc - lowest, 0) * discharge_efficiency)
+                    soc -= delivered / discharge_efficiency
+                    totals['discharged'] += delivered
+                    shortfall = deficit - delivered
+                else:
+                    shortfall = deficit
+                if outage:
+                    totals['unserved'] += shortfall
+                    imported = 0.0
+                else:
+                    imported = shortfall
+                    if grid_target[hour]:
+                        top_up = np.clip(np.minimum(np.minimum(power, import_limit - shortfall),
+                                                    reserve + grid_target[hour] - soc),
+                                         0, (size - soc) / charge_efficiency)
+                        soc += top_up * charge_efficiency
+                        imported = imported + top_up
+                        totals['grid_charged'] += top_up
+                        totals['charged'] += top_up
+
+            totals['grid_import'] += imported
+            totals['grid_export'] += exported
+            if hourly:
+                grid_import[:, hour] = imported
+                grid_export[:, hour] = exported
+
+        total_generation = generation.sum()
+        total_load = load.sum()
+        solar_charged = totals['charged'] - totals['grid_charged']
+        # Solar used on site: directly, or via the battery
+        direct = np.minimum(generation, load).sum()
+        result = dict(totals)
+        result.update({
+            'size': size,
+            'cycles': np.divide(totals['discharged'], size * self.depth_of_discharge,
+                                out=np.zeros(size.shape), where=size > 0),
+            'self_consumption': (direct + solar_charged) / total_generation if total_generation else np.zeros(size.shape),
+            'self_sufficiency': 1 - (totals['grid_import'] - totals['grid_charged'] + totals['unserved']) / total_load
+            if total_load else np.zeros(size.shape)
+        })
+        if hourly:
+            result['hourly_import'] = grid_import
+            result['hourly_export'] = grid_export
+        return result
+
+
+def _next_day_total(values: np.ndarray) -> np.ndarray:
+    """Sum of each hour and the 23 hours after it"""
+    running = np.concatenate(([0.0], np.cumsum(values)))
+    start = np.arange(values.shape[0])
+    return running[np.minimum(start + 24, values.shape[0])] - running[start]
+
+
+def default_outage_hours(hours_per_day: int = 2, start_hour: int = 19) -> np.ndarray:
+    """Boolean outage mask: the same evening window every day of the year"""
+    outages = np.zeros(HOURS_PER_YEAR, dtype=bool)
+    for offset in range(hours_per_day):
+        outages[(start_hour + offset) % 24::24] = True
+    return outages
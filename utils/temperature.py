@@ -0,0 +1,150 @@
+"""
+Cell-temperature derating (Faiman / NOCT) on hourly weather series
+"""
+from functools import lru_cache
+from typing import Dict, Optional
+
+import numpy as np
+
+from utils.hourly_simulation import HOUR_OF_DAY, MONTH_INDEX
+
+STC_TEMPERATURE = 25.0  # °C cell temperature at standard test conditions
+NOCT_IRRADIANCE = 800.0  # W/m²
+NOCT_AMBIENT = 20.0  # °C
+
+# Power temperature coefficients (fraction per °C) by module technology
+MODULE_TEMPERATURE_COEFFICIENTS = {
+    'mono_perc': -0.0035,
+    'polycrystalline': -0.0040,
+    'topcon': -0.0030,
+    'thin_film': -0.0025
+}
+
+# Typical monthly mean ambient temperature (°C, Jan-Dec), mean diurnal range
+# (°C) and mean wind speed (m/s) for each SolarDataFetcher climate zone
+CLIMATE_TEMPERATURES = {
+    'Hot-Dry': {
+        'monthly_mean': (16, 19, 25, 30, 34, 34, 31, 29, 29, 27, 21, 17),
+        'diurnal_range': 13.0,
+        'wind_speed': 2.5
+    },
+    'Hot-Humid': {
+        'monthly_mean': (25, 26, 28, 30, 31, 30, 29, 29, 29, 28, 27, 25),
+        'diurnal_range': 7.0,
+        'wind_speed': 3.5
+    },
+    'Temperate': {
+        'monthly_mean': (5, 7, 11, 15, 18, 20, 20, 19, 17, 14, 10, 7),
+        'diurnal_range': 10.0,
+        'wind_speed': 2.0
+    },
+    'Composite': {
+        'monthly_mean': (14, 17, 23, 29, 33, 33, 31, 30, 29, 26, 20, 15),
+        'diurnal_range': 11.0,
+        'wind_speed': 2.0
+    }
+}
+
+# Energy-weighted annual derate already included in the calculator's
+# PERFORMANCE_RATIO (a mono-PERC module at a typical hot Indian site); the
+# hourly derate is applied relative to it so that loss is not counted twice
+REFERENCE_DERATE = 0.93
+
+# Hour of the daily temperature (and wind) maximum
+PEAK_HOUR = 15.0
+
+
+@lru_cache(maxsize=16)
+def hourly_weather(climate_zone: str) -> Dict[str, np.ndarray]:
+    """
+    Hourly ambient temperature and wind speed for a climate zone
+
+    A daily cosine around each month's mean, peaking mid-afternoon. Built
+    once per zone; the arrays are read-only because they are shared.
+
+    Args:
+        climate_zone: Key of CLIMATE_TEMPERATURES (unknown zones use Composite)
+
+    Returns:
+        Dict with 'temperature' (°C) and 'wind_speed' (m/s), 8760 values each
+    """
+    climate = CLIMATE_TEMPERATURES.get(climate_zone, CLIMATE_TEMPERATURES['Composite'])
+    diurnal = np.cos(2 * np.pi * (HOUR_OF_DAY - PEAK_HOUR) / 24)
+
+    temperature = np.asarray(climate['monthly_mean'], dtype=float)[MONTH_INDEX] + climate['diurnal_range'] / 2 * diurnal
+    wind_speed = climate['wind_speed'] * (1 + 0.3 * diurnal)
+    temperature.flags.writeable = False
+    wind_speed.flags.writeable = False
+    return {'temperature': temperature, 'wind_speed': wind_speed}
+
+
+class TemperatureModel:
+    """Module cell temperature and the resulting power derate"""
+
+    def __init__(self, model: str = 'faiman', temperature_coefficient: float = -0.0035,
+                 u0: float = 25.0, u1: float = 6.84, noct: float = 45.0,
+                 reference_derate: float = REFERENCE_DERATE):
+        """
+        Initialize model
+
+        Args:
+            model: 'faiman' (wind-dependent heat loss) or 'noct'
+            temperature_coefficient: Power change per °C above STC
+                (see MODULE_TEMPERATURE_COEFFICIENTS)
+            u0: Faiman constant heat-loss factor in W/m²K
+            u1: Faiman wind heat-loss factor in W·s/m³K
+            noct: Nominal operating cell temperature in °C
+            reference_derate: Annual temperature derate the performance
+                ratio already includes (see relative_derate)
+        """
+        if model not in ('faiman', 'noct'):
+            raise ValueError(f"Unknown temperature model: {model}")
+        self.model = model
+        self.temperature_coefficient = temperature_coefficient
+        self.u0 = u0
+        self.u1 = u1
+        self.noct = noct
+        self.reference_derate = reference_derate
+
+    def cell_temperature(self, poa: np.ndarray, ambient_temperature: np.ndarray,
+                         wind_speed: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Cell temperature for every hour
+
+        Args:
+            poa: Plane-of-array irradiance in W/m² (any leading axes, hours last)
+            ambient_temperature: Ambient temperature in °C
+            wind_speed: Wind speed in m/s (Faiman only; defaults to 1 m/s)
+
+        Returns:
+            Cell temperature in °C, shaped like poa
+        """
+        if self.model == 'noct':
+            return ambient_temperature + poa * (self.noct - NOCT_AMBIENT) / NOCT_IRRADIANCE
+        wind = 1.0 if wind_speed is None else wind_speed
+        return ambient_temperature + poa / (self.u0 + self.u1 * wind)
+
+    def derate(self, poa: np.ndarray, ambient_temperature: np.ndarray,
+               wind_speed: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Hourly power multiplier relative to STC cell temperature
+
+        Returns:
+            Array shaped like poa (1.0 at 25 °C, below 1 when hotter)
+        """
+        cell = self.cell_temperature(poa, ambient_temperature, wind_speed)
+        return 1 + self.temperature_coefficient * (cell - STC_TEMPERATURE)
+
+    def relative_derate(self, poa: np.ndarray, ambient_temperature: np.ndarray,
+                        wind_speed: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Hourly multiplier for output already scaled by a performance ratio
+
+        The derate divided by reference_derate: a site as hot as the one the
+        performance ratio assumes keeps its yield, hotter sites lose and
+        cooler ones gain.
+
+        Returns:
+            Array shaped like poa
+        """
+        return self.derate(poa, ambient_temperature, wind_speed) / self.reference_derate